@@ -15,6 +15,7 @@ from api.languages.types import Language
 from api.pretix.query import get_conference_tickets, get_voucher
 from api.pretix.types import TicketItem, Voucher
 from api.schedule.types import Room, ScheduleItem, ScheduleItemUser
+from api.schedule.snapshot import get_schedule_days
 from api.schedule.types.day import Day
 from api.sponsors.types import (
     SponsorBenefit,
@@ -292,7 +293,7 @@ class Conference:
 
     @strawberry_django.field
     def days(self, info: Info) -> list[Day]:
-        return self.days.all()
+        return get_schedule_days(self, user_id=info.context.request.user.id)
 
     @strawberry_django.field
     def current_day(self) -> Day | None:
@@ -75,7 +75,8 @@ def _is_ticket_available(item) -> bool:
 def get_conference_tickets(
     conference: Conference, language: str, show_unavailable_tickets: bool = False
 ) -> list[TicketItem]:
-    items = pretix.get_items(conference)
+    items, questions, categories, quotas = pretix.get_tickets_catalog(conference)
+    questions = questions.values()
 
     # hide non active items
     items = {key: item for key, item in items.items() if item["active"]}
@@ -83,10 +84,6 @@ def get_conference_tickets(
     if not show_unavailable_tickets:
         items = {key: item for key, item in items.items() if _is_ticket_available(item)}
 
-    questions = pretix.get_questions(conference).values()
-    categories = pretix.get_categories(conference)
-    quotas = pretix.get_quotas(conference)
-
     def sort_func(ticket):
         # Make gadgets and association appear at the end
         if (
@@ -1,12 +1,11 @@
 from typing import Annotated, Union
+from django.core.cache import cache
 from api.context import Info
 from pretix import user_has_admission_ticket
 import strawberry
 from api.permissions import IsAuthenticated
-from schedule.models import (
-    ScheduleItem,
-    ScheduleItemAttendee,
-)
+from schedule.booking import BookingStatus, book_schedule_item as book
+from schedule.models import ScheduleItem
 from api.schedule.types import (
     ScheduleItem as ScheduleItemType,
 )
@@ -15,6 +14,7 @@ from api.schedule.types import (
 @strawberry.type
 class ScheduleItemIsFull:
     message: str = "This event is full"
+    waitlist_position: int | None = None
 
 
 @strawberry.type
@@ -44,27 +44,47 @@ BookScheduleItemResult = Annotated[
 ]
 
 
+# Tickets are not refunded during the booking rush, so the positive
+# answers of pretix can be reused for a while
+TICKET_CHECK_CACHE_TTL = 60 * 60  # 1 hour
+
+
+def _user_has_ticket(user, conference) -> bool:
+    key = f"booking:has_ticket:conf_{conference.id}:user_{user.id}"
+
+    if cache.get(key):
+        return True
+
+    has_ticket = user_has_admission_ticket(
+        email=user.email,
+        event_organizer=conference.pretix_organizer_id,
+        event_slug=conference.pretix_event_id,
+    )
+
+    if has_ticket:
+        cache.set(key, True, TICKET_CHECK_CACHE_TTL)
+
+    return has_ticket
+
+
 @strawberry.mutation(permission_classes=[IsAuthenticated])
 def book_schedule_item(info: Info, id: strawberry.ID) -> BookScheduleItemResult:
-    schedule_item = ScheduleItem.objects.get(id=id)
-    user_id = info.context.request.user.id
-
-    if not user_has_admission_ticket(
-        email=info.context.request.user.email,
-        event_organizer=schedule_item.conference.pretix_organizer_id,
-        event_slug=schedule_item.conference.pretix_event_id,
-    ):
-        return UserNeedsConferenceTicket()
+    schedule_item = ScheduleItem.objects.select_related("conference").get(id=id)
+    user = info.context.request.user
 
-    if schedule_item.actual_attendees_total_capacity is None:
-        return ScheduleItemNotBookable()
+    if not _user_has_ticket(user, schedule_item.conference):
+        return UserNeedsConferenceTicket()
 
-    if schedule_item.attendees.filter(user_id=user_id).exists():
-        return UserIsAlreadyBooked()
+    result = book(schedule_item.id, user.id)
 
-    if schedule_item.attendees.count() >= schedule_item.actual_attendees_total_capacity:
-        return ScheduleItemIsFull()
+    match result.status:
+        case BookingStatus.NOT_BOOKABLE:
+            return ScheduleItemNotBookable()
+        case BookingStatus.ALREADY_BOOKED:
+            return UserIsAlreadyBooked()
+        case BookingStatus.WAITLISTED:
+            return ScheduleItemIsFull(waitlist_position=result.waitlist_position)
 
-    ScheduleItemAttendee.objects.create(schedule_item=schedule_item, user_id=user_id)
+    schedule_item = result.schedule_item
     schedule_item.__strawberry_definition__ = ScheduleItemType.__strawberry_definition__
     return schedule_item
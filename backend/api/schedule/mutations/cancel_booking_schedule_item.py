@@ -6,10 +6,8 @@ from api.schedule.types import (
 from typing import Annotated, Union
 import strawberry
 from api.permissions import IsAuthenticated
-from schedule.models import (
-    ScheduleItem,
-    ScheduleItemAttendee,
-)
+from schedule.booking import cancel_booking
+from schedule.models import ScheduleItem
 
 
 @strawberry.type
@@ -33,11 +31,8 @@ def cancel_booking_schedule_item(
     if schedule_item.actual_attendees_total_capacity is None:
         return ScheduleItemNotBookable()
 
-    if not schedule_item.attendees.filter(user_id=user_id).exists():
+    if not cancel_booking(schedule_item, user_id):
         return UserIsNotBooked()
 
-    ScheduleItemAttendee.objects.filter(
-        schedule_item=schedule_item, user_id=user_id
-    ).delete()
     schedule_item.__strawberry_definition__ = ScheduleItemType.__strawberry_definition__
     return schedule_item
@@ -0,0 +1,222 @@
+from django.apps import apps
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Count, Prefetch
+from django.db.models.base import ModelState
+from django.db.models.fields.files import FieldFile
+from strawberry_django.optimizer import mark_optimized_by_prefetching
+
+from participants.models import Participant
+from schedule.booking import get_user_waitlist_positions
+from schedule.models import Day, Room, ScheduleItem, ScheduleItemAttendee, Slot
+from schedule.revisions import get_schedule_revision
+from submissions.models import SubmissionTag
+
+# Every schedule change bumps the revision, the TTL bounds how stale the
+# data of speakers and submissions can get, their changes don't
+SCHEDULE_SNAPSHOT_TTL = 60 * 10  # 10 minutes
+
+
+def _snapshot_cache_key(conference_id: int, revision: int) -> str:
+    # v2 is the dump_schedule_snapshot format, v1 pickled the model instances
+    return f"schedule:snapshot:v2:conf_{conference_id}:rev_{revision}"
+
+
+def _prefetched(queryset):
+    # Tells Strawberry Django the relation is already loaded, so it serves
+    # the prefetched rows instead of querying them again
+    return mark_optimized_by_prefetching(queryset)
+
+
+def _dump_instance(instance, rows: dict, dumped: set) -> tuple[str, int]:
+    """Adds `instance`, and the related objects it has loaded, to `rows` as
+    plain dicts of their field values. Returns its reference in `rows`."""
+    label = instance._meta.label_lower
+    ref = (label, instance.pk)
+
+    if id(instance) in dumped:
+        return ref
+
+    dumped.add(id(instance))
+    row = rows.setdefault(label, {}).setdefault(
+        instance.pk, {"values": {}, "annotations": {}, "related": {}, "prefetched": {}}
+    )
+
+    for field in instance._meta.concrete_fields:
+        if field.attname in instance.__dict__:
+            value = instance.__dict__[field.attname]
+            row["values"][field.attname] = (
+                value.name if isinstance(value, FieldFile) else value
+            )
+
+    for name, value in instance.__dict__.items():
+        if name.startswith("graphql_"):
+            row["annotations"][name] = value
+
+    # The same row can be loaded more than once, e.g. a user who is the
+    # speaker of two items, every copy adds the relations it has loaded
+    for name, related in instance._state.fields_cache.items():
+        row["related"][name] = related and _dump_instance(related, rows, dumped)
+
+    for name, queryset in getattr(instance, "_prefetched_objects_cache", {}).items():
+        row["prefetched"][name] = (
+            queryset.model._meta.label_lower,
+            [_dump_instance(obj, rows, dumped)[1] for obj in queryset],
+        )
+
+    return ref
+
+
+def dump_schedule_snapshot(days: list[Day]) -> dict:
+    """Compact form of the `days` tree stored in the cache: the rows of every
+    model by primary key, with the relations as primary keys. It holds
+    plain values only, unlike pickled model instances with their state."""
+    rows = {}
+    dumped = set()
+    return {
+        "days": [_dump_instance(day, rows, dumped)[1] for day in days],
+        "rows": rows,
+    }
+
+
+def load_schedule_snapshot(snapshot: dict) -> list[Day]:
+    """Rebuilds the `days` tree of `dump_schedule_snapshot`, with the
+    relations loaded like the prefetched tree it was made from."""
+    instances = {}
+
+    for label, model_rows in snapshot["rows"].items():
+        model = apps.get_model(label)
+        instances[label] = {}
+
+        for pk, row in model_rows.items():
+            # Built like unpickling does, without __init__ and its signals.
+            # The fields missing from the values are deferred
+            instance = model.__new__(model)
+            instance.__dict__.update(row["values"])
+            instance.__dict__.update(row["annotations"])
+            instance._state = ModelState()
+            instance._state.adding = False
+            instance._state.db = DEFAULT_DB_ALIAS
+            instances[label][pk] = instance
+
+    for label, model_rows in snapshot["rows"].items():
+        for pk, row in model_rows.items():
+            instance = instances[label][pk]
+
+            for name, ref in row["related"].items():
+                instance._state.fields_cache[name] = ref and instances[ref[0]][ref[1]]
+
+            if not row["prefetched"]:
+                continue
+
+            instance._prefetched_objects_cache = {}
+
+            for name, (related_label, pks) in row["prefetched"].items():
+                related_instances = instances.get(related_label, {})
+                queryset = _prefetched(
+                    apps.get_model(related_label)._default_manager.get_queryset()
+                )
+                queryset._result_cache = [related_instances[pk] for pk in pks]
+                queryset._prefetch_done = True
+                instance._prefetched_objects_cache[name] = queryset
+
+    return [instances[Day._meta.label_lower][pk] for pk in snapshot["days"]]
+
+
+def build_schedule_snapshot(conference) -> list[Day]:
+    """Loads the whole `days` tree of `conference` with its related data,
+    so that it can be cached and served without queries."""
+    from api.schedule.types.schedule_item import (
+        CAPACITY_ANNOTATION,
+        ScheduleItem as ScheduleItemType,
+        capacity_annotation,
+    )
+
+    participants = Participant.objects.filter(conference=conference).select_related(
+        "photo_file"
+    )
+    items = (
+        ScheduleItemType.get_queryset(ScheduleItem.objects.all(), None)
+        .annotate(**{CAPACITY_ANNOTATION: capacity_annotation(None)})
+        .select_related(
+            "conference",
+            "language",
+            "audience_level",
+            "livestreaming_room",
+            "keynote",
+            "submission__conference",
+            "submission__speaker",
+            "submission__type",
+            "submission__duration",
+            "submission__audience_level",
+        )
+        .prefetch_related(
+            Prefetch("rooms", queryset=_prefetched(Room.objects.all())),
+            Prefetch(
+                "submission__tags", queryset=_prefetched(SubmissionTag.objects.all())
+            ),
+            Prefetch("submission__speaker__participants", queryset=participants),
+            "keynote__speakers__user",
+            Prefetch("keynote__speakers__user__participants", queryset=participants),
+            "additional_speakers__user",
+            Prefetch("additional_speakers__user__participants", queryset=participants),
+        )
+    )
+
+    return list(
+        Day.objects.filter(conference=conference)
+        .select_related("conference")
+        .prefetch_related(
+            "added_rooms__room",
+            Prefetch("slots", queryset=_prefetched(Slot.objects.all())),
+            Prefetch("slots__items", queryset=_prefetched(items)),
+        )
+        .order_by("day", "id")
+    )
+
+
+def add_live_data(conference, days: list[Day], user_id: int | None) -> None:
+    """Sets the attendees count, the spot of the user and their waitlist
+    position on every schedule item, they change too often to be part of
+    the snapshot."""
+    attendees_counts = dict(
+        ScheduleItemAttendee.objects.filter(schedule_item__conference=conference)
+        .values("schedule_item_id")
+        .annotate(count=Count("id"))
+        .values_list("schedule_item_id", "count")
+    )
+    user_spots = (
+        set(
+            ScheduleItemAttendee.objects.filter(
+                schedule_item__conference=conference, user_id=user_id
+            ).values_list("schedule_item_id", flat=True)
+        )
+        if user_id
+        else set()
+    )
+    user_waitlist_positions = (
+        get_user_waitlist_positions(conference.id, user_id) if user_id else {}
+    )
+
+    for day in days:
+        for slot in day.slots.all():
+            for item in slot.items.all():
+                item.graphql_attendees_count = attendees_counts.get(item.id, 0)
+                item.graphql_user_has_spot = item.id in user_spots
+                item.graphql_user_waitlist_position = user_waitlist_positions.get(
+                    item.id
+                )
+
+
+def get_schedule_days(conference, *, user_id: int | None = None) -> list[Day]:
+    key = _snapshot_cache_key(conference.id, get_schedule_revision(conference.id))
+    snapshot = cache.get(key)
+
+    if snapshot is None:
+        days = build_schedule_snapshot(conference)
+        cache.set(key, dump_schedule_snapshot(days), SCHEDULE_SNAPSHOT_TTL)
+    else:
+        days = load_schedule_snapshot(snapshot)
+
+    add_live_data(conference, days, user_id)
+    return days
@@ -0,0 +1,150 @@
+import datetime
+
+from django.core.cache import cache
+
+from api.schedule.snapshot import _snapshot_cache_key, get_schedule_days
+from participants.tests.factories import ParticipantFactory
+from schedule.models import (
+    ScheduleItem,
+    ScheduleItemAttendee,
+    ScheduleItemWaitlistEntry,
+)
+from schedule.revisions import get_schedule_revision
+from schedule.tests.factories import (
+    DayFactory,
+    ScheduleItemAdditionalSpeakerFactory,
+    RoomFactory,
+    ScheduleItemFactory,
+    SlotFactory,
+)
+from users.tests.factories import UserFactory
+import pytest
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+
+
+def _create_schedule_item(**kwargs):
+    schedule_item = ScheduleItemFactory(type=ScheduleItem.TYPES.talk, **kwargs)
+    day = DayFactory(
+        conference=schedule_item.conference, day=datetime.date(2020, 10, 10)
+    )
+    schedule_item.slot = SlotFactory(day=day, hour=datetime.time(10, 0), duration=30)
+    schedule_item.save()
+    schedule_item.rooms.add(RoomFactory())
+    return schedule_item
+
+
+def test_snapshot_is_reused_until_the_schedule_changes(
+    locmem_cache, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    schedule_item = _create_schedule_item()
+    conference = schedule_item.conference
+
+    [day] = get_schedule_days(conference)
+    [slot] = day.slots.all()
+    [item] = slot.items.all()
+    assert item.title == schedule_item.title
+
+    # Only the attendees counts are loaded, the user is anonymous
+    with django_assert_num_queries(1):
+        [day] = get_schedule_days(conference)
+        [item] = day.slots.all()[0].items.all()
+        [_] = item.rooms.all()
+        assert list(item.slot.day.added_rooms.all()) == []
+
+    assert item.title == schedule_item.title
+
+    with django_capture_on_commit_callbacks(execute=True):
+        schedule_item.title = "New title"
+        schedule_item.save()
+
+    [day] = get_schedule_days(conference)
+    [item] = day.slots.all()[0].items.all()
+    assert item.title == "New title"
+
+
+def test_cached_snapshot_is_rebuilt_with_its_relations(
+    locmem_cache, django_assert_num_queries
+):
+    speaker = UserFactory()
+    schedule_item = _create_schedule_item(submission__speaker=speaker)
+    ParticipantFactory(user=speaker, conference=schedule_item.conference)
+    additional_speaker = ScheduleItemAdditionalSpeakerFactory(
+        scheduleitem=schedule_item
+    )
+    conference = schedule_item.conference
+    get_schedule_days(conference)
+
+    # Only plain values are stored, not model instances
+    snapshot = cache.get(
+        _snapshot_cache_key(conference.id, get_schedule_revision(conference.id))
+    )
+    assert snapshot["days"] == [schedule_item.slot.day_id]
+    assert snapshot["rows"]["schedule.scheduleitem"][schedule_item.id]["values"][
+        "title"
+    ] == (schedule_item.title)
+
+    rooms = list(schedule_item.rooms.all())
+    participants = list(speaker.participants.all())
+    tags = list(schedule_item.submission.tags.all())
+
+    # The rebuilt tree serves what the resolvers read, only the attendees
+    # counts are loaded
+    with django_assert_num_queries(1):
+        [day] = get_schedule_days(conference)
+        [slot] = day.slots.all()
+        [item] = slot.items.all()
+
+        assert item == schedule_item
+        assert item.slot.day.conference.timezone == conference.timezone
+        assert item.graphql_attendees_total_capacity is None
+        assert list(item.rooms.all()) == rooms
+        assert item.speakers == [speaker, additional_speaker.user]
+        assert list(item.submission.speaker.participants.all()) == participants
+        assert list(item.submission.tags.all()) == tags
+        assert item.language.code == schedule_item.language.code
+
+
+def test_live_data_is_added_to_cached_snapshot(locmem_cache):
+    schedule_item = _create_schedule_item()
+    conference = schedule_item.conference
+    user = UserFactory()
+
+    [day] = get_schedule_days(conference, user_id=user.id)
+    [item] = day.slots.all()[0].items.all()
+    assert item.graphql_attendees_count == 0
+    assert item.graphql_user_has_spot is False
+
+    ScheduleItemAttendee.objects.create(schedule_item=schedule_item, user=user)
+    ScheduleItemAttendee.objects.create(schedule_item=schedule_item, user=UserFactory())
+
+    [day] = get_schedule_days(conference, user_id=user.id)
+    [item] = day.slots.all()[0].items.all()
+    assert item.graphql_attendees_count == 2
+    assert item.graphql_user_has_spot is True
+    assert item.graphql_user_waitlist_position is None
+
+    waitlisted_user = UserFactory()
+    ScheduleItemWaitlistEntry.objects.create(
+        schedule_item=schedule_item, user=UserFactory()
+    )
+    ScheduleItemWaitlistEntry.objects.create(
+        schedule_item=schedule_item, user=waitlisted_user
+    )
+
+    [day] = get_schedule_days(conference, user_id=waitlisted_user.id)
+    [item] = day.slots.all()[0].items.all()
+    assert item.graphql_user_has_spot is False
+    assert item.graphql_user_waitlist_position == 2
+
+    [day] = get_schedule_days(conference)
+    [item] = day.slots.all()[0].items.all()
+    assert item.graphql_user_has_spot is False
@@ -37,9 +37,20 @@ class Day:
     def slots(
         self, info: Info, room: strawberry.ID | None = None
     ) -> list[ScheduleSlot]:
+        slots = list(self.slots.all())
+
         if room:
-            return self.slots.filter(items__rooms__id=room)
-        return self.slots.all()
+            return [
+                slot
+                for slot in slots
+                if any(
+                    str(item_room.id) == str(room)
+                    for item in slot.items.all()
+                    for item_room in item.rooms.all()
+                )
+            ]
+
+        return slots
 
     @strawberry_django.field
     def running_events(self, info: Info) -> list[ScheduleItem]:
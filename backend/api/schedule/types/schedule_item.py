@@ -15,6 +15,7 @@ from api.schedule.types.schedule_item_user import ScheduleItemUser
 from api.submissions.types import Submission
 from participants import models as participant_models
 from schedule import models
+from schedule.booking import get_waitlist_position
 
 if TYPE_CHECKING:  # pragma: no cover
     from api.conferences.types import AudienceLevel, Conference, Keynote
@@ -158,6 +159,16 @@ class ScheduleItem:
             user_id = info.context.request.user.id
             return self.attendees.filter(user_id=user_id).exists()
 
+    @strawberry.field
+    def user_waitlist_position(self, info: Info) -> int | None:
+        try:
+            return self.graphql_user_waitlist_position
+        except AttributeError:
+            if not (user_id := info.context.request.user.id):
+                return None
+
+            return get_waitlist_position(self.id, user_id)
+
     @strawberry.field
     def user_is_talk_manager(self, info: Info) -> bool:
         if not (user_id := info.context.request.user.id):
@@ -242,5 +253,14 @@ class ScheduleItem:
         if self.slido_url:
             return self.slido_url
 
-        # For multi-room items we use the first room slido url
-        return self.slot.day.added_rooms.get(room_id=self.rooms.first().id).slido_url
+        # For multi-room items we use the first room slido url, looked up in
+        # memory so that the prefetched schedule snapshot is enough
+        first_room = min(self.rooms.all(), key=lambda room: room.id)
+        return next(
+            (
+                added_room.slido_url
+                for added_room in self.slot.day.added_rooms.all()
+                if added_room.room_id == first_room.id
+            ),
+            "",
+        )
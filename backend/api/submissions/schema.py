@@ -2,19 +2,55 @@ import random
 
 import strawberry
 import strawberry_django
-from django.db.models import Case, IntegerField, When
+from django.db.models import Case, Exists, IntegerField, OuterRef, When
 
 from api.context import Info
 from api.permissions import CanSeeSubmissions, IsAuthenticated
 from api.submissions.permissions import CanSeeSubmissionRestrictedFields
+from api.submissions.snapshots import create_snapshot, get_filters_key, get_snapshot
 from api.types import Paginated
 from conferences import models as conference_models
 from submissions import models as submission_models
 from voting.helpers import check_if_user_can_vote
+from voting.models import Vote
 
 from .types import Submission, SubmissionTag
 
 
+def _get_shuffled_submission_ids(
+    conference,
+    user,
+    *,
+    status,
+    languages,
+    voted,
+    tags,
+    types,
+    audience_levels,
+) -> list[int]:
+    qs = conference.submissions.filter(status=status)
+
+    if languages:
+        qs = qs.filter(languages__code__in=languages)
+
+    if tags:
+        qs = qs.filter(tags__id__in=tags)
+
+    if voted is not None:
+        user_votes = Vote.objects.filter(submission_id=OuterRef("pk"), user_id=user.id)
+        qs = qs.filter(Exists(user_votes) if voted else ~Exists(user_votes))
+
+    if types:
+        qs = qs.filter(type__id__in=types)
+
+    if audience_levels:
+        qs = qs.filter(audience_level__id__in=audience_levels)
+
+    submission_ids = list(qs.order_by("id").distinct().values_list("id", flat=True))
+    random.Random(user.id).shuffle(submission_ids)
+    return submission_ids
+
+
 @strawberry.type
 class SubmissionsQuery:
     @strawberry_django.field
@@ -46,6 +82,7 @@ class SubmissionsQuery:
         page: int | None = 1,
         page_size: int | None = 50,
         only_accepted: bool = False,
+        cursor: str | None = None,
     ) -> Paginated[Submission] | None:
         if page_size > 300:
             raise ValueError("Page size cannot be greater than 300")
@@ -72,40 +109,46 @@ class SubmissionsQuery:
         ):
             raise PermissionError("You need to have a ticket to see submissions")
 
-        qs = conference.submissions.all()
-
-        if only_accepted:
-            qs = qs.filter(status=submission_models.Submission.STATUS.accepted)
-        else:
-            qs = qs.filter(status=submission_models.Submission.STATUS.proposed)
-
-        if languages:
-            qs = qs.filter(languages__code__in=languages)
-
-        if tags:
-            qs = qs.filter(tags__id__in=tags)
-
-        if voted:
-            qs = qs.filter(votes__user_id=user.id)
-        elif voted is not None:
-            qs = qs.exclude(id__in=[s.id for s in qs.filter(votes__user_id=user.id)])
-
-        if types:
-            qs = qs.filter(type__id__in=types)
+        status = (
+            submission_models.Submission.STATUS.accepted
+            if only_accepted
+            else submission_models.Submission.STATUS.proposed
+        )
+        filters_key = get_filters_key(
+            user_id=user.id,
+            conference_id=conference.id,
+            languages=languages,
+            voted=voted,
+            tags=tags,
+            types=types,
+            audience_levels=audience_levels,
+            only_accepted=only_accepted,
+        )
 
-        if audience_levels:
-            qs = qs.filter(audience_level__id__in=audience_levels)
+        # The first page takes a new snapshot of the shuffled ids, the next
+        # ones only look up the ids of the page
+        snapshot = get_snapshot(filters_key, cursor) if cursor or page > 1 else None
 
-        submission_ids = list(
-            qs.order_by("id").distinct().values_list("id", flat=True)
-        )
-        random.Random(user.id).shuffle(submission_ids)
+        if snapshot:
+            cursor, submission_ids = snapshot
+        else:
+            submission_ids = _get_shuffled_submission_ids(
+                conference,
+                user,
+                status=status,
+                languages=languages,
+                voted=voted,
+                tags=tags,
+                types=types,
+                audience_levels=audience_levels,
+            )
+            cursor = create_snapshot(filters_key, submission_ids)
 
         total_items = len(submission_ids)
-        page_submission_ids = submission_ids[
-            (page - 1) * page_size : page * page_size
-        ]
-        submissions = conference.submissions.filter(id__in=page_submission_ids)
+        page_submission_ids = submission_ids[(page - 1) * page_size : page * page_size]
+        submissions = conference.submissions.filter(
+            id__in=page_submission_ids, status=status
+        )
         if not only_accepted:
             # This relation is used by a permission check, so it is invisible to
             # Strawberry Django's selection-based optimizer.
@@ -127,6 +170,7 @@ class SubmissionsQuery:
             page_size=page_size,
             total_items=total_items,
             page=page,
+            cursor=cursor,
         )
 
     @strawberry.field
@@ -0,0 +1,60 @@
+import hashlib
+import json
+import uuid
+
+from django.core.cache import cache
+
+# How long a voter can keep paging through the same shuffled list
+SNAPSHOT_TTL = 60 * 30  # 30 minutes
+
+
+def get_filters_key(*, user_id: int | None, conference_id: int, **filters) -> str:
+    normalized = {
+        name: sorted(value) if isinstance(value, list) else value
+        for name, value in filters.items()
+    }
+    filters_hash = hashlib.md5(
+        json.dumps(normalized, sort_keys=True).encode()
+    ).hexdigest()
+    return f"conf_{conference_id}:user_{user_id}:{filters_hash}"
+
+
+def _snapshot_cache_key(cursor: str) -> str:
+    return f"submissions:snapshot:{cursor}"
+
+
+def _latest_cursor_cache_key(filters_key: str) -> str:
+    return f"submissions:snapshot:latest:{filters_key}"
+
+
+def get_snapshot(filters_key: str, cursor: str | None) -> tuple[str, list[int]] | None:
+    """Returns the cursor and the submission ids of the snapshot `cursor`, or
+    of the latest snapshot taken for `filters_key` when no cursor is given.
+    Snapshots of other users or filters are never returned.
+    """
+    cursor = cursor or cache.get(_latest_cursor_cache_key(filters_key))
+
+    if not cursor:
+        return None
+
+    snapshot = cache.get(_snapshot_cache_key(cursor))
+
+    if not snapshot or snapshot["filters_key"] != filters_key:
+        return None
+
+    return cursor, snapshot["ids"]
+
+
+def create_snapshot(filters_key: str, submission_ids: list[int]) -> str:
+    cursor = uuid.uuid4().hex
+    cache.set_many(
+        {
+            _snapshot_cache_key(cursor): {
+                "filters_key": filters_key,
+                "ids": submission_ids,
+            },
+            _latest_cursor_cache_key(filters_key): cursor,
+        },
+        SNAPSHOT_TTL,
+    )
+    return cursor
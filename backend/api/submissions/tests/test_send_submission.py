@@ -151,6 +151,7 @@ def test_submit_talk(
 ):
     settings.FRONTEND_URL = "http://testserver"
     mock_notify = mocker.patch("api.submissions.mutations.notify_new_cfp_submission")
+    mock_embedding = mocker.patch("reviews.tasks.schedule_submission_embeddings_update")
     graphql_client.force_login(user)
 
     conference = ConferenceFactory(
@@ -224,6 +225,7 @@ def test_submit_talk(
     ).exists()
 
     mock_notify.delay.assert_called_once()
+    mock_embedding.assert_called_once_with()
 
     # Verify that the correct email template was used and email was sent
     emails_sent = sent_emails()
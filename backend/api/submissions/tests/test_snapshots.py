@@ -0,0 +1,45 @@
+import pytest
+
+from api.submissions.snapshots import create_snapshot, get_filters_key, get_snapshot
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+
+
+def test_filters_key_ignores_the_order_of_list_filters():
+    assert get_filters_key(
+        user_id=1, conference_id=1, tags=["1", "2"], voted=None
+    ) == get_filters_key(user_id=1, conference_id=1, tags=["2", "1"], voted=None)
+    assert get_filters_key(user_id=1, conference_id=1, voted=True) != (
+        get_filters_key(user_id=1, conference_id=1, voted=False)
+    )
+    assert get_filters_key(user_id=1, conference_id=1) != (
+        get_filters_key(user_id=2, conference_id=1)
+    )
+
+
+def test_get_snapshot_by_cursor():
+    filters_key = get_filters_key(user_id=1, conference_id=1)
+    cursor = create_snapshot(filters_key, [3, 1, 2])
+
+    assert get_snapshot(filters_key, cursor) == (cursor, [3, 1, 2])
+
+
+def test_get_latest_snapshot_without_cursor():
+    filters_key = get_filters_key(user_id=1, conference_id=1)
+    create_snapshot(filters_key, [3, 1, 2])
+    cursor = create_snapshot(filters_key, [2, 3])
+
+    assert get_snapshot(filters_key, None) == (cursor, [2, 3])
+
+
+def test_cannot_use_the_snapshot_of_other_filters():
+    filters_key = get_filters_key(user_id=1, conference_id=1)
+    cursor = create_snapshot(filters_key, [3, 1, 2])
+
+    assert get_snapshot(get_filters_key(user_id=2, conference_id=1), cursor) is None
+    assert get_snapshot(filters_key, "unknown") is None
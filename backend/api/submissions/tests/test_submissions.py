@@ -362,6 +362,66 @@ def test_filter_by_user_has_not_voted(graphql_client, user, mock_has_ticket):
     assert resp["data"]["submissions"]["items"] == [{"id": submission_2.hashid}]
 
 
+def test_next_pages_use_the_snapshot_of_the_first_page(
+    graphql_client, user, mock_has_ticket, settings
+):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    graphql_client.force_login(user)
+    submission = SubmissionFactory()
+    SubmissionFactory(conference=submission.conference)
+    mock_has_ticket(submission.conference)
+
+    query = """query Submissions($code: String!, $page: Int, $cursor: String) {
+        submissions(
+            code: $code, voted: false, page: $page, pageSize: 1, cursor: $cursor
+        ) {
+            pageInfo {
+                totalItems
+                cursor
+            }
+            items {
+                id
+            }
+        }
+    }"""
+
+    resp = graphql_client.query(
+        query, variables={"code": submission.conference.code, "page": 1}
+    )
+
+    assert not resp.get("errors")
+    cursor = resp["data"]["submissions"]["pageInfo"]["cursor"]
+    first_page_id = resp["data"]["submissions"]["items"][0]["id"]
+
+    # Voting does not shift the pages of the snapshot
+    VoteFactory(
+        user_id=user.id,
+        submission=Submission.objects.get_by_hashid(first_page_id),
+    )
+
+    resp = graphql_client.query(
+        query,
+        variables={"code": submission.conference.code, "page": 2, "cursor": cursor},
+    )
+
+    assert not resp.get("errors")
+    assert resp["data"]["submissions"]["pageInfo"] == {
+        "totalItems": 2,
+        "cursor": cursor,
+    }
+    assert resp["data"]["submissions"]["items"][0]["id"] != first_page_id
+
+    # A new first page takes a new snapshot
+    resp = graphql_client.query(
+        query, variables={"code": submission.conference.code, "page": 1}
+    )
+
+    assert resp["data"]["submissions"]["pageInfo"]["totalItems"] == 1
+    assert resp["data"]["submissions"]["pageInfo"]["cursor"] != cursor
+
+
 def test_filter_by_type(graphql_client, user, mock_has_ticket):
     graphql_client.force_login(user)
     conference = ConferenceFactory(
@@ -127,6 +127,8 @@ class PageInfo:
     total_pages: int
     total_items: int
     page_size: int
+    # Pass it back to keep paging through the same results
+    cursor: str | None = None
 
 
 @strawberry.type
@@ -136,13 +138,20 @@ class Paginated(Generic[ItemType]):
 
     @classmethod
     def paginate_list(
-        cls, *, items: List[ItemType], page_size: int, total_items: int, page: int
+        cls,
+        *,
+        items: List[ItemType],
+        page_size: int,
+        total_items: int,
+        page: int,
+        cursor: str | None = None,
     ) -> "Paginated[ItemType]":
         return Paginated(
             page_info=PageInfo(
                 total_pages=math.ceil(total_items / page_size),
                 page_size=page_size,
                 total_items=total_items,
+                cursor=cursor,
             ),
             items=items,
         )
@@ -5,6 +5,7 @@ from association_membership.exceptions import WebhookError
 from association_membership.handlers.sns import ses_event
 
 from .pretix.pretix_event_order_paid import pretix_event_order_paid
+from .pretix.pretix_event_order_updated import pretix_event_order_updated
 from .stripe.handle_invoice_paid import handle_invoice_paid
 
 logger = logging.getLogger(__file__)
@@ -15,7 +16,17 @@ HANDLERS = {
     "stripe": {
         "invoice.paid": handle_invoice_paid,
     },
-    "pretix": {"pretix.event.order.paid": pretix_event_order_paid},
+    "pretix": {
+        "pretix.event.order.paid": pretix_event_order_paid,
+        "pretix.event.order.placed": pretix_event_order_updated,
+        "pretix.event.order.placed.require_approval": pretix_event_order_updated,
+        "pretix.event.order.approved": pretix_event_order_updated,
+        "pretix.event.order.denied": pretix_event_order_updated,
+        "pretix.event.order.canceled": pretix_event_order_updated,
+        "pretix.event.order.expired": pretix_event_order_updated,
+        "pretix.event.order.reactivated": pretix_event_order_updated,
+        "pretix.event.order.modified": pretix_event_order_updated,
+    },
     "sns": {
         "bounce": ses_event,
         "complaint": ses_event,
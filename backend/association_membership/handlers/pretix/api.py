@@ -1,11 +1,10 @@
 import urllib.parse
 from typing import Literal
 
-import requests
-
 from django.conf import settings
 
 from conferences.models.conference import Conference
+from pretix.client import get_client
 
 METHODS = Literal["get", "post", "put", "patch", "delete"]
 
@@ -33,12 +32,10 @@ class PretixAPI:
         qs: dict[str, str] = None,
         json: dict = None,
     ):
-        headers = {"Authorization": f"Token {str(settings.PRETIX_API_TOKEN)}"}
-
         if qs:
             url = f"{url}?" + "&".join([f"{key}={value}" for key, value in qs.items()])
 
-        return getattr(requests, method)(url, headers=headers, json=json)
+        return get_client().request(method, url, json=json)
 
     def _request(self, endpoint: str, **kwargs):
         url = f"{self.base_url}/{endpoint}/"
@@ -18,6 +18,7 @@ from association_membership.exceptions import (
 )
 
 from .api import PretixAPI
+from .pretix_event_order_updated import pretix_event_order_updated
 
 logger = logging.getLogger(__file__)
 
@@ -28,6 +29,8 @@ def pretix_event_order_paid(payload):
     event = payload["event"]
     order_code = payload["code"]
 
+    pretix_event_order_updated(payload)
+
     pretix_api = PretixAPI(organizer, event)
 
     order_data = pretix_api.get_order_data(order_code)
@@ -0,0 +1,22 @@
+import logging
+
+from pretix.cache import invalidate_pretix_cache
+from pretix_mirror.tasks import sync_pretix_order
+
+logger = logging.getLogger(__file__)
+
+
+def pretix_event_order_updated(payload):
+    organizer = payload["organizer"]
+    event = payload["event"]
+    order_code = payload["code"]
+
+    logger.info(
+        "Received %s for order_code=%s, updating local pretix data",
+        payload["action"],
+        order_code,
+    )
+
+    # Placing, cancelling or changing an order changes the quotas availability
+    invalidate_pretix_cache(organizer, event, "quotas")
+    sync_pretix_order.delay(organizer=organizer, event=event, code=order_code)
@@ -36,6 +36,13 @@ class Membership(models.Model):
     def is_active(self) -> bool:
         return self.status == MembershipStatus.ACTIVE
 
+    def save(self, *args, **kwargs):
+        from voting.eligibility import invalidate_voting_eligibility
+
+        super().save(*args, **kwargs)
+        # Active members can vote
+        invalidate_voting_eligibility(self.user_id)
+
     def _change_state(self, to: MembershipStatus):
         logger.info(
             "Switching membership_id=%s of user_id=%s"
@@ -0,0 +1,23 @@
+from association_membership.handlers import run_handler
+
+
+def test_order_placed_invalidates_quotas_cache(mocker):
+    invalidate_mock = mocker.patch(
+        "association_membership.handlers.pretix.pretix_event_order_updated.invalidate_pretix_cache"
+    )
+
+    run_handler(
+        "pretix",
+        "pretix.event.order.placed",
+        {
+            "notification_id": 4122,
+            "organizer": "test-organizer",
+            "event": "local-conf-test",
+            "code": "9YKZK",
+            "action": "pretix.event.order.placed",
+        },
+    )
+
+    invalidate_mock.assert_called_once_with(
+        "test-organizer", "local-conf-test", "quotas"
+    )
@@ -0,0 +1,13 @@
+from rest_framework.permissions import BasePermission
+
+from api.models import APIToken
+
+
+class HasBackendToken(BasePermission):
+    def has_permission(self, request, view):
+        token = request.headers.get("X-Backend-Token")
+
+        if token:
+            return APIToken.objects.filter(token=token).exists()
+
+        return False
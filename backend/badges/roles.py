@@ -1,12 +1,15 @@
 import strawberry
 from enum import Enum
-from typing import Dict, List, Set
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
 import pretix
+from pretix_mirror import queries as pretix_mirror
 from conferences.models import Conference
 from schedule.models import ScheduleItem
 from django.core.cache import cache
 from badges.models import AttendeeConferenceRole
 from django.db.models import Q
+from django.db.models.functions import Lower
+from users.models import User
 
 
 class Role(Enum):
@@ -75,18 +78,90 @@ def get_conference_roles_for_ticket_data(
 def get_conference_roles_for_user(
     conference: Conference, user_id: int | None, user_email: str
 ) -> List[Role]:
-    user_tickets = pretix.get_user_tickets(conference, user_email)
-    admission_tickets = [
-        user_ticket
-        for user_ticket in user_tickets
-        if user_ticket["item"]["admission"]
-        and user_ticket["attendee_email"] == user_email
-    ]
+    if pretix_mirror.is_mirrored(conference):
+        ticket = pretix_mirror.get_admission_position(conference, user_email)
+    else:
+        user_tickets = pretix.get_user_tickets(conference, user_email)
+        admission_tickets = [
+            user_ticket
+            for user_ticket in user_tickets
+            if user_ticket["item"]["admission"]
+            and user_ticket["attendee_email"] == user_email
+        ]
+        ticket = admission_tickets[0] if admission_tickets else None
 
     return _get_roles(
         conference=conference,
         user_id=user_id,
-        ticket=admission_tickets[0] if admission_tickets else None,
+        ticket=ticket,
+    )
+
+
+def get_conference_roles_for_tickets(
+    conference: Conference, tickets: Iterable[Dict]
+) -> Iterator[Tuple[Dict, List[Role]]]:
+    """Yields the roles of every ticket, loading the vouchers, the speakers,
+    the attendees and the manual overrides once for all of them."""
+    tickets = list(tickets)
+    # pretix keeps the emails as they were typed in the order, compare them
+    # lowercased like the pretix mirror does
+    user_ids_by_email = dict(
+        User.objects.annotate(lower_email=Lower("email"))
+        .filter(
+            lower_email__in={
+                (ticket["attendee_email"] or "").lower() for ticket in tickets
+            }
+        )
+        .values_list("lower_email", "id")
+    )
+    manual_roles = list(
+        AttendeeConferenceRole.objects.filter(
+            Q(order_position_id__in=[ticket["id"] for ticket in tickets])
+            | Q(user_id__in=user_ids_by_email.values()),
+            conference=conference,
+        ).order_by("pk")
+    )
+    manual_roles_by_position = {}
+    manual_roles_by_user = {}
+
+    for manual_role in manual_roles:
+        if manual_role.order_position_id is not None:
+            manual_roles_by_position.setdefault(
+                manual_role.order_position_id, manual_role
+            )
+
+        if manual_role.user_id is not None:
+            manual_roles_by_user.setdefault(manual_role.user_id, manual_role)
+
+    vouchers = pretix.get_all_vouchers(conference)
+    speaker_ids = speakers_user_ids(conference)
+
+    for ticket in tickets:
+        user_id = user_ids_by_email.get((ticket["attendee_email"] or "").lower())
+        # same override the single ticket lookup picks: the oldest one
+        # matching the ticket or the user
+        candidates = [
+            manual_role
+            for manual_role in (
+                manual_roles_by_position.get(ticket["id"]),
+                manual_roles_by_user.get(user_id),
+            )
+            if manual_role
+        ]
+        manual_role = min(candidates, key=lambda role: role.pk, default=None)
+
+        if manual_role:
+            roles = [Role(role) for role in manual_role.roles]
+        else:
+            roles = _roles_from_ticket(user_id, ticket, vouchers, speaker_ids)
+
+        yield ticket, _sort_roles(roles)
+
+
+def _sort_roles(roles: List[Role]) -> List[Role]:
+    return sorted(
+        roles,
+        key=lambda role: ROLES_PRIORITY.index(role),
     )
 
 
@@ -114,21 +189,27 @@ def _get_roles(
     elif ticket:
         roles = _calculate_roles(conference, user_id, ticket)
 
-    return sorted(
-        roles,
-        key=lambda role: ROLES_PRIORITY.index(role),
-    )
+    return _sort_roles(roles)
 
 
 def _calculate_roles(
     conference: Conference, user_id: int | None, ticket: dict
+) -> List[Role]:
+    return _roles_from_ticket(
+        user_id,
+        ticket,
+        pretix.get_all_vouchers(conference),
+        speakers_user_ids(conference) if user_id else set(),
+    )
+
+
+def _roles_from_ticket(
+    user_id: int | None, ticket: dict, vouchers: Dict, speaker_ids: Set[int]
 ) -> List[Role]:
     roles = [
         Role.ATTENDEE,
     ]
 
-    vouchers = pretix.get_all_vouchers(conference)
-
     if (voucher_id := ticket["voucher"]) and (voucher := vouchers.get(voucher_id)):
         tags = voucher["tag"].lower().split(",")
         voucher_code = voucher["code"].lower()
@@ -149,7 +230,7 @@ def _calculate_roles(
     # so we check if there is a schedule item where they are a speaker
     # this has the effect of tagging non-speakers as speakers if their ticket
     # was purchased by a speaker (I know only one case of this happening right now)
-    user_is_in_schedule_item = user_id and user_id in speakers_user_ids(conference)
+    user_is_in_schedule_item = user_id and user_id in speaker_ids
     if Role.SPEAKER not in roles and user_is_in_schedule_item:
         roles.append(Role.SPEAKER)
 
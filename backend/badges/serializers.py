@@ -0,0 +1,22 @@
+from rest_framework import serializers
+
+
+REQUIRED_POSITION_FIELDS = ("id", "voucher", "attendee_email")
+
+
+class TicketsRolesSerializer(serializers.Serializer):
+    positions = serializers.ListField(
+        child=serializers.DictField(),
+        required=True,
+    )
+
+    def validate_positions(self, positions):
+        # Checked before the response starts streaming, the values can be
+        # null but a missing key would fail halfway through it
+        for position in positions:
+            if any(field not in position for field in REQUIRED_POSITION_FIELDS):
+                raise serializers.ValidationError(
+                    "Every position needs an id, a voucher and an attendee_email"
+                )
+
+        return positions
@@ -8,6 +8,7 @@ from schedule.tests.factories import (
 from badges.roles import (
     Role,
     _get_roles,
+    get_conference_roles_for_tickets,
     get_conference_roles_for_user,
     speakers_user_ids,
 )
@@ -274,3 +275,82 @@ def test_get_conference_roles_for_user_as_sponsor(requests_mock):
     )
 
     assert roles == [Role.SPONSOR, Role.ATTENDEE]
+
+
+def test_get_roles_for_tickets_in_bulk(requests_mock, django_assert_max_num_queries):
+    conference = ConferenceFactory()
+    submission = SubmissionFactory()
+    ScheduleItemFactory(type="talk", conference=conference, submission=submission)
+    overridden_user = UserFactory()
+    AttendeeConferenceRole.objects.create(
+        user_id=overridden_user.id, conference=conference, roles=[Role.STAFF.value]
+    )
+    AttendeeConferenceRole.objects.create(
+        order_position_id=4, conference=conference, roles=[Role.SPONSOR.value]
+    )
+
+    vouchers_mock = requests_mock.get(
+        f"{settings.PRETIX_API}organizers/base-pretix-organizer-id/events/base-pretix-event-id/vouchers/",
+        status_code=200,
+        json={
+            "next": None,
+            "results": [{"id": 1, "code": "keynoter-123", "tag": ""}],
+        },
+    )
+
+    tickets = [
+        {"id": 1, "voucher": None, "attendee_email": "someone@example.org"},
+        {"id": 2, "voucher": 1, "attendee_email": "keynoter@example.org"},
+        {"id": 3, "voucher": None, "attendee_email": submission.speaker.email},
+        {"id": 4, "voucher": None, "attendee_email": "sponsor@example.org"},
+        {"id": 5, "voucher": None, "attendee_email": overridden_user.email},
+    ]
+
+    # users, overrides and speakers are loaded once for all the tickets
+    with django_assert_max_num_queries(4):
+        roles = {
+            ticket["id"]: roles
+            for ticket, roles in get_conference_roles_for_tickets(conference, tickets)
+        }
+
+    assert roles == {
+        1: [Role.ATTENDEE],
+        2: [Role.KEYNOTER, Role.ATTENDEE],
+        3: [Role.SPEAKER, Role.ATTENDEE],
+        4: [Role.SPONSOR],
+        5: [Role.STAFF],
+    }
+    assert vouchers_mock.call_count == 1
+
+
+def test_get_roles_for_tickets_matches_emails_case_insensitively(requests_mock):
+    conference = ConferenceFactory()
+    submission = SubmissionFactory(speaker__email="speaker@example.org")
+    ScheduleItemFactory(type="talk", conference=conference, submission=submission)
+    overridden_user = UserFactory(email="staff@example.org")
+    AttendeeConferenceRole.objects.create(
+        user_id=overridden_user.id, conference=conference, roles=[Role.STAFF.value]
+    )
+
+    requests_mock.get(
+        f"{settings.PRETIX_API}organizers/base-pretix-organizer-id/events/base-pretix-event-id/vouchers/",
+        status_code=200,
+        json={"next": None, "results": []},
+    )
+
+    tickets = [
+        {"id": 1, "voucher": None, "attendee_email": "Speaker@Example.org"},
+        {"id": 2, "voucher": None, "attendee_email": "STAFF@example.org"},
+        {"id": 3, "voucher": None, "attendee_email": None},
+    ]
+
+    roles = {
+        ticket["id"]: roles
+        for ticket, roles in get_conference_roles_for_tickets(conference, tickets)
+    }
+
+    assert roles == {
+        1: [Role.SPEAKER, Role.ATTENDEE],
+        2: [Role.STAFF],
+        3: [Role.ATTENDEE],
+    }
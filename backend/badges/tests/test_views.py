@@ -0,0 +1,95 @@
+import json
+
+import pytest
+from django.conf import settings
+from django.urls import reverse
+
+from api.helpers.ids import encode_hashid
+from api.models import APIToken
+from conferences.tests.factories import ConferenceFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_conference_roles_for_tickets(rest_api_client, requests_mock):
+    APIToken.objects.create(token="backend-token")
+    conference = ConferenceFactory(code="pycon2026")
+    requests_mock.get(
+        f"{settings.PRETIX_API}organizers/base-pretix-organizer-id/events/base-pretix-event-id/vouchers/",
+        status_code=200,
+        json={"next": None, "results": [{"id": 1, "code": "staff-1", "tag": ""}]},
+    )
+
+    response = rest_api_client.post(
+        reverse("conference_roles_for_tickets", args=[conference.code]),
+        {
+            "positions": [
+                {"id": 10, "voucher": None, "attendee_email": "a@example.org"},
+                {"id": 11, "voucher": 1, "attendee_email": "b@example.org"},
+            ]
+        },
+        headers={"X-Backend-Token": "backend-token"},
+    )
+
+    assert response.status_code == 200
+    assert response.streaming
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"id": 10, "role": "ATTENDEE", "ticket_hashid": encode_hashid(10)},
+        {"id": 11, "role": "STAFF", "ticket_hashid": encode_hashid(11)},
+    ]
+
+
+def test_conference_roles_for_tickets_requires_token(rest_api_client):
+    APIToken.objects.create(token="backend-token")
+    conference = ConferenceFactory(code="pycon2026")
+
+    response = rest_api_client.post(
+        reverse("conference_roles_for_tickets", args=[conference.code]),
+        {"positions": []},
+        headers={"X-Backend-Token": "wrong"},
+    )
+
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("missing_field", ["id", "voucher", "attendee_email"])
+def test_conference_roles_for_tickets_validates_positions(
+    rest_api_client, missing_field
+):
+    APIToken.objects.create(token="backend-token")
+    conference = ConferenceFactory(code="pycon2026")
+    position = {"id": 10, "voucher": None, "attendee_email": None}
+    del position[missing_field]
+
+    response = rest_api_client.post(
+        reverse("conference_roles_for_tickets", args=[conference.code]),
+        {"positions": [position]},
+        headers={"X-Backend-Token": "backend-token"},
+    )
+
+    assert response.status_code == 400
+
+
+def test_conference_roles_for_tickets_without_attendee_email(
+    rest_api_client, requests_mock
+):
+    APIToken.objects.create(token="backend-token")
+    conference = ConferenceFactory(code="pycon2026")
+    requests_mock.get(
+        f"{settings.PRETIX_API}organizers/base-pretix-organizer-id/events/base-pretix-event-id/vouchers/",
+        status_code=200,
+        json={"next": None, "results": []},
+    )
+
+    response = rest_api_client.post(
+        reverse("conference_roles_for_tickets", args=[conference.code]),
+        {"positions": [{"id": 10, "voucher": None, "attendee_email": None}]},
+        headers={"X-Backend-Token": "backend-token"},
+    )
+
+    assert response.status_code == 200
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"id": 10, "role": "ATTENDEE", "ticket_hashid": encode_hashid(10)},
+    ]
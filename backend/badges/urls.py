@@ -0,0 +1,11 @@
+from django.urls import path
+
+from badges.views import conference_roles_for_tickets
+
+urlpatterns = [
+    path(
+        "<str:conference_code>/roles",
+        conference_roles_for_tickets,
+        name="conference_roles_for_tickets",
+    ),
+]
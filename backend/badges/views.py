@@ -0,0 +1,44 @@
+import json
+
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    permission_classes,
+)
+from rest_framework.response import Response
+
+from api.helpers.ids import encode_hashid
+from badges.permissions import HasBackendToken
+from badges.roles import get_conference_roles_for_tickets
+from badges.serializers import TicketsRolesSerializer
+from conferences.models import Conference
+
+
+@api_view(["POST"])
+@authentication_classes([])
+@permission_classes([HasBackendToken])
+def conference_roles_for_tickets(request, conference_code):
+    conference = Conference.objects.filter(code=conference_code).first()
+
+    if not conference:
+        return Response(status=status.HTTP_404_NOT_FOUND)
+
+    serializer = TicketsRolesSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    positions = serializer.validated_data["positions"]
+
+    # One JSON object per line, sent as soon as each role is known
+    lines = (
+        json.dumps(
+            {
+                "id": position["id"],
+                "role": roles[0].name,
+                "ticket_hashid": encode_hashid(position["id"]),
+            }
+        )
+        + "\n"
+        for position, roles in get_conference_roles_for_tickets(conference, positions)
+    )
+    return StreamingHttpResponse(lines, content_type="application/x-ndjson")
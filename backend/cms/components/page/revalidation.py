@@ -0,0 +1,199 @@
+import hashlib
+import logging
+import os
+import time
+
+import requests
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Paths queued within this window are deduplicated and sent together
+REVALIDATE_WINDOW = 5  # seconds
+# Max number of paths sent in a single request to the frontend
+REVALIDATE_BATCH_SIZE = 50
+REVALIDATE_TIMEOUT = (5, 30)  # connect, read
+# Bounds how long a queued path can block the same path from being queued
+# again, in case its flush never runs
+REVALIDATE_PENDING_TTL = 60 * 10  # 10 minutes
+# The item of a position is written right after the position is taken, if
+# it is still missing after this long, its writer crashed in between
+REVALIDATE_ITEM_WRITE_TIMEOUT = 60  # seconds
+
+_session = None
+_session_pid = None
+
+
+def frontend_session() -> requests.Session:
+    # Sockets must not be shared between forked workers
+    global _session, _session_pid
+
+    if _session is None or _session_pid != os.getpid():
+        _session = requests.Session()
+        _session_pid = os.getpid()
+
+    return _session
+
+
+def _queue_id(url: str) -> str:
+    return hashlib.md5(url.encode()).hexdigest()
+
+
+def _head_key(queue_id: str) -> str:
+    return f"frontend-revalidate:{queue_id}:head"
+
+
+def _tail_key(queue_id: str) -> str:
+    return f"frontend-revalidate:{queue_id}:tail"
+
+
+def _item_key(queue_id: str, position: int) -> str:
+    return f"frontend-revalidate:{queue_id}:item:{position}"
+
+
+def _pending_path_key(queue_id: str, path: str) -> str:
+    return f"frontend-revalidate:{queue_id}:pending:{path}"
+
+
+def _claim_key(queue_id: str, position: int) -> str:
+    return f"frontend-revalidate:{queue_id}:claim:{position}"
+
+
+def _missing_item_key(queue_id: str, position: int) -> str:
+    return f"frontend-revalidate:{queue_id}:missing:{position}"
+
+
+def _flush_scheduled_key(queue_id: str) -> str:
+    return f"frontend-revalidate:{queue_id}:flush-scheduled"
+
+
+def _schedule_flush(url: str, secret: str) -> None:
+    from cms.components.page.tasks import flush_frontend_revalidate_queue
+
+    key = _flush_scheduled_key(_queue_id(url))
+
+    if not cache.add(key, True, REVALIDATE_PENDING_TTL):
+        return
+
+    try:
+        flush_frontend_revalidate_queue.apply_async(
+            kwargs={"url": url, "secret": secret}, countdown=REVALIDATE_WINDOW
+        )
+    except Exception:
+        cache.delete(key)
+        logger.exception("Could not schedule the frontend revalidation")
+
+
+def queue_frontend_revalidate(*, url: str, secret: str, paths: list[str]) -> None:
+    """Queues the revalidation of `paths`, the paths already waiting in the
+    queue are skipped. The queue is sent after REVALIDATE_WINDOW seconds."""
+    queue_id = _queue_id(url)
+    queued = 0
+
+    for path in dict.fromkeys(paths):
+        if not cache.add(
+            _pending_path_key(queue_id, path), True, REVALIDATE_PENDING_TTL
+        ):
+            continue
+
+        cache.add(_tail_key(queue_id), 0, None)
+        position = cache.incr(_tail_key(queue_id))
+        cache.set(
+            _item_key(queue_id, position),
+            {"path": path, "queued_at": time.time()},
+            REVALIDATE_PENDING_TTL,
+        )
+        queued += 1
+
+    if queued:
+        _schedule_flush(url, secret)
+
+
+def _is_item_abandoned(queue_id: str, position: int) -> bool:
+    key = _missing_item_key(queue_id, position)
+    cache.add(key, time.time(), REVALIDATE_PENDING_TTL)
+    return time.time() - cache.get(key, time.time()) > REVALIDATE_ITEM_WRITE_TIMEOUT
+
+
+def flush_frontend_revalidate_queue(*, url: str, secret: str) -> None:
+    """Sends the queued paths. Flushes can overlap: every item is claimed
+    by exactly one of them, and the head only moves past the positions
+    that are done, so an item written late is sent by a later flush."""
+    queue_id = _queue_id(url)
+    # Paths queued from now on schedule a new flush
+    cache.delete(_flush_scheduled_key(queue_id))
+
+    head = cache.get(_head_key(queue_id), 0)
+    tail = cache.get(_tail_key(queue_id), 0)
+    positions = range(head + 1, tail + 1)
+    items = cache.get_many([_item_key(queue_id, position) for position in positions])
+
+    claimed = {}
+    new_head = head
+    has_missing_items = False
+
+    for position in positions:
+        item = items.get(_item_key(queue_id, position))
+
+        if item is not None:
+            if cache.add(_claim_key(queue_id, position), True, REVALIDATE_PENDING_TTL):
+                claimed[position] = item
+        elif not cache.get(_claim_key(queue_id, position)) and not _is_item_abandoned(
+            queue_id, position
+        ):
+            # Not written yet, wait for it
+            has_missing_items = True
+
+        if not has_missing_items:
+            new_head = position
+
+    if new_head > cache.get(_head_key(queue_id), 0):
+        cache.set(_head_key(queue_id), new_head, None)
+
+    cache.delete_many(
+        [_item_key(queue_id, position) for position in claimed]
+        + [_pending_path_key(queue_id, item["path"]) for item in claimed.values()]
+    )
+
+    if claimed:
+        oldest_queued_at = min(item["queued_at"] for item in claimed.values())
+        logger.info(
+            "Revalidating %s frontend paths (queue depth %s, oldest queued %.1fs ago)",
+            len(claimed),
+            tail - head,
+            time.time() - oldest_queued_at,
+        )
+        send_frontend_revalidate(
+            url=url,
+            secret=secret,
+            paths=[item["path"] for item in claimed.values()],
+        )
+
+    if has_missing_items or cache.get(_tail_key(queue_id), 0) > tail:
+        _schedule_flush(url, secret)
+
+
+def send_frontend_revalidate(*, url: str, secret: str, paths: list[str]) -> None:
+    for start in range(0, len(paths), REVALIDATE_BATCH_SIZE):
+        batch = paths[start : start + REVALIDATE_BATCH_SIZE]
+        started_at = time.monotonic()
+
+        try:
+            response = frontend_session().post(
+                url,
+                timeout=REVALIDATE_TIMEOUT,
+                json={
+                    "secret": secret,
+                    "paths": batch,
+                },
+            )
+            response.raise_for_status()
+        except Exception as e:
+            logger.error(f"Error while revalidating {', '.join(batch)}: {e}")
+            continue
+
+        logger.info(
+            "Revalidated %s frontend paths in %.2fs",
+            len(batch),
+            time.monotonic() - started_at,
+        )
@@ -1,8 +1,8 @@
-import requests
 import logging
 from pycon.celery import app
 from wagtail.models import Page
 from cms.components.sites.models import VercelFrontendSettings
+from cms.components.page import revalidation
 
 logger = logging.getLogger(__name__)
 
@@ -47,27 +47,19 @@ def revalidate_vercel_frontend_task(page_id):
     else:
         path = f"/{language_code}{page_path}"
 
-    execute_frontend_revalidate(
+    revalidation.queue_frontend_revalidate(
         url=url,
-        path=path,
         secret=secret,
+        paths=[path],
     )
 
 
 @app.task
 def execute_frontend_revalidate(url: str, path: str, secret: str):
-    try:
-        response = requests.post(
-            url,
-            timeout=None,
-            json={
-                "secret": secret,
-                "path": path,
-            },
-        )
-        response.raise_for_status()
-    except Exception as e:
-        logger.error(f"Error while revalidating {path}: {e}")
-        return
+    # Kept for the tasks enqueued before the revalidation queue
+    revalidation.send_frontend_revalidate(url=url, secret=secret, paths=[path])
 
-    logger.info(f"Revalidated {path}")
+
+@app.task
+def flush_frontend_revalidate_queue(*, url: str, secret: str):
+    revalidation.flush_frontend_revalidate_queue(url=url, secret=secret)
@@ -0,0 +1,191 @@
+import time
+
+import pytest
+import time_machine
+from django.core.cache import cache
+from cms.components.page import revalidation
+from cms.components.page.revalidation import (
+    flush_frontend_revalidate_queue,
+    queue_frontend_revalidate,
+)
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+
+
+@pytest.fixture
+def scheduled_flush(mocker):
+    return mocker.patch(
+        "cms.components.page.tasks.flush_frontend_revalidate_queue.apply_async"
+    )
+
+
+def test_queued_paths_are_deduplicated_and_sent_together(
+    requests_mock, scheduled_flush
+):
+    mock_call = requests_mock.post("https://example.com/revalidate")
+
+    queue_frontend_revalidate(
+        url="https://example.com/revalidate", secret="secret", paths=["/en/a"]
+    )
+    queue_frontend_revalidate(
+        url="https://example.com/revalidate",
+        secret="secret",
+        paths=["/en/a", "/en/b", "/en/b"],
+    )
+
+    # one flush is scheduled for the whole window
+    scheduled_flush.assert_called_once_with(
+        kwargs={"url": "https://example.com/revalidate", "secret": "secret"},
+        countdown=revalidation.REVALIDATE_WINDOW,
+    )
+    assert not mock_call.called
+
+    flush_frontend_revalidate_queue(
+        url="https://example.com/revalidate", secret="secret"
+    )
+
+    assert mock_call.call_count == 1
+    assert mock_call.last_request.json() == {
+        "secret": "secret",
+        "paths": ["/en/a", "/en/b"],
+    }
+
+
+def test_paths_can_be_queued_again_after_the_flush(requests_mock, scheduled_flush):
+    mock_call = requests_mock.post("https://example.com/revalidate")
+
+    queue_frontend_revalidate(
+        url="https://example.com/revalidate", secret="secret", paths=["/en/a"]
+    )
+    flush_frontend_revalidate_queue(
+        url="https://example.com/revalidate", secret="secret"
+    )
+    queue_frontend_revalidate(
+        url="https://example.com/revalidate", secret="secret", paths=["/en/a"]
+    )
+    flush_frontend_revalidate_queue(
+        url="https://example.com/revalidate", secret="secret"
+    )
+
+    assert scheduled_flush.call_count == 2
+    assert [request.json()["paths"] for request in mock_call.request_history] == [
+        ["/en/a"],
+        ["/en/a"],
+    ]
+
+
+def test_paths_are_sent_in_batches(requests_mock, scheduled_flush, mocker):
+    mocker.patch.object(revalidation, "REVALIDATE_BATCH_SIZE", 2)
+    mock_call = requests_mock.post("https://example.com/revalidate")
+
+    queue_frontend_revalidate(
+        url="https://example.com/revalidate",
+        secret="secret",
+        paths=["/en/a", "/en/b", "/en/c"],
+    )
+    flush_frontend_revalidate_queue(
+        url="https://example.com/revalidate", secret="secret"
+    )
+
+    assert [request.json()["paths"] for request in mock_call.request_history] == [
+        ["/en/a", "/en/b"],
+        ["/en/c"],
+    ]
+    assert all(request.timeout == (5, 30) for request in mock_call.request_history)
+
+
+def test_failed_batch_does_not_stop_the_others(requests_mock, scheduled_flush, mocker):
+    mocker.patch.object(revalidation, "REVALIDATE_BATCH_SIZE", 1)
+    mock_call = requests_mock.post(
+        "https://example.com/revalidate",
+        [{"status_code": 500}, {"status_code": 200}],
+    )
+
+    queue_frontend_revalidate(
+        url="https://example.com/revalidate", secret="secret", paths=["/en/a", "/en/b"]
+    )
+    flush_frontend_revalidate_queue(
+        url="https://example.com/revalidate", secret="secret"
+    )
+
+    assert mock_call.call_count == 2
+
+
+def test_flush_waits_for_items_not_written_yet(requests_mock, scheduled_flush):
+    mock_call = requests_mock.post("https://example.com/revalidate")
+    queue_id = revalidation._queue_id("https://example.com/revalidate")
+
+    # A concurrent queue took the first position but has not written it yet
+    cache.add(revalidation._tail_key(queue_id), 0, None)
+    position = cache.incr(revalidation._tail_key(queue_id))
+    queue_frontend_revalidate(
+        url="https://example.com/revalidate", secret="secret", paths=["/en/b"]
+    )
+
+    flush_frontend_revalidate_queue(
+        url="https://example.com/revalidate", secret="secret"
+    )
+
+    assert mock_call.last_request.json()["paths"] == ["/en/b"]
+    assert cache.get(revalidation._head_key(queue_id), 0) == 0
+    # Another flush is scheduled for the missing item
+    assert scheduled_flush.call_count == 2
+
+    cache.set(
+        revalidation._item_key(queue_id, position),
+        {"path": "/en/a", "queued_at": time.time()},
+    )
+    flush_frontend_revalidate_queue(
+        url="https://example.com/revalidate", secret="secret"
+    )
+
+    assert mock_call.last_request.json()["paths"] == ["/en/a"]
+    assert cache.get(revalidation._head_key(queue_id)) == 2
+
+
+def test_flush_skips_items_abandoned_by_their_writer(requests_mock, scheduled_flush):
+    mock_call = requests_mock.post("https://example.com/revalidate")
+    queue_id = revalidation._queue_id("https://example.com/revalidate")
+    cache.add(revalidation._tail_key(queue_id), 0, None)
+    cache.incr(revalidation._tail_key(queue_id))
+
+    with time_machine.travel("2024-01-01 10:00:00", tick=False):
+        flush_frontend_revalidate_queue(
+            url="https://example.com/revalidate", secret="secret"
+        )
+
+    assert cache.get(revalidation._head_key(queue_id), 0) == 0
+
+    with time_machine.travel("2024-01-01 10:02:00", tick=False):
+        flush_frontend_revalidate_queue(
+            url="https://example.com/revalidate", secret="secret"
+        )
+
+    assert cache.get(revalidation._head_key(queue_id)) == 1
+    assert not mock_call.called
+
+
+def test_items_claimed_by_an_overlapping_flush_are_not_sent_again(
+    requests_mock, scheduled_flush
+):
+    mock_call = requests_mock.post("https://example.com/revalidate")
+    queue_id = revalidation._queue_id("https://example.com/revalidate")
+
+    queue_frontend_revalidate(
+        url="https://example.com/revalidate", secret="secret", paths=["/en/a", "/en/b"]
+    )
+    # The first item was claimed by a flush still sending it
+    cache.add(revalidation._claim_key(queue_id, 1), True)
+
+    flush_frontend_revalidate_queue(
+        url="https://example.com/revalidate", secret="secret"
+    )
+
+    assert mock_call.last_request.json()["paths"] == ["/en/b"]
+    assert cache.get(revalidation._head_key(queue_id)) == 2
@@ -7,6 +7,13 @@ from cms.components.page.models import GenericPage
 pytestmark = pytest.mark.django_db
 
 
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+
+
 def test_revalidate_vercel_frontend(
     requests_mock,
 ):
@@ -27,7 +34,7 @@ def test_revalidate_vercel_frontend(
     assert mock_call.called
     body = mock_call.last_request.json()
     assert body["secret"] == "test"
-    assert body["path"] == "/en/test-page123"
+    assert body["paths"] == ["/en/test-page123"]
 
 
 def test_revalidate_vercel_frontend_special_case_for_landing_page(
@@ -51,7 +58,7 @@ def test_revalidate_vercel_frontend_special_case_for_landing_page(
 
     body = mock_call.last_request.json()
     assert body["secret"] == "test"
-    assert body["path"] == "/en"
+    assert body["paths"] == ["/en"]
 
 
 def test_revalidate_vercel_frontend_for_different_language(requests_mock, locale):
@@ -77,7 +84,7 @@ def test_revalidate_vercel_frontend_for_different_language(requests_mock, locale
 
     body = mock_call.last_request.json()
     assert body["secret"] == "test"
-    assert body["path"] == "/it/test123"
+    assert body["paths"] == ["/it/test123"]
 
 
 def test_revalidate_vercel_frontend_when_vercel_is_down_doesnt_crash(
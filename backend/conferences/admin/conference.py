@@ -18,9 +18,11 @@ from ordered_model.admin import (
     OrderedTabularInline,
 )
 from collections import defaultdict
+from dataclasses import dataclass
 from itertools import permutations
 from unicodedata import combining, normalize
 from conferences.models import ConferenceVoucher
+from pycon.storages import CustomS3Boto3Storage
 from schedule.models import ScheduleItem
 from sponsors.models import SponsorLevel
 from voting.models import IncludedEvent
@@ -377,13 +379,17 @@ class ConferenceAdmin(
 
         matched_videos = 0
         used_files = set()
+        files_index = VideoFilesIndex(files)
+        changed_events = []
 
         for event in all_events:
             video_uploaded_path = self.match_event_to_video_file(
-                event, files, day_numbers, same_day_order.get(event.id)
+                event, files_index, day_numbers, same_day_order.get(event.id)
             )
-            event.video_uploaded_path = video_uploaded_path
-            event.save(update_fields=["video_uploaded_path"])
+
+            if event.video_uploaded_path != video_uploaded_path:
+                event.video_uploaded_path = video_uploaded_path
+                changed_events.append(event)
 
             if video_uploaded_path in used_files:
                 self.message_user(
@@ -396,6 +402,10 @@ class ConferenceAdmin(
                 matched_videos += 1
                 used_files.add(video_uploaded_path)
 
+        ScheduleItem.objects.bulk_update(
+            changed_events, ["video_uploaded_path"], batch_size=500
+        )
+
         self.message_user(
             request,
             f"Matched {matched_videos} videos to events.",
@@ -410,7 +420,9 @@ class ConferenceAdmin(
                 messages.WARNING,
             )
 
-    def match_event_to_video_file(self, event, files, day_numbers, same_day_order):
+    def match_event_to_video_file(
+        self, event, files_index, day_numbers, same_day_order
+    ):
         possible_file_names = []
 
         def best_name(speaker):
@@ -420,18 +432,6 @@ class ConferenceAdmin(
         if event.slot_id:
             event_day = day_numbers.get(event.slot.day.day)
 
-        # when both the event and the file have a known conference day,
-        # a mismatch means the file belongs to another day's event
-        normalized_files = []
-        for video_file in files:
-            normalized_video_file = cleanup_string(video_file)
-            file_day = extract_day_from_video_path(normalized_video_file)
-
-            if event_day and file_day and event_day != file_day:
-                continue
-
-            normalized_files.append((normalized_video_file, video_file))
-
         all_speakers_names = [best_name(speaker) for speaker in event.speakers]
 
         count_speakers = len(all_speakers_names)
@@ -457,36 +457,24 @@ class ConferenceAdmin(
             )
 
         if multi_speaker_exact_match:
-            exact_match_found = next(
-                (
-                    original_video_file
-                    for video_file, original_video_file in normalized_files
-                    if multi_speaker_exact_match in video_file
-                ),
-                None,
-            )
+            exact_matches = files_index.search([multi_speaker_exact_match], event_day)
 
-            if exact_match_found:
-                return exact_match_found
-
-        matches = []
-        for video_file, original_video_file in normalized_files:
-            is_multi_speakers_video = "," in video_file
-
-            if is_multi_speakers_video and single_speaker:
-                continue
+            if exact_matches:
+                return exact_matches[0].original
 
-            if any(name in video_file for name in possible_file_names):
-                matches.append(original_video_file)
+        matches = [
+            video_file.original
+            for video_file in files_index.search(possible_file_names, event_day)
+            if not (video_file.is_multi_speakers and single_speaker)
+        ]
 
         # multi-speaker talks are sometimes uploaded with the name
         # of only one of the speakers
         if not matches and count_speakers > 1:
             matches = [
-                original_video_file
-                for video_file, original_video_file in normalized_files
-                if "," not in video_file
-                and any(name in video_file for name in all_speakers_names)
+                video_file.original
+                for video_file in files_index.search(all_speakers_names, event_day)
+                if not video_file.is_multi_speakers
             ]
 
         if not matches:
@@ -501,6 +489,76 @@ class ConferenceAdmin(
         return matches[min(same_day_order, len(matches) - 1)]
 
 
+@dataclass
+class IndexedVideoFile:
+    position: int
+    original: str
+    normalized: str
+    day: int | None
+
+    @property
+    def is_multi_speakers(self) -> bool:
+        return "," in self.normalized
+
+
+class VideoFilesIndex:
+    """Normalizes the video files once and indexes them by trigram and by
+    conference day, so every event only checks the files that can contain
+    its names."""
+
+    def __init__(self, files: list[str]):
+        self.files = []
+        self.files_by_day = defaultdict(set)
+        self.trigrams = defaultdict(set)
+
+        for position, video_file in enumerate(files):
+            normalized = cleanup_string(video_file)
+            indexed_file = IndexedVideoFile(
+                position=position,
+                original=video_file,
+                normalized=normalized,
+                day=extract_day_from_video_path(normalized),
+            )
+            self.files.append(indexed_file)
+            self.files_by_day[indexed_file.day].add(position)
+
+            for trigram in get_trigrams(normalized):
+                self.trigrams[trigram].add(position)
+
+    def search(self, names: list[str], day: int | None) -> list[IndexedVideoFile]:
+        """Files containing any of `names`, in listing order. When both the
+        event and the file have a known conference day, a mismatch means the
+        file belongs to another day's event."""
+        if day:
+            allowed = self.files_by_day[None] | self.files_by_day[day]
+        else:
+            allowed = set(range(len(self.files)))
+
+        found = set()
+        for name in names:
+            candidates = allowed - found
+            trigrams = get_trigrams(name)
+
+            # a file containing the name contains all its trigrams
+            for trigram in sorted(trigrams, key=lambda t: len(self.trigrams[t])):
+                candidates &= self.trigrams[trigram]
+
+                if not candidates:
+                    break
+
+            found.update(
+                position
+                for position in candidates
+                if name in self.files[position].normalized
+            )
+
+        return [self.files[position] for position in sorted(found)]
+
+
+def get_trigrams(string: str) -> set[str]:
+    return {string[index : index + 3] for index in range(len(string) - 2)}
+
+
 def video_file_position(video_path: str) -> int:
     match = re.match(r"(\d+)", Path(video_path).name)
     return int(match.group(1)) if match else 0
@@ -514,6 +572,9 @@ def extract_day_from_video_path(normalized_video_path: str) -> int | None:
 
 
 def walk_conference_videos_folder(storage, base_path):
+    if isinstance(storage, CustomS3Boto3Storage):
+        return storage.list_files(base_path)
+
     folders, files = storage.listdir(base_path)
     all_files = [f"{base_path}{file_}" for file_ in files]
 
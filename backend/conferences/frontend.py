@@ -2,7 +2,7 @@ from django.db import models
 from submissions.models import Submission
 from schedule.models import ScheduleItem
 from job_board.models import JobListing
-from cms.components.page.tasks import execute_frontend_revalidate
+from cms.components.page.revalidation import queue_frontend_revalidate
 from conferences.models.conference import Conference
 
 
@@ -10,13 +10,13 @@ def trigger_frontend_revalidate(conference: Conference, object: models.Model):
     if not conference.frontend_revalidate_url:
         return
 
-    for path in get_paths(object):
-        for locale in ["en", "it"]:
-            execute_frontend_revalidate.delay(
-                url=conference.frontend_revalidate_url,
-                path=f"/{locale}{path}",
-                secret=conference.frontend_revalidate_secret,
-            )
+    queue_frontend_revalidate(
+        url=conference.frontend_revalidate_url,
+        secret=conference.frontend_revalidate_secret,
+        paths=[
+            f"/{locale}{path}" for path in get_paths(object) for locale in ["en", "it"]
+        ],
+    )
 
 
 def get_paths(object: models.Model) -> list[str]:
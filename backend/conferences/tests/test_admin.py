@@ -32,8 +32,10 @@ from conferences.admin.conference import (
     validate_deadlines_form,
     walk_conference_videos_folder,
     DeadlineForm,
+    VideoFilesIndex,
 )
 from conferences.models import ConferenceVoucher
+from pycon.storages import CustomS3Boto3Storage
 from schedule.models import ScheduleItem
 
 pytestmark = mark.django_db
@@ -888,6 +890,36 @@ def test_storage_walk_conference_videos_folder(mocker):
     ]
 
 
+def test_video_files_index_search():
+    index = VideoFilesIndex(
+        [
+            "conf/D1/1-Kim Kitsuragi.mp4",
+            "conf/D2/2-Kim Kitsuragi, Harrier.mp4",
+            "conf/3-Kimberly.mp4",
+            "conf/D1/4-Ab.mp4",
+        ]
+    )
+
+    assert [file.position for file in index.search(["kim"], None)] == [0, 1, 2]
+    # files of another day are skipped, files without a day are kept
+    assert [file.position for file in index.search(["kim"], 1)] == [0, 2]
+    assert [file.position for file in index.search(["harrier"], 1)] == []
+    # names shorter than a trigram are still matched
+    assert [file.position for file in index.search(["ab"], 1)] == [3]
+    assert index.search(["kim kitsuragi, harrier"], 2)[0].is_multi_speakers
+
+
+def test_storage_walk_conference_videos_folder_on_s3(mocker):
+    storage = mocker.Mock(spec=CustomS3Boto3Storage)
+    storage.list_files.return_value = ["conf/D1/1-talk.mp4"]
+
+    output = walk_conference_videos_folder(storage, "conf/")
+
+    assert output == ["conf/D1/1-talk.mp4"]
+    storage.list_files.assert_called_once_with("conf/")
+    storage.listdir.assert_not_called()
+
+
 def test_save_manual_changes(
     rf,
     mocker,
@@ -61,7 +61,7 @@ def test_get_paths_for_accepted_submission_invalidates_schedule_items():
 
 
 def test_trigger_frontend_revalidate(mocker):
-    mock_call = mocker.patch("conferences.frontend.execute_frontend_revalidate.delay")
+    mock_call = mocker.patch("conferences.frontend.queue_frontend_revalidate")
 
     conference = ConferenceFactory(
         frontend_revalidate_url="https://example.com",
@@ -75,18 +75,8 @@ def test_trigger_frontend_revalidate(mocker):
 
     trigger_frontend_revalidate(conference, object)
 
-    mock_call.assert_has_calls(
-        [
-            mocker.call(
-                url="https://example.com",
-                path="/en/event/event-1",
-                secret="secret",
-            ),
-            mocker.call(
-                url="https://example.com",
-                path="/it/event/event-1",
-                secret="secret",
-            ),
-        ],
-        any_order=True,
+    mock_call.assert_called_once_with(
+        url="https://example.com",
+        secret="secret",
+        paths=["/en/event/event-1", "/it/event/event-1"],
     )
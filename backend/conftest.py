@@ -134,3 +134,18 @@ def sent_emails(db):
         return SentEmail.objects.all()
     
     return get_sent_emails
+
+
+@pytest.fixture(autouse=True)
+def pending_used_quotas():
+    """
+    Drops the Google API quota rows buffered in memory by a test, so they
+    are not written by the next one. Tests that check the rows flush them
+    with `google_api.quota_ledger.flush_used_quotas`.
+    """
+    from google_api import quota_ledger
+
+    yield quota_ledger._pending_used_quotas
+
+    quota_ledger._pending_used_quotas.clear()
+    quota_ledger._oldest_pending_at = None
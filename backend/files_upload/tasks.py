@@ -1,8 +1,11 @@
+import functools
 import time
+from contextlib import contextmanager
 from django.db import transaction
 from django.conf import settings
+from django.core.cache import cache
 import requests
-import tempfile
+from celery.signals import worker_process_init
 from pycon.celery_utils import OnlyOneAtTimeTask
 import pyclamd
 
@@ -13,63 +16,171 @@ from files_upload.models import File
 from pycon.celery import app
 from django.utils import timezone
 from magika import Magika
-from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Size of the reads from storage and of the chunks sent to clamd
+STREAM_CHUNK_SIZE = 64 * 1024
+# Bytes at the start of the file used to detect its MIME type
+MIME_SNIFF_SIZE = 64 * 1024
+CLAMAV_CONNECTION_ATTEMPTS = 3
+
+DELETE_UNUSED_FILES_BATCH_SIZE = 1000
+DELETE_UNUSED_FILES_TIME_LIMIT = 60 * 5  # 5 minutes
+DELETE_UNUSED_FILES_CURSOR_KEY = "files_upload:delete_unused_files:cursor"
+
+
+@functools.cache
+def get_magika() -> Magika:
+    return Magika()
+
+
+@worker_process_init.connect
+def warm_up_magika(**kwargs):
+    # Load the model when the worker starts, so uploads don't pay for it
+    logger.info("Loading the Magika model")
+    get_magika()
+
+
+def get_unused_files():
+    return File.objects.filter(
+        participants__isnull=True,
+        proposalmaterial__isnull=True,
+        created__lt=timezone.now() - timedelta(hours=24),
+    )
+
 
 @app.task
 def delete_unused_files():
+    """Deletes the files uploaded more than 24 hours ago and never used,
+    in batches ordered by id. When the run takes longer than
+    DELETE_UNUSED_FILES_TIME_LIMIT, the next run resumes from the last
+    deleted id."""
     logger.info("Deleting unused files")
-    unused_files = File.objects.filter(
-        participants__isnull=True, proposalmaterial__isnull=True
-    ).filter(created__lt=timezone.now() - timedelta(hours=24))
+    storage = File._meta.get_field("file").storage
+    started_at = time.monotonic()
+    cursor = cache.get(DELETE_UNUSED_FILES_CURSOR_KEY)
+    deleted_files = 0
+    storage_errors = 0
+    completed = False
+
+    while time.monotonic() - started_at < DELETE_UNUSED_FILES_TIME_LIMIT:
+        unused_files = get_unused_files().order_by("id")
+
+        if cursor:
+            unused_files = unused_files.filter(id__gt=cursor)
+
+        with transaction.atomic():
+            batch = list(
+                unused_files.select_for_update(
+                    skip_locked=True, of=("self",)
+                ).values_list("id", "file")[:DELETE_UNUSED_FILES_BATCH_SIZE]
+            )
+
+            if not batch:
+                completed = True
+                break
+
+            File.objects.filter(id__in=[id for id, _ in batch]).delete()
+
+        cursor = str(batch[-1][0])
+
+        # Rows go first, so a file can never reference a deleted object
+        failed = storage.delete_many([name for _, name in batch if name])
+
+        if failed:
+            logger.error("Could not delete from storage files=%s", failed)
+
+        deleted_files += len(batch)
+        storage_errors += len(failed)
+
+    if completed:
+        cache.delete(DELETE_UNUSED_FILES_CURSOR_KEY)
+    else:
+        cache.set(DELETE_UNUSED_FILES_CURSOR_KEY, cursor, 60 * 60 * 24)
 
-    for unused_file in unused_files:
-        logger.info("Deleting file_id=%s", unused_file.id)
-        unused_file.file.delete(save=False)
-        unused_file.delete()
+    stats = {
+        "deleted_files": deleted_files,
+        "storage_errors": storage_errors,
+        "completed": completed,
+        "duration": round(time.monotonic() - started_at, 2),
+    }
+    logger.info("Deleted unused files %s", stats)
+    return stats
+
+
+class PrefixedStream:
+    """File-like object reading `prefix` before the rest of `stream`,
+    so the bytes read to sniff the MIME type are still scanned."""
+
+    def __init__(self, prefix: bytes, stream):
+        self.prefix = prefix
+        self.stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        if self.prefix:
+            if size < 0:
+                data, self.prefix = self.prefix + self.stream.read(), b""
+                return data
+
+            data, self.prefix = self.prefix[:size], self.prefix[size:]
+            return data
+
+        return self.stream.read(size)
+
+
+@contextmanager
+def open_file_stream(file: File):
+    if not file.file.storage.is_remote:
+        with file.file.open("rb") as file_handle:
+            yield file_handle
+        return
+
+    with requests.get(file.url, stream=True, timeout=30) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        yield response.raw
+
+
+def connect_to_virus_scanner() -> pyclamd.ClamdNetworkSocket | None:
+    for attempt in range(1, CLAMAV_CONNECTION_ATTEMPTS + 1):
+        try:
+            return pyclamd.ClamdNetworkSocket(
+                host=settings.CLAMAV_HOST, port=settings.CLAMAV_PORT, timeout=10
+            )
+        except pyclamd.ConnectionError:
+            logger.exception("Could not connect to clamd server (attempt: %s)", attempt)
+            time.sleep(attempt)
+
+    return None
 
 
 @app.task(base=OnlyOneAtTimeTask)
-@transaction.atomic
 def post_process_file_upload(file_id: str):
     logger.info("Processing file_id=%s", file_id)
-    magika = Magika()
-
-    with tempfile.NamedTemporaryFile() as temp_file:
-        file = File.objects.select_for_update().get(id=file_id)
-        if file.file.storage.is_remote:
-            with requests.get(file.url, stream=True) as response:
-                response.raise_for_status()
-
-                for chunk in response.iter_content():
-                    temp_file.write(chunk)
+    file = File.objects.get(id=file_id)
+    virus_found = None
 
-            file_path = temp_file.name
-            file_handle = temp_file
-        else:
-            file_path = file.file.path
-            file_handle = file.file.open("rb")
+    with open_file_stream(file) as stream:
+        head = stream.read(MIME_SNIFF_SIZE)
+        mime_type = get_magika().identify_bytes(head).output.mime_type
 
-        magika_result = magika.identify_path(Path(file_path))
-        file.mime_type = magika_result.output.mime_type
+        virus_scanner = connect_to_virus_scanner()
 
-        attempts = 0
-        while attempts < 3:
+        if virus_scanner:
             try:
-                virus_scanner = pyclamd.ClamdNetworkSocket(
-                    host=settings.CLAMAV_HOST, port=settings.CLAMAV_PORT, timeout=10
+                result = virus_scanner.scan_stream(
+                    PrefixedStream(head, stream), chunk_size=STREAM_CHUNK_SIZE
                 )
-                result = virus_scanner.scan_stream(file_handle)
-                virus_found = bool(result and result[file_path][0] == "FOUND")
-                file.virus = virus_found
-                break
-            except pyclamd.ConnectionError:
-                logger.exception(
-                    "Could not connect to clamd server (attempt: %s)", attempts
+                virus_found = any(
+                    status == "FOUND" for status, _ in (result or {}).values()
                 )
-                attempts = attempts + 1
-                time.sleep(attempts)
+            except pyclamd.ConnectionError:
+                logger.exception("Lost connection to clamd server")
 
+    # The row is only locked for the update, not for the download and scan
+    with transaction.atomic():
+        file = File.objects.select_for_update().get(id=file_id)
+        file.mime_type = mime_type
+        file.virus = virus_found
         file.save(update_fields=["virus", "mime_type"])
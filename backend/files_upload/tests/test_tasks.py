@@ -1,3 +1,5 @@
+import io
+
 import pytest
 from submissions.tests.factories import ProposalMaterialFactory
 import pyclamd
@@ -5,7 +7,11 @@ import datetime
 from participants.tests.factories import ParticipantFactory
 from files_upload.models import File
 import time_machine
-from files_upload.tasks import delete_unused_files, post_process_file_upload
+from files_upload.tasks import (
+    PrefixedStream,
+    delete_unused_files,
+    post_process_file_upload,
+)
 from files_upload.tests.factories import FileFactory
 from django.utils import timezone
 from django.test import override_settings
@@ -21,8 +27,7 @@ class FakeRemoteStorage(InMemoryStorage):
     def url(self, name, *args, **kwargs):
         return "http://example.org/example.txt"
 
-    def generate_upload_url(self, file_obj):
-        ...
+    def generate_upload_url(self, file_obj): ...
 
 
 def test_delete_unused_files():
@@ -57,15 +62,67 @@ def test_delete_unused_files():
     assert File.objects.filter(id=file_4.id).exists()
 
 
+def test_delete_unused_files_resumes_from_the_last_batch(mocker, settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    mocker.patch("files_upload.tasks.DELETE_UNUSED_FILES_BATCH_SIZE", 1)
+    # The second batch is over the time limit
+    mocker.patch("files_upload.tasks.time.monotonic", side_effect=[0, 0, 1000, 1000])
+
+    with time_machine.travel("2010-10-10 10:20:00Z", tick=False):
+        files = sorted(
+            FileFactory.create_batch(
+                2,
+                created=timezone.datetime(
+                    2010, 1, 4, 10, 0, 0, tzinfo=datetime.timezone.utc
+                ),
+            ),
+            key=lambda file: file.id,
+        )
+
+        stats = delete_unused_files()
+
+        assert stats["deleted_files"] == 1
+        assert not stats["completed"]
+        assert not File.objects.filter(id=files[0].id).exists()
+        assert File.objects.filter(id=files[1].id).exists()
+
+        mocker.patch("files_upload.tasks.time.monotonic", return_value=0)
+        stats = delete_unused_files()
+
+    assert stats["deleted_files"] == 1
+    assert stats["completed"]
+    assert not File.objects.exists()
+
+
+def test_delete_unused_files_reports_storage_errors(mocker):
+    file = FileFactory(
+        created=timezone.datetime(2010, 1, 4, 10, 0, 0, tzinfo=datetime.timezone.utc),
+    )
+    delete_many = mocker.patch(
+        "pycon.storages.CustomInMemoryStorage.delete_many",
+        return_value=[file.file.name],
+    )
+
+    with time_machine.travel("2010-10-10 10:20:00Z", tick=False):
+        stats = delete_unused_files()
+
+    delete_many.assert_called_once_with([file.file.name])
+    assert stats["deleted_files"] == 1
+    assert stats["storage_errors"] == 1
+    assert not File.objects.filter(id=file.id).exists()
+
+
 def test_post_process_file_upload(requests_mock, mocker):
     file = FileFactory()
 
     mock_pyclamd = mocker.patch("pyclamd.ClamdNetworkSocket")
     mock_pyclamd.return_value.scan_stream.return_value = {
-        file.file.path: ("FOUND", "virus type")
+        "stream": ("FOUND", "virus type")
     }
 
-    mock_magika = mocker.patch("magika.Magika.identify_path")
+    mock_magika = mocker.patch("magika.Magika.identify_bytes")
     mock_magika.return_value.output.mime_type = "text/plain"
 
     post_process_file_upload(file.id)
@@ -82,7 +139,7 @@ def test_post_process_file_upload_no_virus(requests_mock, mocker):
     mock_pyclamd = mocker.patch("pyclamd.ClamdNetworkSocket")
     mock_pyclamd.return_value.scan_stream.return_value = {}
 
-    mock_magika = mocker.patch("magika.Magika.identify_path")
+    mock_magika = mocker.patch("magika.Magika.identify_bytes")
     mock_magika.return_value.output.mime_type = "text/plain"
 
     post_process_file_upload(file.id)
@@ -101,7 +158,7 @@ def test_post_process_handles_connection_errors(mocker):
     mock_pyclamd = mocker.patch("pyclamd.ClamdNetworkSocket")
     mock_pyclamd.side_effect = pyclamd.ConnectionError
 
-    mock_magika = mocker.patch("magika.Magika.identify_path")
+    mock_magika = mocker.patch("magika.Magika.identify_bytes")
     mock_magika.return_value.output.mime_type = "text/plain"
 
     post_process_file_upload(file.id)
@@ -127,7 +184,7 @@ def test_post_process_file_upload_remote_file(requests_mock, mocker):
     mock_pyclamd = mocker.patch("pyclamd.ClamdNetworkSocket")
     mock_pyclamd.return_value.scan_stream.return_value = None
 
-    mock_magika = mocker.patch("magika.Magika.identify_path")
+    mock_magika = mocker.patch("magika.Magika.identify_bytes")
     mock_magika.return_value.output.mime_type = "text/plain"
 
     post_process_file_upload(file.id)
@@ -136,10 +193,23 @@ def test_post_process_file_upload_remote_file(requests_mock, mocker):
 
     assert not file.virus
     assert file.mime_type == "text/plain"
+    mock_magika.assert_called_once_with(b"test")
+    scanned_stream = mock_pyclamd.return_value.scan_stream.call_args[0][0]
+    assert scanned_stream.read() == b"test"
+
+
+def test_prefixed_stream_reads_the_prefix_first():
+    stream = PrefixedStream(b"abc", io.BytesIO(b"defgh"))
+
+    assert stream.read(2) == b"ab"
+    assert stream.read(2) == b"c"
+    assert stream.read(2) == b"de"
+    assert stream.read() == b"fgh"
+    assert stream.read(2) == b""
 
 
 def test_check_we_updated_delete_files_job():
     known_types = ["participant_avatar", "proposal_material"]
-    assert (
-        File.Type.values == known_types
-    ), "Please update the delete_unused_files job to include new file types"
+    assert File.Type.values == known_types, (
+        "Please update the delete_unused_files job to include new file types"
+    )
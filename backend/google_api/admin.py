@@ -36,7 +36,7 @@ class GoogleCloudOAuthCredentialAdmin(ImportExportModelAdmin):
         return obj.youtube_quota_left
 
     def get_queryset(self, request: HttpRequest) -> QuerySet[Any]:
-        return super().get_queryset(request).with_quota_left("youtube")
+        return super().get_queryset(request).with_daily_quota_left("youtube")
 
     @admin.display(boolean=True)
     def has_token(self, obj):
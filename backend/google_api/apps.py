@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.core.signals import request_finished
 
 
 class GoogleApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "google_api"
+
+    def ready(self):
+        from google_api.quota_ledger import flush_used_quotas_after_request
+
+        request_finished.connect(
+            flush_used_quotas_after_request,
+            dispatch_uid="google_api_flush_used_quotas_after_request",
+        )
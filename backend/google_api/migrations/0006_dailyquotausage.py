@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:37
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('google_api', '0005_googlecloudoauthcredential_quota_limit_for_drive'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='usedrequestquota',
+            name='used_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.CreateModel(
+            name='DailyQuotaUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('service', models.CharField(max_length=255)),
+                ('day', models.DateField()),
+                ('used', models.IntegerField(default=0)),
+                ('reserved', models.IntegerField(default=0)),
+                ('credentials', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_quota_usages', to='google_api.googlecloudoauthcredential')),
+            ],
+            options={
+                'unique_together': {('credentials', 'service', 'day')},
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 22:18
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('google_api', '0006_dailyquotausage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyQuotaReservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cost', models.IntegerField()),
+                ('reserved_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('usage', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservations', to='google_api.dailyquotausage')),
+            ],
+        ),
+    ]
@@ -1,7 +1,8 @@
+import datetime
 from typing import Optional
 from zoneinfo import ZoneInfo
 from django.db import models
-from django.db.models import F
+from django.db.models import F, OuterRef, Subquery
 from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.utils import timezone
@@ -10,6 +11,11 @@ DAILY_YOUTUBE_QUOTA = 10_000
 DAILY_DRIVE_QUOTA = 10_000
 
 
+def get_quota_day() -> datetime.date:
+    # Google resets the daily quotas at midnight Pacific time
+    return timezone.now().astimezone(ZoneInfo("America/Los_Angeles")).date()
+
+
 class GoogleCloudOAuthCredentialQuerySet(models.QuerySet):
     def get_by_client_id(self, client_id: str) -> "GoogleCloudOAuthCredential":
         return self.filter(client_id=client_id).first()
@@ -43,6 +49,25 @@ class GoogleCloudOAuthCredentialQuerySet(models.QuerySet):
             }
         )
 
+    def with_daily_quota_left(self, service: str):
+        """Like `with_quota_left`, from today's DailyQuotaUsage running
+        totals, which include the calls in progress and are always up to
+        date."""
+        daily_usage = (
+            DailyQuotaUsage.objects.filter(
+                credentials_id=OuterRef("id"), service=service, day=get_quota_day()
+            )
+            .annotate(total=F("used") + F("reserved"))
+            .values("total")[:1]
+        )
+
+        return self.annotate(
+            **{
+                f"{service}_quota_left": F(f"quota_limit_for_{service}")
+                - Coalesce(Subquery(daily_usage), 0)
+            }
+        )
+
 
 class GoogleCloudOAuthCredential(models.Model):
     client_id = models.TextField()
@@ -61,25 +86,27 @@ class GoogleCloudOAuthCredential(models.Model):
     def get_available_credentials_token(
         service: str, min_quota: int
     ) -> Optional["GoogleCloudToken"]:
-        credential = (
-            GoogleCloudOAuthCredential.objects.with_quota_left(service)
-            .annotate(
-                has_token=models.Exists(
-                    GoogleCloudToken.objects.filter(
-                        oauth_credential_id=models.OuterRef("id")
-                    )
-                ),
-            )
-            .filter(
-                has_token=True,
-                **{
-                    f"{service}_quota_left__gte": min_quota,
-                },
-            )
-            .order_by(f"{service}_quota_left")
-            .first()
+        from google_api.quota_ledger import get_usages_with_quota_left
+
+        usage = get_usages_with_quota_left(service, min_quota).first()
+        return usage.credentials.googlecloudtoken_set.first() if usage else None
+
+    @staticmethod
+    def get_all_available_credentials_tokens(
+        service: str, min_quota: int
+    ) -> list[tuple["GoogleCloudToken", int]]:
+        """One token for each credential with at least `min_quota` left,
+        together with the quota it has left, most quota first."""
+        from google_api.quota_ledger import get_usages_with_quota_left
+
+        usages = get_usages_with_quota_left(service, min_quota).order_by(
+            "-quota_left", "credentials_id"
         )
-        return credential.googlecloudtoken_set.first() if credential else None
+
+        return [
+            (usage.credentials.googlecloudtoken_set.first(), usage.quota_left)
+            for usage in usages
+        ]
 
     class Meta:
         verbose_name = "Google Cloud OAuth Credential"
@@ -87,7 +114,8 @@ class GoogleCloudOAuthCredential(models.Model):
 
 
 class UsedRequestQuota(models.Model):
-    used_at = models.DateTimeField(auto_now_add=True)
+    # Not auto_now_add: the rows are written in batches after the calls
+    used_at = models.DateTimeField(default=timezone.now)
     credentials = models.ForeignKey(
         GoogleCloudOAuthCredential, on_delete=models.CASCADE
     )
@@ -95,6 +123,38 @@ class UsedRequestQuota(models.Model):
     service = models.CharField(max_length=255)
 
 
+class DailyQuotaUsage(models.Model):
+    """Running total of the quota a credential used in a day, so picking a
+    credential does not have to sum the UsedRequestQuota rows. `reserved`
+    is the quota of the calls in progress."""
+
+    credentials = models.ForeignKey(
+        GoogleCloudOAuthCredential,
+        on_delete=models.CASCADE,
+        related_name="daily_quota_usages",
+    )
+    service = models.CharField(max_length=255)
+    day = models.DateField()
+    used = models.IntegerField(default=0)
+    reserved = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("credentials", "service", "day")
+
+
+class DailyQuotaReservation(models.Model):
+    """Quota held by a call in progress, counted in the `reserved` of its
+    usage. A worker killed during the call never commits it, so the
+    reservations older than QUOTA_RESERVATION_TTL are given back by
+    `release_expired_quota_reservations`."""
+
+    usage = models.ForeignKey(
+        DailyQuotaUsage, on_delete=models.CASCADE, related_name="reservations"
+    )
+    cost = models.IntegerField()
+    reserved_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+
 class GoogleCloudToken(models.Model):
     oauth_credential = models.ForeignKey(
         GoogleCloudOAuthCredential, on_delete=models.CASCADE
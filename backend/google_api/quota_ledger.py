@@ -0,0 +1,209 @@
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
+
+from google_api.models import (
+    DailyQuotaReservation,
+    DailyQuotaUsage,
+    GoogleCloudOAuthCredential,
+    GoogleCloudToken,
+    get_quota_day,
+)
+
+# The UsedRequestQuota rows are kept in memory and written in batches of
+# this size, or when the oldest one has waited USED_QUOTA_FLUSH_INTERVAL
+USED_QUOTA_BATCH_SIZE = 100
+USED_QUOTA_FLUSH_INTERVAL = 60  # seconds
+
+_pending_used_quotas: list[dict] = []
+_pending_used_quotas_lock = threading.Lock()
+_oldest_pending_at: float | None = None
+
+# Longer than the slowest call holding a reservation, a video upload
+QUOTA_RESERVATION_TTL = timedelta(hours=3)
+
+
+@dataclass
+class QuotaReservation:
+    id: int
+    usage_id: int
+    credentials_id: int
+    service: str
+    cost: int
+
+
+def ensure_daily_usages(service: str):
+    """Creates today's usage of the credentials that have none yet, starting
+    from the quota they already used today."""
+    day = get_quota_day()
+    missing = (
+        GoogleCloudOAuthCredential.objects.with_quota_left(service)
+        .filter(
+            ~Exists(
+                DailyQuotaUsage.objects.filter(
+                    credentials_id=OuterRef("id"), service=service, day=day
+                )
+            )
+        )
+        .values_list("id", f"{service}_used_quota")
+    )
+
+    DailyQuotaUsage.objects.bulk_create(
+        [
+            DailyQuotaUsage(
+                credentials_id=credentials_id, service=service, day=day, used=used
+            )
+            for credentials_id, used in missing
+        ],
+        ignore_conflicts=True,
+    )
+    return day
+
+
+def get_usages_with_quota_left(service: str, min_quota: int):
+    """Today's usages of the authorized credentials with at least `min_quota`
+    left, the ones with the least quota left first."""
+    day = ensure_daily_usages(service)
+
+    return (
+        DailyQuotaUsage.objects.filter(service=service, day=day)
+        .filter(
+            Exists(
+                GoogleCloudToken.objects.filter(
+                    oauth_credential_id=OuterRef("credentials_id")
+                )
+            )
+        )
+        .annotate(
+            quota_limit=F(f"credentials__quota_limit_for_{service}"),
+            quota_left=F("quota_limit") - F("used") - F("reserved"),
+        )
+        .filter(quota_left__gte=min_quota)
+        .select_related("credentials")
+        .order_by("quota_left", "credentials_id")
+    )
+
+
+def reserve_quota(
+    service: str, quota: int
+) -> tuple[GoogleCloudToken, QuotaReservation] | None:
+    for usage in get_usages_with_quota_left(service, quota):
+        # Another worker can reserve the same quota between the lookup and
+        # the update, so the update only applies if it still fits
+        with transaction.atomic():
+            reserved = DailyQuotaUsage.objects.filter(
+                id=usage.id, used__lte=usage.quota_limit - quota - F("reserved")
+            ).update(reserved=F("reserved") + quota)
+
+            if not reserved:
+                continue
+
+            reservation = DailyQuotaReservation.objects.create(
+                usage_id=usage.id, cost=quota
+            )
+
+        return usage.credentials.googlecloudtoken_set.first(), QuotaReservation(
+            id=reservation.id,
+            usage_id=usage.id,
+            credentials_id=usage.credentials_id,
+            service=service,
+            cost=quota,
+        )
+
+    return None
+
+
+def commit_quota(reservation: QuotaReservation) -> None:
+    with transaction.atomic():
+        # A reservation that outlived its TTL was already given back
+        released, _ = DailyQuotaReservation.objects.filter(id=reservation.id).delete()
+        DailyQuotaUsage.objects.filter(id=reservation.usage_id).update(
+            reserved=F("reserved") - reservation.cost if released else F("reserved"),
+            used=F("used") + reservation.cost,
+        )
+
+    record_used_quota(reservation.credentials_id, reservation.service, reservation.cost)
+
+
+def release_expired_reservations() -> int:
+    """Gives back the quota of the reservations older than
+    QUOTA_RESERVATION_TTL, left behind by calls that never committed."""
+    expired = DailyQuotaReservation.objects.filter(
+        reserved_at__lt=timezone.now() - QUOTA_RESERVATION_TTL
+    ).values_list("id", "usage_id", "cost")
+    released_count = 0
+
+    for reservation_id, usage_id, cost in expired:
+        with transaction.atomic():
+            # Only one of the commit and the release gets to delete it
+            released, _ = DailyQuotaReservation.objects.filter(
+                id=reservation_id
+            ).delete()
+
+            if released:
+                DailyQuotaUsage.objects.filter(id=usage_id).update(
+                    reserved=F("reserved") - cost
+                )
+                released_count += 1
+
+    return released_count
+
+
+def charge_quota(credentials_id: int, service: str, quota: int) -> None:
+    """Charges quota used without a reservation, by callers that picked the
+    credentials themselves."""
+    day = ensure_daily_usages(service)
+    DailyQuotaUsage.objects.filter(
+        credentials_id=credentials_id, service=service, day=day
+    ).update(used=F("used") + quota)
+    record_used_quota(credentials_id, service, quota)
+
+
+def record_used_quota(credentials_id: int, service: str, cost: int) -> None:
+    global _oldest_pending_at
+
+    with _pending_used_quotas_lock:
+        _pending_used_quotas.append(
+            {
+                "credentials_id": credentials_id,
+                "service": service,
+                "cost": cost,
+                "used_at": timezone.now().isoformat(),
+            }
+        )
+
+        if _oldest_pending_at is None:
+            _oldest_pending_at = time.monotonic()
+
+        should_flush = (
+            len(_pending_used_quotas) >= USED_QUOTA_BATCH_SIZE
+            or time.monotonic() - _oldest_pending_at >= USED_QUOTA_FLUSH_INTERVAL
+        )
+
+    if should_flush:
+        flush_used_quotas()
+
+
+def flush_used_quotas() -> None:
+    from google_api.tasks import persist_used_request_quotas
+
+    global _oldest_pending_at
+
+    with _pending_used_quotas_lock:
+        rows = _pending_used_quotas[:]
+        _pending_used_quotas.clear()
+        _oldest_pending_at = None
+
+    if rows:
+        persist_used_request_quotas.delay(rows)
+
+
+def flush_used_quotas_after_request(sender=None, **kwargs):
+    # Web processes don't run Celery's task_postrun, without this their
+    # rows would wait for the next call, or be lost when the process exits
+    flush_used_quotas()
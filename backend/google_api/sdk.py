@@ -1,7 +1,9 @@
 import inspect
+import threading
 import requests
 from google_api.exceptions import NoGoogleCloudQuotaLeftError
-from google_api.models import GoogleCloudOAuthCredential, UsedRequestQuota
+from google_api.models import GoogleCloudOAuthCredential
+from google_api.quota_ledger import charge_quota, commit_quota, reserve_quota
 from googleapiclient.discovery import build
 from apiclient.http import MediaFileUpload
 from google.auth.transport.requests import Request
@@ -17,16 +19,18 @@ GOOGLE_CLOUD_SCOPES = [
 
 DRIVE_API_URL = "https://www.googleapis.com/drive/v3"
 DRIVE_LIST_PAGE_SIZE = 1000
+# Folders whose children are listed with a single query, each one adds
+# about 50 characters to the query string
+DRIVE_PARENTS_PER_QUERY = 50
 
+_drive_sessions = threading.local()
 
-def get_available_credentials(service, min_quota):
-    token = GoogleCloudOAuthCredential.get_available_credentials_token(
-        service=service, min_quota=min_quota
-    )
 
-    if not token:
-        raise NoGoogleCloudQuotaLeftError()
+YOUTUBE_VIDEOS_INSERT_QUOTA = 1600
+YOUTUBE_VIDEOS_SET_THUMBNAIL_QUOTA = 50
 
+
+def credentials_from_token(token) -> Credentials:
     return Credentials.from_authorized_user_info(
         {
             "token": token.token,
@@ -39,17 +43,51 @@ def get_available_credentials(service, min_quota):
     )
 
 
+def get_available_credentials(service, min_quota):
+    token = GoogleCloudOAuthCredential.get_available_credentials_token(
+        service=service, min_quota=min_quota
+    )
+
+    if not token:
+        raise NoGoogleCloudQuotaLeftError()
+
+    return credentials_from_token(token)
+
+
+def get_all_available_credentials(
+    service: str, min_quota: int
+) -> list[tuple[Credentials, int]]:
+    """Credentials of every account with at least `min_quota` left, with the
+    quota each one has left. Used to spread work across the accounts."""
+    return [
+        (credentials_from_token(token), quota_left)
+        for token, quota_left in GoogleCloudOAuthCredential.get_all_available_credentials_tokens(
+            service=service, min_quota=min_quota
+        )
+    ]
+
+
 def count_quota(service: str, quota: int):
-    def _add_quota(credentials):
+    def _reserve_credentials():
+        # The quota is reserved for the whole call, so concurrent workers
+        # don't pick an account that only has room for one of them
+        reserved = reserve_quota(service, quota)
+
+        if not reserved:
+            raise NoGoogleCloudQuotaLeftError()
+
+        token, reservation = reserved
+        return credentials_from_token(token), reservation
+
+    def _add_quota(credentials, reservation):
+        if reservation:
+            commit_quota(reservation)
+            return
+
         credential_object = GoogleCloudOAuthCredential.objects.get_by_client_id(
             credentials.client_id
         )
-
-        UsedRequestQuota.objects.create(
-            credentials=credential_object,
-            cost=quota,
-            service=service,
-        )
+        charge_quota(credential_object.id, service, quota)
 
     def wrapper(func):
         # Callers that make several calls for one piece of work pass the
@@ -59,23 +97,25 @@ def count_quota(service: str, quota: int):
         if inspect.isgeneratorfunction(func):
 
             def wrapped(*args, credentials=None, **kwargs):
+                reservation = None
                 if credentials is None:
-                    credentials = get_available_credentials(service, quota)
+                    credentials, reservation = _reserve_credentials()
                 try:
                     for value in func(*args, credentials=credentials, **kwargs):
                         yield value
                 finally:
-                    _add_quota(credentials)
+                    _add_quota(credentials, reservation)
 
         else:
 
             def wrapped(*args, credentials=None, **kwargs):
+                reservation = None
                 if credentials is None:
-                    credentials = get_available_credentials(service, quota)
+                    credentials, reservation = _reserve_credentials()
                 try:
                     ret_value = func(*args, credentials=credentials, **kwargs)
                 finally:
-                    _add_quota(credentials)
+                    _add_quota(credentials, reservation)
                 return ret_value
 
         return wrapped
@@ -94,6 +134,17 @@ def refreshed(credentials: Credentials) -> Credentials:
     return credentials
 
 
+def drive_session() -> requests.Session:
+    """A session for each thread, so that the Drive calls of a worker reuse
+    their connection instead of opening one for each request."""
+    session = getattr(_drive_sessions, "session", None)
+
+    if session is None:
+        session = _drive_sessions.session = requests.Session()
+
+    return session
+
+
 def drive_headers(credentials: Credentials) -> dict:
     return {"Authorization": f"Bearer {refreshed(credentials).token}"}
 
@@ -106,7 +157,7 @@ def get_drive_credentials(*, credentials: Credentials) -> Credentials:
 
 @count_quota("drive", 1)
 def drive_file_metadata(*, file_id: str, credentials: Credentials) -> dict:
-    response = requests.get(
+    response = drive_session().get(
         f"{DRIVE_API_URL}/files/{file_id}",
         params={
             "fields": "id,name,size,mimeType",
@@ -119,24 +170,27 @@ def drive_file_metadata(*, file_id: str, credentials: Credentials) -> dict:
 
 
 @count_quota("drive", 1)
-def drive_list_files_in_folder(*, folder_id: str, credentials: Credentials):
+def drive_list_files_in_folders(*, folder_ids: list[str], credentials: Credentials):
+    """Lists the children of all `folder_ids` with one query. Each file has
+    its `parents`, to tell which of the folders it is in."""
+    parents = " or ".join(f"'{folder_id}' in parents" for folder_id in folder_ids)
     headers = drive_headers(credentials)
     params = {
-        "q": f"'{folder_id}' in parents and trashed = false",
-        "fields": "nextPageToken,files(id,name,mimeType,size)",
+        "q": f"({parents}) and trashed = false",
+        "fields": "nextPageToken,files(id,name,mimeType,size,parents)",
         "pageSize": DRIVE_LIST_PAGE_SIZE,
         "supportsAllDrives": "true",
         "includeItemsFromAllDrives": "true",
     }
 
     while True:
-        response = requests.get(
+        response = drive_session().get(
             f"{DRIVE_API_URL}/files", params=params, headers=headers
         )
         response.raise_for_status()
         payload = response.json()
 
-        logger.info("List files in folder %s", folder_id)
+        logger.info("List files in folders %s", folder_ids)
 
         yield from payload.get("files", [])
 
@@ -147,7 +201,7 @@ def drive_list_files_in_folder(*, folder_id: str, credentials: Credentials):
         params["pageToken"] = page_token
 
 
-@count_quota("youtube", 1600)
+@count_quota("youtube", YOUTUBE_VIDEOS_INSERT_QUOTA)
 def youtube_videos_insert(
     *,
     title: str,
@@ -187,7 +241,7 @@ def youtube_videos_insert(
         raise ValueError("The upload failed with an unexpected response: %s" % response)
 
 
-@count_quota("youtube", 50)
+@count_quota("youtube", YOUTUBE_VIDEOS_SET_THUMBNAIL_QUOTA)
 def youtube_videos_set_thumbnail(
     *, video_id: str, thumbnail_path: str, credentials: Credentials
 ):
@@ -0,0 +1,42 @@
+import datetime
+import logging
+
+from celery.signals import task_postrun
+
+from google_api.models import UsedRequestQuota
+from google_api.quota_ledger import flush_used_quotas, release_expired_reservations
+from pycon.celery import app
+
+logger = logging.getLogger(__name__)
+
+
+@app.task
+def persist_used_request_quotas(rows: list[dict]):
+    UsedRequestQuota.objects.bulk_create(
+        [
+            UsedRequestQuota(
+                credentials_id=row["credentials_id"],
+                service=row["service"],
+                cost=row["cost"],
+                used_at=datetime.datetime.fromisoformat(row["used_at"]),
+            )
+            for row in rows
+        ]
+    )
+
+
+@app.task
+def release_expired_quota_reservations():
+    released = release_expired_reservations()
+
+    if released:
+        logger.warning("Released %s expired quota reservations", released)
+
+
+@task_postrun.connect
+def flush_used_quotas_after_task(sender=None, **kwargs):
+    # Writing the rows is itself a task, don't schedule one after it
+    if sender is persist_used_request_quotas:
+        return
+
+    flush_used_quotas()
@@ -1,5 +1,8 @@
+import datetime
+
 import time_machine
 from google_api.models import (
+    DailyQuotaUsage,
     GoogleCloudOAuthCredential,
     GoogleCloudToken,
     UsedRequestQuota,
@@ -50,6 +53,37 @@ def test_with_quota_left_for_drive():
         assert result.drive_quota_left == credential.quota_limit_for_drive - 1
 
 
+def test_with_daily_quota_left():
+    credential = GoogleCloudOAuthCredential.objects.create(
+        quota_limit_for_youtube=10_000,
+    )
+
+    with time_machine.travel("2023-10-10 12:00:00", tick=False):
+        result = GoogleCloudOAuthCredential.objects.with_daily_quota_left(
+            "youtube"
+        ).get()
+        assert result.youtube_quota_left == 10_000
+
+        DailyQuotaUsage.objects.create(
+            credentials=credential,
+            service="youtube",
+            day=datetime.date(2023, 10, 10),
+            used=1_000,
+            reserved=500,
+        )
+        DailyQuotaUsage.objects.create(
+            credentials=credential,
+            service="youtube",
+            day=datetime.date(2023, 10, 9),
+            used=9_000,
+        )
+
+        result = GoogleCloudOAuthCredential.objects.with_daily_quota_left(
+            "youtube"
+        ).get()
+        assert result.youtube_quota_left == 8_500
+
+
 def test_get_available_credentials_token_for_drive(admin_user):
     credential = GoogleCloudOAuthCredential.objects.create()
     GoogleCloudToken.objects.create(
@@ -74,3 +108,36 @@ def test_get_by_client_id():
         == credential.id
     )
     assert GoogleCloudOAuthCredential.objects.get_by_client_id("invalid") is None
+
+
+def test_get_all_available_credentials_tokens(admin_user):
+    credential_1 = GoogleCloudOAuthCredential.objects.create(
+        quota_limit_for_youtube=2_000,
+    )
+    GoogleCloudToken.objects.create(
+        oauth_credential=credential_1, token="token1", admin_user=admin_user
+    )
+    credential_2 = GoogleCloudOAuthCredential.objects.create(
+        quota_limit_for_youtube=5_000,
+    )
+    GoogleCloudToken.objects.create(
+        oauth_credential=credential_2, token="token2", admin_user=admin_user
+    )
+    # Not enough quota left
+    credential_3 = GoogleCloudOAuthCredential.objects.create(
+        quota_limit_for_youtube=100,
+    )
+    GoogleCloudToken.objects.create(
+        oauth_credential=credential_3, token="token3", admin_user=admin_user
+    )
+    # No token
+    GoogleCloudOAuthCredential.objects.create()
+
+    tokens = GoogleCloudOAuthCredential.get_all_available_credentials_tokens(
+        service="youtube", min_quota=1_000
+    )
+
+    assert [(token.token, quota_left) for token, quota_left in tokens] == [
+        ("token2", 5_000),
+        ("token1", 2_000),
+    ]
@@ -0,0 +1,169 @@
+import time_machine
+from django.core.signals import request_finished
+from google_api import quota_ledger
+from google_api.models import (
+    DailyQuotaReservation,
+    DailyQuotaUsage,
+    GoogleCloudOAuthCredential,
+    GoogleCloudToken,
+    UsedRequestQuota,
+)
+from google_api.quota_ledger import (
+    charge_quota,
+    commit_quota,
+    flush_used_quotas,
+    record_used_quota,
+    release_expired_reservations,
+    reserve_quota,
+)
+import pytest
+
+pytestmark = pytest.mark.django_db
+
+
+def _create_credential(admin_user, **kwargs):
+    credential = GoogleCloudOAuthCredential.objects.create(**kwargs)
+    GoogleCloudToken.objects.create(
+        oauth_credential=credential,
+        token=f"token-{credential.id}",
+        admin_user=admin_user,
+    )
+    return credential
+
+
+def test_reserve_quota_starts_from_the_quota_used_today(admin_user):
+    credential = _create_credential(admin_user, quota_limit_for_youtube=2_000)
+
+    with time_machine.travel("2023-10-10 12:00:00", tick=False):
+        UsedRequestQuota.objects.create(
+            credentials=credential, cost=1_000, service="youtube"
+        )
+
+        assert reserve_quota("youtube", 1_600) is None
+
+        token, reservation = reserve_quota("youtube", 1_000)
+
+    assert token.oauth_credential_id == credential.id
+    usage = DailyQuotaUsage.objects.get(id=reservation.usage_id)
+    assert usage.used == 1_000
+    assert usage.reserved == 1_000
+
+
+def test_reserve_quota_does_not_oversubscribe_a_credential(admin_user):
+    almost_full = _create_credential(admin_user, quota_limit_for_youtube=2_000)
+    empty = _create_credential(admin_user, quota_limit_for_youtube=10_000)
+
+    _, first = reserve_quota("youtube", 1_600)
+    _, second = reserve_quota("youtube", 1_600)
+
+    # The credential with the least quota left is used first, the second
+    # call does not fit in what is left of it
+    assert first.credentials_id == almost_full.id
+    assert second.credentials_id == empty.id
+
+
+def test_commit_quota_moves_the_reservation_to_used(admin_user):
+    credential = _create_credential(admin_user)
+
+    with time_machine.travel("2023-10-10 12:00:00", tick=False):
+        _, reservation = reserve_quota("drive", 1)
+        commit_quota(reservation)
+
+        usage = DailyQuotaUsage.objects.get(credentials=credential, service="drive")
+        assert usage.used == 1
+        assert usage.reserved == 0
+        assert not DailyQuotaReservation.objects.exists()
+        assert not UsedRequestQuota.objects.exists()
+
+        flush_used_quotas()
+
+        used_quota = UsedRequestQuota.objects.get()
+        assert used_quota.credentials == credential
+        assert used_quota.service == "drive"
+        assert used_quota.cost == 1
+
+
+def test_expired_reservations_are_released(admin_user):
+    credential = _create_credential(admin_user, quota_limit_for_youtube=2_000)
+
+    with time_machine.travel("2023-10-10 09:00:00", tick=False):
+        # Reserved by a worker killed before committing it
+        reserve_quota("youtube", 1_600)
+
+    with time_machine.travel("2023-10-10 11:00:00", tick=False):
+        _, recent = reserve_quota("youtube", 100)
+        assert reserve_quota("youtube", 1_600) is None
+
+    with time_machine.travel("2023-10-10 12:30:00", tick=False):
+        assert release_expired_reservations() == 1
+
+        usage = DailyQuotaUsage.objects.get(credentials=credential, service="youtube")
+        assert usage.reserved == 100
+        assert list(DailyQuotaReservation.objects.values_list("id", flat=True)) == [
+            recent.id
+        ]
+        assert reserve_quota("youtube", 1_600) is not None
+
+
+def test_committing_a_released_reservation_only_charges_it(admin_user):
+    credential = _create_credential(admin_user)
+
+    with time_machine.travel("2023-10-10 09:00:00", tick=False):
+        _, reservation = reserve_quota("drive", 10)
+
+    with time_machine.travel("2023-10-10 12:30:00", tick=False):
+        release_expired_reservations()
+        commit_quota(reservation)
+
+    usage = DailyQuotaUsage.objects.get(credentials=credential, service="drive")
+    assert usage.used == 10
+    assert usage.reserved == 0
+
+
+def test_charge_quota_without_reservation(admin_user):
+    credential = _create_credential(admin_user, quota_limit_for_youtube=2_000)
+
+    charge_quota(credential.id, "youtube", 1_600)
+
+    assert reserve_quota("youtube", 1_600) is None
+
+
+def test_used_quotas_are_written_in_batches(admin_user, monkeypatch):
+    monkeypatch.setattr(quota_ledger, "USED_QUOTA_BATCH_SIZE", 3)
+    credential = _create_credential(admin_user)
+
+    record_used_quota(credential.id, "drive", 1)
+    record_used_quota(credential.id, "drive", 1)
+
+    assert not UsedRequestQuota.objects.exists()
+
+    record_used_quota(credential.id, "drive", 1)
+
+    assert UsedRequestQuota.objects.count() == 3
+
+
+def test_a_new_day_starts_a_new_usage(admin_user):
+    credential = _create_credential(admin_user, quota_limit_for_youtube=2_000)
+
+    with time_machine.travel("2023-10-10 12:00:00", tick=False):
+        charge_quota(credential.id, "youtube", 1_600)
+        assert reserve_quota("youtube", 1_600) is None
+
+    # Midnight in Pacific time
+    with time_machine.travel("2023-10-11 08:00:00", tick=False):
+        assert reserve_quota("youtube", 1_600) is not None
+
+    assert DailyQuotaUsage.objects.filter(credentials=credential).count() == 2
+
+
+def test_used_quotas_are_flushed_when_a_request_finishes(admin_user):
+    credential = _create_credential(admin_user)
+    record_used_quota(credential.id, "youtube", 10)
+
+    assert not UsedRequestQuota.objects.exists()
+
+    request_finished.send(sender=None)
+
+    used_quota = UsedRequestQuota.objects.get()
+    assert used_quota.credentials == credential
+    assert used_quota.cost == 10
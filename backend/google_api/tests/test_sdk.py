@@ -7,10 +7,11 @@ from google_api.models import (
     UsedRequestQuota,
 )
 from google_api.exceptions import NoGoogleCloudQuotaLeftError
+from google_api.quota_ledger import flush_used_quotas
 from google_api.sdk import (
     count_quota,
     drive_file_metadata,
-    drive_list_files_in_folder,
+    drive_list_files_in_folders,
     get_available_credentials,
     get_drive_credentials,
     youtube_videos_insert,
@@ -77,10 +78,13 @@ def test_drive_file_metadata_sends_the_refreshed_bearer_token(
         metadata_mock.last_request.headers["Authorization"] == "Bearer refreshed-token"
     )
     assert metadata_mock.last_request.qs["supportsalldrives"] == ["true"]
+    flush_used_quotas()
     assert drive_credential.usedrequestquota_set.filter(service="drive").count() == 1
 
 
-def test_drive_list_files_in_folder_follows_pagination(requests_mock, drive_credential):
+def test_drive_list_files_in_folders_follows_pagination(
+    requests_mock, drive_credential
+):
     mock_token_refresh(requests_mock)
     requests_mock.get(
         "https://www.googleapis.com/drive/v3/files",
@@ -99,12 +103,12 @@ def test_drive_list_files_in_folder_follows_pagination(requests_mock, drive_cred
         ],
     )
 
-    files = list(drive_list_files_in_folder(folder_id="folder123"))
+    files = list(drive_list_files_in_folders(folder_ids=["folder123"]))
 
     assert [file["id"] for file in files] == ["1", "2"]
 
 
-def test_drive_list_files_in_folder_queries_only_the_folder_children(
+def test_drive_list_files_in_folders_queries_only_the_folders_children(
     requests_mock, drive_credential
 ):
     mock_token_refresh(requests_mock)
@@ -112,11 +116,12 @@ def test_drive_list_files_in_folder_queries_only_the_folder_children(
         "https://www.googleapis.com/drive/v3/files", json={"files": []}
     )
 
-    list(drive_list_files_in_folder(folder_id="folder123"))
+    list(drive_list_files_in_folders(folder_ids=["folder123", "folder456"]))
 
     query = listing_mock.last_request.qs["q"][0]
-    assert "'folder123' in parents" in query
+    assert "('folder123' in parents or 'folder456' in parents)" in query
     assert "trashed = false" in query
+    assert "parents" in listing_mock.last_request.qs["fields"][0]
 
 
 def test_drive_helpers_fail_when_no_credential_has_drive_quota(admin_user):
@@ -168,6 +173,7 @@ def test_count_quota(admin_user):
         credentials = test_function()
 
         assert credentials.token == "token"
+        flush_used_quotas()
         assert stored_credential.usedrequestquota_set.count() == 1
 
         used_quota = stored_credential.usedrequestquota_set.first()
@@ -203,6 +209,8 @@ def test_count_quota_reuses_the_credentials_it_is_given(admin_user):
     returned = test_function(credentials=passed_in)
 
     assert returned is passed_in
+
+    flush_used_quotas()
     # the quota is still charged, to the account that actually did the work
     assert (
         GoogleCloudOAuthCredential.objects.get_by_client_id(passed_in.client_id)
@@ -233,6 +241,7 @@ def test_count_quota_with_generator_function(admin_user):
 
         assert vals == [1, 2, 3]
 
+        flush_used_quotas()
         assert stored_credential.usedrequestquota_set.count() == 1
 
         used_quota = stored_credential.usedrequestquota_set.first()
@@ -288,6 +297,7 @@ def test_youtube_videos_insert(mocker, admin_user):
     assert response[0] is None
     assert response[1]["id"] == "12345"
 
+    flush_used_quotas()
     assert UsedRequestQuota.objects.filter(service="youtube", cost=1600).exists()
 
 
@@ -338,6 +348,7 @@ def test_youtube_videos_insert_when_failing_raises_an_error(mocker, admin_user):
         media_body=mock.ANY,
     )
 
+    flush_used_quotas()
     assert UsedRequestQuota.objects.filter(service="youtube", cost=1600).exists()
 
 
@@ -363,4 +374,5 @@ def test_youtube_videos_set_thumbnail(mocker, admin_user):
         videoId="123", media_body=mock.ANY
     )
 
+    flush_used_quotas()
     assert UsedRequestQuota.objects.filter(service="youtube", cost=50).exists()
@@ -1,5 +1,3 @@
-import functools
-import logging
 from django.db import transaction
 from django.utils import timezone
 from typing import Any
@@ -20,9 +18,7 @@ from django.utils.safestring import mark_safe
 from notifications.models import EmailTemplate, SentEmail, SentEmailEvent
 from django.forms import Textarea
 from django.db.models import QuerySet
-from notifications.tasks import send_pending_email
-
-logger = logging.getLogger(__name__)
+from notifications.tasks import schedule_pending_emails_sending
 
 
 class SentEmailEventInline(admin.TabularInline):
@@ -119,17 +115,6 @@ class EmailTemplateAdmin(ConferencePermissionMixin, admin.ModelAdmin):
         return reverse("admin:view-email-template", args=(obj.id,))
 
 
-def _submit_emails_for_sending(sent_emails_ids: list[int]) -> None:
-    for sent_email_id in sent_emails_ids:
-        try:
-            send_pending_email.delay(sent_email_id)
-        except Exception:
-            logger.exception(
-                "Could not queue sent_email_id=%s, leaving it pending",
-                sent_email_id,
-            )
-
-
 @admin.register(SentEmail)
 class SentEmailAdmin(admin.ModelAdmin):
     list_display = [
@@ -222,9 +207,7 @@ class SentEmailAdmin(admin.ModelAdmin):
             modified=timezone.now(),
         )
 
-        transaction.on_commit(
-            functools.partial(_submit_emails_for_sending, affected_emails_ids)
-        )
+        transaction.on_commit(schedule_pending_emails_sending)
         self.message_user(
             request, f"Emails queued for sending: {len(affected_emails_ids)}"
         )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 22:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0024_alter_emailtemplate_identifier'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='emailtemplate',
+            name='identifier',
+            field=models.CharField(choices=[('proposal_accepted', 'Proposal accepted'), ('proposal_scheduled', 'Proposal scheduled'), ('proposal_rejected', 'Proposal rejected'), ('proposal_in_waiting_list', 'Proposal in waiting list'), ('proposal_scheduled_time_changed', 'Proposal scheduled time changed'), ('proposal_received_confirmation', 'Proposal received confirmation'), ('speaker_communication', 'Speaker communication'), ('voucher_code', 'Voucher code'), ('reset_password', '[System] Reset password'), ('grant_application_confirmation', 'Grant application confirmation'), ('grant_approved', 'Grant approved'), ('grant_rejected', 'Grant rejected'), ('grant_waiting_list', 'Grant waiting list'), ('grant_waiting_list_update', 'Grant waiting list update'), ('sponsorship_brochure', 'Sponsorship brochure'), ('visa_invitation_letter_download', 'Visa invitation letter download'), ('speaker_video_recording_uploaded', 'Speaker: Video recording uploaded'), ('schedule_item_waitlist_spot_booked', 'Schedule item waitlist spot booked'), ('custom', 'Custom')], max_length=200, verbose_name='identifier'),
+        ),
+    ]
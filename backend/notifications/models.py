@@ -58,6 +58,11 @@ class EmailTemplateIdentifier(models.TextChoices):
         _("Speaker: Video recording uploaded"),
     )
 
+    schedule_item_waitlist_spot_booked = (
+        "schedule_item_waitlist_spot_booked",
+        _("Schedule item waitlist spot booked"),
+    )
+
     custom = "custom", _("Custom")
 
 
@@ -177,6 +182,13 @@ class EmailTemplate(TimeStampedModel):
             "schedule_item_title",
             "schedule_item_type",
         ],
+        EmailTemplateIdentifier.schedule_item_waitlist_spot_booked: [
+            *BASE_PLACEHOLDERS,
+            "conference_name",
+            "user_name",
+            "schedule_item_title",
+            "schedule_item_url",
+        ],
     }
 
     conference = models.ForeignKey(
@@ -285,15 +297,15 @@ class EmailTemplate(TimeStampedModel):
         recipient_email: str | None = None,
         placeholders: dict = None,
     ):
-        from notifications.tasks import send_pending_email
+        from notifications.tasks import schedule_pending_emails_sending
 
-        sent_email = self._prepare_email(
+        self._prepare_email(
             status=SentEmail.Status.pending,
             recipient=recipient,
             recipient_email=recipient_email,
             placeholders=placeholders,
         )
-        transaction.on_commit(lambda: send_pending_email.delay(sent_email.id))
+        transaction.on_commit(schedule_pending_emails_sending)
 
     @property
     def is_custom(self):
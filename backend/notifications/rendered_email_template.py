@@ -19,7 +19,7 @@ class RenderedEmailTemplate:
     def __post_init__(self):
         self.placeholders = self.placeholders or {}
 
-    @property
+    @cached_property
     def all_placeholders(self):
         return {
             "conference": self.email_template.conference,
@@ -1,14 +1,31 @@
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 
 import logging
+import time
+from datetime import timedelta
 from uuid import uuid4
+from django.utils import timezone
 from notifications.models import SentEmail
 from pycon.celery import app
+from pycon.celery_utils import OnlyOneAtTimeTask
 from django.core.mail import EmailMultiAlternatives
 from django.core.mail import get_connection
 
 logger = logging.getLogger(__name__)
 
+SEND_PENDING_EMAILS_SCHEDULED_KEY = "notifications:send_pending_emails:scheduled"
+# Emails still pending after this long are left alone by send_pending_emails,
+# they were stuck before it existed and are not relevant anymore
+PENDING_EMAILS_MAX_AGE = timedelta(days=2)
+# Long enough for all the retries of send_pending_email
+RETRYING_EMAIL_TTL = 60 * 60  # 1 hour
+
+
+def _retrying_email_key(sent_email_id: int) -> str:
+    return f"notifications:send_pending_email:retrying:{sent_email_id}"
+
 
 def send_pending_email_failed(self, exc, task_id, args, kwargs, einfo):
     sent_email_id = args[0]
@@ -60,9 +77,127 @@ def send_pending_email(self, sent_email_id: int):
     )
 
 
-def send_email(sent_email, email_backend_connection):
-    logger.info(f"Sending sent_email_id={sent_email.id}")
+def schedule_pending_emails_sending():
+    """Queue a send_pending_emails run, unless one is already queued and has
+    not started yet, so a mass send becomes a single task instead of one per
+    email. Emails left pending are picked up by the periodic run anyway.
+    """
+    if not cache.add(SEND_PENDING_EMAILS_SCHEDULED_KEY, True, timeout=60):
+        return
+
+    try:
+        send_pending_emails.delay()
+    except Exception:
+        cache.delete(SEND_PENDING_EMAILS_SCHEDULED_KEY)
+        logger.exception("Could not queue send_pending_emails")
+
+
+class SendRateLimiter:
+    """Spaces out sends so that at most `rate` recipients per second are
+    sent to, matching the sending quota of the email provider."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate else 0
+        self.next_send_at = 0.0
+
+    def wait(self, recipients: int = 1):
+        now = time.monotonic()
+
+        if self.next_send_at > now:
+            time.sleep(self.next_send_at - now)
+            now = self.next_send_at
+
+        self.next_send_at = now + self.interval * recipients
+
+
+@app.task(
+    base=OnlyOneAtTimeTask,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=5,
+)
+def send_pending_emails():
+    # Runs never overlap, so the rate limiter alone keeps the sends within
+    # the quota. From now on, new pending emails need another run
+    cache.delete(SEND_PENDING_EMAILS_SCHEDULED_KEY)
+
+    rate_limiter = SendRateLimiter(settings.EMAIL_SEND_RATE)
+    pending_emails = SentEmail.objects.pending().filter(
+        created__gte=timezone.now() - PENDING_EMAILS_MAX_AGE
+    )
+    last_id = 0
+    failed_emails_ids = []
+    sent_count = 0
+
+    with get_connection() as email_backend_connection:
+        while True:
+            batch = list(
+                pending_emails.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[: settings.EMAIL_SEND_BATCH_SIZE]
+            )
+
+            if not batch:
+                break
+
+            last_id = batch[-1]
+            # Failed emails are only retried by send_pending_email
+            retrying = cache.get_many([_retrying_email_key(id) for id in batch])
+
+            for sent_email_id in batch:
+                if _retrying_email_key(sent_email_id) in retrying:
+                    continue
 
+                sent = send_pending_email_now(
+                    sent_email_id, email_backend_connection, rate_limiter
+                )
+
+                if sent:
+                    sent_count += 1
+                elif sent is False:
+                    failed_emails_ids.append(sent_email_id)
+
+    logger.info("Sent %s emails, %s failed", sent_count, len(failed_emails_ids))
+
+    # Failed emails are retried one by one, with backoff, until they are
+    # sent or marked as failed
+    for sent_email_id in failed_emails_ids:
+        cache.set(_retrying_email_key(sent_email_id), True, RETRYING_EMAIL_TTL)
+        send_pending_email.delay(sent_email_id)
+
+
+@transaction.atomic()
+def send_pending_email_now(sent_email_id, email_backend_connection, rate_limiter):
+    """Sends the email and marks it as sent in its own transaction, so an
+    email delivered before a later failure is never sent again.
+    Returns None when the email is no longer pending or is being sent
+    by another task."""
+    sent_email = (
+        SentEmail.objects.select_for_update(skip_locked=True)
+        .pending()
+        .filter(id=sent_email_id)
+        .first()
+    )
+
+    if not sent_email:
+        return None
+
+    email_message = build_email_message(sent_email, email_backend_connection)
+    rate_limiter.wait(len(email_message.recipients()))
+
+    try:
+        email_backend_connection.send_messages([email_message])
+    except Exception:
+        logger.exception("Failed to send sent_email_id=%s", sent_email.id)
+        return False
+
+    sent_email.mark_as_sent(
+        email_message.extra_headers.get("message_id", f"local-{uuid4()}")
+    )
+    return True
+
+
+def build_email_message(sent_email, email_backend_connection):
     email_message = EmailMultiAlternatives(
         subject=sent_email.subject,
         body=sent_email.text_body,
@@ -74,5 +209,12 @@ def send_email(sent_email, email_backend_connection):
         connection=email_backend_connection,
     )
     email_message.attach_alternative(sent_email.body, "text/html")
+    return email_message
+
+
+def send_email(sent_email, email_backend_connection):
+    logger.info(f"Sending sent_email_id={sent_email.id}")
+
+    email_message = build_email_message(sent_email, email_backend_connection)
     email_message.send()
     return email_message.extra_headers.get("message_id", f"local-{uuid4()}")
@@ -1,4 +1,12 @@
-from jinja2 import Environment, Undefined
+import hashlib
+import threading
+from collections import OrderedDict
+
+from jinja2 import Environment, Template, Undefined
+
+# Compiled templates kept in memory, a bulk send renders the same
+# subject, preview text and body for every recipient
+TEMPLATE_CACHE_SIZE = 256
 
 
 class ShowPlaceholdersUndefined(Undefined):
@@ -10,9 +18,7 @@ class ShowPlaceholdersUndefined(Undefined):
         return "{{" + self.variable_name + "}}"
 
 
-def render_template_from_string(
-    template_string: str, context: dict, *, show_placeholders: bool = False
-) -> str:
+def _create_environment(*, show_placeholders: bool) -> Environment:
     env = Environment(
         trim_blocks=True,
         lstrip_blocks=True,
@@ -21,5 +27,53 @@ def render_template_from_string(
     if show_placeholders:
         env.undefined = ShowPlaceholdersUndefined
 
-    template = env.from_string(template_string)
+    return env
+
+
+_environments = {
+    False: _create_environment(show_placeholders=False),
+    True: _create_environment(show_placeholders=True),
+}
+
+_compiled_templates: OrderedDict[tuple[str, bool], Template] = OrderedDict()
+_compiled_templates_lock = threading.Lock()
+
+
+def get_compiled_template(
+    template_string: str, *, show_placeholders: bool = False
+) -> Template:
+    key = (
+        hashlib.sha256(template_string.encode()).hexdigest(),
+        show_placeholders,
+    )
+
+    with _compiled_templates_lock:
+        template = _compiled_templates.get(key)
+
+        if template is not None:
+            _compiled_templates.move_to_end(key)
+            return template
+
+    template = _environments[show_placeholders].from_string(template_string)
+
+    with _compiled_templates_lock:
+        _compiled_templates[key] = template
+
+        while len(_compiled_templates) > TEMPLATE_CACHE_SIZE:
+            _compiled_templates.popitem(last=False)
+
+    return template
+
+
+def clear_compiled_templates():
+    with _compiled_templates_lock:
+        _compiled_templates.clear()
+
+
+def render_template_from_string(
+    template_string: str, context: dict, *, show_placeholders: bool = False
+) -> str:
+    template = get_compiled_template(
+        template_string, show_placeholders=show_placeholders
+    )
     return template.render(context).strip()
@@ -101,8 +101,8 @@ def test_email_template_display_name():
 
 
 def test_send_email_action(rf, admin_user, django_capture_on_commit_callbacks, mocker):
-    mock_send_pending_email = mocker.patch(
-        "notifications.admin.admins.send_pending_email.delay"
+    mock_send_pending_emails = mocker.patch(
+        "notifications.tasks.send_pending_emails.delay"
     )
     admin = SentEmailAdmin(
         model=SentEmail,
@@ -122,15 +122,9 @@ def test_send_email_action(rf, admin_user, django_capture_on_commit_callbacks, m
     with django_capture_on_commit_callbacks(execute=True):
         admin.send_email(request, SentEmail.objects.all())
 
-    # drafts, pending and failed emails are all (re)queued for sending
-    queued_ids = {call.args[0] for call in mock_send_pending_email.call_args_list}
-    assert queued_ids == {
-        draft_email_1.id,
-        draft_email_2.id,
-        pending_email.id,
-        failed_email.id,
-    }
-    assert mock_send_pending_email.call_count == 4
+    # drafts, pending and failed emails are all (re)queued for sending,
+    # in a single run
+    mock_send_pending_emails.assert_called_once_with()
 
     for email in (draft_email_1, draft_email_2, pending_email, failed_email):
         email.refresh_from_db()
@@ -148,8 +142,8 @@ def test_send_email_action_with_a_status_filtered_queryset(
 ):
     """The changelist queryset carries the active list_filter, so the action
     receives a queryset already narrowed to a single status."""
-    mock_send_pending_email = mocker.patch(
-        "notifications.admin.admins.send_pending_email.delay"
+    mock_send_pending_emails = mocker.patch(
+        "notifications.tasks.send_pending_emails.delay"
     )
     admin = SentEmailAdmin(
         model=SentEmail,
@@ -167,18 +161,18 @@ def test_send_email_action_with_a_status_filtered_queryset(
             request, SentEmail.objects.filter(status=SentEmail.Status.draft)
         )
 
-    mock_send_pending_email.assert_called_once_with(draft_email.id)
+    mock_send_pending_emails.assert_called_once_with()
 
     draft_email.refresh_from_db()
     assert draft_email.status == SentEmail.Status.pending
 
 
-def test_send_email_action_keeps_queueing_after_a_broker_failure(
+def test_send_email_action_leaves_emails_pending_after_a_broker_failure(
     rf, admin_user, django_capture_on_commit_callbacks, mocker
 ):
-    mock_send_pending_email = mocker.patch(
-        "notifications.admin.admins.send_pending_email.delay",
-        side_effect=[Exception("broker is down"), None],
+    mocker.patch(
+        "notifications.tasks.send_pending_emails.delay",
+        side_effect=Exception("broker is down"),
     )
     admin = SentEmailAdmin(
         model=SentEmail,
@@ -189,11 +183,11 @@ def test_send_email_action_keeps_queueing_after_a_broker_failure(
     request = rf.post("/")
     request.user = admin_user
 
-    SentEmailFactory(status=SentEmail.Status.draft)
-    SentEmailFactory(status=SentEmail.Status.draft)
+    draft_email = SentEmailFactory(status=SentEmail.Status.draft)
 
     with django_capture_on_commit_callbacks(execute=True):
         admin.send_email(request, SentEmail.objects.all())
 
-    # the first publish blowing up must not strand the remaining emails
-    assert mock_send_pending_email.call_count == 2
+    # the periodic send_pending_emails run picks it up later
+    draft_email.refresh_from_db()
+    assert draft_email.status == SentEmail.Status.pending
@@ -52,8 +52,8 @@ def test_send_email_template_to_recipient_email(
         reply_to="replyto@example.com",
     )
 
-    mock_send_pending_email = mocker.patch(
-        "notifications.tasks.send_pending_email.delay"
+    mock_send_pending_emails = mocker.patch(
+        "notifications.tasks.send_pending_emails.delay"
     )
 
     with django_capture_on_commit_callbacks(execute=True):
@@ -68,7 +68,7 @@ def test_send_email_template_to_recipient_email(
         email_template=email_template,
     )
 
-    mock_send_pending_email.assert_called_once_with(sent_email.id)
+    mock_send_pending_emails.assert_called_once_with()
 
     assert sent_email.recipient is None
     assert sent_email.recipient_email == "example@example.com"
@@ -276,8 +276,8 @@ def test_draft_email_template_to_recipient_email(
         reply_to="replyto@example.com",
     )
 
-    mock_send_pending_email = mocker.patch(
-        "notifications.tasks.send_pending_email.delay"
+    mock_send_pending_emails = mocker.patch(
+        "notifications.tasks.send_pending_emails.delay"
     )
 
     with django_capture_on_commit_callbacks(execute=True):
@@ -289,7 +289,7 @@ def test_draft_email_template_to_recipient_email(
         )
 
     # drafts are only queued once the action in the admin is used
-    mock_send_pending_email.assert_not_called()
+    mock_send_pending_emails.assert_not_called()
 
     assert sent_email.status == SentEmail.Status.draft
     assert sent_email.sent_at is None
@@ -337,8 +337,8 @@ def test_draft_email_requires_a_recipient():
 def test_send_email_creates_a_pending_email(mocker, django_capture_on_commit_callbacks):
     email_template = EmailTemplateFactory()
 
-    mock_send_pending_email = mocker.patch(
-        "notifications.tasks.send_pending_email.delay"
+    mock_send_pending_emails = mocker.patch(
+        "notifications.tasks.send_pending_emails.delay"
     )
 
     with django_capture_on_commit_callbacks(execute=True):
@@ -347,4 +347,4 @@ def test_send_email_creates_a_pending_email(mocker, django_capture_on_commit_cal
     sent_email = SentEmail.objects.get(email_template=email_template)
 
     assert sent_email.status == SentEmail.Status.pending
-    mock_send_pending_email.assert_called_once_with(sent_email.id)
+    mock_send_pending_emails.assert_called_once_with()
@@ -1,9 +1,18 @@
 import smtplib
 from unittest.mock import patch
+import pytest
+from django.core.mail.backends import locmem
+from notifications import tasks as notifications_tasks
 from uuid import uuid4
 import time_machine
 from django.core import mail
-from notifications.tasks import send_pending_email, send_pending_email_failed
+from django.core.cache import cache
+from notifications.tasks import (
+    SendRateLimiter,
+    send_pending_email,
+    send_pending_email_failed,
+    send_pending_emails,
+)
 from notifications.models import SentEmail
 from notifications.tests.factories import SentEmailFactory
 
@@ -92,3 +101,139 @@ def test_send_pending_email_failure():
 
     assert len(mail.outbox) == 0
     assert pending_email_1.status == SentEmail.Status.failed
+
+
+def test_send_pending_emails_sends_all_pending_emails_in_batches(settings, mocker):
+    settings.EMAIL_SEND_BATCH_SIZE = 2
+    settings.EMAIL_SEND_RATE = 0
+    get_connection = mocker.spy(notifications_tasks, "get_connection")
+
+    pending_emails = SentEmailFactory.create_batch(3, status=SentEmail.Status.pending)
+    draft_email = SentEmailFactory(status=SentEmail.Status.draft)
+
+    with time_machine.travel("2021-01-01 12:00Z", tick=False):
+        send_pending_emails()
+
+    # A single connection is used for every batch
+    get_connection.assert_called_once()
+    assert sorted(message.to[0] for message in mail.outbox) == sorted(
+        email.recipient_email for email in pending_emails
+    )
+
+    for pending_email in pending_emails:
+        pending_email.refresh_from_db()
+        assert pending_email.status == SentEmail.Status.sent
+        assert pending_email.message_id.startswith("local-")
+        assert pending_email.sent_at.isoformat() == "2021-01-01T12:00:00+00:00"
+
+    draft_email.refresh_from_db()
+    assert draft_email.status == SentEmail.Status.draft
+
+
+def test_send_pending_emails_retries_failed_emails_one_by_one(settings, mocker):
+    settings.EMAIL_SEND_RATE = 0
+    failing_email = SentEmailFactory(status=SentEmail.Status.pending)
+    working_email = SentEmailFactory(status=SentEmail.Status.pending)
+
+    original_send_messages = locmem.EmailBackend.send_messages
+
+    def send_messages(self, messages):
+        if messages[0].to == [failing_email.recipient_email]:
+            raise smtplib.SMTPException("test")
+        return original_send_messages(self, messages)
+
+    mocker.patch.object(locmem.EmailBackend, "send_messages", send_messages)
+    mock_send_pending_email = mocker.patch(
+        "notifications.tasks.send_pending_email.delay"
+    )
+
+    send_pending_emails()
+
+    working_email.refresh_from_db()
+    assert working_email.status == SentEmail.Status.sent
+
+    failing_email.refresh_from_db()
+    assert failing_email.status == SentEmail.Status.pending
+    mock_send_pending_email.assert_called_once_with(failing_email.id)
+
+
+def test_send_pending_emails_skips_emails_being_retried(settings, mocker):
+    settings.EMAIL_SEND_RATE = 0
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    failing_email = SentEmailFactory(status=SentEmail.Status.pending)
+
+    mocker.patch.object(
+        locmem.EmailBackend,
+        "send_messages",
+        side_effect=smtplib.SMTPException("test"),
+    )
+    mock_send_pending_email = mocker.patch(
+        "notifications.tasks.send_pending_email.delay"
+    )
+
+    send_pending_emails()
+    send_pending_emails()
+
+    mock_send_pending_email.assert_called_once_with(failing_email.id)
+
+
+def test_send_pending_emails_ignores_old_pending_emails(settings):
+    settings.EMAIL_SEND_RATE = 0
+
+    with time_machine.travel("2021-01-01 12:00:00Z", tick=False):
+        old_email = SentEmailFactory(status=SentEmail.Status.pending)
+
+    with time_machine.travel("2021-01-05 12:00:00Z", tick=False):
+        recent_email = SentEmailFactory(status=SentEmail.Status.pending)
+
+        send_pending_emails()
+
+    old_email.refresh_from_db()
+    assert old_email.status == SentEmail.Status.pending
+
+    recent_email.refresh_from_db()
+    assert recent_email.status == SentEmail.Status.sent
+
+
+def test_send_pending_emails_keeps_sent_emails_when_the_run_fails(settings, mocker):
+    settings.EMAIL_SEND_RATE = 0
+    sent_email = SentEmailFactory(status=SentEmail.Status.pending)
+    broken_email = SentEmailFactory(status=SentEmail.Status.pending)
+
+    original_build_email_message = notifications_tasks.build_email_message
+
+    def build_email_message(email, connection):
+        if email.id == broken_email.id:
+            raise ValueError("test")
+        return original_build_email_message(email, connection)
+
+    mocker.patch.object(
+        notifications_tasks, "build_email_message", side_effect=build_email_message
+    )
+
+    with pytest.raises(ValueError):
+        send_pending_emails()
+
+    # The email delivered before the failure is not sent again by the retry
+    sent_email.refresh_from_db()
+    assert sent_email.status == SentEmail.Status.sent
+    assert len(mail.outbox) == 1
+
+    broken_email.refresh_from_db()
+    assert broken_email.status == SentEmail.Status.pending
+
+
+def test_send_rate_limiter_spaces_out_recipients(mocker):
+    mocker.patch("notifications.tasks.time.monotonic", return_value=100.0)
+    mock_sleep = mocker.patch("notifications.tasks.time.sleep")
+
+    rate_limiter = SendRateLimiter(rate=10)
+
+    rate_limiter.wait(recipients=2)
+    mock_sleep.assert_not_called()
+
+    rate_limiter.wait()
+    mock_sleep.assert_called_once_with(pytest.approx(0.2))
@@ -0,0 +1,65 @@
+import pytest
+
+from notifications import template_utils
+from notifications.template_utils import (
+    clear_compiled_templates,
+    get_compiled_template,
+    render_template_from_string,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_template_cache():
+    clear_compiled_templates()
+    yield
+    clear_compiled_templates()
+
+
+def test_render_template_from_string():
+    assert render_template_from_string("Hello {{ name }} ", {"name": "Marco"}) == (
+        "Hello Marco"
+    )
+
+
+def test_render_template_from_string_showing_placeholders():
+    assert (
+        render_template_from_string("Hello {{ name }}", {}, show_placeholders=True)
+        == "Hello {{name}}"
+    )
+    assert render_template_from_string("Hello {{ name }}", {}) == "Hello"
+
+
+def test_compiled_templates_are_reused(mocker):
+    from_string = mocker.spy(template_utils._environments[False], "from_string")
+
+    first = get_compiled_template("Hello {{ name }}")
+    second = get_compiled_template("Hello {{ name }}")
+
+    assert first is second
+    from_string.assert_called_once()
+
+
+def test_show_placeholders_templates_are_cached_separately():
+    template = get_compiled_template("Hello {{ name }}")
+    placeholders_template = get_compiled_template(
+        "Hello {{ name }}", show_placeholders=True
+    )
+
+    assert template is not placeholders_template
+    assert placeholders_template.render() == "Hello {{name}}"
+
+
+def test_least_recently_used_templates_are_evicted(mocker):
+    mocker.patch.object(template_utils, "TEMPLATE_CACHE_SIZE", 2)
+
+    first = get_compiled_template("first")
+    get_compiled_template("second")
+    # Using the first template again makes the second the oldest one
+    get_compiled_template("first")
+    get_compiled_template("third")
+
+    assert get_compiled_template("first") is first
+    assert len(template_utils._compiled_templates) == 2
+    assert "second" not in [
+        t.render() for t in template_utils._compiled_templates.values()
+    ]
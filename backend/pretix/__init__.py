@@ -3,12 +3,10 @@ import logging
 from typing import Any, Dict, List, Optional
 from urllib.parse import urljoin
 from django.utils.dateparse import parse_datetime
-import requests
 from api.types import BaseErrorType
 from countries import countries
 import strawberry
 from django.conf import settings
-from django.core.cache import cache
 from api.pretix.types import (
     AttendeeNameInput,
     AttendeeNameInputError,
@@ -16,6 +14,7 @@ from api.pretix.types import (
     Voucher,
 )
 from conferences.models.conference import Conference
+from pretix_mirror import queries as pretix_mirror
 from pretix.types import Category, Question, Quota
 import sentry_sdk
 from billing.validation import (
@@ -31,10 +30,23 @@ from billing.exceptions import (
     SdiValidationError,
 )
 
+from .cache import cache_pretix
+from .client import get_client
 from .exceptions import PretixError
 
 logger = logging.getLogger(__file__)
 
+# Items, questions and categories rarely change, while quotas track the
+# tickets still available and need to follow sales closely.
+CATALOG_TTL = 60 * 15
+CATALOG_STALE_TTL = 60 * 60 * 24
+QUOTAS_TTL = 30
+QUOTAS_STALE_TTL = 60 * 5
+# Vouchers decide the badge roles, a value is never served more than
+# 3 minutes after it was fetched, as before the stale values were served
+VOUCHERS_TTL = 60 * 2
+VOUCHERS_STALE_TTL = 60
+
 
 def get_api_url(conference: Conference, endpoint: str) -> str:
     return urljoin(
@@ -50,13 +62,7 @@ def _pretix_request(
     method="get",
     **kwargs,
 ):
-    return requests.request(
-        method,
-        url,
-        params=qs or {},
-        headers={"Authorization": f"Token {settings.PRETIX_API_TOKEN}"},
-        **kwargs,
-    )
+    return get_client().request(method, url, params=qs, **kwargs)
 
 
 def pretix(
@@ -139,8 +145,10 @@ def create_voucher(
     return response.json()
 
 
-def get_order(conference: Conference, code: str):
-    response = pretix(conference, f"orders/{code}")
+def get_order(
+    conference: Conference, code: str, params: Optional[Dict[str, Any]] = None
+):
+    response = pretix(conference, f"orders/{code}", params)
 
     if response.status_code == 404:
         return None
@@ -151,6 +159,9 @@ def get_order(conference: Conference, code: str):
 
 
 def get_user_orders(conference: Conference, email: str):
+    if pretix_mirror.is_mirrored(conference):
+        return pretix_mirror.get_user_orders(conference, email)
+
     response = pretix(conference, "orders", {"email": email})
     response.raise_for_status()
     return response.json()
@@ -162,11 +173,7 @@ def _get_paginated(
     url = get_api_url(conference, endpoint)
 
     while url is not None:
-        response = requests.get(
-            url,
-            params=qs,
-            headers={"Authorization": f"Token {settings.PRETIX_API_TOKEN}"},
-        )
+        response = get_client().get(url, params=qs)
 
         response.raise_for_status()
 
@@ -176,8 +183,8 @@ def _get_paginated(
         yield from (order for order in data["results"])
 
 
-def get_orders(conference: Conference):
-    return _get_paginated(conference, "orders")
+def get_orders(conference: Conference, params: Optional[Dict[str, Any]] = None):
+    return _get_paginated(conference, "orders", params)
 
 
 def get_all_order_positions(
@@ -190,6 +197,7 @@ def get_invoices(conference: Conference):
     return _get_paginated(conference, "invoices")
 
 
+@cache_pretix(name="items", ttl=CATALOG_TTL, stale_ttl=CATALOG_STALE_TTL)
 def get_items(conference: Conference, params: Optional[Dict[str, Any]] = None):
     response = pretix(conference, "items", params)
     response.raise_for_status()
@@ -198,29 +206,7 @@ def get_items(conference: Conference, params: Optional[Dict[str, Any]] = None):
     return {str(result["id"]): result for result in data["results"]}
 
 
-def cache_pretix(name: str):
-    def factory(func):
-        def wrapper(*args, **kwargs):
-            conference = args[0]
-            cache_key = (
-                f"pretix:"
-                f"{conference.pretix_organizer_id}:{conference.pretix_event_id}:"
-                f"{name}"
-            )
-
-            if cache.has_key(cache_key):
-                return cache.get(cache_key)
-
-            value = func(*args, **kwargs)
-            cache.set(cache_key, value, timeout=60 * 3)
-            return value
-
-        return wrapper
-
-    return factory
-
-
-@cache_pretix(name="questions")
+@cache_pretix(name="questions", ttl=CATALOG_TTL, stale_ttl=CATALOG_STALE_TTL)
 def get_questions(conference: Conference) -> Dict[str, Question]:
     response = pretix(conference, "questions")
     response.raise_for_status()
@@ -229,7 +215,7 @@ def get_questions(conference: Conference) -> Dict[str, Question]:
     return {str(result["id"]): result for result in data["results"]}
 
 
-@cache_pretix(name="categories")
+@cache_pretix(name="categories", ttl=CATALOG_TTL, stale_ttl=CATALOG_STALE_TTL)
 def get_categories(conference: Conference) -> Dict[str, Category]:
     response = pretix(conference, "categories")
     response.raise_for_status()
@@ -237,6 +223,7 @@ def get_categories(conference: Conference) -> Dict[str, Category]:
     return {str(result["id"]): result for result in data["results"]}
 
 
+@cache_pretix(name="quotas", ttl=QUOTAS_TTL, stale_ttl=QUOTAS_STALE_TTL)
 def get_quotas(conference: Conference) -> Dict[str, Quota]:
     response = pretix(conference, "quotas", qs={"with_availability": "true"})
     response.raise_for_status()
@@ -245,6 +232,20 @@ def get_quotas(conference: Conference) -> Dict[str, Quota]:
     return {str(result["id"]): result for result in data["results"]}
 
 
+def get_tickets_catalog(
+    conference: Conference,
+) -> tuple[dict, Dict[str, Question], Dict[str, Category], Dict[str, Quota]]:
+    """Fetches items, questions, categories and quotas in parallel, so the
+    caller waits for the slowest request instead of the sum of all four.
+    """
+    return get_client().run_concurrently(
+        lambda: get_items(conference),
+        lambda: get_questions(conference),
+        lambda: get_categories(conference),
+        lambda: get_quotas(conference),
+    )
+
+
 @strawberry.type
 class InvoiceInformationErrors:
     company: list[str] = strawberry.field(default_factory=list)
@@ -599,6 +600,17 @@ def user_has_admission_ticket(
             "event_slug": event_slug,
         }
     ] + additional_events
+
+    # Answer from the local mirror when possible, and only ask pretix
+    # when some of the events are not mirrored (or the mirror is behind)
+    conferences, all_mirrored = pretix_mirror.get_mirrored_conferences(events)
+
+    if conferences and pretix_mirror.has_admission_ticket(conferences, email):
+        return True
+
+    if all_mirrored:
+        return False
+
     response = pretix(
         conference=Conference(
             pretix_organizer_id=event_organizer, pretix_event_id=event_slug
@@ -632,7 +644,7 @@ def get_user_tickets(conference: Conference, email: str):
     return response.json()
 
 
-@cache_pretix(name="all_vouchers")
+@cache_pretix(name="all_vouchers", ttl=VOUCHERS_TTL, stale_ttl=VOUCHERS_STALE_TTL)
 def get_all_vouchers(conference: Conference):
     vouchers = _get_paginated(conference, "vouchers")
     vouchers_by_id = {voucher["id"]: voucher for voucher in vouchers}
@@ -0,0 +1,126 @@
+import logging
+import time
+from functools import wraps
+from typing import Any, Callable
+
+from django.core.cache import cache
+
+from conferences.models.conference import Conference
+
+logger = logging.getLogger(__file__)
+
+# Bump when the shape of the cached data changes, so that a deploy
+# never reads entries written by the previous version of the code.
+CACHE_VERSION = 1
+
+# Max time a background refresh can hold the single-flight lock.
+REFRESH_LOCK_TIMEOUT = 60
+
+CACHED_FETCHERS: dict[str, Callable[[Conference], Any]] = {}
+
+
+def get_cache_key(organizer: str, event: str, name: str) -> str:
+    return f"pretix:v{CACHE_VERSION}:{organizer}:{event}:{name}"
+
+
+def _get_conference_cache_key(conference: Conference, name: str) -> str:
+    return get_cache_key(
+        conference.pretix_organizer_id, conference.pretix_event_id, name
+    )
+
+
+def _store(cache_key: str, value: Any, ttl: int, stale_ttl: int) -> None:
+    cache.set(
+        cache_key,
+        {"value": value, "fresh_until": time.time() + ttl},
+        timeout=ttl + stale_ttl,
+    )
+
+
+def refresh(conference: Conference, name: str) -> Any:
+    """Fetches `name` from pretix and stores it as the new fresh value."""
+    fetcher = CACHED_FETCHERS[name]
+    value = fetcher.__wrapped__(conference)
+    _store(
+        _get_conference_cache_key(conference, name),
+        value,
+        fetcher.ttl,
+        fetcher.stale_ttl,
+    )
+    return value
+
+
+def _schedule_refresh(conference: Conference, cache_key: str, name: str) -> None:
+    from pretix.tasks import refresh_pretix_cache
+
+    lock_key = f"{cache_key}:refreshing"
+
+    # Single flight: only the first request that sees a stale entry
+    # schedules a refresh, everyone else keeps serving the stale value.
+    if not cache.add(lock_key, True, timeout=REFRESH_LOCK_TIMEOUT):
+        return
+
+    try:
+        refresh_pretix_cache.delay(conference_id=conference.id, name=name)
+    except Exception:
+        logger.exception("Unable to schedule refresh of pretix cache %s", cache_key)
+        cache.delete(lock_key)
+
+
+def release_refresh_lock(conference: Conference, name: str) -> None:
+    cache.delete(f"{_get_conference_cache_key(conference, name)}:refreshing")
+
+
+def cache_pretix(name: str, *, ttl: int, stale_ttl: int):
+    """Stale-while-revalidate cache for pretix catalog data.
+
+    A fresh value is returned straight from the cache. Once `ttl` has passed
+    the value is still served for up to `stale_ttl` more seconds, while a
+    background task fetches the new one. Only a cache miss hits pretix
+    synchronously.
+
+    Calls with arguments other than the conference skip the cache.
+    """
+
+    def factory(func):
+        @wraps(func)
+        def wrapper(conference: Conference, *args, **kwargs):
+            if args or kwargs:
+                return func(conference, *args, **kwargs)
+
+            cache_key = _get_conference_cache_key(conference, name)
+            entry = cache.get(cache_key)
+
+            if entry is None:
+                value = func(conference)
+                _store(cache_key, value, ttl, stale_ttl)
+                return value
+
+            if entry["fresh_until"] <= time.time():
+                _schedule_refresh(conference, cache_key, name)
+
+            return entry["value"]
+
+        wrapper.ttl = ttl
+        wrapper.stale_ttl = stale_ttl
+        CACHED_FETCHERS[name] = wrapper
+        return wrapper
+
+    return factory
+
+
+def invalidate_pretix_cache(organizer: str, event: str, *names: str) -> None:
+    """Marks the cached values for `names` (or every cached endpoint when
+    no name is passed) as stale. The next read still serves them and
+    refreshes them in the background, so a webhook during the sales peak
+    doesn't send every request to pretix at once.
+    """
+    names = names or tuple(CACHED_FETCHERS.keys())
+    cache_keys = {get_cache_key(organizer, event, name): name for name in names}
+
+    for cache_key, entry in cache.get_many(list(cache_keys)).items():
+        cache.set(
+            cache_key,
+            {**entry, "fresh_until": 0},
+            timeout=CACHED_FETCHERS[cache_keys[cache_key]].stale_ttl,
+        )
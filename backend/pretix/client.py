@@ -0,0 +1,193 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+import sentry_sdk
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__file__)
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class PretixClient:
+    """HTTP client used for every call to the pretix API.
+
+    Each worker process keeps its own pooled `requests.Session`, so calls
+    reuse keep-alive connections instead of paying a new TCP+TLS handshake.
+    Idempotent requests are retried with exponential backoff and jitter
+    when pretix answers with 429 or 5xx; the last response is returned
+    as-is so callers can keep checking the status code themselves.
+    """
+
+    def __init__(
+        self,
+        *,
+        connect_timeout: float,
+        read_timeout: float,
+        max_retries: int,
+        backoff_factor: float,
+        pool_maxsize: int,
+        max_concurrent_requests: int,
+    ):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.pool_maxsize = pool_maxsize
+        self.max_concurrent_requests = max_concurrent_requests
+
+        self._session = None
+        self._session_pid = None
+        self._executor = None
+        self._executor_pid = None
+
+    @classmethod
+    def from_settings(cls) -> "PretixClient":
+        return cls(
+            connect_timeout=settings.PRETIX_CONNECT_TIMEOUT,
+            read_timeout=settings.PRETIX_READ_TIMEOUT,
+            max_retries=settings.PRETIX_MAX_RETRIES,
+            backoff_factor=settings.PRETIX_RETRY_BACKOFF_FACTOR,
+            pool_maxsize=settings.PRETIX_POOL_MAXSIZE,
+            max_concurrent_requests=settings.PRETIX_MAX_CONCURRENT_REQUESTS,
+        )
+
+    @property
+    def session(self) -> requests.Session:
+        # Sockets must not be shared between forked workers, so the session
+        # is (re)created the first time it is used in each process.
+        pid = os.getpid()
+
+        if self._session is None or self._session_pid != pid:
+            self._session = self._build_session()
+            self._session_pid = pid
+
+        return self._session
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        # Threads do not survive a fork either
+        pid = os.getpid()
+
+        if self._executor is None or self._executor_pid != pid:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrent_requests,
+                thread_name_prefix="pretix",
+            )
+            self._executor_pid = pid
+
+        return self._executor
+
+    def run_concurrently(self, *calls: Callable[[], Any]) -> list[Any]:
+        """Runs independent pretix calls in parallel on the shared pool and
+        returns their results in the same order. The first exception raised
+        by any of the calls is re-raised.
+        """
+        if len(calls) <= 1:
+            return [call() for call in calls]
+
+        futures = [self.executor.submit(call) for call in calls]
+        return [future.result() for future in futures]
+
+    def _build_session(self) -> requests.Session:
+        retry = Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=0,
+            status=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            backoff_jitter=self.backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            max_retries=retry,
+            pool_connections=1,
+            pool_maxsize=self.pool_maxsize,
+        )
+
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> requests.Response:
+        kwargs.setdefault("timeout", (self.connect_timeout, self.read_timeout))
+
+        headers = {"Authorization": f"Token {settings.PRETIX_API_TOKEN}"}
+        headers.update(kwargs.pop("headers", None) or {})
+
+        endpoint = get_endpoint_name(url)
+        method = method.upper()
+
+        with sentry_sdk.start_span(
+            op="http.client.pretix", name=f"{method} {endpoint}"
+        ) as span:
+            start = time.perf_counter()
+            response = self.session.request(
+                method, url, params=params or {}, headers=headers, **kwargs
+            )
+            duration = time.perf_counter() - start
+
+            span.set_data("http.response.status_code", response.status_code)
+            span.set_data("duration_ms", round(duration * 1000, 2))
+
+        logger.debug(
+            "pretix %s %s responded %s in %.3fs",
+            method,
+            endpoint,
+            response.status_code,
+            duration,
+        )
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("get", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("post", url, **kwargs)
+
+
+def get_endpoint_name(url: str) -> str:
+    """Returns the pretix endpoint of `url` without the organizer/event prefix
+    or any numeric id, so that latencies can be grouped per endpoint.
+    """
+    path = urlparse(url).path
+    api_path = urlparse(settings.PRETIX_API or "").path
+
+    if api_path and path.startswith(api_path):
+        path = path[len(api_path) :]
+
+    parts = [part for part in path.split("/") if part]
+
+    if len(parts) >= 4 and parts[0] == "organizers" and parts[2] == "events":
+        parts = parts[4:]
+
+    return "/".join(":id" if part.isdigit() else part for part in parts) or "/"
+
+
+_client = None
+
+
+def get_client() -> PretixClient:
+    global _client
+
+    if _client is None:
+        _client = PretixClient.from_settings()
+
+    return _client
@@ -0,0 +1,16 @@
+from conferences.models.conference import Conference
+from pycon.celery import app
+
+
+@app.task
+def refresh_pretix_cache(*, conference_id: int, name: str):
+    # Importing the module registers all the cached pretix fetchers
+    import pretix  # noqa: F401
+    from pretix.cache import refresh, release_refresh_lock
+
+    conference = Conference.objects.get(id=conference_id)
+
+    try:
+        refresh(conference, name)
+    finally:
+        release_refresh_lock(conference, name)
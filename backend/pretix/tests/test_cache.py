@@ -0,0 +1,117 @@
+import pytest
+import time_machine
+from django.core.cache import cache
+
+from conferences.tests.factories import ConferenceFactory
+from pretix import get_categories, get_quotas
+from pretix.cache import get_cache_key, invalidate_pretix_cache
+
+pytestmark = pytest.mark.django_db
+
+CATEGORIES_URL = "https://pretix/api/organizers/base-pretix-organizer-id/events/base-pretix-event-id/categories/"
+QUOTAS_URL = "https://pretix/api/organizers/base-pretix-organizer-id/events/base-pretix-event-id/quotas/"
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    settings.PRETIX_API = "https://pretix/api/"
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_fresh_value_is_served_from_cache(locmem_cache, requests_mock):
+    conference = ConferenceFactory()
+    mock = requests_mock.get(CATEGORIES_URL, json={"results": [{"id": 1}]})
+
+    assert get_categories(conference) == {"1": {"id": 1}}
+    assert get_categories(conference) == {"1": {"id": 1}}
+
+    assert mock.call_count == 1
+
+
+def test_stale_value_is_served_and_refreshed_once(locmem_cache, requests_mock):
+    conference = ConferenceFactory()
+    mock = requests_mock.get(
+        QUOTAS_URL,
+        [
+            {"json": {"results": [{"id": 1, "available_number": 10}]}},
+            {"json": {"results": [{"id": 1, "available_number": 5}]}},
+        ],
+    )
+
+    with time_machine.travel("2024-01-01 10:00:00Z", tick=False):
+        get_quotas(conference)
+
+    with time_machine.travel("2024-01-01 10:01:00Z", tick=False):
+        # The stale value is returned while the refresh task
+        # (eager in tests) stores the new one
+        assert get_quotas(conference)["1"]["available_number"] == 10
+        assert get_quotas(conference)["1"]["available_number"] == 5
+
+    assert mock.call_count == 2
+
+
+def test_refresh_is_single_flight(locmem_cache, requests_mock, mocker):
+    conference = ConferenceFactory()
+    requests_mock.get(QUOTAS_URL, json={"results": [{"id": 1}]})
+    refresh_task = mocker.patch("pretix.tasks.refresh_pretix_cache.delay")
+
+    with time_machine.travel("2024-01-01 10:00:00Z", tick=False):
+        get_quotas(conference)
+
+    with time_machine.travel("2024-01-01 10:01:00Z", tick=False):
+        get_quotas(conference)
+        get_quotas(conference)
+        get_quotas(conference)
+
+    refresh_task.assert_called_once_with(conference_id=conference.id, name="quotas")
+
+
+def test_expired_value_is_fetched_again(locmem_cache, requests_mock):
+    conference = ConferenceFactory()
+    mock = requests_mock.get(QUOTAS_URL, json={"results": [{"id": 1}]})
+
+    with time_machine.travel("2024-01-01 10:00:00Z", tick=False):
+        get_quotas(conference)
+
+    with time_machine.travel("2024-01-01 11:00:00Z", tick=False):
+        get_quotas(conference)
+
+    assert mock.call_count == 2
+
+
+def test_invalidate_pretix_cache(locmem_cache, requests_mock, mocker):
+    conference = ConferenceFactory()
+    mock = requests_mock.get(QUOTAS_URL, json={"results": [{"id": 1}]})
+    refresh_task = mocker.patch("pretix.tasks.refresh_pretix_cache.delay")
+
+    get_quotas(conference)
+    invalidate_pretix_cache(
+        conference.pretix_organizer_id, conference.pretix_event_id, "quotas"
+    )
+
+    # The stale value is still served, pretix is called once in the background
+    assert get_quotas(conference) == {"1": {"id": 1}}
+    assert get_quotas(conference) == {"1": {"id": 1}}
+
+    assert mock.call_count == 1
+    refresh_task.assert_called_once_with(conference_id=conference.id, name="quotas")
+
+
+def test_invalidate_pretix_cache_without_cached_value(locmem_cache):
+    conference = ConferenceFactory()
+
+    invalidate_pretix_cache(conference.pretix_organizer_id, conference.pretix_event_id)
+
+    assert (
+        cache.get(
+            get_cache_key(
+                conference.pretix_organizer_id, conference.pretix_event_id, "quotas"
+            )
+        )
+        is None
+    )
@@ -0,0 +1,122 @@
+import threading
+
+import pytest
+
+from pretix.client import PretixClient, get_client, get_endpoint_name
+
+
+def _client():
+    return PretixClient(
+        connect_timeout=1,
+        read_timeout=5,
+        max_retries=2,
+        backoff_factor=0.1,
+        pool_maxsize=4,
+        max_concurrent_requests=4,
+    )
+
+
+def test_request_sends_token_and_timeout(settings, requests_mock):
+    settings.PRETIX_API_TOKEN = "token"
+    client = _client()
+
+    requests_mock.get("https://pretix/api/organizers/org/events/ev/items/", json={})
+
+    response = client.request(
+        "get",
+        "https://pretix/api/organizers/org/events/ev/items/",
+        params={"active": "true"},
+    )
+
+    assert response.status_code == 200
+    assert requests_mock.last_request.headers["Authorization"] == "Token token"
+    assert requests_mock.last_request.timeout == (1, 5)
+    assert requests_mock.last_request.qs == {"active": ["true"]}
+
+
+def test_session_is_reused_between_requests(requests_mock):
+    client = _client()
+
+    requests_mock.get("https://pretix/api/organizers/org/events/ev/items/", json={})
+
+    client.get("https://pretix/api/organizers/org/events/ev/items/")
+    session = client.session
+    client.get("https://pretix/api/organizers/org/events/ev/items/")
+
+    assert client.session is session
+
+
+def test_session_is_recreated_after_fork(mocker):
+    client = _client()
+
+    mocker.patch("pretix.client.os.getpid", return_value=1)
+    first_session = client.session
+
+    mocker.patch("pretix.client.os.getpid", return_value=2)
+
+    assert client.session is not first_session
+
+
+def test_session_retries_idempotent_requests_on_server_errors():
+    client = _client()
+
+    retry = client.session.get_adapter("https://pretix/").max_retries
+
+    assert retry.total == 2
+    assert 429 in retry.status_forcelist
+    assert 503 in retry.status_forcelist
+    assert retry.is_retry("GET", 503)
+    assert not retry.is_retry("POST", 503)
+    assert not retry.is_retry("GET", 404)
+
+
+def test_run_concurrently_runs_calls_in_parallel():
+    client = _client()
+    barrier = threading.Barrier(3, timeout=5)
+
+    def call(value):
+        # Blocks until all three calls are running at the same time
+        barrier.wait()
+        return value
+
+    results = client.run_concurrently(lambda: call(1), lambda: call(2), lambda: call(3))
+
+    assert results == [1, 2, 3]
+
+
+def test_run_concurrently_reraises_errors():
+    client = _client()
+
+    def fail():
+        raise ValueError("pretix is down")
+
+    with pytest.raises(ValueError, match="pretix is down"):
+        client.run_concurrently(lambda: 1, fail)
+
+
+def test_get_client_uses_settings(settings, mocker):
+    mocker.patch("pretix.client._client", None)
+    settings.PRETIX_READ_TIMEOUT = 42
+
+    client = get_client()
+
+    assert client.read_timeout == 42
+    assert get_client() is client
+
+
+def test_get_endpoint_name(settings):
+    settings.PRETIX_API = "https://pretix/api/"
+
+    assert (
+        get_endpoint_name("https://pretix/api/organizers/org/events/ev/items/")
+        == "items"
+    )
+    assert (
+        get_endpoint_name(
+            "https://pretix/api/organizers/org/events/ev/orderpositions/123/"
+        )
+        == "orderpositions/:id"
+    )
+    assert get_endpoint_name("https://pretix/api/orders/ABC/update/") == (
+        "orders/ABC/update"
+    )
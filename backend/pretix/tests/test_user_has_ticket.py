@@ -2,6 +2,10 @@ from conferences.tests.factories import ConferenceFactory
 from pytest import mark
 
 from pretix import user_has_admission_ticket
+from pretix_mirror.tests.factories import (
+    PretixOrderPositionFactory,
+    PretixSyncStateFactory,
+)
 
 pytestmark = mark.django_db
 
@@ -34,3 +38,46 @@ def test_user_has_admission_ticket(settings, has_ticket, requests_mock):
             }
         ],
     }
+
+
+def test_user_has_admission_ticket_uses_local_mirror(requests_mock):
+    position = PretixOrderPositionFactory(attendee_email="nina@fake-work-email.ca")
+    PretixSyncStateFactory(conference=position.conference)
+    conference = position.conference
+
+    assert user_has_admission_ticket(
+        email="nina@fake-work-email.ca",
+        event_organizer=conference.pretix_organizer_id,
+        event_slug=conference.pretix_event_id,
+    )
+    assert not user_has_admission_ticket(
+        email="other@fake-work-email.ca",
+        event_organizer=conference.pretix_organizer_id,
+        event_slug=conference.pretix_event_id,
+    )
+    assert not requests_mock.called
+
+
+def test_user_has_admission_ticket_falls_back_to_pretix_for_events_not_mirrored(
+    settings, requests_mock
+):
+    settings.PRETIX_API = "http://localhost:9090/"
+    conference = PretixSyncStateFactory().conference
+    other_conference = ConferenceFactory(pretix_event_id="other-event")
+
+    requests_mock.post(
+        f"{settings.PRETIX_API}organizers/{conference.pretix_organizer_id}/events/{conference.pretix_event_id}/tickets/attendee-has-ticket/",
+        json={"user_has_admission_ticket": True},
+    )
+
+    assert user_has_admission_ticket(
+        email="nina@fake-work-email.ca",
+        event_organizer=conference.pretix_organizer_id,
+        event_slug=conference.pretix_event_id,
+        additional_events=[
+            {
+                "organizer_slug": other_conference.pretix_organizer_id,
+                "event_slug": other_conference.pretix_event_id,
+            }
+        ],
+    )
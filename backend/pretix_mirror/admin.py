@@ -0,0 +1,26 @@
+from django.contrib import admin
+
+from pretix_mirror.models import PretixOrder, PretixOrderPosition, PretixSyncState
+
+
+class PretixOrderPositionInline(admin.TabularInline):
+    model = PretixOrderPosition
+    fields = ("pretix_id", "item_id", "attendee_email", "is_admission", "canceled")
+    readonly_fields = fields
+    can_delete = False
+    extra = 0
+
+
+@admin.register(PretixOrder)
+class PretixOrderAdmin(admin.ModelAdmin):
+    list_display = ("code", "email", "status", "conference", "pretix_last_modified")
+    list_filter = ("conference", "status")
+    search_fields = ("code", "email", "positions__attendee_email")
+    readonly_fields = ("conference", "code", "email", "status", "pretix_last_modified")
+    exclude = ("data",)
+    inlines = [PretixOrderPositionInline]
+
+
+@admin.register(PretixSyncState)
+class PretixSyncStateAdmin(admin.ModelAdmin):
+    list_display = ("conference", "orders_modified_since", "last_synced_at")
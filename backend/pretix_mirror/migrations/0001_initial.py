@@ -0,0 +1,83 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:33
+
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('conferences', '0058_conference_hostname'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PretixOrder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('code', models.CharField(max_length=16, verbose_name='code')),
+                ('email', models.EmailField(blank=True, default='', max_length=254, verbose_name='email')),
+                ('status', models.CharField(choices=[('n', 'Pending'), ('p', 'Paid'), ('e', 'Expired'), ('c', 'Canceled')], max_length=1, verbose_name='status')),
+                ('pretix_last_modified', models.DateTimeField(verbose_name='pretix last modified')),
+                ('data', models.JSONField(default=dict, verbose_name='data')),
+                ('conference', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pretix_orders', to='conferences.conference', verbose_name='conference')),
+            ],
+            options={
+                'verbose_name': 'Pretix order',
+                'verbose_name_plural': 'Pretix orders',
+            },
+        ),
+        migrations.CreateModel(
+            name='PretixOrderPosition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pretix_id', models.IntegerField(verbose_name='pretix id')),
+                ('item_id', models.IntegerField(verbose_name='item id')),
+                ('is_admission', models.BooleanField(default=False, verbose_name='is admission')),
+                ('canceled', models.BooleanField(default=False, verbose_name='canceled')),
+                ('attendee_email', models.EmailField(blank=True, default='', max_length=254, verbose_name='attendee email')),
+                ('data', models.JSONField(default=dict, verbose_name='data')),
+                ('conference', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='conferences.conference', verbose_name='conference')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='positions', to='pretix_mirror.pretixorder', verbose_name='order')),
+            ],
+            options={
+                'verbose_name': 'Pretix order position',
+                'verbose_name_plural': 'Pretix order positions',
+            },
+        ),
+        migrations.CreateModel(
+            name='PretixSyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('orders_modified_since', models.DateTimeField(blank=True, null=True, verbose_name='orders modified since')),
+                ('last_synced_at', models.DateTimeField(blank=True, null=True, verbose_name='last synced at')),
+                ('conference', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='pretix_sync_state', to='conferences.conference', verbose_name='conference')),
+            ],
+            options={
+                'verbose_name': 'Pretix sync state',
+                'verbose_name_plural': 'Pretix sync states',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='pretixorder',
+            index=models.Index(fields=['conference', 'email'], name='pretix_mirr_confere_7cea52_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='pretixorder',
+            constraint=models.UniqueConstraint(fields=('conference', 'code'), name='unique_pretix_order'),
+        ),
+        migrations.AddIndex(
+            model_name='pretixorderposition',
+            index=models.Index(fields=['conference', 'attendee_email'], name='pretix_mirr_confere_d23b7f_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='pretixorderposition',
+            constraint=models.UniqueConstraint(fields=('conference', 'pretix_id'), name='unique_pretix_order_position'),
+        ),
+    ]
@@ -0,0 +1,123 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from model_utils.models import TimeStampedModel
+
+from conferences.querysets import ConferenceQuerySetMixin
+
+
+class PretixOrderQuerySet(ConferenceQuerySetMixin, models.QuerySet):
+    def of_email(self, email: str):
+        return self.filter(email=email.lower())
+
+
+class PretixOrderPositionQuerySet(ConferenceQuerySetMixin, models.QuerySet):
+    def of_attendee(self, email: str):
+        return self.filter(attendee_email=email.lower())
+
+    def valid_admissions(self):
+        return self.filter(
+            is_admission=True,
+            canceled=False,
+            order__status__in=VALID_ORDER_STATUSES,
+        )
+
+
+class PretixOrder(TimeStampedModel):
+    """Local copy of a pretix order, kept in sync by `pretix_mirror.sync`."""
+
+    class Status(models.TextChoices):
+        PENDING = "n", _("Pending")
+        PAID = "p", _("Paid")
+        EXPIRED = "e", _("Expired")
+        CANCELED = "c", _("Canceled")
+
+    conference = models.ForeignKey(
+        "conferences.Conference",
+        on_delete=models.CASCADE,
+        verbose_name=_("conference"),
+        related_name="pretix_orders",
+    )
+    code = models.CharField(_("code"), max_length=16)
+    email = models.EmailField(_("email"), blank=True, default="")
+    status = models.CharField(_("status"), max_length=1, choices=Status.choices)
+    pretix_last_modified = models.DateTimeField(_("pretix last modified"))
+    data = models.JSONField(_("data"), default=dict)
+
+    objects = PretixOrderQuerySet().as_manager()
+
+    def __str__(self):
+        return f"{self.code} ({self.conference.code})"
+
+    class Meta:
+        verbose_name = _("Pretix order")
+        verbose_name_plural = _("Pretix orders")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["conference", "code"], name="unique_pretix_order"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["conference", "email"]),
+        ]
+
+
+# Only the orders in these statuses give a ticket to their attendees
+VALID_ORDER_STATUSES = (PretixOrder.Status.PAID,)
+
+
+class PretixOrderPosition(models.Model):
+    conference = models.ForeignKey(
+        "conferences.Conference",
+        on_delete=models.CASCADE,
+        verbose_name=_("conference"),
+        related_name="+",
+    )
+    order = models.ForeignKey(
+        PretixOrder,
+        on_delete=models.CASCADE,
+        verbose_name=_("order"),
+        related_name="positions",
+    )
+    pretix_id = models.IntegerField(_("pretix id"))
+    item_id = models.IntegerField(_("item id"))
+    is_admission = models.BooleanField(_("is admission"), default=False)
+    canceled = models.BooleanField(_("canceled"), default=False)
+    attendee_email = models.EmailField(_("attendee email"), blank=True, default="")
+    data = models.JSONField(_("data"), default=dict)
+
+    objects = PretixOrderPositionQuerySet().as_manager()
+
+    def __str__(self):
+        return f"{self.order.code}-{self.pretix_id}"
+
+    class Meta:
+        verbose_name = _("Pretix order position")
+        verbose_name_plural = _("Pretix order positions")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["conference", "pretix_id"], name="unique_pretix_order_position"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["conference", "attendee_email"]),
+        ]
+
+
+class PretixSyncState(models.Model):
+    conference = models.OneToOneField(
+        "conferences.Conference",
+        on_delete=models.CASCADE,
+        verbose_name=_("conference"),
+        related_name="pretix_sync_state",
+    )
+    orders_modified_since = models.DateTimeField(
+        _("orders modified since"), null=True, blank=True
+    )
+    last_synced_at = models.DateTimeField(_("last synced at"), null=True, blank=True)
+
+    def __str__(self):
+        return f"Pretix sync state for {self.conference.code}"
+
+    class Meta:
+        verbose_name = _("Pretix sync state")
+        verbose_name_plural = _("Pretix sync states")
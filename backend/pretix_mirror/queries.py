@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from conferences.models import Conference
+from pretix_mirror.models import PretixOrder, PretixOrderPosition
+
+
+def get_mirrored_conferences(events: list[dict]) -> tuple[list[Conference], bool]:
+    """Returns the conferences matching the pretix `events` whose local mirror
+    is up to date, and whether all the `events` are covered by them.
+    """
+    filters = Q()
+    for event in events:
+        filters |= Q(
+            pretix_organizer_id=event["organizer_slug"],
+            pretix_event_id=event["event_slug"],
+        )
+
+    fresh_after = timezone.now() - timedelta(seconds=settings.PRETIX_MIRROR_MAX_AGE)
+    conferences = list(
+        Conference.objects.filter(
+            filters, pretix_sync_state__last_synced_at__gte=fresh_after
+        )
+    )
+    mirrored_events = {
+        (conference.pretix_organizer_id, conference.pretix_event_id)
+        for conference in conferences
+    }
+    all_mirrored = all(
+        (event["organizer_slug"], event["event_slug"]) in mirrored_events
+        for event in events
+    )
+    return conferences, all_mirrored
+
+
+def is_mirrored(conference: Conference) -> bool:
+    _, all_mirrored = get_mirrored_conferences(
+        [
+            {
+                "organizer_slug": conference.pretix_organizer_id,
+                "event_slug": conference.pretix_event_id,
+            }
+        ]
+    )
+    return all_mirrored
+
+
+def has_admission_ticket(conferences: list[Conference], email: str) -> bool:
+    return (
+        PretixOrderPosition.objects.filter(conference__in=conferences)
+        .of_attendee(email)
+        .valid_admissions()
+        .exists()
+    )
+
+
+def get_admission_position(conference: Conference, email: str) -> dict | None:
+    position = (
+        PretixOrderPosition.objects.for_conference(conference)
+        .of_attendee(email)
+        .valid_admissions()
+        .order_by("pretix_id")
+        .only("data")
+        .first()
+    )
+    return position.data if position else None
+
+
+def _without_canceled_positions(order_data: dict) -> dict:
+    if "positions" not in order_data:
+        return order_data
+
+    return {
+        **order_data,
+        "positions": [
+            position
+            for position in order_data["positions"]
+            if not position.get("canceled")
+        ],
+    }
+
+
+def get_user_orders(conference: Conference, email: str) -> dict:
+    """Same shape as the pretix `orders` list endpoint, which leaves out
+    the canceled positions."""
+    orders = [
+        _without_canceled_positions(order.data)
+        for order in PretixOrder.objects.for_conference(conference)
+        .of_email(email)
+        .order_by("pretix_last_modified")
+        .only("data")
+    ]
+    return {"count": len(orders), "next": None, "previous": None, "results": orders}
+
+
+def get_order_emails(conference: Conference, code: str) -> set[str]:
+    """The email of the order and of its attendees."""
+    order = (
+        PretixOrder.objects.for_conference(conference)
+        .filter(code=code)
+        .prefetch_related("positions")
+        .first()
+    )
+
+    if not order:
+        return set()
+
+    emails = {order.email}
+    emails.update(position.attendee_email for position in order.positions.all())
+    emails.discard("")
+    return emails
@@ -0,0 +1,93 @@
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+import pretix
+from conferences.models import Conference
+from pretix_mirror.models import PretixOrder, PretixOrderPosition, PretixSyncState
+
+logger = logging.getLogger(__file__)
+
+# Both sync paths store the same order data, the queries hide the canceled
+# positions where the live API would not return them
+ORDER_SYNC_PARAMS = {"include_canceled_positions": "true"}
+
+
+def store_order(conference: Conference, data: dict, items: dict) -> PretixOrder:
+    with transaction.atomic():
+        order, _ = PretixOrder.objects.update_or_create(
+            conference=conference,
+            code=data["code"],
+            defaults={
+                "email": (data.get("email") or "").lower(),
+                "status": data["status"],
+                "pretix_last_modified": parse_datetime(data["last_modified"]),
+                "data": data,
+            },
+        )
+
+        position_ids = []
+
+        for position in data["positions"]:
+            item = items.get(str(position["item"]))
+            PretixOrderPosition.objects.update_or_create(
+                conference=conference,
+                pretix_id=position["id"],
+                defaults={
+                    "order": order,
+                    "item_id": position["item"],
+                    "is_admission": bool(item and item["admission"]),
+                    "canceled": position.get("canceled", False),
+                    "attendee_email": (position.get("attendee_email") or "").lower(),
+                    "data": position,
+                },
+            )
+            position_ids.append(position["id"])
+
+        order.positions.exclude(pretix_id__in=position_ids).delete()
+
+    return order
+
+
+def sync_order(conference: Conference, code: str) -> PretixOrder | None:
+    data = pretix.get_order(conference, code, ORDER_SYNC_PARAMS)
+
+    if not data:
+        PretixOrder.objects.filter(conference=conference, code=code).delete()
+        return None
+
+    return store_order(conference, data, pretix.get_items(conference))
+
+
+def sync_conference_orders(conference: Conference) -> int:
+    """Stores every order modified since the last run and moves the cursor
+    forward. Returns the number of orders synced.
+    """
+    state, _ = PretixSyncState.objects.get_or_create(conference=conference)
+    started_at = timezone.now()
+
+    params = {**ORDER_SYNC_PARAMS}
+
+    if state.orders_modified_since:
+        params["modified_since"] = state.orders_modified_since.isoformat()
+
+    items = pretix.get_items(conference)
+    latest_modified = state.orders_modified_since
+    synced = 0
+
+    for data in pretix.get_orders(conference, params):
+        store_order(conference, data, items)
+        synced += 1
+
+        last_modified = parse_datetime(data["last_modified"])
+        if latest_modified is None or last_modified > latest_modified:
+            latest_modified = last_modified
+
+    state.orders_modified_since = latest_modified
+    state.last_synced_at = started_at
+    state.save(update_fields=["orders_modified_since", "last_synced_at"])
+
+    logger.info("Synced %s pretix orders for conference_id=%s", synced, conference.id)
+    return synced
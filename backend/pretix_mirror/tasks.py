@@ -0,0 +1,53 @@
+import logging
+from datetime import timedelta
+
+from django.utils import timezone
+
+from conferences.models import Conference
+from pretix_mirror.queries import get_order_emails
+from pretix_mirror.sync import sync_conference_orders, sync_order
+from pycon.celery import app
+from pycon.celery_utils import OnlyOneAtTimeTask
+from voting.eligibility import invalidate_voting_eligibility_of_emails
+
+logger = logging.getLogger(__file__)
+
+
+@app.task(base=OnlyOneAtTimeTask)
+def sync_pretix_orders():
+    # Keep syncing for a while after the conference, refunds and
+    # badge printing still rely on the mirror
+    conferences = (
+        Conference.objects.exclude(pretix_organizer_id="")
+        .exclude(pretix_event_id="")
+        .filter(end__gte=timezone.now() - timedelta(days=30))
+    )
+
+    for conference in conferences:
+        sync_conference_pretix_orders.delay(conference_id=conference.id)
+
+
+@app.task(base=OnlyOneAtTimeTask)
+def sync_conference_pretix_orders(*, conference_id: int):
+    conference = Conference.objects.get(id=conference_id)
+    sync_conference_orders(conference)
+
+
+@app.task
+def sync_pretix_order(*, organizer: str, event: str, code: str):
+    conferences = Conference.objects.filter(
+        pretix_organizer_id=organizer,
+        pretix_event_id=event,
+    )
+
+    emails = set()
+
+    for conference in conferences:
+        logger.info("Syncing pretix order %s of conference_id=%s", code, conference.id)
+        # Both the people in the order before and after the change might
+        # have gained or lost a ticket
+        emails.update(get_order_emails(conference, code))
+        sync_order(conference, code)
+        emails.update(get_order_emails(conference, code))
+
+    invalidate_voting_eligibility_of_emails(emails)
@@ -0,0 +1,45 @@
+import factory
+from django.utils import timezone
+from factory.django import DjangoModelFactory
+
+from conferences.tests.factories import ConferenceFactory
+from pretix_mirror.models import PretixOrder, PretixOrderPosition, PretixSyncState
+
+
+class PretixOrderFactory(DjangoModelFactory):
+    conference = factory.SubFactory(ConferenceFactory)
+    code = factory.Sequence(lambda n: f"ORD{n}")
+    email = factory.Faker("email")
+    status = PretixOrder.Status.PAID
+    pretix_last_modified = factory.LazyFunction(timezone.now)
+
+    class Meta:
+        model = PretixOrder
+
+
+class PretixOrderPositionFactory(DjangoModelFactory):
+    conference = factory.SelfAttribute("order.conference")
+    order = factory.SubFactory(PretixOrderFactory)
+    pretix_id = factory.Sequence(lambda n: n + 1)
+    item_id = 1
+    is_admission = True
+    attendee_email = factory.Faker("email")
+    data = factory.LazyAttribute(
+        lambda position: {
+            "id": position.pretix_id,
+            "item": position.item_id,
+            "attendee_email": position.attendee_email,
+            "voucher": None,
+        }
+    )
+
+    class Meta:
+        model = PretixOrderPosition
+
+
+class PretixSyncStateFactory(DjangoModelFactory):
+    conference = factory.SubFactory(ConferenceFactory)
+    last_synced_at = factory.LazyFunction(timezone.now)
+
+    class Meta:
+        model = PretixSyncState
@@ -0,0 +1,139 @@
+import pytest
+import time_machine
+
+from conferences.tests.factories import ConferenceFactory
+from pretix_mirror.models import PretixOrder
+from pretix_mirror.queries import (
+    get_admission_position,
+    get_mirrored_conferences,
+    get_order_emails,
+    get_user_orders,
+    has_admission_ticket,
+)
+from pretix_mirror.tests.factories import (
+    PretixOrderFactory,
+    PretixOrderPositionFactory,
+    PretixSyncStateFactory,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def _event(conference):
+    return {
+        "organizer_slug": conference.pretix_organizer_id,
+        "event_slug": conference.pretix_event_id,
+    }
+
+
+def test_get_mirrored_conferences():
+    synced = PretixSyncStateFactory(conference__pretix_event_id="synced").conference
+    not_synced = ConferenceFactory(pretix_event_id="not-synced")
+
+    conferences, all_mirrored = get_mirrored_conferences(
+        [_event(synced), _event(not_synced)]
+    )
+
+    assert conferences == [synced]
+    assert not all_mirrored
+
+    conferences, all_mirrored = get_mirrored_conferences([_event(synced)])
+
+    assert conferences == [synced]
+    assert all_mirrored
+
+
+def test_stale_mirror_is_not_used(settings):
+    settings.PRETIX_MIRROR_MAX_AGE = 60
+
+    with time_machine.travel("2024-01-01 10:00:00Z", tick=False):
+        conference = PretixSyncStateFactory().conference
+
+    with time_machine.travel("2024-01-01 10:05:00Z", tick=False):
+        conferences, all_mirrored = get_mirrored_conferences([_event(conference)])
+
+    assert conferences == []
+    assert not all_mirrored
+
+
+@pytest.mark.parametrize(
+    "status,is_admission,canceled,expected",
+    [
+        (PretixOrder.Status.PAID, True, False, True),
+        (PretixOrder.Status.PENDING, True, False, False),
+        (PretixOrder.Status.PAID, False, False, False),
+        (PretixOrder.Status.PAID, True, True, False),
+    ],
+)
+def test_has_admission_ticket(status, is_admission, canceled, expected):
+    position = PretixOrderPositionFactory(
+        order__status=status,
+        is_admission=is_admission,
+        canceled=canceled,
+        attendee_email="attendee@example.org",
+    )
+
+    assert (
+        has_admission_ticket([position.conference], "Attendee@Example.org") is expected
+    )
+
+
+def test_get_admission_position():
+    position = PretixOrderPositionFactory(attendee_email="attendee@example.org")
+    PretixOrderPositionFactory(
+        order=position.order, is_admission=False, attendee_email="attendee@example.org"
+    )
+
+    assert get_admission_position(position.conference, "attendee@example.org") == (
+        position.data
+    )
+    assert get_admission_position(position.conference, "other@example.org") is None
+
+
+@pytest.mark.parametrize(
+    "status", [PretixOrder.Status.PENDING, PretixOrder.Status.EXPIRED]
+)
+def test_get_admission_position_ignores_unpaid_orders(status):
+    position = PretixOrderPositionFactory(
+        order__status=status, attendee_email="attendee@example.org"
+    )
+
+    assert get_admission_position(position.conference, "attendee@example.org") is None
+
+
+def test_get_user_orders():
+    order = PretixOrderFactory(email="buyer@example.org", data={"code": "AAA"})
+    PretixOrderFactory(conference=order.conference, email="other@example.org")
+
+    assert get_user_orders(order.conference, "Buyer@example.org") == {
+        "count": 1,
+        "next": None,
+        "previous": None,
+        "results": [{"code": "AAA"}],
+    }
+
+
+def test_get_user_orders_leaves_out_canceled_positions():
+    order = PretixOrderFactory(
+        email="buyer@example.org",
+        data={
+            "code": "AAA",
+            "positions": [{"id": 1, "canceled": False}, {"id": 2, "canceled": True}],
+        },
+    )
+
+    [order_data] = get_user_orders(order.conference, "buyer@example.org")["results"]
+
+    assert order_data["positions"] == [{"id": 1, "canceled": False}]
+
+
+def test_get_order_emails():
+    order = PretixOrderFactory(email="buyer@example.org")
+    PretixOrderPositionFactory(order=order, attendee_email="attendee@example.org")
+    PretixOrderPositionFactory(order=order, attendee_email="")
+
+    assert get_order_emails(order.conference, order.code) == {
+        "buyer@example.org",
+        "attendee@example.org",
+    }
+    assert get_order_emails(order.conference, "MISSING") == set()
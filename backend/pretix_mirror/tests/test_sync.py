@@ -0,0 +1,170 @@
+import datetime
+
+import pytest
+import time_machine
+
+from conferences.tests.factories import ConferenceFactory
+from pretix_mirror.models import PretixOrder, PretixOrderPosition, PretixSyncState
+from pretix_mirror.sync import sync_conference_orders, sync_order
+from pretix_mirror.tests.factories import PretixSyncStateFactory
+
+pytestmark = pytest.mark.django_db
+
+BASE_URL = (
+    "https://pretix/api/organizers/base-pretix-organizer-id/events/base-pretix-event-id"
+)
+
+ITEMS = {
+    "results": [
+        {"id": 1, "admission": True},
+        {"id": 2, "admission": False},
+    ]
+}
+
+
+def _order(
+    code, status="p", last_modified="2024-01-01T10:00:00Z", positions=None, first_id=10
+):
+    return {
+        "code": code,
+        "status": status,
+        "email": "Buyer@Example.org",
+        "last_modified": last_modified,
+        "positions": positions
+        if positions is not None
+        else [
+            {
+                "id": first_id,
+                "item": 1,
+                "attendee_email": "Attendee@Example.org",
+                "voucher": None,
+                "canceled": False,
+            },
+            {
+                "id": first_id + 1,
+                "item": 2,
+                "attendee_email": None,
+                "voucher": None,
+                "canceled": False,
+            },
+        ],
+    }
+
+
+@pytest.fixture(autouse=True)
+def pretix_api(settings):
+    settings.PRETIX_API = "https://pretix/api/"
+
+
+def test_sync_conference_orders(requests_mock):
+    conference = ConferenceFactory()
+    requests_mock.get(f"{BASE_URL}/items/", json=ITEMS)
+    orders_mock = requests_mock.get(
+        f"{BASE_URL}/orders/",
+        json={
+            "next": None,
+            "results": [
+                _order("AAA", last_modified="2024-01-01T10:00:00Z"),
+                _order(
+                    "BBB",
+                    status="n",
+                    last_modified="2024-01-02T10:00:00Z",
+                    first_id=20,
+                ),
+            ],
+        },
+    )
+
+    with time_machine.travel("2024-01-03 10:00:00Z", tick=False):
+        assert sync_conference_orders(conference) == 2
+
+    assert "modified_since" not in orders_mock.last_request.qs
+
+    order = PretixOrder.objects.get(conference=conference, code="AAA")
+    assert order.email == "buyer@example.org"
+    assert order.status == "p"
+
+    position = order.positions.get(pretix_id=10)
+    assert position.attendee_email == "attendee@example.org"
+    assert position.is_admission
+    assert not order.positions.get(pretix_id=11).is_admission
+
+    state = PretixSyncState.objects.get(conference=conference)
+    assert state.orders_modified_since == datetime.datetime(
+        2024, 1, 2, 10, 0, tzinfo=datetime.timezone.utc
+    )
+    assert state.last_synced_at == datetime.datetime(
+        2024, 1, 3, 10, 0, tzinfo=datetime.timezone.utc
+    )
+
+
+def test_sync_conference_orders_uses_cursor(requests_mock):
+    state = PretixSyncStateFactory(
+        orders_modified_since=datetime.datetime(
+            2024, 1, 2, 10, 0, tzinfo=datetime.timezone.utc
+        )
+    )
+    requests_mock.get(f"{BASE_URL}/items/", json=ITEMS)
+    orders_mock = requests_mock.get(
+        f"{BASE_URL}/orders/", json={"next": None, "results": []}
+    )
+
+    assert sync_conference_orders(state.conference) == 0
+
+    assert orders_mock.last_request.qs["modified_since"] == [
+        "2024-01-02t10:00:00+00:00"
+    ]
+    state.refresh_from_db()
+    assert state.orders_modified_since == datetime.datetime(
+        2024, 1, 2, 10, 0, tzinfo=datetime.timezone.utc
+    )
+
+
+def test_sync_order_updates_existing_order_and_removes_positions(requests_mock):
+    conference = ConferenceFactory()
+    requests_mock.get(f"{BASE_URL}/items/", json=ITEMS)
+    requests_mock.get(f"{BASE_URL}/orders/AAA/", json=_order("AAA", status="n"))
+
+    sync_order(conference, "AAA")
+
+    requests_mock.get(
+        f"{BASE_URL}/orders/AAA/",
+        json=_order(
+            "AAA",
+            positions=[
+                {
+                    "id": 10,
+                    "item": 1,
+                    "attendee_email": "attendee@example.org",
+                    "voucher": None,
+                    "canceled": True,
+                }
+            ],
+        ),
+    )
+
+    order = sync_order(conference, "AAA")
+
+    assert order.status == "p"
+    assert list(order.positions.values_list("pretix_id", "canceled")) == [(10, True)]
+    # Same data as the bulk sync
+    [order_request, *_] = [
+        request
+        for request in reversed(requests_mock.request_history)
+        if request.path.endswith("/orders/aaa/")
+    ]
+    assert order_request.qs["include_canceled_positions"] == ["true"]
+
+
+def test_sync_order_deletes_missing_orders(requests_mock):
+    conference = ConferenceFactory()
+    requests_mock.get(f"{BASE_URL}/items/", json=ITEMS)
+    requests_mock.get(f"{BASE_URL}/orders/AAA/", json=_order("AAA"))
+
+    sync_order(conference, "AAA")
+
+    requests_mock.get(f"{BASE_URL}/orders/AAA/", status_code=404)
+
+    assert sync_order(conference, "AAA") is None
+    assert not PretixOrder.objects.filter(code="AAA").exists()
+    assert not PretixOrderPosition.objects.exists()
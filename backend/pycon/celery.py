@@ -10,6 +10,8 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pycon.settings.prod")
 app = Celery("pycon")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
+# pretix is not a Django app, so its tasks are not found automatically
+app.autodiscover_tasks(["pretix"])
 
 
 @app.on_after_configure.connect
@@ -23,6 +25,9 @@ def setup_periodic_tasks(sender, **kwargs):
     )
     from schedule.tasks import process_schedule_items_videos_to_upload
     from files_upload.tasks import delete_unused_files
+    from google_api.tasks import release_expired_quota_reservations
+    from notifications.tasks import send_pending_emails
+    from pretix_mirror.tasks import sync_pretix_orders
     from pycon.tasks import (
         check_for_idle_heavy_processing_workers,
         check_pending_heavy_processing_work,
@@ -45,6 +50,16 @@ def setup_periodic_tasks(sender, **kwargs):
         delete_unused_files,
         name="Delete unused files",
     )
+    add(
+        timedelta(minutes=1),
+        send_pending_emails,
+        name="Send pending emails",
+    )
+    add(
+        timedelta(minutes=5),
+        sync_pretix_orders,
+        name="Sync pretix orders",
+    )
     add(
         timedelta(minutes=2),
         check_for_idle_heavy_processing_workers,
@@ -55,3 +70,8 @@ def setup_periodic_tasks(sender, **kwargs):
         check_pending_heavy_processing_work,
         name="Check pending heavy processing work",
     )
+    add(
+        timedelta(minutes=15),
+        release_expired_quota_reservations,
+        name="Release expired Google quota reservations",
+    )
@@ -120,6 +120,7 @@ INSTALLED_APPS = [
     "rest_framework",
     "integrations.apps.IntegrationsConfig",
     "healthchecks.apps.HealthchecksConfig",
+    "pretix_mirror.apps.PretixMirrorConfig",
     "files_upload.apps.FilesUploadConfig",
     "video_uploads.apps.VideoUploadsConfig",
     "organizers.apps.OrganizersConfig",
@@ -246,6 +247,15 @@ USE_X_FORWARDED_HOST = False
 
 PRETIX_API = env("PRETIX_API", default="")
 PRETIX_API_TOKEN = None
+PRETIX_CONNECT_TIMEOUT = env.float("PRETIX_CONNECT_TIMEOUT", default=3.05)
+PRETIX_READ_TIMEOUT = env.float("PRETIX_READ_TIMEOUT", default=20)
+PRETIX_MAX_RETRIES = env.int("PRETIX_MAX_RETRIES", default=3)
+PRETIX_RETRY_BACKOFF_FACTOR = env.float("PRETIX_RETRY_BACKOFF_FACTOR", default=0.3)
+PRETIX_POOL_MAXSIZE = env.int("PRETIX_POOL_MAXSIZE", default=10)
+PRETIX_MAX_CONCURRENT_REQUESTS = env.int("PRETIX_MAX_CONCURRENT_REQUESTS", default=8)
+# Seconds after the last successful sync in which the local copy of pretix
+# orders is trusted instead of asking pretix
+PRETIX_MIRROR_MAX_AGE = env.int("PRETIX_MIRROR_MAX_AGE", default=60 * 15)
 
 STORAGES = {
     "default": {
@@ -427,4 +437,7 @@ SNS_WEBHOOK_SECRET = env("SNS_WEBHOOK_SECRET", default="")
 USE_SES_V2 = True
 
 AWS_SES_CONFIGURATION_SET = env("AWS_SES_CONFIGURATION_SET", default="")
+# Recipients per second, keep in sync with the SES maximum send rate
+EMAIL_SEND_RATE = env.float("EMAIL_SEND_RATE", default=14)
+EMAIL_SEND_BATCH_SIZE = env.int("EMAIL_SEND_BATCH_SIZE", default=100)
 DEFAULT_FROM_EMAIL = "noreply@pycon.it"
@@ -3,10 +3,14 @@ from dataclasses import dataclass
 from files_upload.constants import get_max_upload_size_bytes
 import boto3
 from storages.backends.s3boto3 import S3Boto3Storage
+from storages.utils import clean_name
 from django.core.files.storage.memory import InMemoryStorage
 from django.core.files.storage import FileSystemStorage
 from django.urls import reverse
 
+# Max number of keys accepted by a single S3 DeleteObjects request
+S3_DELETE_OBJECTS_LIMIT = 1000
+
 
 @dataclass
 class UploadURL:
@@ -24,9 +28,46 @@ class UploadURL:
         return json.dumps(fields)
 
 
+class LocalDeleteManyMixin:
+    def delete_many(self, names: list[str]) -> list[str]:
+        """Deletes the files `names`, returning the ones that failed."""
+        for name in names:
+            self.delete(name)
+
+        return []
+
+
 class CustomS3Boto3Storage(S3Boto3Storage):
     is_remote = True
 
+    def delete_many(self, names: list[str]) -> list[str]:
+        """Deletes the files `names` with DeleteObjects, returning the ones
+        that failed."""
+        keys = {self._normalize_name(clean_name(name)): name for name in names}
+        key_list = list(keys)
+        failed = []
+
+        for start in range(0, len(key_list), S3_DELETE_OBJECTS_LIMIT):
+            batch = key_list[start : start + S3_DELETE_OBJECTS_LIMIT]
+            response = self.bucket.delete_objects(
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True}
+            )
+            failed.extend(keys[error["Key"]] for error in response.get("Errors", []))
+
+        return failed
+
+    def list_files(self, prefix: str) -> list[str]:
+        """Names of all the files under `prefix`, listed flat by key prefix
+        instead of one request per folder."""
+        key_prefix = self._normalize_name(clean_name(prefix))
+        location_prefix = f"{self.location}/" if self.location else ""
+
+        return [
+            obj.key.removeprefix(location_prefix)
+            for obj in self.bucket.objects.filter(Prefix=key_prefix)
+            if not obj.key.endswith("/")
+        ]
+
     def generate_upload_url(self, file_obj):
         file = file_obj.file
         bucket_name = self.bucket_name
@@ -71,7 +112,7 @@ class PrivateCustomS3Boto3Storage(CustomS3Boto3Storage):
         return params
 
 
-class CustomInMemoryStorage(InMemoryStorage):
+class CustomInMemoryStorage(LocalDeleteManyMixin, InMemoryStorage):
     is_remote = False
 
     def generate_upload_url(self, file_obj):
@@ -82,7 +123,7 @@ class CustomInMemoryStorage(InMemoryStorage):
         )
 
 
-class CustomFileSystemStorage(FileSystemStorage):
+class CustomFileSystemStorage(LocalDeleteManyMixin, FileSystemStorage):
     is_remote = False
 
     def generate_upload_url(self, file_obj):
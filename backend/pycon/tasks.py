@@ -52,13 +52,13 @@ def launch_heavy_processing_worker():
                 "name": "storage",
                 "managedEBSVolume": {
                     "encrypted": False,
-                    "sizeInGiB": 500,
+                    "sizeInGiB": 50,
                     "volumeType": "gp3",
                     "terminationPolicy": {"deleteOnTermination": True},
                     "filesystemType": "xfs",
                     "roleArn": settings.ECS_SERVICE_ROLE,
-                    "iops": 16_000,
-                    "throughput": 1_000,
+                    "iops": 3_000,
+                    "throughput": 125,
                 },
             }
         ],
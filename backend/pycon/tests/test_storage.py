@@ -51,3 +51,41 @@ def test_private_storage_removes_cache_control_params():
     storage = PrivateCustomS3Boto3Storage()
     params = storage.get_object_parameters("test.pdf")
     assert "CacheControl" not in params
+
+
+def test_s3_storage_delete_many_uses_delete_objects(mocker):
+    mocker.patch("pycon.storages.S3_DELETE_OBJECTS_LIMIT", 2)
+    bucket = mocker.patch.object(CustomS3Boto3Storage, "bucket")
+    bucket.delete_objects.side_effect = [
+        {"Errors": [{"Key": "files/b.txt", "Code": "AccessDenied"}]},
+        {},
+    ]
+
+    storage = CustomS3Boto3Storage()
+    failed = storage.delete_many(["files/a.txt", "files/b.txt", "files/c.txt"])
+
+    assert failed == ["files/b.txt"]
+    assert bucket.delete_objects.call_args_list == [
+        mock.call(
+            Delete={
+                "Objects": [{"Key": "files/a.txt"}, {"Key": "files/b.txt"}],
+                "Quiet": True,
+            }
+        ),
+        mock.call(Delete={"Objects": [{"Key": "files/c.txt"}], "Quiet": True}),
+    ]
+
+
+def test_s3_storage_list_files_is_flat(mocker):
+    bucket = mocker.patch.object(CustomS3Boto3Storage, "bucket")
+    bucket.objects.filter.return_value = [
+        mock.Mock(key="videos/conf/"),
+        mock.Mock(key="videos/conf/D1/1-talk.mp4"),
+        mock.Mock(key="videos/conf/D2/2-talk.mp4"),
+    ]
+
+    storage = CustomS3Boto3Storage()
+    files = storage.list_files("videos/conf/")
+
+    assert files == ["videos/conf/D1/1-talk.mp4", "videos/conf/D2/2-talk.mp4"]
+    bucket.objects.filter.assert_called_once_with(Prefix="videos/conf/")
@@ -33,6 +33,7 @@ urlpatterns = [
     path("", include("files_upload.urls")),
     path("", include("notifications.urls")),
     path("visa/", include("visa.urls")),
+    path("badges/", include("badges.urls")),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
 
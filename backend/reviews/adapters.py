@@ -30,6 +30,7 @@ from generic_forms.services import display_answers
 from grants.models import Grant, GrantReimbursement, GrantReimbursementCategory
 from participants.models import Participant
 from reviews.models import AvailableScoreOption, ReviewSession, UserReview
+from reviews.similarity_index import get_similar_submissions
 from submissions.models import Submission, SubmissionTag
 
 if TYPE_CHECKING:
@@ -303,6 +304,7 @@ class ProposalsReviewAdapter:
             seen=request.GET.get("seen", "").split(","),
             existing_comment=existing_comment,
             review_session_repr=str(review_session),
+            similar_proposals=get_similar_submissions(proposal),
             title=f"Proposal Review: {proposal.title.localize('en')}",
         )
 
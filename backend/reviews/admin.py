@@ -476,15 +476,20 @@ class ReviewSessionAdmin(ConferencePermissionMixin, admin.ModelAdmin):
 
         # Check for stale lock from a crashed/finished task
         existing_task_id = cache.get(computing_key)
+        stage = None
         if existing_task_id:
             from celery.result import AsyncResult
 
-            if AsyncResult(existing_task_id).state in (
+            existing_task = AsyncResult(existing_task_id)
+
+            if existing_task.state in (
                 "SUCCESS",
                 "FAILURE",
                 "REVOKED",
             ):
                 cache.delete(computing_key)
+            elif existing_task.state == "PROGRESS":
+                stage = existing_task.info.get("stage")
 
         if cache.add(computing_key, "pending", timeout=300):
             result = compute_recap_analysis.apply_async(
@@ -495,6 +500,8 @@ class ReviewSessionAdmin(ConferencePermissionMixin, admin.ModelAdmin):
             # Store task ID so subsequent requests can detect stale locks
             cache.set(computing_key, result.id, timeout=300)
             check_pending_heavy_processing_work.delay()
+        elif stage:
+            return JsonResponse({"status": "processing", "stage": stage})
 
         return JsonResponse({"status": "processing"})
 
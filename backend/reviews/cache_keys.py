@@ -13,6 +13,10 @@ def get_embedding_text(submission) -> str:
     return f"{title}. {elevator_pitch}. {abstract}"
 
 
+def get_content_hash(submission) -> str:
+    return hashlib.md5(get_embedding_text(submission).encode()).hexdigest()
+
+
 def get_cache_key(prefix: str, conference_id: int, submissions) -> str:
     """Generate a cache key based on conference and submission content."""
     content_hash = hashlib.md5()
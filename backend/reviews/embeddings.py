@@ -0,0 +1,111 @@
+import functools
+import logging
+
+import numpy as np
+from django.utils import timezone
+from sentence_transformers import SentenceTransformer
+
+from reviews.cache_keys import get_content_hash, get_embedding_text
+from reviews.models import EMBEDDING_MODEL_NAME, SubmissionEmbedding
+
+logger = logging.getLogger(__name__)
+
+
+@functools.cache
+def get_embedding_model():
+    """Get or create the shared embedding model instance."""
+    return SentenceTransformer(EMBEDDING_MODEL_NAME, token=False)
+
+
+def _load_embeddings(submissions) -> dict[int, SubmissionEmbedding]:
+    return {
+        embedding.submission_id: embedding
+        for embedding in SubmissionEmbedding.objects.filter(
+            submission_id__in=[s.id for s in submissions],
+            model_name=EMBEDDING_MODEL_NAME,
+        )
+    }
+
+
+def _is_up_to_date(embedding: SubmissionEmbedding | None, content_hash: str) -> bool:
+    return embedding is not None and embedding.content_hash == content_hash
+
+
+def update_submission_embeddings(submissions) -> dict[int, np.ndarray]:
+    """
+    Encode and store the embeddings of new or changed submissions.
+
+    Args:
+        submissions: A list of Submission objects
+
+    Returns:
+        A dictionary mapping every submission ID to its embedding
+    """
+    submissions = list(submissions)
+    stored = _load_embeddings(submissions)
+
+    vectors = {}
+    to_encode = []
+
+    for submission in submissions:
+        content_hash = get_content_hash(submission)
+        embedding = stored.get(submission.id)
+
+        if _is_up_to_date(embedding, content_hash):
+            vectors[submission.id] = np.frombuffer(embedding.vector, dtype=np.float32)
+        else:
+            to_encode.append((submission, content_hash, embedding))
+
+    if not to_encode:
+        return vectors
+
+    logger.info("Encoding %s new or changed submissions", len(to_encode))
+
+    encoded = get_embedding_model().encode(
+        [get_embedding_text(submission) for submission, _, _ in to_encode]
+    )
+
+    to_create = []
+    to_update = []
+
+    for (submission, content_hash, embedding), vector in zip(to_encode, encoded):
+        vector = np.asarray(vector, dtype=np.float32)
+        vectors[submission.id] = vector
+
+        if embedding is None:
+            to_create.append(
+                SubmissionEmbedding(
+                    submission_id=submission.id,
+                    content_hash=content_hash,
+                    model_name=EMBEDDING_MODEL_NAME,
+                    vector=vector.tobytes(),
+                )
+            )
+        else:
+            embedding.content_hash = content_hash
+            embedding.vector = vector.tobytes()
+            embedding.modified = timezone.now()
+            to_update.append(embedding)
+
+    # Another worker might have stored the same submission in the meantime
+    SubmissionEmbedding.objects.bulk_create(
+        to_create,
+        update_conflicts=True,
+        unique_fields=["submission"],
+        update_fields=["content_hash", "model_name", "vector", "modified"],
+    )
+    SubmissionEmbedding.objects.bulk_update(
+        to_update, fields=["content_hash", "vector", "modified"]
+    )
+
+    return vectors
+
+
+def get_submission_embeddings(submissions) -> np.ndarray:
+    """
+    Get the embeddings matrix of submissions, one row per submission in the
+    same order, only encoding the ones that are not stored yet.
+    """
+    submissions = list(submissions)
+    vectors = update_submission_embeddings(submissions)
+    return np.vstack([vectors[submission.id] for submission in submissions])
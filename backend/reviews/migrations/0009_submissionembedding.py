@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:46
+
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_alter_reviewsession_options'),
+        ('submissions', '0030_submissiontype_is_recordable'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionEmbedding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('content_hash', models.CharField(max_length=32)),
+                ('model_name', models.CharField(max_length=100)),
+                ('vector', models.BinaryField()),
+                ('submission', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='embedding', to='submissions.submission')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
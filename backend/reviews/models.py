@@ -138,3 +138,26 @@ class UserReview(TimeStampedModel):
             return self.proposal
 
         return self.grant
+
+
+# Sentence transformers model the stored embeddings were encoded with
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+class SubmissionEmbedding(TimeStampedModel):
+    """Sentence embedding of a submission, stored so that it is only
+    re-encoded when its title, elevator pitch or abstract change.
+    """
+
+    submission = models.OneToOneField(
+        "submissions.Submission",
+        on_delete=models.CASCADE,
+        related_name="embedding",
+    )
+    content_hash = models.CharField(max_length=32)
+    model_name = models.CharField(max_length=100)
+    # float32 vector, see reviews.embeddings
+    vector = models.BinaryField()
+
+    def __str__(self) -> str:
+        return f"Embedding of submission {self.submission_id}"
@@ -1,23 +1,28 @@
 import functools
 import logging
+from collections import Counter
 
 import nltk
 import numpy as np
 from bertopic import BERTopic
 from bertopic.representation import KeyBERTInspired, MaximalMarginalRelevance
 from django.core.cache import cache
-from sentence_transformers import SentenceTransformer
 from sklearn.cluster import AgglomerativeClustering
 from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
 from reviews.cache_keys import get_cache_key as _get_cache_key
 from reviews.cache_keys import get_embedding_text
+from reviews.embeddings import get_embedding_model, get_submission_embeddings
+from reviews.similarity_index import SIMILARITY_THRESHOLD, SimilarityIndex
 
 logger = logging.getLogger(__name__)
 
 CACHE_TIMEOUT = 60 * 60 * 24  # 24 hours
 
+# Topic clusters of a previous run are updated in place, instead of fitting
+# BERTopic again, while at most 10% of the submissions changed since then
+MAX_CLUSTERING_CHANGES = 0.1
+
 
 # Map language codes to NLTK stopword language names
 LANGUAGE_CODE_MAP = {
@@ -218,12 +223,6 @@ def get_stopwords_for_languages(language_codes: set[str]) -> set[str]:
     return stopwords
 
 
-@functools.cache
-def get_embedding_model():
-    """Get or create the shared embedding model instance."""
-    return SentenceTransformer("all-MiniLM-L6-v2", token=False)
-
-
 def _get_submission_languages(submissions) -> set[str]:
     """Extract all unique language codes from submissions."""
     language_codes = set()
@@ -236,7 +235,7 @@ def _get_submission_languages(submissions) -> set[str]:
 
 
 def compute_similar_talks(
-    submissions, top_n=5, conference_id=None, force_recompute=False
+    submissions, top_n=5, conference_id=None, force_recompute=False, embeddings=None
 ):
     """
     Compute similar talks for each submission based on embeddings.
@@ -246,6 +245,8 @@ def compute_similar_talks(
         top_n: Number of similar talks to return for each submission
         conference_id: Optional conference ID for cache key
         force_recompute: Skip cache and recompute fresh results
+        embeddings: Optional embeddings matrix of the submissions, in the
+            same order, to avoid loading them again
 
     Returns:
         A dictionary mapping submission IDs to lists of similar submission IDs
@@ -266,27 +267,18 @@ def compute_similar_talks(
             if cached_result is not None:
                 return cached_result
 
-    model = get_embedding_model()
-
-    texts = [get_embedding_text(s) for s in submissions_list]
-    embeddings = model.encode(texts)
+    if embeddings is None:
+        embeddings = get_submission_embeddings(submissions_list)
 
-    similarity_matrix = cosine_similarity(embeddings)
-
-    similar_talks = {}
-    for i, submission in enumerate(submissions_list):
-        sims = similarity_matrix[i]
-        top_indices = np.argsort(sims)[::-1][1 : top_n + 1]  # skip self (index 0)
+    index = SimilarityIndex.from_embeddings(
+        [s.id for s in submissions_list], embeddings
+    )
+    titles = {s.id: str(s.title) for s in submissions_list}
 
-        similar_talks[submission.id] = [
-            {
-                "id": submissions_list[idx].id,
-                "title": str(submissions_list[idx].title),
-                "similarity": round(float(sims[idx]) * 100, 1),
-            }
-            for idx in top_indices
-            if sims[idx] > 0.3  # Only include if similarity > 30%
-        ]
+    similar_talks = {
+        submission_id: _format_similar(neighbours, titles)
+        for submission_id, neighbours in index.all_similar(top_n).items()
+    }
 
     # Cache the result
     if cache_key:
@@ -295,8 +287,24 @@ def compute_similar_talks(
     return similar_talks
 
 
+def _format_similar(neighbours, titles):
+    return [
+        {
+            "id": other_id,
+            "title": titles[other_id],
+            "similarity": round(similarity * 100, 1),
+        }
+        for other_id, similarity in neighbours
+        if similarity > SIMILARITY_THRESHOLD
+    ]
+
+
 def compute_topic_clusters(
-    submissions, min_topic_size=3, conference_id=None, force_recompute=False
+    submissions,
+    min_topic_size=3,
+    conference_id=None,
+    force_recompute=False,
+    embeddings=None,
 ):
     """
     Compute topic clusters for submissions using BERTopic.
@@ -306,6 +314,8 @@ def compute_topic_clusters(
         min_topic_size: Minimum number of talks per cluster
         conference_id: Optional conference ID for cache key
         force_recompute: Skip cache and recompute fresh results
+        embeddings: Optional embeddings matrix of the submissions, in the
+            same order, to avoid loading them again
 
     Returns:
         A dictionary with:
@@ -330,7 +340,9 @@ def compute_topic_clusters(
 
     model = get_embedding_model()
     texts = [get_embedding_text(s) for s in submissions_list]
-    embeddings = model.encode(texts)
+
+    if embeddings is None:
+        embeddings = get_submission_embeddings(submissions_list)
 
     # Get stopwords based on submission languages
     language_codes = _get_submission_languages(submissions_list)
@@ -432,6 +444,16 @@ def compute_topic_clusters(
         topic_id = topics[i]
         submission_topics[submission.id] = topic_id
 
+    result = _group_by_topic(topics_list, submissions_list, submission_topics)
+
+    # Cache the result
+    if cache_key:
+        cache.set(cache_key, result, CACHE_TIMEOUT)
+
+    return result
+
+
+def _group_by_topic(topics_list, submissions_list, submission_topics):
     # Group submissions by topic
     topics_with_submissions = []
     for topic in sorted(topics_list, key=lambda t: t["count"], reverse=True):
@@ -449,14 +471,91 @@ def compute_topic_clusters(
         if submission_topics.get(s.id) == -1
     ]
 
-    result = {
+    return {
         "topics": topics_with_submissions,
         "outliers": outlier_submissions,
         "submission_topics": submission_topics,
     }
 
-    # Cache the result
-    if cache_key:
-        cache.set(cache_key, result, CACHE_TIMEOUT)
 
-    return result
+def update_topic_clusters(previous, submissions, embeddings, content_hashes):
+    """
+    Update the topic clusters of a previous run without fitting BERTopic again.
+
+    Submissions that did not change keep their topic, new or changed ones
+    are assigned to the topic with the closest centroid (or become outliers
+    when no topic is similar enough). Topic names and keywords are kept.
+
+    Args:
+        previous: A dict with the 'topic_clusters' computed by
+            compute_topic_clusters and the 'content_hashes' of the
+            submissions they were computed from
+        submissions: A list of Submission objects
+        embeddings: Embeddings matrix of the submissions, in the same order
+        content_hashes: Dict mapping submission IDs to their content hash
+
+    Returns:
+        The updated topic clusters, or None when too many submissions
+        changed and the clusters need to be computed again
+    """
+    submissions_list = list(submissions)
+    previous_clusters = previous["topic_clusters"]
+    previous_hashes = previous["content_hashes"]
+    previous_topics = previous_clusters["submission_topics"]
+
+    changed = [
+        position
+        for position, s in enumerate(submissions_list)
+        if previous_hashes.get(s.id) != content_hashes[s.id]
+        or s.id not in previous_topics
+    ]
+    removed = previous_hashes.keys() - content_hashes.keys()
+
+    if len(changed) + len(removed) > MAX_CLUSTERING_CHANGES * len(submissions_list):
+        return None
+
+    changed_positions = set(changed)
+    submission_topics = {
+        s.id: previous_topics[s.id]
+        for position, s in enumerate(submissions_list)
+        if position not in changed_positions
+    }
+
+    topic_ids = [topic["id"] for topic in previous_clusters["topics"]]
+    members = {topic_id: [] for topic_id in topic_ids}
+
+    for position, s in enumerate(submissions_list):
+        topic_id = submission_topics.get(s.id)
+        if topic_id in members:
+            members[topic_id].append(position)
+
+    topic_ids = [topic_id for topic_id in topic_ids if members[topic_id]]
+
+    if changed and topic_ids:
+        centroids = np.vstack(
+            [embeddings[members[topic_id]].mean(axis=0) for topic_id in topic_ids]
+        )
+        index = SimilarityIndex.from_embeddings(topic_ids, centroids)
+
+        for position in changed:
+            [(topic_id, similarity)] = index.query(embeddings[position], top_n=1)
+            submission_topics[submissions_list[position].id] = (
+                topic_id if similarity > SIMILARITY_THRESHOLD else -1
+            )
+    else:
+        for position in changed:
+            submission_topics[submissions_list[position].id] = -1
+
+    counts = Counter(submission_topics.values())
+    topics_list = [
+        {
+            "id": topic["id"],
+            "name": topic["name"],
+            "count": counts[topic["id"]],
+            "keywords": topic["keywords"],
+        }
+        for topic in previous_clusters["topics"]
+        if counts[topic["id"]]
+    ]
+
+    return _group_by_topic(topics_list, submissions_list, submission_topics)
@@ -0,0 +1,160 @@
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from reviews.models import EMBEDDING_MODEL_NAME, SubmissionEmbedding
+
+# Rows compared at once in `SimilarityIndex.all_similar`, bounds the
+# memory to CHUNK_SIZE × N instead of a full N × N similarity matrix.
+CHUNK_SIZE = 256
+
+# Only include similar talks above 30% similarity
+SIMILARITY_THRESHOLD = 0.3
+
+SIMILARITY_INDEX_CACHE_TTL = 60 * 60 * 24  # 24 hours
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first, without a full sort."""
+    k = min(k, scores.shape[-1])
+
+    if k <= 0:
+        return np.empty(0, dtype=int)
+
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class SimilarityIndex:
+    """
+    Exact top-k cosine similarity index over submission embeddings.
+
+    Vectors are normalised once when the index is built, so a lookup is a
+    single matrix-vector product followed by `argpartition`.
+    """
+
+    def __init__(self, dimensions: int):
+        self.ids: list[int] = []
+        self.vectors = np.empty((0, dimensions), dtype=np.float32)
+        self._positions: dict[int, int] = {}
+
+    @classmethod
+    def from_embeddings(cls, ids, embeddings: np.ndarray) -> "SimilarityIndex":
+        embeddings = np.atleast_2d(embeddings)
+        index = cls(dimensions=embeddings.shape[1])
+        index.ids = list(ids)
+        index.vectors = _normalize(embeddings)
+        index._positions = {id: position for position, id in enumerate(index.ids)}
+        return index
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, id: int) -> bool:
+        return id in self._positions
+
+    def query(
+        self, vector: np.ndarray, top_n: int, exclude_id: int | None = None
+    ) -> list[tuple[int, float]]:
+        """Returns the `top_n` most similar (id, similarity) pairs to `vector`."""
+        if not self.ids:
+            return []
+
+        scores = self.vectors @ _normalize(vector)[0]
+
+        if exclude_id is not None and exclude_id in self._positions:
+            scores[self._positions[exclude_id]] = -np.inf
+
+        return [
+            (self.ids[position], float(scores[position]))
+            for position in _top_k(scores, top_n)
+            if scores[position] != -np.inf
+        ]
+
+    def similar_to(self, id: int, top_n: int) -> list[tuple[int, float]]:
+        """Returns the `top_n` submissions most similar to the submission `id`."""
+        return self.query(self.vectors[self._positions[id]], top_n, exclude_id=id)
+
+    def all_similar(self, top_n: int) -> dict[int, list[tuple[int, float]]]:
+        """Runs `similar_to` for every submission, in chunks of rows."""
+        results = {}
+
+        for start in range(0, len(self.ids), CHUNK_SIZE):
+            chunk = self.vectors[start : start + CHUNK_SIZE]
+            scores = chunk @ self.vectors.T
+
+            for offset, row in enumerate(scores):
+                position = start + offset
+                row[position] = -np.inf
+
+                results[self.ids[position]] = [
+                    (self.ids[other], float(row[other]))
+                    for other in _top_k(row, top_n)
+                    if row[other] != -np.inf
+                ]
+
+        return results
+
+
+def get_conference_similarity_index(conference_id: int) -> SimilarityIndex | None:
+    """Index of the stored embeddings of the conference submissions. It is
+    cached until an embedding is added, updated or removed, the embeddings
+    themselves are kept up to date by `reviews.tasks`."""
+    embeddings = SubmissionEmbedding.objects.filter(
+        submission__conference_id=conference_id, model_name=EMBEDDING_MODEL_NAME
+    )
+    state = embeddings.aggregate(count=Count("id"), last_modified=Max("modified"))
+
+    if not state["count"]:
+        return None
+
+    cache_key = (
+        f"reviews:similarity_index:conf_{conference_id}:"
+        f"{state['count']}:{state['last_modified'].timestamp()}"
+    )
+    index = cache.get(cache_key)
+
+    if index is None:
+        rows = list(embeddings.values_list("submission_id", "vector"))
+        index = SimilarityIndex.from_embeddings(
+            [submission_id for submission_id, _ in rows],
+            np.vstack([np.frombuffer(vector, dtype=np.float32) for _, vector in rows]),
+        )
+        cache.set(cache_key, index, SIMILARITY_INDEX_CACHE_TTL)
+
+    return index
+
+
+def get_similar_submissions(submission, top_n: int = 5) -> list[dict]:
+    """The submissions of the same conference most similar to `submission`,
+    without encoding anything: empty until its embedding is stored."""
+    from submissions.models import Submission
+
+    index = get_conference_similarity_index(submission.conference_id)
+
+    if index is None or submission.id not in index:
+        return []
+
+    neighbours = [
+        (other_id, similarity)
+        for other_id, similarity in index.similar_to(submission.id, top_n)
+        if similarity > SIMILARITY_THRESHOLD
+    ]
+    others = Submission.objects.in_bulk([other_id for other_id, _ in neighbours])
+
+    return [
+        {
+            "id": other_id,
+            "title": str(others[other_id].title),
+            "similarity": round(similarity * 100, 1),
+        }
+        for other_id, similarity in neighbours
+        if other_id in others
+    ]
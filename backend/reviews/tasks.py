@@ -1,4 +1,11 @@
 import logging
+from datetime import timedelta
+
+from celery.signals import worker_process_init
+from django.core.cache import cache
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 from pycon.celery import app
 
@@ -6,19 +13,106 @@ logger = logging.getLogger(__name__)
 
 RESULT_CACHE_TTL = 60 * 60 * 24  # 24 hours
 ERROR_CACHE_TTL = 60 * 2  # 2 minutes
+TOPIC_CLUSTERS_CACHE_TTL = 60 * 60 * 24 * 30  # 30 days
+
+HEAVY_PROCESSING_QUEUE = "heavy_processing"
+
+# The submissions changed within this window are encoded together, so
+# during the CFP the heavy processing worker boots at most once per window
+EMBEDDINGS_UPDATE_DEBOUNCE = 60 * 30  # 30 minutes
+EMBEDDINGS_UPDATE_SCHEDULED_KEY = "reviews:embeddings:update-scheduled"
+
+
+@worker_process_init.connect
+def warm_up_embedding_model(**kwargs):
+    # Load the model when a heavy processing worker starts, so the first
+    # recap analysis does not pay for it
+    if HEAVY_PROCESSING_QUEUE not in (app.amqp.queues.consume_from or {}):
+        return
+
+    from reviews.embeddings import get_embedding_model
+
+    logger.info("Loading the embedding model")
+    get_embedding_model()
+
+
+def get_topic_clusters_cache_key(conference_id):
+    return f"recap_analysis:conf_{conference_id}:topic_clusters"
+
+
+def schedule_submission_embeddings_update():
+    """Queues a sweep of the changed submissions, unless one is already
+    queued. The recap analysis encodes whatever the sweep hasn't yet."""
+    if not cache.add(
+        EMBEDDINGS_UPDATE_SCHEDULED_KEY, True, timeout=EMBEDDINGS_UPDATE_DEBOUNCE
+    ):
+        return
+
+    # Margin for the saves committed just before the sweep was queued
+    since = timezone.now() - timedelta(minutes=5)
+    queue_stale_submission_embeddings.apply_async(
+        kwargs={"since": since.isoformat()}, countdown=EMBEDDINGS_UPDATE_DEBOUNCE
+    )
+
+
+@app.task
+def queue_stale_submission_embeddings(*, since):
+    from reviews.cache_keys import get_content_hash
+    from submissions.models import Submission
+
+    # From now on, changed submissions need another sweep
+    cache.delete(EMBEDDINGS_UPDATE_SCHEDULED_KEY)
+
+    candidates = (
+        Submission.objects.filter(modified__gte=parse_datetime(since))
+        .filter(Q(embedding__isnull=True) | Q(embedding__modified__lt=F("modified")))
+        .select_related("embedding")
+    )
+    stale_ids = [
+        submission.id
+        for submission in candidates
+        if getattr(submission, "embedding", None) is None
+        or submission.embedding.content_hash != get_content_hash(submission)
+    ]
+
+    if not stale_ids:
+        return
+
+    # Encoding needs the model, only the heavy processing workers have
+    # the memory for it
+    compute_submission_embeddings.apply_async(
+        kwargs={"submission_ids": stale_ids}, queue=HEAVY_PROCESSING_QUEUE
+    )
 
 
 @app.task
-def compute_recap_analysis(conference_id, combined_cache_key, force_recompute=False):
+def compute_submission_embeddings(*, submission_ids):
+    from reviews.embeddings import update_submission_embeddings
+    from submissions.models import Submission
+
+    update_submission_embeddings(Submission.objects.filter(id__in=submission_ids))
+
+
+@app.task(bind=True)
+def compute_recap_analysis(
+    self, conference_id, combined_cache_key, force_recompute=False
+):
     from django.core.cache import cache
 
     from conferences.models import Conference
     from reviews.admin import get_accepted_submissions
+    from reviews.embeddings import get_content_hash, get_submission_embeddings
     from reviews.similar_talks import (
         compute_similar_talks,
         compute_topic_clusters,
+        update_topic_clusters,
     )
 
+    def set_stage(stage):
+        # Read by the admin view while polling for the result
+        if self.request.id:
+            self.update_state(state="PROGRESS", meta={"stage": stage})
+
     try:
         conference = Conference.objects.get(id=conference_id)
     except Conference.DoesNotExist:
@@ -29,21 +123,56 @@ def compute_recap_analysis(conference_id, combined_cache_key, force_recompute=Fa
     accepted_submissions = list(get_accepted_submissions(conference))
 
     try:
+        # Encode once, both stages share the same embeddings
+        set_stage("embeddings")
+        embeddings = (
+            get_submission_embeddings(accepted_submissions)
+            if accepted_submissions
+            else None
+        )
+
         # Pass conference_id=None to skip individual function caching;
         # the combined result is cached under combined_cache_key instead.
+        set_stage("similar_talks")
         similar_talks = compute_similar_talks(
             accepted_submissions,
             top_n=5,
             conference_id=None,
             force_recompute=force_recompute,
+            embeddings=embeddings,
         )
 
-        topic_clusters = compute_topic_clusters(
-            accepted_submissions,
-            min_topic_size=3,
-            conference_id=None,
-            force_recompute=force_recompute,
+        set_stage("topic_clusters")
+        content_hashes = {s.id: get_content_hash(s) for s in accepted_submissions}
+        topic_clusters_cache_key = get_topic_clusters_cache_key(conference_id)
+        previous_topic_clusters = (
+            None if force_recompute else cache.get(topic_clusters_cache_key)
         )
+        topic_clusters = None
+
+        if previous_topic_clusters and embeddings is not None:
+            topic_clusters = update_topic_clusters(
+                previous_topic_clusters,
+                accepted_submissions,
+                embeddings,
+                content_hashes,
+            )
+
+        if topic_clusters is None:
+            topic_clusters = compute_topic_clusters(
+                accepted_submissions,
+                min_topic_size=3,
+                conference_id=None,
+                force_recompute=force_recompute,
+                embeddings=embeddings,
+            )
+            # Later runs are compared against this full run, so small
+            # changes do not pile up over several incremental updates
+            cache.set(
+                topic_clusters_cache_key,
+                {"topic_clusters": topic_clusters, "content_hashes": content_hashes},
+                TOPIC_CLUSTERS_CACHE_TTL,
+            )
 
         submissions_list = sorted(
             [
@@ -944,6 +944,8 @@ def test_proposals_review_get_review_context(rf):
     assert context["proposal"].id == submission.id
     assert context["proposal_id"] == submission.id
     assert context["review_session_id"] == review_session.id
+    # No embedding is stored yet
+    assert context["similar_proposals"] == []
 
 
 # --- GrantsReviewAdapter Tests ---
@@ -0,0 +1,156 @@
+import numpy as np
+import pytest
+from django.core.cache import cache
+from i18n.strings import LazyI18nString
+
+from reviews.embeddings import (
+    EMBEDDING_MODEL_NAME,
+    get_content_hash,
+    get_submission_embeddings,
+    update_submission_embeddings,
+)
+from reviews.models import SubmissionEmbedding
+from reviews.tasks import (
+    EMBEDDINGS_UPDATE_DEBOUNCE,
+    compute_submission_embeddings,
+    queue_stale_submission_embeddings,
+)
+from submissions.tests.factories import SubmissionFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def mock_model(mocker):
+    model = mocker.patch("reviews.embeddings.get_embedding_model").return_value
+    model.encode.side_effect = lambda texts: np.array(
+        [[float(len(text)), 1.0, 0.0] for text in texts]
+    )
+    return model
+
+
+def test_stores_embeddings_of_new_submissions(mock_model):
+    submissions = SubmissionFactory.create_batch(2)
+
+    vectors = update_submission_embeddings(submissions)
+
+    assert set(vectors) == {s.id for s in submissions}
+    mock_model.encode.assert_called_once()
+
+    embedding = SubmissionEmbedding.objects.get(submission=submissions[0])
+    assert embedding.content_hash == get_content_hash(submissions[0])
+    assert embedding.model_name == EMBEDDING_MODEL_NAME
+    assert np.array_equal(
+        np.frombuffer(embedding.vector, dtype=np.float32), vectors[submissions[0].id]
+    )
+
+
+def test_only_encodes_new_or_changed_submissions(mock_model):
+    unchanged, changed = SubmissionFactory.create_batch(2)
+    update_submission_embeddings([unchanged, changed])
+    new = SubmissionFactory()
+
+    changed.title = "A brand new title"
+    changed.save()
+    mock_model.encode.reset_mock()
+
+    get_submission_embeddings([unchanged, changed, new])
+
+    encoded_texts = mock_model.encode.call_args[0][0]
+    assert len(encoded_texts) == 2
+    assert encoded_texts[0].startswith("A brand new title")
+    assert SubmissionEmbedding.objects.get(
+        submission=changed
+    ).content_hash == get_content_hash(changed)
+    assert SubmissionEmbedding.objects.count() == 3
+
+
+def test_get_submission_embeddings_keeps_submissions_order(mock_model):
+    submissions = SubmissionFactory.create_batch(3)
+    update_submission_embeddings(submissions[1:])
+
+    embeddings = get_submission_embeddings(submissions)
+
+    assert embeddings.shape == (3, 3)
+    for row, submission in zip(embeddings, submissions):
+        assert np.array_equal(
+            row,
+            np.frombuffer(submission.embedding.vector, dtype=np.float32),
+        )
+
+
+def test_does_not_encode_when_everything_is_stored(mock_model):
+    submissions = SubmissionFactory.create_batch(2)
+    update_submission_embeddings(submissions)
+    mock_model.encode.reset_mock()
+
+    get_submission_embeddings(submissions)
+
+    mock_model.encode.assert_not_called()
+
+
+def test_compute_submission_embeddings_task(mock_model):
+    submissions = SubmissionFactory.create_batch(2)
+
+    compute_submission_embeddings(submission_ids=[s.id for s in submissions])
+
+    assert SubmissionEmbedding.objects.count() == 2
+    mock_model.encode.assert_called_once()
+
+
+def test_saving_submission_schedules_one_embeddings_sweep(
+    mocker, settings, django_capture_on_commit_callbacks
+):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    mock_sweep = mocker.patch("reviews.tasks.queue_stale_submission_embeddings")
+    submission = SubmissionFactory()
+    other_submission = SubmissionFactory()
+    cache.clear()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        submission.status = "accepted"
+        submission.save(update_fields=["status"])
+
+    mock_sweep.apply_async.assert_not_called()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        submission.save()
+        other_submission.save()
+
+    # Changes within the window are swept together
+    mock_sweep.apply_async.assert_called_once_with(
+        kwargs={"since": mocker.ANY}, countdown=EMBEDDINGS_UPDATE_DEBOUNCE
+    )
+    cache.clear()
+
+
+def test_sweep_queues_only_changed_submissions_on_heavy_queue(mocker, mock_model):
+    unchanged, changed = SubmissionFactory.create_batch(2)
+    update_submission_embeddings([unchanged, changed])
+    new = SubmissionFactory()
+    changed.title = LazyI18nString({"en": "A new title"})
+    changed.save()
+    mock_task = mocker.patch("reviews.tasks.compute_submission_embeddings")
+
+    queue_stale_submission_embeddings(since="2000-01-01T00:00:00+00:00")
+
+    mock_task.apply_async.assert_called_once_with(
+        kwargs={"submission_ids": mocker.ANY}, queue="heavy_processing"
+    )
+    assert sorted(
+        mock_task.apply_async.call_args.kwargs["kwargs"]["submission_ids"]
+    ) == sorted([changed.id, new.id])
+
+
+def test_sweep_without_changes_does_not_boot_the_heavy_worker(mocker, mock_model):
+    submission = SubmissionFactory()
+    update_submission_embeddings([submission])
+    submission.status = "accepted"
+    submission.save()
+    mock_task = mocker.patch("reviews.tasks.compute_submission_embeddings")
+
+    queue_stale_submission_embeddings(since="2000-01-01T00:00:00+00:00")
+
+    mock_task.apply_async.assert_not_called()
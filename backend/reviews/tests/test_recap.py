@@ -1,5 +1,6 @@
 import json
 
+import numpy as np
 import pytest
 from django.contrib.admin import AdminSite
 from django.core.exceptions import PermissionDenied
@@ -401,6 +402,7 @@ def test_task_populates_cache_with_results(mocker):
     user, conference, review_session, submissions = _create_recap_setup()
     sub1, sub2 = submissions
 
+    mocker.patch("reviews.embeddings.get_submission_embeddings", return_value=np.eye(2))
     mocker.patch(
         "reviews.similar_talks.compute_similar_talks",
         return_value={
@@ -447,6 +449,7 @@ def test_task_caches_error_on_failure(mocker):
 
     user, conference, review_session, submissions = _create_recap_setup()
 
+    mocker.patch("reviews.embeddings.get_submission_embeddings", return_value=np.eye(2))
     mocker.patch(
         "reviews.similar_talks.compute_similar_talks",
         side_effect=RuntimeError("ML model failed"),
@@ -467,6 +470,70 @@ def test_task_caches_error_on_failure(mocker):
     assert cache.get(f"{cache_key}:computing") is None
 
 
+@pytest.mark.django_db
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_task_encodes_submissions_once_for_both_stages(mocker):
+    from reviews.tasks import compute_recap_analysis
+
+    user, conference, review_session, submissions = _create_recap_setup()
+    embeddings = np.eye(2)
+
+    mock_embeddings = mocker.patch(
+        "reviews.embeddings.get_submission_embeddings", return_value=embeddings
+    )
+    mock_similar = mocker.patch(
+        "reviews.similar_talks.compute_similar_talks", return_value={}
+    )
+    mock_clusters = mocker.patch(
+        "reviews.similar_talks.compute_topic_clusters",
+        return_value={"topics": [], "outliers": [], "submission_topics": {}},
+    )
+
+    compute_recap_analysis(conference.id, "recap_analysis:conf_test:once")
+
+    mock_embeddings.assert_called_once()
+    assert mock_similar.call_args.kwargs["embeddings"] is embeddings
+    assert mock_clusters.call_args.kwargs["embeddings"] is embeddings
+
+
+@pytest.mark.django_db
+@override_settings(CACHES=LOCMEM_CACHE)
+def test_task_reuses_previous_topic_clusters(mocker):
+    from django.core.cache import cache
+
+    from reviews.tasks import compute_recap_analysis, get_topic_clusters_cache_key
+
+    user, conference, review_session, submissions = _create_recap_setup()
+    cache.delete(get_topic_clusters_cache_key(conference.id))
+
+    mocker.patch("reviews.embeddings.get_submission_embeddings", return_value=np.eye(2))
+    mocker.patch("reviews.similar_talks.compute_similar_talks", return_value={})
+    mock_clusters = mocker.patch(
+        "reviews.similar_talks.compute_topic_clusters",
+        return_value={"topics": [], "outliers": [], "submission_topics": {}},
+    )
+    updated_clusters = {"topics": [], "outliers": [], "submission_topics": {}}
+    mock_update = mocker.patch(
+        "reviews.similar_talks.update_topic_clusters",
+        return_value=updated_clusters,
+    )
+
+    compute_recap_analysis(conference.id, "recap_analysis:conf_test:first")
+    result = compute_recap_analysis(conference.id, "recap_analysis:conf_test:second")
+
+    mock_clusters.assert_called_once()
+    mock_update.assert_called_once()
+    assert result["topic_clusters"] is updated_clusters
+
+    # A forced recompute always fits the clusters again
+    compute_recap_analysis(
+        conference.id, "recap_analysis:conf_test:third", force_recompute=True
+    )
+
+    assert mock_clusters.call_count == 2
+    mock_update.assert_called_once()
+
+
 def test_task_handles_missing_conference(mocker):
     from reviews.tasks import compute_recap_analysis
 
@@ -568,6 +635,29 @@ def test_compute_analysis_view_keeps_active_task_lock(rf, mocker):
     mock_check.assert_not_called()
 
 
+def test_compute_analysis_view_returns_the_stage_of_the_running_task(rf, mocker):
+    user, conference, review_session, submissions = _create_recap_setup()
+
+    _, mock_cache_add, mock_task, _ = _mock_analysis_deps(
+        mocker, computing_task_id="active-task-id-456"
+    )
+    mock_cache_add.return_value = False
+
+    mock_async_result_cls = mocker.patch("celery.result.AsyncResult")
+    mock_async_result_cls.return_value.state = "PROGRESS"
+    mock_async_result_cls.return_value.info = {"stage": "topic_clusters"}
+
+    request = rf.get("/")
+    request.user = user
+
+    admin = ReviewSessionAdmin(ReviewSession, AdminSite())
+    response = admin.review_recap_compute_analysis_view(request, review_session.id)
+
+    data = json.loads(response.content)
+    assert data == {"status": "processing", "stage": "topic_clusters"}
+    mock_task.assert_not_called()
+
+
 def test_compute_analysis_view_check_only_returns_empty_on_cache_miss(rf, mocker):
     user, conference, review_session, submissions = _create_recap_setup()
 
@@ -5,6 +5,7 @@ import numpy as np
 from reviews.similar_talks import (
     compute_similar_talks,
     compute_topic_clusters,
+    update_topic_clusters,
 )
 
 
@@ -21,21 +22,21 @@ def _make_submission(
     return sub
 
 
-@patch("reviews.similar_talks.get_embedding_model")
+@patch("reviews.similar_talks.get_submission_embeddings")
 @patch("reviews.similar_talks.cache")
 class TestComputeSimilarTalks:
-    def test_empty_submissions(self, mock_cache, mock_model):
+    def test_empty_submissions(self, mock_cache, mock_embeddings):
         result = compute_similar_talks([], top_n=5)
         assert result == {}
-        mock_model.assert_not_called()
+        mock_embeddings.assert_not_called()
 
-    def test_single_submission(self, mock_cache, mock_model):
+    def test_single_submission(self, mock_cache, mock_embeddings):
         sub = _make_submission(1)
         result = compute_similar_talks([sub], top_n=5)
         assert result == {}
-        mock_model.assert_not_called()
+        mock_embeddings.assert_not_called()
 
-    def test_returns_similar_talks(self, mock_cache, mock_model):
+    def test_returns_similar_talks(self, mock_cache, mock_embeddings):
         mock_cache.get.return_value = None
 
         embeddings = np.array(
@@ -45,7 +46,7 @@ class TestComputeSimilarTalks:
                 [0.0, 0.0, 1.0],
             ]
         )
-        mock_model.return_value.encode.return_value = embeddings
+        mock_embeddings.return_value = embeddings
 
         subs = [
             _make_submission(1, title="Talk A"),
@@ -63,7 +64,7 @@ class TestComputeSimilarTalks:
         similar_to_a = result[1]
         assert similar_to_a[0]["id"] == 2
 
-    def test_uses_cache(self, mock_cache, mock_model):
+    def test_uses_cache(self, mock_cache, mock_embeddings):
         cached = {1: [{"id": 2, "title": "Cached", "similarity": 80.0}]}
         mock_cache.get.return_value = cached
 
@@ -71,37 +72,38 @@ class TestComputeSimilarTalks:
         result = compute_similar_talks(subs, top_n=5, conference_id=1)
 
         assert result == cached
-        mock_model.return_value.encode.assert_not_called()
+        mock_embeddings.assert_not_called()
 
-    def test_force_recompute_skips_cache(self, mock_cache, mock_model):
+    def test_force_recompute_skips_cache(self, mock_cache, mock_embeddings):
         mock_cache.get.return_value = None
 
         embeddings = np.array([[1.0, 0.0], [0.0, 1.0]])
-        mock_model.return_value.encode.return_value = embeddings
+        mock_embeddings.return_value = embeddings
 
         subs = [_make_submission(1), _make_submission(2)]
         compute_similar_talks(subs, top_n=5, conference_id=1, force_recompute=True)
 
         mock_cache.get.assert_not_called()
-        mock_model.return_value.encode.assert_called_once()
+        mock_embeddings.assert_called_once()
         mock_cache.set.assert_called_once()
 
 
+@patch("reviews.similar_talks.get_submission_embeddings")
 @patch("reviews.similar_talks.get_embedding_model")
 @patch("reviews.similar_talks.cache")
 class TestComputeTopicClusters:
-    def test_empty_submissions(self, mock_cache, mock_model):
+    def test_empty_submissions(self, mock_cache, mock_model, mock_embeddings):
         result = compute_topic_clusters([])
         assert result == {"topics": [], "submission_topics": {}, "outliers": []}
         mock_model.assert_not_called()
 
-    def test_too_few_submissions(self, mock_cache, mock_model):
+    def test_too_few_submissions(self, mock_cache, mock_model, mock_embeddings):
         subs = [_make_submission(1), _make_submission(2)]
         result = compute_topic_clusters(subs, min_topic_size=3)
         assert result == {"topics": [], "submission_topics": {}, "outliers": []}
         mock_model.assert_not_called()
 
-    def test_uses_cache(self, mock_cache, mock_model):
+    def test_uses_cache(self, mock_cache, mock_model, mock_embeddings):
         cached = {
             "topics": [{"name": "Cached"}],
             "outliers": [],
@@ -113,13 +115,13 @@ class TestComputeTopicClusters:
         result = compute_topic_clusters(subs, min_topic_size=3, conference_id=1)
 
         assert result == cached
-        mock_model.return_value.encode.assert_not_called()
+        mock_embeddings.assert_not_called()
 
-    def test_force_recompute_skips_cache(self, mock_cache, mock_model):
+    def test_force_recompute_skips_cache(self, mock_cache, mock_model, mock_embeddings):
         mock_cache.get.return_value = None
 
         embeddings = np.random.rand(5, 10)
-        mock_model.return_value.encode.return_value = embeddings
+        mock_embeddings.return_value = embeddings
 
         subs = [_make_submission(i, title=f"Talk {i}") for i in range(5)]
 
@@ -137,5 +139,86 @@ class TestComputeTopicClusters:
             )
 
         mock_cache.get.assert_not_called()
-        mock_model.return_value.encode.assert_called_once()
+        mock_embeddings.assert_called_once()
         mock_cache.set.assert_called_once()
+
+
+def _previous_topic_clusters():
+    return {
+        "topic_clusters": {
+            "topics": [
+                {"id": 0, "name": "Web", "count": 2, "keywords": ["web"]},
+                {"id": 1, "name": "Data", "count": 2, "keywords": ["data"]},
+            ],
+            "outliers": [],
+            "submission_topics": {1: 0, 2: 0, 3: 1, 4: 1},
+        },
+        "content_hashes": {1: "a", 2: "b", 3: "c", 4: "d"},
+    }
+
+
+@patch("reviews.similar_talks.MAX_CLUSTERING_CHANGES", 0.5)
+def test_update_topic_clusters_assigns_changed_submissions_to_closest_topic():
+    subs = [_make_submission(id) for id in (1, 2, 3, 4, 5)]
+    embeddings = np.array(
+        [
+            [1.0, 0.0, 0.0],
+            [0.9, 0.1, 0.0],
+            [0.0, 1.0, 0.0],
+            [0.0, 0.9, 0.1],
+            [0.1, 1.0, 0.0],
+        ]
+    )
+
+    result = update_topic_clusters(
+        _previous_topic_clusters(),
+        subs,
+        embeddings,
+        {1: "a", 2: "changed", 3: "c", 4: "d", 5: "new"},
+    )
+
+    # Submission 2 is still about web, the new submission 5 is about data
+    assert result["submission_topics"] == {1: 0, 2: 0, 3: 1, 4: 1, 5: 1}
+    assert [topic["name"] for topic in result["topics"]] == ["Data", "Web"]
+    assert result["topics"][0]["count"] == 3
+    assert [s["id"] for s in result["topics"][0]["submissions"]] == [3, 4, 5]
+    assert result["outliers"] == []
+
+
+@patch("reviews.similar_talks.MAX_CLUSTERING_CHANGES", 0.5)
+def test_update_topic_clusters_marks_unrelated_submissions_as_outliers():
+    subs = [_make_submission(id) for id in (1, 2, 3, 4, 5)]
+    embeddings = np.array(
+        [
+            [1.0, 0.0, 0.0],
+            [0.9, 0.1, 0.0],
+            [0.0, 1.0, 0.0],
+            [0.0, 0.9, 0.1],
+            [0.0, 0.0, 1.0],
+        ]
+    )
+
+    result = update_topic_clusters(
+        _previous_topic_clusters(),
+        subs,
+        embeddings,
+        {1: "a", 2: "b", 3: "c", 4: "d", 5: "new"},
+    )
+
+    assert result["submission_topics"][5] == -1
+    assert result["outliers"] == [{"id": 5, "title": "Test Talk"}]
+
+
+def test_update_topic_clusters_needs_recompute_when_too_many_changed():
+    subs = [_make_submission(id) for id in (1, 2, 3)]
+    embeddings = np.eye(3)
+
+    result = update_topic_clusters(
+        _previous_topic_clusters(),
+        subs,
+        embeddings,
+        {1: "changed", 2: "b", 3: "c"},
+    )
+
+    # Submission 1 changed and submission 4 was removed
+    assert result is None
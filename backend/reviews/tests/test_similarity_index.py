@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from reviews.models import EMBEDDING_MODEL_NAME, SubmissionEmbedding
+from reviews.similarity_index import (
+    SimilarityIndex,
+    get_conference_similarity_index,
+    get_similar_submissions,
+)
+from submissions.tests.factories import SubmissionFactory
+
+
+@pytest.fixture
+def index():
+    return SimilarityIndex.from_embeddings(
+        [1, 2, 3, 4],
+        np.array(
+            [
+                [1.0, 0.0, 0.0],
+                [0.9, 0.1, 0.0],
+                [0.0, 0.0, 1.0],
+                [0.1, 0.2, 0.8],
+            ]
+        ),
+    )
+
+
+def test_similar_to_excludes_itself(index):
+    result = index.similar_to(1, top_n=2)
+
+    assert [id for id, _ in result] == [2, 4]
+    assert result[0][1] == pytest.approx(0.9939, abs=1e-4)
+
+
+def test_similar_to_with_top_n_bigger_than_index(index):
+    result = index.similar_to(3, top_n=10)
+
+    assert [id for id, _ in result][0] == 4
+    assert len(result) == 3
+
+
+def _assert_same_neighbours(all_similar, index, top_n):
+    assert set(all_similar) == set(index.ids)
+
+    for id, neighbours in all_similar.items():
+        expected = index.similar_to(id, top_n=top_n)
+
+        assert [other for other, _ in neighbours] == [other for other, _ in expected]
+        assert [score for _, score in neighbours] == pytest.approx(
+            [score for _, score in expected]
+        )
+
+
+def test_all_similar_matches_similar_to(index):
+    _assert_same_neighbours(index.all_similar(top_n=2), index, top_n=2)
+
+
+def test_all_similar_in_multiple_chunks(index, mocker):
+    mocker.patch("reviews.similarity_index.CHUNK_SIZE", 3)
+
+    _assert_same_neighbours(index.all_similar(top_n=1), index, top_n=1)
+
+
+def test_query_empty_index():
+    assert SimilarityIndex(dimensions=3).query(np.ones(3), top_n=5) == []
+
+
+def test_zero_vectors_do_not_break_normalisation():
+    index = SimilarityIndex.from_embeddings([1, 2], np.array([[0.0, 0.0], [1.0, 0.0]]))
+
+    assert index.similar_to(1, top_n=1) == [(2, 0.0)]
+
+
+def _store_embedding(submission, vector):
+    return SubmissionEmbedding.objects.create(
+        submission=submission,
+        content_hash="hash",
+        model_name=EMBEDDING_MODEL_NAME,
+        vector=np.asarray(vector, dtype=np.float32).tobytes(),
+    )
+
+
+@pytest.mark.django_db
+def test_get_similar_submissions_from_stored_embeddings():
+    submission = SubmissionFactory()
+    similar = SubmissionFactory(conference=submission.conference)
+    different = SubmissionFactory(conference=submission.conference)
+    other_conference = SubmissionFactory()
+    _store_embedding(submission, [1.0, 0.0, 0.0])
+    _store_embedding(similar, [0.9, 0.1, 0.0])
+    _store_embedding(different, [0.0, 0.0, 1.0])
+    _store_embedding(other_conference, [1.0, 0.0, 0.0])
+
+    assert get_similar_submissions(submission) == [
+        {"id": similar.id, "title": str(similar.title), "similarity": 99.4}
+    ]
+
+
+@pytest.mark.django_db
+def test_get_similar_submissions_without_embedding():
+    submission = SubmissionFactory()
+    _store_embedding(SubmissionFactory(conference=submission.conference), [1.0, 0.0])
+
+    assert get_similar_submissions(submission) == []
+
+
+@pytest.mark.django_db
+def test_conference_similarity_index_follows_the_stored_embeddings(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    submission = SubmissionFactory()
+    _store_embedding(submission, [1.0, 0.0])
+
+    index = get_conference_similarity_index(submission.conference_id)
+    assert get_conference_similarity_index(submission.conference_id).ids == index.ids
+
+    new_submission = SubmissionFactory(conference=submission.conference)
+    _store_embedding(new_submission, [0.0, 1.0])
+
+    # A new embedding is a new version of the index
+    assert get_conference_similarity_index(submission.conference_id).ids == [
+        submission.id,
+        new_submission.id,
+    ]
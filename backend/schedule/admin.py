@@ -40,6 +40,7 @@ from .models import (
     ScheduleItemAttendee,
     ScheduleItemInvitation,
     ScheduleItemSentForVideoUpload,
+    ScheduleItemWaitlistEntry,
     Slot,
 )
 
@@ -243,6 +244,14 @@ class ScheduleItemAttendeeInline(admin.TabularInline):
     autocomplete_fields = ("user",)
 
 
+class ScheduleItemWaitlistEntryInline(admin.TabularInline):
+    model = ScheduleItemWaitlistEntry
+    fields = ("user", "created")
+    readonly_fields = ("created",)
+    autocomplete_fields = ("user",)
+    extra = 0
+
+
 class ScheduleItemAdminForm(forms.ModelForm):
     new_slot = forms.ModelChoiceField(
         queryset=Slot.objects.all(), required=False, empty_label="(Don't move)"
@@ -387,6 +396,7 @@ class ScheduleItemAdmin(ConferencePermissionMixin, admin.ModelAdmin):
     inlines = [
         ScheduleItemAdditionalSpeakerInline,
         ScheduleItemAttendeeInline,
+        ScheduleItemWaitlistEntryInline,
     ]
     actions = [
         send_schedule_invitation_to_all,
@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class ScheduleConfig(AppConfig):
     name = "schedule"
+
+    def ready(self):
+        from schedule.revisions import connect_schedule_revision_signals
+
+        connect_schedule_revision_signals()
@@ -0,0 +1,161 @@
+from dataclasses import dataclass
+from enum import Enum
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from schedule.models import (
+    ScheduleItem,
+    ScheduleItemAttendee,
+    ScheduleItemWaitlistEntry,
+)
+from schedule.tasks import send_schedule_item_waitlist_spot_booked_email
+
+
+class BookingStatus(Enum):
+    BOOKED = "booked"
+    ALREADY_BOOKED = "already_booked"
+    WAITLISTED = "waitlisted"
+    NOT_BOOKABLE = "not_bookable"
+
+
+@dataclass
+class BookingResult:
+    status: BookingStatus
+    schedule_item: ScheduleItem
+    waitlist_position: int | None = None
+
+
+def _waitlist_position(entry: ScheduleItemWaitlistEntry) -> int:
+    return (
+        ScheduleItemWaitlistEntry.objects.filter(
+            Q(created__lt=entry.created) | Q(created=entry.created, id__lt=entry.id),
+            schedule_item_id=entry.schedule_item_id,
+        ).count()
+        + 1
+    )
+
+
+def get_waitlist_position(schedule_item_id: int, user_id: int) -> int | None:
+    """Position of the user in the waitlist of the schedule item, starting
+    from 1, or None when they are not in it."""
+    entry = ScheduleItemWaitlistEntry.objects.filter(
+        schedule_item_id=schedule_item_id, user_id=user_id
+    ).first()
+
+    if not entry:
+        return None
+
+    return _waitlist_position(entry)
+
+
+def get_user_waitlist_positions(conference_id: int, user_id: int) -> dict[int, int]:
+    """Positions of the user in every waitlist of the conference, by schedule
+    item id."""
+    entries_ahead = (
+        ScheduleItemWaitlistEntry.objects.filter(
+            Q(created__lt=OuterRef("created"))
+            | Q(created=OuterRef("created"), id__lt=OuterRef("id")),
+            schedule_item_id=OuterRef("schedule_item_id"),
+        )
+        .values("schedule_item_id")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    return dict(
+        ScheduleItemWaitlistEntry.objects.filter(
+            schedule_item__conference_id=conference_id, user_id=user_id
+        )
+        .annotate(position=Coalesce(Subquery(entries_ahead), 0) + 1)
+        .values_list("schedule_item_id", "position")
+    )
+
+
+def book_schedule_item(schedule_item_id: int, user_id: int) -> BookingResult:
+    """Books a spot for the user, or puts them on the waitlist when the
+    event is full. Booking twice is a no-op."""
+    # Fast path without locks for the users retrying a booking they have
+    if ScheduleItemAttendee.objects.filter(
+        schedule_item_id=schedule_item_id, user_id=user_id
+    ).exists():
+        return BookingResult(
+            BookingStatus.ALREADY_BOOKED, ScheduleItem.objects.get(id=schedule_item_id)
+        )
+
+    with transaction.atomic():
+        # The row lock serializes the bookings of the same event, so the
+        # count below can't be raced into an overbooking
+        schedule_item = ScheduleItem.objects.select_for_update().get(
+            id=schedule_item_id
+        )
+        capacity = schedule_item.actual_attendees_total_capacity
+
+        if capacity is None:
+            return BookingResult(BookingStatus.NOT_BOOKABLE, schedule_item)
+
+        if schedule_item.attendees.filter(user_id=user_id).exists():
+            return BookingResult(BookingStatus.ALREADY_BOOKED, schedule_item)
+
+        if schedule_item.attendees.count() >= capacity:
+            entry, _ = ScheduleItemWaitlistEntry.objects.get_or_create(
+                schedule_item=schedule_item, user_id=user_id
+            )
+            return BookingResult(
+                BookingStatus.WAITLISTED,
+                schedule_item,
+                waitlist_position=_waitlist_position(entry),
+            )
+
+        try:
+            with transaction.atomic():
+                ScheduleItemAttendee.objects.create(
+                    schedule_item=schedule_item, user_id=user_id
+                )
+        except IntegrityError:
+            return BookingResult(BookingStatus.ALREADY_BOOKED, schedule_item)
+
+        schedule_item.waitlist_entries.filter(user_id=user_id).delete()
+
+    return BookingResult(BookingStatus.BOOKED, schedule_item)
+
+
+def cancel_booking(schedule_item: ScheduleItem, user_id: int) -> bool:
+    """Cancels the booking or the waitlist entry of the user, the freed spot
+    goes to the first user in the waitlist, who gets an email about it.
+    Returns False when the user had neither."""
+    with transaction.atomic():
+        schedule_item = ScheduleItem.objects.select_for_update().get(
+            id=schedule_item.id
+        )
+        removed_from_waitlist, _ = schedule_item.waitlist_entries.filter(
+            user_id=user_id
+        ).delete()
+        cancelled, _ = schedule_item.attendees.filter(user_id=user_id).delete()
+
+        if not cancelled:
+            return bool(removed_from_waitlist)
+
+        capacity = schedule_item.actual_attendees_total_capacity
+        spots_left = capacity - schedule_item.attendees.count() if capacity else 0
+        promoted = list(schedule_item.waitlist_entries.all()[: max(spots_left, 0)])
+
+        ScheduleItemAttendee.objects.bulk_create(
+            [
+                ScheduleItemAttendee(schedule_item=schedule_item, user_id=entry.user_id)
+                for entry in promoted
+            ],
+            ignore_conflicts=True,
+        )
+        schedule_item.waitlist_entries.filter(
+            id__in=[entry.id for entry in promoted]
+        ).delete()
+
+        for entry in promoted:
+            transaction.on_commit(
+                lambda uid=entry.user_id: send_schedule_item_waitlist_spot_booked_email.delay(
+                    schedule_item_id=schedule_item.id, user_id=uid
+                )
+            )
+
+    return True
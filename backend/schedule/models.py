@@ -489,6 +489,32 @@ class ScheduleItemAttendee(TimeStampedModel):
         )
 
 
+class ScheduleItemWaitlistEntry(TimeStampedModel):
+    schedule_item = models.ForeignKey(
+        ScheduleItem,
+        on_delete=models.CASCADE,
+        verbose_name=_("schedule item"),
+        related_name="waitlist_entries",
+    )
+    user = models.ForeignKey(
+        "users.User",
+        on_delete=models.CASCADE,
+        null=False,
+        blank=False,
+        verbose_name=_("user"),
+        related_name="+",
+    )
+
+    class Meta:
+        verbose_name = _("Schedule item waitlist entry")
+        verbose_name_plural = _("Schedule item waitlist entries")
+        ordering = ("created", "id")
+        unique_together = (
+            "user",
+            "schedule_item",
+        )
+
+
 class ScheduleItemInvitation(ScheduleItem):
     class Meta:
         proxy = True
@@ -0,0 +1,134 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from schedule.models import (
+    Day,
+    DayRoomThroughModel,
+    Room,
+    ScheduleItem,
+    ScheduleItemAdditionalSpeaker,
+    Slot,
+)
+
+
+def _revision_cache_key(conference_id: int) -> str:
+    return f"schedule:revision:conf_{conference_id}"
+
+
+def _new_revision() -> int:
+    # Counters start from the current time, so a counter evicted from the
+    # cache never goes back to a revision that already has a snapshot
+    return time.time_ns()
+
+
+def get_schedule_revision(conference_id: int) -> int:
+    key = _revision_cache_key(conference_id)
+    revision = cache.get(key)
+
+    if revision is None:
+        revision = _new_revision()
+
+        if not cache.add(key, revision, None):
+            revision = cache.get(key, revision)
+
+    return revision
+
+
+def bump_schedule_revision(*conference_ids: int) -> None:
+    """Bumps the revision once the current transaction commits, before that
+    a snapshot built for the new revision would still see the old data."""
+    conference_ids = set(conference_ids)
+
+    def bump():
+        for conference_id in conference_ids:
+            key = _revision_cache_key(conference_id)
+
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, _new_revision(), None)
+
+    if conference_ids:
+        transaction.on_commit(bump)
+
+
+def _conferences_using_room(room_id: int) -> set[int]:
+    return set(
+        Day.objects.filter(added_rooms__room_id=room_id).values_list(
+            "conference_id", flat=True
+        )
+    ) | set(
+        ScheduleItem.objects.filter(rooms__id=room_id).values_list(
+            "conference_id", flat=True
+        )
+    )
+
+
+def schedule_item_changed(sender, instance, **kwargs):
+    bump_schedule_revision(instance.conference_id)
+
+
+def schedule_item_rooms_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+
+    if not reverse:
+        bump_schedule_revision(instance.conference_id)
+        return
+
+    # Rooms changed from the room side, pk_set are the schedule items
+    bump_schedule_revision(
+        *ScheduleItem.objects.filter(pk__in=pk_set or []).values_list(
+            "conference_id", flat=True
+        ),
+        *_conferences_using_room(instance.id),
+    )
+
+
+def _conferences_of_days(*day_ids: int) -> list[int]:
+    # Looked up by id, the day can be going away in the same cascade
+    return list(
+        Day.objects.filter(id__in=day_ids).values_list("conference_id", flat=True)
+    )
+
+
+def additional_speaker_changed(sender, instance, **kwargs):
+    bump_schedule_revision(
+        *ScheduleItem.objects.filter(id=instance.scheduleitem_id).values_list(
+            "conference_id", flat=True
+        )
+    )
+
+
+def slot_changed(sender, instance, **kwargs):
+    bump_schedule_revision(*_conferences_of_days(instance.day_id))
+
+
+def day_changed(sender, instance, **kwargs):
+    bump_schedule_revision(instance.conference_id)
+
+
+def day_room_changed(sender, instance, **kwargs):
+    bump_schedule_revision(*_conferences_of_days(instance.day_id))
+
+
+def room_changed(sender, instance, **kwargs):
+    bump_schedule_revision(*_conferences_using_room(instance.id))
+
+
+def connect_schedule_revision_signals():
+    for model, receiver in (
+        (ScheduleItem, schedule_item_changed),
+        (ScheduleItemAdditionalSpeaker, additional_speaker_changed),
+        (Slot, slot_changed),
+        (Day, day_changed),
+        (DayRoomThroughModel, day_room_changed),
+        (Room, room_changed),
+    ):
+        post_save.connect(receiver, sender=model)
+        post_delete.connect(receiver, sender=model)
+
+    m2m_changed.connect(schedule_item_rooms_changed, sender=ScheduleItem.rooms.through)
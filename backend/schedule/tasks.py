@@ -1,4 +1,7 @@
-from django.db import transaction
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from django.db import connection, transaction
 from django.db.models import Q
 from conferences.tasks import send_conference_voucher_email
 from conferences.vouchers import create_conference_voucher
@@ -6,7 +9,14 @@ from conferences.models.conference_voucher import ConferenceVoucher
 from pycon.celery_utils import OnlyOneAtTimeTask
 from google_api.exceptions import NoGoogleCloudQuotaLeftError
 from googleapiclient.errors import HttpError
-from google_api.sdk import youtube_videos_insert, youtube_videos_set_thumbnail
+from google_api.sdk import (
+    YOUTUBE_VIDEOS_INSERT_QUOTA,
+    YOUTUBE_VIDEOS_SET_THUMBNAIL_QUOTA,
+    get_all_available_credentials,
+    youtube_videos_insert,
+    youtube_videos_set_thumbnail,
+)
+from google.oauth2.credentials import Credentials
 from integrations import plain
 from pretix import user_has_admission_ticket
 from django.utils import timezone
@@ -29,6 +39,13 @@ from schedule.models import ScheduleItem
 
 logger = logging.getLogger(__name__)
 
+# Videos downloaded from S3 ahead of time, on top of the ones being uploaded
+VIDEO_PREFETCH_COUNT = 2
+
+YOUTUBE_VIDEO_UPLOAD_QUOTA = (
+    YOUTUBE_VIDEOS_INSERT_QUOTA + YOUTUBE_VIDEOS_SET_THUMBNAIL_QUOTA
+)
+
 
 @app.task
 def send_schedule_invitation_email(*, schedule_item_id, is_reminder):
@@ -98,6 +115,30 @@ def send_submission_time_slot_changed_email(*, schedule_item_id):
     )
 
 
+@app.task
+def send_schedule_item_waitlist_spot_booked_email(*, schedule_item_id, user_id):
+    schedule_item = ScheduleItem.objects.select_related("conference").get(
+        id=schedule_item_id
+    )
+    conference = schedule_item.conference
+    user = User.objects.get(id=user_id)
+
+    email_template = EmailTemplate.objects.for_conference(conference).get_by_identifier(
+        EmailTemplateIdentifier.schedule_item_waitlist_spot_booked
+    )
+    email_template.send_email(
+        recipient=user,
+        placeholders={
+            "conference_name": conference.name.localize("en"),
+            "user_name": get_name(user, "there"),
+            "schedule_item_title": schedule_item.title,
+            "schedule_item_url": urljoin(
+                settings.FRONTEND_URL, f"/event/{schedule_item.slug}"
+            ),
+        },
+    )
+
+
 @app.task
 def notify_new_schedule_invitation_answer_slack(
     *, schedule_item_id, invitation_admin_url, schedule_item_admin_url
@@ -240,7 +281,9 @@ def send_schedule_invitation_plain_message(*, schedule_item_id, message):
     schedule_item.save(update_fields=["plain_thread_id"])
 
 
-def upload_schedule_item_video(*, sent_for_video_upload_state_id: int):
+def upload_schedule_item_video(
+    *, sent_for_video_upload_state_id: int, credentials: Credentials | None = None
+):
     sent_for_video_upload = ScheduleItemSentForVideoUpload.objects.get(
         id=sent_for_video_upload_state_id
     )
@@ -279,6 +322,7 @@ def upload_schedule_item_video(*, sent_for_video_upload_state_id: int):
             description=video_info.description,
             tags=video_info.tags_as_str,
             file_path=local_video_path,
+            credentials=credentials,
         ):
             logger.info(
                 "schedule_item_id=%s Video uploading: %s", schedule_item.id, response
@@ -310,6 +354,7 @@ def upload_schedule_item_video(*, sent_for_video_upload_state_id: int):
             youtube_videos_set_thumbnail(
                 video_id=video_id,
                 thumbnail_path=thumbnail_path,
+                credentials=credentials,
             )
         except HttpError as e:
             if e.status_code == 429:
@@ -358,6 +403,65 @@ def upload_schedule_item_video(*, sent_for_video_upload_state_id: int):
     sent_for_video_upload.save(update_fields=["status"])
 
 
+@dataclass
+class VideoUploadLane:
+    """One Google account uploading a video at a time. `uploads_left` is
+    None when no account had quota left and the SDK picks one per call."""
+
+    credentials: Credentials | None
+    uploads_left: int | None
+
+    @property
+    def can_upload(self) -> bool:
+        return self.uploads_left is None or self.uploads_left > 0
+
+
+def get_video_upload_lanes() -> list[VideoUploadLane]:
+    lanes = [
+        VideoUploadLane(
+            credentials=credentials,
+            uploads_left=quota_left // YOUTUBE_VIDEO_UPLOAD_QUOTA,
+        )
+        for credentials, quota_left in get_all_available_credentials(
+            "youtube", YOUTUBE_VIDEO_UPLOAD_QUOTA
+        )
+    ]
+
+    # With no account left a single lane still runs, so that the first
+    # upload raises NoGoogleCloudQuotaLeftError and processing stops
+    return lanes or [VideoUploadLane(credentials=None, uploads_left=None)]
+
+
+def prefetch_video_file(sent_for_video_upload_state) -> None:
+    schedule_item = sent_for_video_upload_state.schedule_item
+
+    try:
+        download_video_file(schedule_item.id, schedule_item.video_uploaded_path)
+    except Exception:
+        # The upload downloads the file again and reports the error
+        logger.exception(
+            "Unable to prefetch the video of schedule_item_id=%s", schedule_item.id
+        )
+
+
+def upload_prefetched_schedule_item_video(
+    sent_for_video_upload_state_id: int,
+    credentials: Credentials | None,
+    prefetch: Future | None,
+):
+    try:
+        if prefetch:
+            prefetch.result()
+
+        upload_schedule_item_video(
+            sent_for_video_upload_state_id=sent_for_video_upload_state_id,
+            credentials=credentials,
+        )
+    finally:
+        # Each upload thread opens its own connection
+        connection.close()
+
+
 @app.task(base=OnlyOneAtTimeTask)
 def process_schedule_items_videos_to_upload():
     statuses = (
@@ -372,33 +476,96 @@ def process_schedule_items_videos_to_upload():
         .order_by("last_attempt_at")
     )
 
-    for sent_for_video_upload_state in statuses.iterator():
-        try:
-            upload_schedule_item_video(
-                sent_for_video_upload_state_id=sent_for_video_upload_state.id
-            )
-        except NoGoogleCloudQuotaLeftError:
-            logger.info(
-                "No google cloud quota left to upload the schedule item %s. Moving back to pending and stopping processing.",
-                sent_for_video_upload_state.schedule_item.id,
-            )
-            sent_for_video_upload_state.status = (
-                ScheduleItemSentForVideoUpload.Status.pending
-            )
-            sent_for_video_upload_state.failed_reason = "No Google Cloud Quota Left"
-            sent_for_video_upload_state.save(update_fields=["status", "failed_reason"])
-            break
-        except Exception as e:
-            logger.exception(
-                "Error processing schedule item %s video upload: %s",
-                sent_for_video_upload_state.schedule_item.id,
-                e,
-            )
-            sent_for_video_upload_state.status = (
-                ScheduleItemSentForVideoUpload.Status.failed
+    to_upload = deque(statuses)
+
+    if not to_upload:
+        return
+
+    # Uploads run in parallel, one for each account with quota left, while
+    # the videos next in line are downloaded from S3
+    idle_lanes = deque(get_video_upload_lanes())
+    upload_executor = ThreadPoolExecutor(max_workers=len(idle_lanes))
+    prefetch_executor = ThreadPoolExecutor(max_workers=len(idle_lanes))
+    prefetches = {}
+    uploads = {}
+
+    def prefetch(sent_for_video_upload_state):
+        if sent_for_video_upload_state.video_uploaded:
+            return None
+
+        if sent_for_video_upload_state.id not in prefetches:
+            prefetches[sent_for_video_upload_state.id] = prefetch_executor.submit(
+                prefetch_video_file, sent_for_video_upload_state
             )
-            sent_for_video_upload_state.failed_reason = str(e)
-            sent_for_video_upload_state.save(update_fields=["status", "failed_reason"])
+
+        return prefetches[sent_for_video_upload_state.id]
+
+    try:
+        while to_upload or uploads:
+            while idle_lanes and to_upload:
+                lane = idle_lanes.popleft()
+                sent_for_video_upload_state = to_upload.popleft()
+
+                if lane.uploads_left is not None:
+                    lane.uploads_left -= 1
+
+                future = upload_executor.submit(
+                    upload_prefetched_schedule_item_video,
+                    sent_for_video_upload_state.id,
+                    lane.credentials,
+                    prefetch(sent_for_video_upload_state),
+                )
+                uploads[future] = (lane, sent_for_video_upload_state)
+
+                for next_state in list(to_upload)[:VIDEO_PREFETCH_COUNT]:
+                    prefetch(next_state)
+
+            if not uploads:
+                break
+
+            done, _ = wait(uploads, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                lane, sent_for_video_upload_state = uploads.pop(future)
+
+                try:
+                    future.result()
+                except NoGoogleCloudQuotaLeftError:
+                    logger.info(
+                        "No google cloud quota left to upload the schedule item %s. Moving back to pending and stopping processing.",
+                        sent_for_video_upload_state.schedule_item.id,
+                    )
+                    sent_for_video_upload_state.status = (
+                        ScheduleItemSentForVideoUpload.Status.pending
+                    )
+                    sent_for_video_upload_state.failed_reason = (
+                        "No Google Cloud Quota Left"
+                    )
+                    sent_for_video_upload_state.save(
+                        update_fields=["status", "failed_reason"]
+                    )
+                    continue
+                except Exception as e:
+                    logger.exception(
+                        "Error processing schedule item %s video upload: %s",
+                        sent_for_video_upload_state.schedule_item.id,
+                        e,
+                    )
+                    sent_for_video_upload_state.status = (
+                        ScheduleItemSentForVideoUpload.Status.failed
+                    )
+                    sent_for_video_upload_state.failed_reason = str(e)
+                    sent_for_video_upload_state.save(
+                        update_fields=["status", "failed_reason"]
+                    )
+
+                if lane.can_upload:
+                    idle_lanes.append(lane)
+    finally:
+        # Videos prefetched for uploads that did not start stay on disk and
+        # are reused by the next run
+        prefetch_executor.shutdown(cancel_futures=True)
+        upload_executor.shutdown()
 
 
 @app.task
@@ -0,0 +1,126 @@
+from schedule.booking import (
+    BookingStatus,
+    book_schedule_item,
+    cancel_booking,
+    get_user_waitlist_positions,
+    get_waitlist_position,
+)
+from schedule.models import ScheduleItemAttendee, ScheduleItemWaitlistEntry
+from schedule.tests.factories import ScheduleItemAttendeeFactory, ScheduleItemFactory
+from users.tests.factories import UserFactory
+import pytest
+
+pytestmark = pytest.mark.django_db
+
+
+def test_book_schedule_item():
+    schedule_item = ScheduleItemFactory(attendees_total_capacity=2)
+    user = UserFactory()
+
+    result = book_schedule_item(schedule_item.id, user.id)
+
+    assert result.status == BookingStatus.BOOKED
+    assert result.schedule_item == schedule_item
+    assert ScheduleItemAttendee.objects.filter(
+        schedule_item=schedule_item, user=user
+    ).exists()
+
+
+def test_booking_twice_is_a_no_op():
+    schedule_item = ScheduleItemFactory(attendees_total_capacity=2)
+    user = UserFactory()
+
+    book_schedule_item(schedule_item.id, user.id)
+    result = book_schedule_item(schedule_item.id, user.id)
+
+    assert result.status == BookingStatus.ALREADY_BOOKED
+    assert schedule_item.attendees.count() == 1
+
+
+def test_cannot_book_item_without_capacity():
+    schedule_item = ScheduleItemFactory(attendees_total_capacity=None)
+
+    result = book_schedule_item(schedule_item.id, UserFactory().id)
+
+    assert result.status == BookingStatus.NOT_BOOKABLE
+    assert not schedule_item.attendees.exists()
+
+
+def test_full_item_puts_users_in_the_waitlist():
+    schedule_item = ScheduleItemFactory(attendees_total_capacity=1)
+    ScheduleItemAttendeeFactory(schedule_item=schedule_item)
+    first, second = UserFactory(), UserFactory()
+
+    first_result = book_schedule_item(schedule_item.id, first.id)
+    second_result = book_schedule_item(schedule_item.id, second.id)
+    retried_result = book_schedule_item(schedule_item.id, first.id)
+
+    assert first_result.status == BookingStatus.WAITLISTED
+    assert first_result.waitlist_position == 1
+    assert second_result.waitlist_position == 2
+    assert retried_result.waitlist_position == 1
+    assert schedule_item.attendees.count() == 1
+    assert schedule_item.waitlist_entries.count() == 2
+
+
+def test_get_waitlist_positions():
+    schedule_item = ScheduleItemFactory(attendees_total_capacity=1)
+    other_schedule_item = ScheduleItemFactory(
+        attendees_total_capacity=1, conference=schedule_item.conference
+    )
+    ScheduleItemAttendeeFactory(schedule_item=schedule_item)
+    ScheduleItemAttendeeFactory(schedule_item=other_schedule_item)
+    first, second = UserFactory(), UserFactory()
+    book_schedule_item(schedule_item.id, first.id)
+    book_schedule_item(schedule_item.id, second.id)
+    book_schedule_item(other_schedule_item.id, second.id)
+
+    assert get_waitlist_position(schedule_item.id, second.id) == 2
+    assert get_waitlist_position(other_schedule_item.id, first.id) is None
+    assert get_user_waitlist_positions(schedule_item.conference_id, second.id) == {
+        schedule_item.id: 2,
+        other_schedule_item.id: 1,
+    }
+
+
+def test_cancel_booking_gives_the_spot_to_the_waitlist(
+    mocker, django_capture_on_commit_callbacks
+):
+    mock_send_email = mocker.patch(
+        "schedule.booking.send_schedule_item_waitlist_spot_booked_email"
+    )
+    schedule_item = ScheduleItemFactory(attendees_total_capacity=1)
+    attendee = ScheduleItemAttendeeFactory(schedule_item=schedule_item)
+    first, second = UserFactory(), UserFactory()
+    book_schedule_item(schedule_item.id, first.id)
+    book_schedule_item(schedule_item.id, second.id)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert cancel_booking(schedule_item, attendee.user_id)
+
+    assert list(schedule_item.attendees.values_list("user_id", flat=True)) == [first.id]
+    assert list(
+        ScheduleItemWaitlistEntry.objects.values_list("user_id", flat=True)
+    ) == [second.id]
+    mock_send_email.delay.assert_called_once_with(
+        schedule_item_id=schedule_item.id, user_id=first.id
+    )
+
+
+def test_cancel_booking_removes_user_from_waitlist():
+    schedule_item = ScheduleItemFactory(attendees_total_capacity=1)
+    ScheduleItemAttendeeFactory(schedule_item=schedule_item)
+    user = UserFactory()
+    book_schedule_item(schedule_item.id, user.id)
+
+    assert cancel_booking(schedule_item, user.id)
+
+    assert not schedule_item.waitlist_entries.exists()
+    assert schedule_item.attendees.count() == 1
+    assert get_waitlist_position(schedule_item.id, user.id) is None
+
+
+def test_cancel_booking_of_user_not_booked():
+    schedule_item = ScheduleItemFactory(attendees_total_capacity=1)
+
+    assert not cancel_booking(schedule_item, UserFactory().id)
@@ -0,0 +1,98 @@
+import datetime
+
+from conferences.tests.factories import ConferenceFactory
+from schedule.revisions import bump_schedule_revision, get_schedule_revision
+from schedule.tests.factories import (
+    DayFactory,
+    RoomFactory,
+    ScheduleItemFactory,
+    SlotFactory,
+)
+import pytest
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+
+
+def test_revision_is_stable_until_bumped(
+    locmem_cache, django_capture_on_commit_callbacks
+):
+    conference = ConferenceFactory()
+    other_conference = ConferenceFactory()
+
+    revision = get_schedule_revision(conference.id)
+    other_revision = get_schedule_revision(other_conference.id)
+
+    assert get_schedule_revision(conference.id) == revision
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bump_schedule_revision(conference.id)
+
+        # Nothing changes until the transaction commits
+        assert get_schedule_revision(conference.id) == revision
+
+    assert get_schedule_revision(conference.id) > revision
+    assert get_schedule_revision(other_conference.id) == other_revision
+
+
+def test_saving_schedule_item_bumps_revision(
+    locmem_cache, django_capture_on_commit_callbacks
+):
+    schedule_item = ScheduleItemFactory()
+    revision = get_schedule_revision(schedule_item.conference_id)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        schedule_item.title = "New title"
+        schedule_item.save()
+
+    assert get_schedule_revision(schedule_item.conference_id) > revision
+
+
+def test_changing_schedule_item_rooms_bumps_revision(
+    locmem_cache, django_capture_on_commit_callbacks
+):
+    schedule_item = ScheduleItemFactory()
+    revision = get_schedule_revision(schedule_item.conference_id)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        schedule_item.rooms.add(RoomFactory())
+
+    assert get_schedule_revision(schedule_item.conference_id) > revision
+
+
+def test_saving_and_deleting_slot_bumps_revision(
+    locmem_cache, django_capture_on_commit_callbacks
+):
+    conference = ConferenceFactory()
+    slot = SlotFactory(
+        day=DayFactory(conference=conference), hour=datetime.time(10, 0), duration=30
+    )
+    revision = get_schedule_revision(conference.id)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        slot.duration = 45
+        slot.save()
+
+    after_save = get_schedule_revision(conference.id)
+    assert after_save > revision
+
+    with django_capture_on_commit_callbacks(execute=True):
+        slot.delete()
+
+    assert get_schedule_revision(conference.id) > after_save
+
+
+def test_saving_day_bumps_revision(locmem_cache, django_capture_on_commit_callbacks):
+    day = DayFactory(conference=ConferenceFactory())
+    revision = get_schedule_revision(day.conference_id)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        day.save()
+
+    assert get_schedule_revision(day.conference_id) > revision
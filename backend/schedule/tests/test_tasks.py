@@ -1,6 +1,7 @@
 from conferences.models.conference_voucher import ConferenceVoucher
 from notifications.tests.factories import EmailTemplateFactory
 from google_api.exceptions import NoGoogleCloudQuotaLeftError
+from google_api.models import GoogleCloudOAuthCredential, GoogleCloudToken
 from googleapiclient.errors import HttpError
 import numpy as np
 from io import BytesIO
@@ -19,6 +20,7 @@ from schedule.tasks import (
     process_schedule_items_videos_to_upload,
     send_schedule_invitation_email,
     send_schedule_invitation_plain_message,
+    send_schedule_item_waitlist_spot_booked_email,
     send_speaker_communication_email,
     send_submission_time_slot_changed_email,
     upload_schedule_item_video,
@@ -186,6 +188,39 @@ def test_send_submission_time_slot_changed_email(sent_emails):
     assert sent_email.placeholders["conference_name"] == "Conf"
 
 
+def test_send_schedule_item_waitlist_spot_booked_email(settings, sent_emails):
+    settings.FRONTEND_URL = "https://frontend"
+    user = UserFactory(full_name="Marco Acierno", name="Marco", username="marco")
+    schedule_item = ScheduleItemFactory(
+        title="Workshop",
+        slug="workshop",
+        conference__name=LazyI18nString({"en": "Conf"}),
+        type=ScheduleItem.TYPES.training,
+    )
+
+    EmailTemplateFactory(
+        conference=schedule_item.conference,
+        identifier=EmailTemplateIdentifier.schedule_item_waitlist_spot_booked,
+    )
+
+    send_schedule_item_waitlist_spot_booked_email(
+        schedule_item_id=schedule_item.id, user_id=user.id
+    )
+
+    emails_sent = sent_emails()
+    assert emails_sent.count() == 1
+
+    sent_email = emails_sent.first()
+    assert sent_email.recipient == user
+    assert sent_email.placeholders["user_name"] == "Marco Acierno"
+    assert sent_email.placeholders["schedule_item_title"] == "Workshop"
+    assert (
+        sent_email.placeholders["schedule_item_url"]
+        == "https://frontend/event/workshop"
+    )
+    assert sent_email.placeholders["conference_name"] == "Conf"
+
+
 @pytest.mark.parametrize(
     "status",
     [
@@ -402,7 +437,7 @@ def test_process_schedule_items_videos_to_upload(mocker):
         process_schedule_items_videos_to_upload()
 
     mock_process.assert_called_once_with(
-        sent_for_video_upload_state_id=sent_for_upload_1.id
+        sent_for_video_upload_state_id=sent_for_upload_1.id, credentials=None
     )
     mock_process.reset()
 
@@ -412,8 +447,12 @@ def test_process_schedule_items_videos_to_upload(mocker):
 
     mock_process.assert_has_calls(
         [
-            mock.call(sent_for_video_upload_state_id=sent_for_upload_1.id),
-            mock.call(sent_for_video_upload_state_id=sent_for_upload_2.id),
+            mock.call(
+                sent_for_video_upload_state_id=sent_for_upload_1.id, credentials=None
+            ),
+            mock.call(
+                sent_for_video_upload_state_id=sent_for_upload_2.id, credentials=None
+            ),
         ],
         any_order=True,
     )
@@ -441,7 +480,7 @@ def test_process_schedule_items_videos_stops_processing_when_the_quota_is_finish
         process_schedule_items_videos_to_upload()
 
     mock_process.assert_called_once_with(
-        sent_for_video_upload_state_id=sent_for_upload_1.id
+        sent_for_video_upload_state_id=sent_for_upload_1.id, credentials=None
     )
     mock_process.reset()
 
@@ -449,6 +488,75 @@ def test_process_schedule_items_videos_stops_processing_when_the_quota_is_finish
     assert sent_for_upload_1.status == ScheduleItemSentForVideoUpload.Status.pending
 
 
+def test_process_schedule_items_videos_splits_uploads_across_accounts(
+    mocker, admin_user
+):
+    mock_process = mocker.patch("schedule.tasks.upload_schedule_item_video")
+    mocker.patch("schedule.tasks.download_video_file")
+
+    # Quota for two uploads
+    credential_1 = GoogleCloudOAuthCredential.objects.create(
+        client_id="client_1", quota_limit_for_youtube=3_500
+    )
+    GoogleCloudToken.objects.create(
+        oauth_credential=credential_1,
+        client_id="client_1",
+        token="token1",
+        admin_user=admin_user,
+    )
+    # Quota for one upload
+    credential_2 = GoogleCloudOAuthCredential.objects.create(
+        client_id="client_2", quota_limit_for_youtube=2_000
+    )
+    GoogleCloudToken.objects.create(
+        oauth_credential=credential_2,
+        client_id="client_2",
+        token="token2",
+        admin_user=admin_user,
+    )
+
+    ScheduleItemSentForVideoUploadFactory.create_batch(
+        4,
+        last_attempt_at=None,
+        status=ScheduleItemSentForVideoUpload.Status.pending,
+    )
+
+    with time_machine.travel("2020-01-01 10:30:00Z", tick=False):
+        process_schedule_items_videos_to_upload()
+
+    used_client_ids = sorted(
+        call.kwargs["credentials"].client_id for call in mock_process.call_args_list
+    )
+    assert used_client_ids == ["client_1", "client_1", "client_2"]
+
+
+def test_process_schedule_items_videos_prefetches_videos_to_upload(mocker):
+    mock_process = mocker.patch("schedule.tasks.upload_schedule_item_video")
+    mock_download = mocker.patch("schedule.tasks.download_video_file")
+
+    sent_for_upload_1 = ScheduleItemSentForVideoUploadFactory(
+        last_attempt_at=None,
+        status=ScheduleItemSentForVideoUpload.Status.pending,
+        video_uploaded=False,
+        schedule_item__video_uploaded_path="videos/1.mp4",
+    )
+    # Only the thumbnail is missing, read from the remote file
+    ScheduleItemSentForVideoUploadFactory(
+        last_attempt_at=None,
+        status=ScheduleItemSentForVideoUpload.Status.pending,
+        video_uploaded=True,
+        schedule_item__video_uploaded_path="videos/2.mp4",
+    )
+
+    with time_machine.travel("2020-01-01 10:30:00Z", tick=False):
+        process_schedule_items_videos_to_upload()
+
+    mock_download.assert_called_once_with(
+        sent_for_upload_1.schedule_item.id, "videos/1.mp4"
+    )
+    assert mock_process.call_count == 2
+
+
 def test_failing_to_process_schedule_items_videos_to_upload_sets_failed_status(mocker):
     mock_process = mocker.patch(
         "schedule.tasks.upload_schedule_item_video",
@@ -464,7 +572,7 @@ def test_failing_to_process_schedule_items_videos_to_upload_sets_failed_status(m
         process_schedule_items_videos_to_upload()
 
     mock_process.assert_called_once_with(
-        sent_for_video_upload_state_id=sent_for_upload.id
+        sent_for_video_upload_state_id=sent_for_upload.id, credentials=None
     )
 
     sent_for_upload.refresh_from_db()
@@ -539,9 +647,10 @@ def test_upload_schedule_item_video_flow(mocker):
         description="Test Description",
         tags="",
         file_path=mock.ANY,
+        credentials=None,
     )
     mock_yt_set_thumbnail.assert_called_with(
-        video_id="vid_123", thumbnail_path=mock.ANY
+        video_id="vid_123", thumbnail_path=mock.ANY, credentials=None
     )
 
     sent_for_upload.refresh_from_db()
@@ -623,7 +732,9 @@ def test_upload_schedule_item_with_only_thumbnail_to_upload(mocker):
     )
 
     mock_yt_insert.assert_not_called()
-    mock_yt_set_thumbnail.assert_called_with(video_id="vid_10", thumbnail_path=mock.ANY)
+    mock_yt_set_thumbnail.assert_called_with(
+        video_id="vid_10", thumbnail_path=mock.ANY, credentials=None
+    )
 
     sent_for_upload.refresh_from_db()
     assert sent_for_upload.attempts == 1
@@ -954,9 +1065,10 @@ def test_upload_schedule_item_video_with_failing_thumbnail_is_rescheduled(mocker
         description="Test Description",
         tags="",
         file_path=mock.ANY,
+        credentials=None,
     )
     mock_yt_set_thumbnail.assert_called_with(
-        video_id="vid_123", thumbnail_path=mock.ANY
+        video_id="vid_123", thumbnail_path=mock.ANY, credentials=None
     )
 
     sent_for_upload.refresh_from_db()
@@ -1,11 +1,19 @@
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
 from i18n.strings import LazyI18nString
+import numpy as np
 
 from schedule.models import ScheduleItem
 from schedule.tests.factories import (
     ScheduleItemFactory,
 )
 import pytest
-from schedule.video_upload import create_video_info
+from schedule.video_upload import (
+    create_video_info,
+    download_video_file,
+    extract_video_thumbnail,
+    get_video_file_name,
+)
 
 
 pytestmark = pytest.mark.django_db
@@ -191,3 +199,51 @@ def test_create_video_info_tags():
 
     assert output.tags == ["DjangoGirls", "tag2", "php53"]
     assert output.tags_as_str == "DjangoGirls,tag2,php53"
+
+
+def test_download_video_file_reuses_the_local_copy():
+    storages["default"].save("videos/reuse.mp4", ContentFile(b"video"))
+    local_storage = storages["localstorage"]
+    local_storage.save(get_video_file_name(1), ContentFile(b"local"))
+
+    path = download_video_file(1, "videos/reuse.mp4")
+
+    assert path == local_storage.path(get_video_file_name(1))
+    with local_storage.open(get_video_file_name(1)) as f:
+        assert f.read() == b"local"
+
+    local_storage.delete(get_video_file_name(1))
+
+
+def test_download_video_file_replaces_a_partial_local_copy():
+    storages["default"].save("videos/partial.mp4", ContentFile(b"full video"))
+    local_storage = storages["localstorage"]
+    local_storage.save(get_video_file_name(2), ContentFile(b"full"))
+
+    download_video_file(2, "videos/partial.mp4")
+
+    with local_storage.open(get_video_file_name(2)) as f:
+        assert f.read() == b"full video"
+
+    local_storage.delete(get_video_file_name(2))
+
+
+def test_extract_video_thumbnail_reads_remote_videos_from_their_url(mocker):
+    video_storage = storages["default"]
+    mocker.patch.object(video_storage, "is_remote", True, create=True)
+    mocker.patch.object(
+        video_storage, "url", return_value="https://cdn.example.org/videos/a.mp4"
+    )
+    mock_capture = mocker.patch("schedule.video_upload.cv2.VideoCapture")
+    mock_capture.return_value.read.return_value = (
+        True,
+        np.zeros((2, 2, 3), dtype=np.uint8),
+    )
+
+    thumbnail_path = extract_video_thumbnail("videos/a.mp4", 3)
+
+    mock_capture.assert_called_once_with("https://cdn.example.org/videos/a.mp4")
+    assert not storages["localstorage"].exists(get_video_file_name(3))
+    assert thumbnail_path == storages["localstorage"].path("3-thumbnail.jpg")
+
+    storages["localstorage"].delete("3-thumbnail.jpg")
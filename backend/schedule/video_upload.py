@@ -67,12 +67,36 @@ def download_video_file(id: int, path: str) -> str:
     local_storage = storages["localstorage"]
 
     filename = get_video_file_name(id)
-    if not local_storage.exists(filename):
-        local_storage.save(filename, video_storage.open(path))
 
+    # A copy left by a previous run (or prefetched by this one) is reused,
+    # unless it is a partial download from a run that was interrupted
+    if local_storage.exists(filename):
+        if local_storage.size(filename) == video_storage.size(path):
+            return local_storage.path(filename)
+
+        local_storage.delete(filename)
+
+    local_storage.save(filename, video_storage.open(path))
     return local_storage.path(filename)
 
 
+def get_video_source(id: int, remote_video_path: str) -> str:
+    local_storage = storages["localstorage"]
+    video_file_name = get_video_file_name(id)
+
+    if local_storage.exists(video_file_name):
+        return local_storage.path(video_file_name)
+
+    video_storage = storages["default"]
+
+    if video_storage.is_remote:
+        # OpenCV streams the video over HTTP with range requests, reading
+        # only what it needs to decode the first frame
+        return video_storage.url(remote_video_path)
+
+    return video_storage.path(remote_video_path)
+
+
 def extract_video_thumbnail(remote_video_path: str, id: int) -> str:
     local_storage = storages["localstorage"]
     thumbnail_file_name = get_thumbnail_file_name(id)
@@ -81,10 +105,12 @@ def extract_video_thumbnail(remote_video_path: str, id: int) -> str:
     if local_storage.exists(thumbnail_file_name):
         return file_path
 
-    local_video_path = download_video_file(id, remote_video_path)
+    video_capture = cv2.VideoCapture(get_video_source(id, remote_video_path))
 
-    video_capture = cv2.VideoCapture(local_video_path)
-    success, image = video_capture.read()
+    try:
+        success, image = video_capture.read()
+    finally:
+        video_capture.release()
 
     if not success:
         raise ValueError("Unable to extract frame")
@@ -1,5 +1,5 @@
 from django.core import exceptions
-from django.db import models
+from django.db import models, transaction
 from django.urls import reverse
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
@@ -11,6 +11,9 @@ from i18n.fields import I18nCharField, I18nTextField
 
 from .querysets import SubmissionQuerySet
 
+# Fields used to compute the submission embedding, see reviews.embeddings
+EMBEDDING_FIELDS = {"title", "elevator_pitch", "abstract"}
+
 
 class SubmissionTag(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -199,8 +202,31 @@ class Submission(TimeStampedModel):
             if update_fields:
                 update_fields.append("slug")
 
+        is_new = self._state.adding
+
         super().save(*args, **kwargs)
 
+        if update_fields is None or EMBEDDING_FIELDS.intersection(update_fields):
+            transaction.on_commit(self._update_embedding)
+
+        if is_new and self.speaker_id:
+            from voting.eligibility import invalidate_voting_eligibility
+
+            # Speakers can vote
+            invalidate_voting_eligibility(self.speaker_id)
+
+    def _update_embedding(self):
+        from reviews.cache_keys import get_content_hash
+        from reviews.models import SubmissionEmbedding
+        from reviews.tasks import schedule_submission_embeddings_update
+
+        if SubmissionEmbedding.objects.filter(
+            submission_id=self.id, content_hash=get_content_hash(self)
+        ).exists():
+            return
+
+        schedule_submission_embeddings_update()
+
     @property
     def current_or_pending_status(self):
         return self.pending_status or self.status
@@ -5,7 +5,7 @@ from django.db import transaction
 
 from pycon.tasks import check_pending_heavy_processing_work
 from video_uploads.tasks import process_videos_import_request
-from video_uploads.models import VideosImportRequest
+from video_uploads.models import VideosImportFile, VideosImportRequest
 from video_uploads.transfer import UnsupportedVideoImportUrlError, get_processing_class
 
 
@@ -44,9 +44,24 @@ class VideosImportRequestAdminForm(forms.ModelForm):
         return source_url
 
 
+class VideosImportFileInline(admin.TabularInline):
+    model = VideosImportFile
+    fields = ("source_path", "size", "status", "uploaded_parts")
+    readonly_fields = fields
+    can_delete = False
+    extra = 0
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def uploaded_parts(self, obj):
+        return obj.parts.count()
+
+
 @admin.register(VideosImportRequest)
 class VideosImportRequestAdmin(admin.ModelAdmin):
     form = VideosImportRequestAdminForm
+    inlines = [VideosImportFileInline]
     list_display = [
         "conference",
         "status",
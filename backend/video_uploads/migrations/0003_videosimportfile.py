@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:26
+
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_uploads', '0002_rename_wetransfertos3transferrequest_videosimportrequest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VideosImportFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('source_path', models.CharField(max_length=1024, verbose_name='Source path')),
+                ('size', models.BigIntegerField(verbose_name='Size')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done')], default='pending', max_length=10)),
+                ('upload_id', models.CharField(blank=True, max_length=1024, verbose_name='Multipart upload ID')),
+                ('part_size', models.BigIntegerField(blank=True, null=True, verbose_name='Part size')),
+                ('imported_files', models.JSONField(blank=True, null=True, verbose_name='Imported files')),
+                ('videos_import_request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='files', to='video_uploads.videosimportrequest', verbose_name='videos import request')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='VideosImportFilePart',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('part_number', models.PositiveIntegerField(verbose_name='Part number')),
+                ('etag', models.CharField(max_length=256, verbose_name='ETag')),
+                ('file', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='parts', to='video_uploads.videosimportfile', verbose_name='file')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='videosimportfile',
+            constraint=models.UniqueConstraint(fields=('videos_import_request', 'source_path'), name='unique_source_path_per_videos_import_request'),
+        ),
+        migrations.AddConstraint(
+            model_name='videosimportfilepart',
+            constraint=models.UniqueConstraint(fields=('file', 'part_number'), name='unique_part_number_per_videos_import_file'),
+        ),
+    ]
@@ -26,3 +26,62 @@ class VideosImportRequest(TimeStampedModel):
 
     started_at = models.DateTimeField("Started at", blank=True, null=True)
     finished_at = models.DateTimeField("Finished at", blank=True, null=True)
+
+
+class VideosImportFile(TimeStampedModel):
+    """Progress of one source file of a VideosImportRequest, so that a
+    retried import skips the files already imported and resumes the
+    multipart upload of the interrupted one."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        DONE = "done"
+
+    videos_import_request = models.ForeignKey(
+        VideosImportRequest,
+        on_delete=models.CASCADE,
+        related_name="files",
+        verbose_name="videos import request",
+    )
+    source_path = models.CharField("Source path", max_length=1024)
+    size = models.BigIntegerField("Size")
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    upload_id = models.CharField("Multipart upload ID", max_length=1024, blank=True)
+    part_size = models.BigIntegerField("Part size", blank=True, null=True)
+    imported_files = models.JSONField("Imported files", blank=True, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["videos_import_request", "source_path"],
+                name="unique_source_path_per_videos_import_request",
+            )
+        ]
+
+    def __str__(self):
+        return self.source_path
+
+
+class VideosImportFilePart(models.Model):
+    """Part of a multipart upload already uploaded to S3."""
+
+    file = models.ForeignKey(
+        VideosImportFile,
+        on_delete=models.CASCADE,
+        related_name="parts",
+        verbose_name="file",
+    )
+    part_number = models.PositiveIntegerField("Part number")
+    etag = models.CharField("ETag", max_length=256)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["file", "part_number"],
+                name="unique_part_number_per_videos_import_file",
+            )
+        ]
@@ -1,18 +1,40 @@
 import logging
+import re
 from urllib.parse import parse_qs
-from pycon.constants import GB, MB
+from pycon.constants import GB, KB, MB
+import functools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+import requests
+import io
 from io import BytesIO
-from video_uploads.models import VideosImportRequest
+from video_uploads.models import (
+    VideosImportFile,
+    VideosImportFilePart,
+    VideosImportRequest,
+)
 from video_uploads.tests.factories import VideosImportRequestFactory
 import zipfile
 
 from google_api.models import GoogleCloudOAuthCredential, GoogleCloudToken
 from video_uploads.transfer import (
+    PART_DOWNLOAD_TIMEOUT,
+    ZIP_ENTRY_UPLOAD_CHUNK_SIZE,
+    ZIP_ENTRY_UPLOAD_CONCURRENCY,
+    Blob,
     DriveResourceKind,
+    FileTransfer,
     GoogleDriveProcessing,
+    RangedHTTPReader,
+    TransferJob,
+    TransferScheduler,
     UnsupportedVideoImportUrlError,
     WetransferProcessing,
+    get_part_size,
     get_processing_class,
     parse_drive_url,
 )
@@ -24,6 +46,22 @@ class FakeStorage:
     bucket_name: str = "test"
 
 
+def serve_ranges(content: bytes):
+    """requests_mock callback answering Range requests like a real server."""
+
+    def callback(request, context):
+        range_header = request.headers.get("Range")
+
+        if not range_header:
+            return content
+
+        start, end = range_header.removeprefix("bytes=").split("-")
+        context.status_code = 206
+        return content[int(start) : int(end) + 1]
+
+    return callback
+
+
 def test_transfer_process_with_single_file(requests_mock):
     from django.core.files.storage import storages
 
@@ -93,7 +131,7 @@ def test_transfer_process_with_zip(requests_mock):
     content = zip_buffer.getvalue()
 
     direct_link_mock = requests_mock.get(
-        "https://wetransfer.com/fakezip.zip", content=content
+        "https://wetransfer.com/fakezip.zip", content=serve_ranges(content)
     )
     requests_mock.head(
         "https://wetransfer.com/fakezip.zip",
@@ -119,6 +157,49 @@ def test_transfer_process_with_zip(requests_mock):
     assert set(imported_files) == {"file1.txt", "file2.txt", "nested/file.txt"}
 
 
+def test_zip_entries_jobs_count_the_upload_buffer_on_s3(requests_mock, mocker):
+    mocker.patch("video_uploads.transfer.storages")
+    mocker.patch("video_uploads.transfer.is_s3_storage", return_value=True)
+    mocker.patch("video_uploads.transfer.boto3")
+    mocker.patch("video_uploads.transfer.ZIP_ENTRY_UPLOAD_BUFFER_SIZE", 20)
+
+    zip_buffer = BytesIO()
+
+    with zipfile.ZipFile(zip_buffer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("small.txt", "0123456789")
+        # Compresses to less than the buffer, but is uploaded uncompressed
+        zf.writestr("large.txt", "a" * 100)
+
+    content = zip_buffer.getvalue()
+    requests_mock.get(
+        "https://wetransfer.com/fakezip.zip", content=serve_ranges(content)
+    )
+
+    request = VideosImportRequestFactory(
+        source_url="https://wetransfer.com/downloads/fake_transfer_id/fake_security_code",
+    )
+    process = WetransferProcessing(request)
+    process.setup()
+    transfer = FileTransfer(
+        blob=Blob(
+            filename="fakezip.zip",
+            size=len(content),
+            download_link="https://wetransfer.com/fakezip.zip",
+        )
+    )
+
+    process.add_zip_entries_jobs(transfer)
+
+    assert [job.size for job in transfer.jobs] == [10, 20]
+
+    transfer.jobs[1].run()
+
+    config = process.s3_client.upload_fileobj.call_args.kwargs["Config"]
+    assert config.max_concurrency == ZIP_ENTRY_UPLOAD_CONCURRENCY
+    assert config.max_in_memory_upload_chunks == ZIP_ENTRY_UPLOAD_CONCURRENCY
+    assert config.multipart_chunksize == ZIP_ENTRY_UPLOAD_CHUNK_SIZE
+
+
 def test_transfer_process_fails_with_expired_link(requests_mock):
     requests_mock.post(
         "https://wetransfer.com/api/v4/transfers/fake_transfer_id/download",
@@ -138,57 +219,132 @@ def test_transfer_process_fails_with_expired_link(requests_mock):
     assert str(exc.value) == "Wetransfer download link expired"
 
 
-def test_transfer_determinate_num_parts_rules():
-    process = WetransferProcessing(VideosImportRequestFactory())
-    assert process._determinate_total_num_of_parts(1) == 1
-    assert process._determinate_total_num_of_parts(10 * GB) == 4
-    assert process._determinate_total_num_of_parts(50 * GB) == 8
-    assert process._determinate_total_num_of_parts(100 * GB) == 8
-
-
 def test_transfer_determine_parts_info():
     process = WetransferProcessing(VideosImportRequestFactory())
     parts = process.determine_parts_info(100 * MB)
 
-    assert len(parts) == 1
+    assert len(parts) == 2
     assert parts[0].byte_start == 0
-    assert parts[0].byte_end == 100 * MB
+    assert parts[0].byte_end == 64 * MB
     assert parts[0].part_number == 1
 
-    parts = process.determine_parts_info(10 * GB)
+    assert parts[1].byte_start == 64 * MB
+    assert parts[1].byte_end == 100 * MB
+    assert parts[1].part_number == 2
+
+    parts = process.determine_parts_info(10 * MB)
 
-    assert len(parts) == 4
+    assert len(parts) == 1
     assert parts[0].byte_start == 0
-    assert parts[0].byte_end == 2.5 * GB
-    assert parts[0].part_number == 1
+    assert parts[0].byte_end == 10 * MB
 
-    assert parts[1].byte_start == 2.5 * GB
-    assert parts[1].byte_end == 5 * GB
-    assert parts[1].part_number == 2
 
-    assert parts[2].byte_start == 5 * GB
-    assert parts[2].byte_end == 7.5 * GB
-    assert parts[2].part_number == 3
+def test_transfer_parts_stay_within_the_s3_parts_limit():
+    process = WetransferProcessing(VideosImportRequestFactory())
+    parts = process.determine_parts_info(1000 * GB)
 
-    assert parts[3].byte_start == 7.5 * GB
-    assert parts[3].byte_end == 10 * GB
-    assert parts[3].part_number == 4
+    assert len(parts) <= 10_000
+    assert parts[0].byte_start == 0
+    assert parts[-1].byte_end == 1000 * GB
+    assert all(
+        previous.byte_end == part.byte_start for previous, part in zip(parts, parts[1:])
+    )
 
 
-def test_transfer_cleanup():
-    process = WetransferProcessing(VideosImportRequestFactory())
-    process.cleanup()
+def test_part_size_follows_the_measured_throughput():
+    assert get_part_size(100 * MB) == 64 * MB
+    # about 30 seconds of download per part
+    assert get_part_size(100 * MB, bytes_per_second=1 * MB) == 30 * MB
+    assert get_part_size(100 * MB, bytes_per_second=100 * KB) == 16 * MB
+    assert get_part_size(100 * MB, bytes_per_second=100 * MB) == 256 * MB
+    # never more parts than S3 accepts
+    assert get_part_size(5000 * GB, bytes_per_second=1 * MB) == 512 * MB
 
 
-def test_transfer_process_via_s3_and_multi_parts(requests_mock, mocker):
-    mock_getsize = mocker.patch("video_uploads.transfer.os.path.getsize")
-    mock_getsize.return_value = 500 * GB / 8
+def test_transfer_scheduler_caps_connections_and_in_flight_bytes():
+    lock = threading.Lock()
+    running = {"jobs": 0, "bytes": 0, "max_jobs": 0, "max_bytes": 0}
+
+    def make_job(size):
+        def run():
+            with lock:
+                running["jobs"] += 1
+                running["bytes"] += size
+                running["max_jobs"] = max(running["max_jobs"], running["jobs"])
+                running["max_bytes"] = max(running["max_bytes"], running["bytes"])
+
+            time.sleep(0.01)
+
+            with lock:
+                running["jobs"] -= 1
+                running["bytes"] -= size
+
+            return size
+
+        return TransferJob(size=size, run=run)
+
+    completed = []
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        scheduler = TransferScheduler(
+            executor,
+            max_connections=3,
+            max_active_files=2,
+            max_in_flight_bytes=10,
+        )
+
+        for index in range(4):
+            transfer = FileTransfer(
+                blob=Blob(filename=f"{index}.mp4", size=12, download_link=""),
+                imported_files=[f"{index}.mp4"],
+                jobs=deque(make_job(size) for size in [4, 4, 4]),
+            )
+            transfer.on_complete = functools.partial(completed.append, index)
+            scheduler.add(transfer)
+
+        imported_files = scheduler.finish()
+
+    assert imported_files == ["0.mp4", "1.mp4", "2.mp4", "3.mp4"]
+    assert sorted(completed) == [0, 1, 2, 3]
+    assert running["max_jobs"] <= 2
+    assert running["max_bytes"] <= 10
+    assert scheduler.bytes_per_second is not None
+
+
+def test_ranged_http_reader_reads_ahead():
+    content = bytes(range(100))
+    downloaded = []
+
+    def download_range(part_info):
+        downloaded.append((part_info.byte_start, part_info.byte_end))
+        return content[part_info.byte_start : part_info.byte_end]
+
+    reader = RangedHTTPReader(len(content), download_range, read_ahead=30)
 
+    reader.seek(-10, io.SEEK_END)
+    assert reader.read() == content[90:]
+
+    reader.seek(10)
+    assert reader.read(5) == content[10:15]
+    assert reader.read(5) == content[15:20]
+    assert reader.tell() == 20
+
+    assert downloaded == [(90, 100), (10, 40)]
+
+
+def test_transfer_process_via_s3_and_multi_parts(requests_mock, mocker):
+    mocker.patch("video_uploads.transfer.STREAM_PART_SIZE", 5)
     mock_storages = mocker.patch("video_uploads.transfer.storages")
     mock_storages.__getitem__.return_value.bucket_name = "bucket-name"
     mocker.patch("video_uploads.transfer.is_s3_storage", return_value=True)
     mock_boto3 = mocker.patch("video_uploads.transfer.boto3")
-    mock_subprocess = mocker.patch("video_uploads.transfer.subprocess")
+    s3_client = mock_boto3.client.return_value
+    s3_client.create_multipart_upload.return_value = {"UploadId": "upload-id"}
+    s3_client.upload_part.side_effect = lambda **kwargs: {
+        "ETag": f"etag-{kwargs['PartNumber']}"
+    }
+
+    content = b"fake file content"
 
     download_mock = requests_mock.post(
         "https://wetransfer.com/api/v4/transfers/fake_transfer_id/download",
@@ -196,10 +352,11 @@ def test_transfer_process_via_s3_and_multi_parts(requests_mock, mocker):
     )
     requests_mock.head(
         "https://wetransfer.com/fake-download-link.txt",
-        headers={"Content-Length": str(500 * GB)},
+        headers={"Content-Length": str(len(content))},
     )
-    direct_link_mock = requests_mock.get(
-        "https://wetransfer.com/fake-download-link.txt", content=b"fake file content"
+    requests_mock.get(
+        "https://wetransfer.com/fake-download-link.txt",
+        content=serve_ranges(content),
     )
 
     request = VideosImportRequestFactory(
@@ -216,19 +373,186 @@ def test_transfer_process_via_s3_and_multi_parts(requests_mock, mocker):
         "intent": "entire_transfer",
     } == download_req
 
-    assert direct_link_mock.last_request
     assert imported_files == ["fake-download-link.txt"]
-    subprocess_call_args = mock_subprocess.run.mock_calls[0][1][0]
-    assert subprocess_call_args[0] == "cat"
-    mock_boto3.client.return_value.upload_fileobj.assert_called()
-    upload_mock_call_args = mock_boto3.client.return_value.upload_fileobj.mock_calls[0][
-        1
+    remote_path = f"conference-videos/{request.conference.code}/fake-download-link.txt"
+
+    s3_client.create_multipart_upload.assert_called_once_with(
+        Bucket="bucket-name", Key=remote_path
+    )
+    uploaded_parts = sorted(
+        (call.kwargs["PartNumber"], call.kwargs["Body"])
+        for call in s3_client.upload_part.call_args_list
+    )
+    assert uploaded_parts == [
+        (1, b"fake "),
+        (2, b"file "),
+        (3, b"conte"),
+        (4, b"nt"),
     ]
-    assert upload_mock_call_args[1] == "bucket-name"
-    assert (
-        upload_mock_call_args[2]
-        == f"conference-videos/{request.conference.code}/fake-download-link.txt"
+    s3_client.complete_multipart_upload.assert_called_once_with(
+        Bucket="bucket-name",
+        Key=remote_path,
+        UploadId="upload-id",
+        MultipartUpload={
+            "Parts": [
+                {"PartNumber": number, "ETag": f"etag-{number}"}
+                for number in range(1, 5)
+            ]
+        },
     )
+    s3_client.upload_fileobj.assert_not_called()
+
+
+def test_transfer_keeps_the_multipart_upload_to_resume_it(requests_mock, mocker):
+    mock_storages = mocker.patch("video_uploads.transfer.storages")
+    mock_storages.__getitem__.return_value.bucket_name = "bucket-name"
+    mocker.patch("video_uploads.transfer.is_s3_storage", return_value=True)
+    mock_boto3 = mocker.patch("video_uploads.transfer.boto3")
+    s3_client = mock_boto3.client.return_value
+    s3_client.create_multipart_upload.return_value = {"UploadId": "upload-id"}
+
+    requests_mock.post(
+        "https://wetransfer.com/api/v4/transfers/fake_transfer_id/download",
+        json={"direct_link": "https://wetransfer.com/fake-download-link.txt"},
+    )
+    requests_mock.head(
+        "https://wetransfer.com/fake-download-link.txt",
+        headers={"Content-Length": "100"},
+    )
+    requests_mock.get("https://wetransfer.com/fake-download-link.txt", status_code=500)
+
+    request = VideosImportRequestFactory(
+        source_url="https://wetransfer.com/downloads/fake_transfer_id/fake_security_code",
+        status=VideosImportRequest.Status.QUEUED,
+    )
+
+    with pytest.raises(Exception):
+        WetransferProcessing(request).run()
+
+    s3_client.abort_multipart_upload.assert_not_called()
+    s3_client.complete_multipart_upload.assert_not_called()
+
+    progress = request.files.get()
+    assert progress.source_path == "fake-download-link.txt"
+    assert progress.status == VideosImportFile.Status.PENDING
+    assert progress.upload_id == "upload-id"
+    assert progress.size == 100
+
+
+def test_transfer_resumes_from_the_uploaded_parts(requests_mock, mocker):
+    mock_storages = mocker.patch("video_uploads.transfer.storages")
+    mock_storages.__getitem__.return_value.bucket_name = "bucket-name"
+    mocker.patch("video_uploads.transfer.is_s3_storage", return_value=True)
+    mock_boto3 = mocker.patch("video_uploads.transfer.boto3")
+    s3_client = mock_boto3.client.return_value
+    s3_client.upload_part.side_effect = lambda **kwargs: {
+        "ETag": f"etag-{kwargs['PartNumber']}"
+    }
+
+    content = b"fake file content"
+
+    requests_mock.post(
+        "https://wetransfer.com/api/v4/transfers/fake_transfer_id/download",
+        json={"direct_link": "https://wetransfer.com/fake-download-link.txt"},
+    )
+    requests_mock.head(
+        "https://wetransfer.com/fake-download-link.txt",
+        headers={"Content-Length": str(len(content))},
+    )
+    download_mock = requests_mock.get(
+        "https://wetransfer.com/fake-download-link.txt",
+        content=serve_ranges(content),
+    )
+
+    request = VideosImportRequestFactory(
+        source_url="https://wetransfer.com/downloads/fake_transfer_id/fake_security_code",
+        status=VideosImportRequest.Status.QUEUED,
+    )
+    progress = VideosImportFile.objects.create(
+        videos_import_request=request,
+        source_path="fake-download-link.txt",
+        size=len(content),
+        upload_id="previous-upload-id",
+        part_size=5,
+    )
+    VideosImportFilePart.objects.create(file=progress, part_number=1, etag="etag-1")
+    VideosImportFilePart.objects.create(file=progress, part_number=3, etag="etag-3")
+
+    imported_files = WetransferProcessing(request).run()
+
+    assert imported_files == ["fake-download-link.txt"]
+    assert sorted(sent.headers["Range"] for sent in download_mock.request_history) == [
+        "bytes=15-16",
+        "bytes=5-9",
+    ]
+
+    s3_client.create_multipart_upload.assert_not_called()
+    s3_client.complete_multipart_upload.assert_called_once_with(
+        Bucket="bucket-name",
+        Key=f"conference-videos/{request.conference.code}/fake-download-link.txt",
+        UploadId="previous-upload-id",
+        MultipartUpload={
+            "Parts": [
+                {"PartNumber": number, "ETag": f"etag-{number}"}
+                for number in range(1, 5)
+            ]
+        },
+    )
+
+    progress.refresh_from_db()
+    assert progress.status == VideosImportFile.Status.DONE
+    assert progress.imported_files == ["fake-download-link.txt"]
+    assert not progress.parts.exists()
+
+
+def test_transfer_restarts_files_whose_size_changed(requests_mock, mocker):
+    mocker.patch("video_uploads.transfer.STREAM_PART_SIZE", 5)
+    mock_storages = mocker.patch("video_uploads.transfer.storages")
+    mock_storages.__getitem__.return_value.bucket_name = "bucket-name"
+    mocker.patch("video_uploads.transfer.is_s3_storage", return_value=True)
+    mock_boto3 = mocker.patch("video_uploads.transfer.boto3")
+    s3_client = mock_boto3.client.return_value
+    s3_client.create_multipart_upload.return_value = {"UploadId": "upload-id"}
+    s3_client.upload_part.return_value = {"ETag": "etag"}
+
+    content = b"fake file content"
+
+    requests_mock.post(
+        "https://wetransfer.com/api/v4/transfers/fake_transfer_id/download",
+        json={"direct_link": "https://wetransfer.com/fake-download-link.txt"},
+    )
+    requests_mock.head(
+        "https://wetransfer.com/fake-download-link.txt",
+        headers={"Content-Length": str(len(content))},
+    )
+    requests_mock.get(
+        "https://wetransfer.com/fake-download-link.txt",
+        content=serve_ranges(content),
+    )
+
+    request = VideosImportRequestFactory(
+        source_url="https://wetransfer.com/downloads/fake_transfer_id/fake_security_code",
+        status=VideosImportRequest.Status.QUEUED,
+    )
+    progress = VideosImportFile.objects.create(
+        videos_import_request=request,
+        source_path="fake-download-link.txt",
+        size=1000,
+        upload_id="previous-upload-id",
+        part_size=500,
+    )
+    VideosImportFilePart.objects.create(file=progress, part_number=1, etag="etag-1")
+
+    WetransferProcessing(request).run()
+
+    remote_path = f"conference-videos/{request.conference.code}/fake-download-link.txt"
+    s3_client.abort_multipart_upload.assert_called_once_with(
+        Bucket="bucket-name", Key=remote_path, UploadId="previous-upload-id"
+    )
+    s3_client.create_multipart_upload.assert_called_once_with(
+        Bucket="bucket-name", Key=remote_path
+    )
+    assert s3_client.upload_part.call_count == 4
 
 
 DRIVE_TOKEN_URL = "https://oauth2.googleapis.com/token"
@@ -387,7 +711,9 @@ def test_drive_unzips_a_zip_file(requests_mock, drive_credential):
             "mimeType": "application/zip",
         },
     )
-    requests_mock.get(f"{DRIVE_FILES_URL}/ZIP_ID?alt=media", content=content)
+    requests_mock.get(
+        f"{DRIVE_FILES_URL}/ZIP_ID?alt=media", content=serve_ranges(content)
+    )
 
     request = VideosImportRequestFactory(
         source_url="https://drive.google.com/file/d/ZIP_ID/view",
@@ -458,8 +784,12 @@ def test_drive_keeps_zip_contents_inside_the_folder_holding_the_zip(
         },
     )
 
-    requests_mock.get(f"{DRIVE_FILES_URL}/ZIP1?alt=media", content=day1_zip)
-    requests_mock.get(f"{DRIVE_FILES_URL}/ZIP2?alt=media", content=day2_zip)
+    requests_mock.get(
+        f"{DRIVE_FILES_URL}/ZIP1?alt=media", content=serve_ranges(day1_zip)
+    )
+    requests_mock.get(
+        f"{DRIVE_FILES_URL}/ZIP2?alt=media", content=serve_ranges(day2_zip)
+    )
 
     request = VideosImportRequestFactory(
         source_url="https://drive.google.com/drive/folders/FOLDER_ID",
@@ -487,14 +817,16 @@ def test_drive_keeps_zip_contents_inside_the_folder_holding_the_zip(
 def test_drive_downloads_large_files_in_ranged_parts(
     requests_mock, mocker, drive_credential
 ):
-    mock_getsize = mocker.patch("video_uploads.transfer.os.path.getsize")
-    mock_getsize.return_value = 500 * GB / 8
-
+    mocker.patch("video_uploads.transfer.STREAM_PART_SIZE", 5)
     mock_storages = mocker.patch("video_uploads.transfer.storages")
     mock_storages.__getitem__.return_value.bucket_name = "bucket-name"
     mocker.patch("video_uploads.transfer.is_s3_storage", return_value=True)
-    mocker.patch("video_uploads.transfer.boto3")
-    mocker.patch("video_uploads.transfer.subprocess")
+    mock_boto3 = mocker.patch("video_uploads.transfer.boto3")
+    s3_client = mock_boto3.client.return_value
+    s3_client.create_multipart_upload.return_value = {"UploadId": "upload-id"}
+    s3_client.upload_part.return_value = {"ETag": "etag"}
+
+    content = bytes(range(40))
 
     mock_drive_auth(requests_mock)
     requests_mock.get(
@@ -502,11 +834,13 @@ def test_drive_downloads_large_files_in_ranged_parts(
         json={
             "id": "BIG_ID",
             "name": "big.mp4",
-            "size": str(500 * GB),
+            "size": str(len(content)),
             "mimeType": "video/mp4",
         },
     )
-    requests_mock.get(f"{DRIVE_FILES_URL}/BIG_ID?alt=media", content=b"chunk")
+    requests_mock.get(
+        f"{DRIVE_FILES_URL}/BIG_ID?alt=media", content=serve_ranges(content)
+    )
 
     request = VideosImportRequestFactory(
         source_url="https://drive.google.com/file/d/BIG_ID/view",
@@ -531,21 +865,31 @@ DRIVE_FOLDER_MIME = "application/vnd.google-apps.folder"
 
 
 def mock_drive_folder_listing(requests_mock, pages_by_folder_id):
-    """Answer the Drive listing endpoint based on the folder named in ?q= ."""
+    """Answer the Drive listing endpoint based on the folders named in ?q= ,
+    merging the pages of every folder in the query."""
     # requests_mock lowercases parsed query strings, so match on that.
-    pages_by_folder_id = {
-        folder_id.lower(): pages for folder_id, pages in pages_by_folder_id.items()
-    }
+    folder_ids = {folder_id.lower(): folder_id for folder_id in pages_by_folder_id}
 
     def listing(request, context):
         query = request.qs["q"][0]
-        folder_id = query.split("'")[1]
-        pages = pages_by_folder_id[folder_id]
+        queried_folder_ids = [
+            folder_ids[folder_id]
+            for folder_id in re.findall(r"'([^']+)' in parents", query)
+        ]
         page_token = request.qs.get("pagetoken", [None])[0]
         page_index = 0 if page_token is None else int(page_token)
 
-        payload = {"files": pages[page_index]}
-        if page_index + 1 < len(pages):
+        files = [
+            {**item, "parents": [folder_id]}
+            for folder_id in queried_folder_ids
+            if page_index < len(pages_by_folder_id[folder_id])
+            for item in pages_by_folder_id[folder_id][page_index]
+        ]
+        payload = {"files": files}
+        if any(
+            page_index + 1 < len(pages_by_folder_id[folder_id])
+            for folder_id in queried_folder_ids
+        ):
             payload["nextPageToken"] = str(page_index + 1)
 
         return payload
@@ -638,6 +982,141 @@ def test_drive_imports_a_folder_recursively(requests_mock, drive_credential, cap
     assert any("shortcut to talk" in message for message in skipped)
 
 
+def test_drive_lists_the_folders_of_a_level_with_one_query(
+    requests_mock, drive_credential
+):
+    mock_drive_auth(requests_mock)
+    listing_mock = mock_drive_folder_listing(
+        requests_mock,
+        {
+            "FOLDER_ID": [
+                [
+                    {"id": "DAY1", "name": "day1", "mimeType": DRIVE_FOLDER_MIME},
+                    {"id": "DAY2", "name": "day2", "mimeType": DRIVE_FOLDER_MIME},
+                ]
+            ],
+            "DAY1": [
+                [
+                    {"id": "ROOM", "name": "room-a", "mimeType": DRIVE_FOLDER_MIME},
+                    {
+                        "id": "F1",
+                        "name": "opening.mp4",
+                        "mimeType": "video/mp4",
+                        "size": "5",
+                    },
+                ]
+            ],
+            "DAY2": [
+                [
+                    {
+                        "id": "F2",
+                        "name": "closing.mp4",
+                        "mimeType": "video/mp4",
+                        "size": "5",
+                    }
+                ]
+            ],
+            "ROOM": [
+                [
+                    {
+                        "id": "F3",
+                        "name": "keynote.mp4",
+                        "mimeType": "video/mp4",
+                        "size": "5",
+                    }
+                ]
+            ],
+        },
+    )
+
+    for file_id in ["F1", "F2", "F3"]:
+        requests_mock.get(f"{DRIVE_FILES_URL}/{file_id}?alt=media", content=b"video")
+
+    request = VideosImportRequestFactory(
+        source_url="https://drive.google.com/drive/folders/FOLDER_ID",
+        status=VideosImportRequest.Status.QUEUED,
+    )
+
+    imported_files = GoogleDriveProcessing(request).run()
+
+    assert set(imported_files) == {
+        "day1/opening.mp4",
+        "day2/closing.mp4",
+        "day1/room-a/keynote.mp4",
+    }
+    # One query for each level of the tree, day1 and day2 are listed together
+    assert listing_mock.call_count == 3
+
+
+def test_drive_folder_import_skips_the_files_already_imported(
+    requests_mock, drive_credential
+):
+    from django.core.files.storage import storages
+
+    storage = storages["default"]
+
+    mock_drive_auth(requests_mock)
+    mock_drive_folder_listing(
+        requests_mock,
+        {
+            "FOLDER_ID": [
+                [
+                    {
+                        "id": "F1",
+                        "name": "keynote.mp4",
+                        "mimeType": "video/mp4",
+                        "size": "5",
+                    },
+                    {
+                        "id": "F2",
+                        "name": "lightning.mp4",
+                        "mimeType": "video/mp4",
+                        "size": "5",
+                    },
+                    {
+                        "id": "F3",
+                        "name": "closing.mp4",
+                        "mimeType": "video/mp4",
+                        "size": "5",
+                    },
+                ],
+            ],
+        },
+    )
+    media_mocks = {
+        file_id: requests_mock.get(
+            f"{DRIVE_FILES_URL}/{file_id}?alt=media", content=b"video"
+        )
+        for file_id in ["F1", "F2", "F3"]
+    }
+
+    request = VideosImportRequestFactory(
+        source_url="https://drive.google.com/drive/folders/FOLDER_ID",
+        status=VideosImportRequest.Status.QUEUED,
+    )
+    # keynote.mp4 was imported by the previous attempt, lightning.mp4 was
+    # saved but the worker died before recording it
+    VideosImportFile.objects.create(
+        videos_import_request=request,
+        source_path="keynote.mp4",
+        size=5,
+        status=VideosImportFile.Status.DONE,
+        imported_files=["keynote.mp4"],
+    )
+    storage.save(
+        f"conference-videos/{request.conference.code}/lightning.mp4",
+        BytesIO(b"video"),
+    )
+
+    imported_files = GoogleDriveProcessing(request).run()
+
+    assert set(imported_files) == {"keynote.mp4", "lightning.mp4", "closing.mp4"}
+    assert not media_mocks["F1"].called
+    assert not media_mocks["F2"].called
+    assert media_mocks["F3"].called
+    assert request.files.filter(status=VideosImportFile.Status.DONE).count() == 3
+
+
 def test_drive_imports_an_empty_folder(requests_mock, drive_credential):
     mock_drive_auth(requests_mock)
     mock_drive_folder_listing(requests_mock, {"EMPTY_ID": [[]]})
@@ -816,14 +1295,12 @@ def test_wetransfer_download_sends_no_authorization_header(requests_mock):
 
 
 def test_transfer_process_retries_downloading_parts(requests_mock, mocker):
-    mock_getsize = mocker.patch("video_uploads.transfer.os.path.getsize")
-    mock_getsize.return_value = 100
-
     mock_storages = mocker.patch("video_uploads.transfer.storages")
     mock_storages.__getitem__.return_value.bucket_name = "bucket-name"
     mocker.patch("video_uploads.transfer.is_s3_storage", return_value=True)
-    mocker.patch("video_uploads.transfer.boto3")
-    mocker.patch("video_uploads.transfer.subprocess")
+    mock_boto3 = mocker.patch("video_uploads.transfer.boto3")
+    s3_client = mock_boto3.client.return_value
+    s3_client.create_multipart_upload.return_value = {"UploadId": "upload-id"}
 
     requests_mock.post(
         "https://wetransfer.com/api/v4/transfers/fake_transfer_id/download",
@@ -831,9 +1308,9 @@ def test_transfer_process_retries_downloading_parts(requests_mock, mocker):
     )
     requests_mock.head(
         "https://wetransfer.com/fake-download-link.txt",
-        headers={"Content-Length": str(500 * GB)},
+        headers={"Content-Length": "100"},
     )
-    requests_mock.get(
+    download_mock = requests_mock.get(
         "https://wetransfer.com/fake-download-link.txt", content=b"fake file content"
     )
 
@@ -847,3 +1324,41 @@ def test_transfer_process_retries_downloading_parts(requests_mock, mocker):
         process.run()
 
     assert "Failed to download part" in str(exc.value)
+    assert download_mock.call_count == 3
+
+
+def test_transfer_process_retries_parts_that_time_out(requests_mock, mocker):
+    mock_storages = mocker.patch("video_uploads.transfer.storages")
+    mock_storages.__getitem__.return_value.bucket_name = "bucket-name"
+    mocker.patch("video_uploads.transfer.is_s3_storage", return_value=True)
+    mock_boto3 = mocker.patch("video_uploads.transfer.boto3")
+    s3_client = mock_boto3.client.return_value
+    s3_client.create_multipart_upload.return_value = {"UploadId": "upload-id"}
+    s3_client.upload_part.return_value = {"ETag": "etag-1"}
+
+    requests_mock.post(
+        "https://wetransfer.com/api/v4/transfers/fake_transfer_id/download",
+        json={"direct_link": "https://wetransfer.com/fake-download-link.txt"},
+    )
+    requests_mock.head(
+        "https://wetransfer.com/fake-download-link.txt",
+        headers={"Content-Length": "17"},
+    )
+    download_mock = requests_mock.get(
+        "https://wetransfer.com/fake-download-link.txt",
+        [
+            {"exc": requests.exceptions.ReadTimeout},
+            {"content": b"fake file content"},
+        ],
+    )
+
+    request = VideosImportRequestFactory(
+        source_url="https://wetransfer.com/downloads/fake_transfer_id/fake_security_code",
+        status=VideosImportRequest.Status.QUEUED,
+    )
+
+    WetransferProcessing(request).run()
+
+    assert download_mock.call_count == 2
+    assert download_mock.last_request.timeout == PART_DOWNLOAD_TIMEOUT
+    s3_client.upload_part.assert_called_once()
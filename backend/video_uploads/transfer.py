@@ -1,34 +1,74 @@
-from io import BufferedReader, BytesIO
-import shutil
-import subprocess
+import functools
+import io
+import math
+import time
 import zipfile
+from collections import deque
 from django.core.files.storage import storages
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
 from enum import Enum
 import os
-import tempfile
 import threading
+from typing import Any, BinaryIO, Callable, Iterable
 import requests
+import urllib3
 from urllib.parse import parse_qs, unquote, urlparse
 from google_api.exceptions import NoGoogleCloudQuotaLeftError
 from google_api.sdk import (
     DRIVE_API_URL,
+    DRIVE_PARENTS_PER_QUERY,
     drive_file_metadata,
     drive_headers,
-    drive_list_files_in_folder,
+    drive_list_files_in_folders,
     get_drive_credentials,
 )
 from pycon.storages import CustomS3Boto3Storage
-from pycon.constants import GB, MB
-from video_uploads.models import VideosImportRequest
+from pycon.constants import MB
+from video_uploads.models import (
+    VideosImportFile,
+    VideosImportFilePart,
+    VideosImportRequest,
+)
 import boto3
 import botocore
 from boto3.s3.transfer import TransferConfig
 
 logger = logging.getLogger(__name__)
 
+# Size of the ranges downloaded and uploaded as multipart upload parts,
+# until the throughput of the source is measured
+STREAM_PART_SIZE = 64 * MB
+MIN_STREAM_PART_SIZE = 16 * MB
+MAX_STREAM_PART_SIZE = 256 * MB
+# Seconds a part should take to download on one connection
+TARGET_PART_SECONDS = 30
+# Files transferred at the same time by a folder import
+MAX_ACTIVE_FILES = 8
+# Bytes of parts being downloaded or uploaded at the same time
+MAX_IN_FLIGHT_BYTES = 2 * 1024 * MB
+# Multipart settings of the zip entries uploaded by boto3, which holds up
+# to ZIP_ENTRY_UPLOAD_CONCURRENCY chunks of every entry in memory
+ZIP_ENTRY_UPLOAD_CHUNK_SIZE = 64 * MB
+ZIP_ENTRY_UPLOAD_CONCURRENCY = 4
+ZIP_ENTRY_UPLOAD_BUFFER_SIZE = (
+    ZIP_ENTRY_UPLOAD_CHUNK_SIZE * ZIP_ENTRY_UPLOAD_CONCURRENCY
+)
+# S3 accepts at most 10,000 parts in a multipart upload
+S3_MAX_PARTS = 10_000
+# Bytes downloaded ahead by RangedHTTPReader on every request
+READ_AHEAD_SIZE = 8 * MB
+PART_DOWNLOAD_ATTEMPTS = 3
+# Seconds to connect and to wait for data, a stalled download raises and
+# gets another attempt instead of hanging the worker
+PART_DOWNLOAD_TIMEOUT = (10, 60)
+
 
 def is_s3_storage(storage):
     return type(storage) is CustomS3Boto3Storage
@@ -105,17 +145,290 @@ def parse_drive_url(source_url: str) -> DriveResource:
     )
 
 
+class RangedHTTPReader(io.RawIOBase):
+    """Seekable, read-only file backed by HTTP range requests.
+
+    zipfile reads the central directory at the end of an archive and then
+    seeks to each entry, so entries can be extracted without downloading
+    the whole archive first. Reads are served from a read-ahead buffer to
+    keep the small header reads from turning into one request each.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        download_range: Callable[[PartInfo], bytes],
+        read_ahead: int = READ_AHEAD_SIZE,
+    ) -> None:
+        self.size = size
+        self.download_range = download_range
+        self.read_ahead = read_ahead
+        self.position = 0
+        self.buffer = b""
+        self.buffer_start = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        match whence:
+            case io.SEEK_SET:
+                position = offset
+            case io.SEEK_CUR:
+                position = self.position + offset
+            case io.SEEK_END:
+                position = self.size + offset
+            case _:
+                raise ValueError(f"Invalid whence {whence}")
+
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+
+        self.position = position
+        return position
+
+    def read(self, size: int = -1) -> bytes:
+        remaining = self.size - self.position
+
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+
+        if size <= 0:
+            return b""
+
+        offset = self.position - self.buffer_start
+
+        if offset < 0 or offset + size > len(self.buffer):
+            self.buffer_start = self.position
+            self.buffer = self.download_range(
+                PartInfo(
+                    part_number=1,
+                    byte_start=self.position,
+                    byte_end=min(self.size, self.position + max(size, self.read_ahead)),
+                )
+            )
+            offset = 0
+
+        data = self.buffer[offset : offset + size]
+        self.position += len(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def get_part_size(file_size: int, bytes_per_second: float | None = None) -> int:
+    """Size of the multipart upload parts of a file.
+
+    Without a throughput measure parts are STREAM_PART_SIZE, otherwise they
+    are sized to take about TARGET_PART_SECONDS on one connection, so a
+    slow link retries less data and a fast one makes fewer requests. Parts
+    grow when needed to stay within the S3 parts limit.
+    """
+    part_size = STREAM_PART_SIZE
+
+    if bytes_per_second:
+        part_size = int(bytes_per_second * TARGET_PART_SECONDS)
+        part_size = min(max(part_size, MIN_STREAM_PART_SIZE), MAX_STREAM_PART_SIZE)
+        part_size = math.ceil(part_size / MB) * MB
+
+    return max(part_size, math.ceil(file_size / S3_MAX_PARTS))
+
+
+@dataclass
+class Blob:
+    """A file to import, `filename` is its path relative to the import root."""
+
+    filename: str
+    size: int
+    download_link: str
+
+    @property
+    def extension(self) -> str:
+        return os.path.splitext(self.filename)[1]
+
+    @property
+    def directory(self) -> str:
+        """Folder holding the blob, empty at the import root."""
+        directory = os.path.dirname(self.filename)
+        return f"{directory}/" if directory else ""
+
+
+@dataclass
+class TransferJob:
+    """Unit of work run on the executor. `on_done` receives its result and
+    runs on the scheduling thread, so it can safely use the database."""
+
+    size: int
+    run: Callable[[], Any]
+    on_done: Callable[[Any], None] = lambda result: None
+
+
+@dataclass
+class FileTransfer:
+    blob: Blob
+    imported_files: list[str] = field(default_factory=list)
+    jobs: deque[TransferJob] = field(default_factory=deque)
+    running: int = 0
+    on_complete: Callable[[], None] = lambda: None
+
+    @property
+    def is_complete(self) -> bool:
+        return not self.jobs and not self.running
+
+
+class TransferScheduler:
+    """Transfers several files at once over a shared executor.
+
+    Files are added while the source is still being listed. The jobs of
+    the active files are interleaved, with at most `max_connections` jobs
+    running and `max_in_flight_bytes` held in memory. Results are handled
+    on the thread calling `add` and `finish`.
+    """
+
+    def __init__(
+        self,
+        executor: ThreadPoolExecutor,
+        *,
+        max_connections: int,
+        max_active_files: int = MAX_ACTIVE_FILES,
+        max_in_flight_bytes: int = MAX_IN_FLIGHT_BYTES,
+    ) -> None:
+        self.executor = executor
+        self.max_connections = max_connections
+        self.max_active_files = max_active_files
+        self.max_in_flight_bytes = max_in_flight_bytes
+        self.transfers: list[FileTransfer] = []
+        self.active: list[FileTransfer] = []
+        self.running: dict[Future, tuple[FileTransfer, TransferJob]] = {}
+        self.in_flight_bytes = 0
+        self.bytes_per_second: float | None = None
+        self.throughput_lock = threading.Lock()
+
+    def add(self, transfer: FileTransfer) -> None:
+        self.transfers.append(transfer)
+
+        if transfer.is_complete:
+            transfer.on_complete()
+            return
+
+        while len(self.active) >= self.max_active_files:
+            self.wait()
+
+        self.active.append(transfer)
+        self.collect(timeout=0)
+
+    def finish(self) -> list[str]:
+        while self.active:
+            self.wait()
+
+        return [
+            filename
+            for transfer in self.transfers
+            for filename in transfer.imported_files
+        ]
+
+    def cancel(self) -> None:
+        for future in self.running:
+            future.cancel()
+
+    def wait(self) -> None:
+        self.collect(timeout=None)
+
+    def collect(self, timeout: float | None) -> None:
+        self.submit()
+
+        if not self.running:
+            return
+
+        done, _ = wait(self.running, timeout=timeout, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            transfer, job = self.running.pop(future)
+            transfer.running -= 1
+            self.in_flight_bytes -= job.size
+            job.on_done(future.result())
+
+            if transfer.is_complete:
+                self.active.remove(transfer)
+                transfer.on_complete()
+
+        self.submit()
+
+    def submit(self) -> None:
+        # Round robin over the active files, so a large file doesn't starve
+        # the ones listed after it
+        submitted = True
+
+        while submitted:
+            submitted = False
+
+            for transfer in self.active:
+                if len(self.running) >= self.max_connections:
+                    return
+
+                if not transfer.jobs:
+                    continue
+
+                job = transfer.jobs[0]
+
+                if (
+                    self.in_flight_bytes
+                    and self.in_flight_bytes + job.size > self.max_in_flight_bytes
+                ):
+                    return
+
+                transfer.jobs.popleft()
+                transfer.running += 1
+                self.in_flight_bytes += job.size
+                self.running[self.executor.submit(self.timed, job)] = (transfer, job)
+                submitted = True
+
+    def timed(self, job: TransferJob):
+        started_at = time.monotonic()
+        result = job.run()
+        elapsed = time.monotonic() - started_at
+
+        if elapsed > 0:
+            self.record_throughput(job.size / elapsed)
+
+        return result
+
+    def record_throughput(self, bytes_per_second: float) -> None:
+        with self.throughput_lock:
+            if self.bytes_per_second is None:
+                self.bytes_per_second = bytes_per_second
+            else:
+                self.bytes_per_second = (
+                    0.8 * self.bytes_per_second + 0.2 * bytes_per_second
+                )
+
+    def part_size(self, file_size: int) -> int:
+        return get_part_size(file_size, self.bytes_per_second)
+
+
 class BaseTransferProcessing:
     """Shared machinery to import one or more blobs into the conference storage.
 
-    Subclasses resolve the source link and enumerate the files to import, then
-    hand each one to import_blob by setting download_link, filename, extension
-    and transfer_total_size.
+    Subclasses resolve the source link and enumerate the files to import as
+    Blob objects, then hand them to import_blobs.
+
+    Nothing is written to the local disk: on S3 each downloaded range is
+    uploaded as a part of a multipart upload, and zip entries are read
+    through ranged requests. The progress of every file is stored in
+    VideosImportFile, so a retried import resumes where it stopped.
     """
 
     def __init__(self, videos_import_request: VideosImportRequest) -> None:
         self.videos_import_request = videos_import_request
-        self.merged_file = None
 
     def run(self) -> list[str]:
         raise NotImplementedError
@@ -125,105 +438,181 @@ class BaseTransferProcessing:
         self.s3_client = self._get_s3_client()
 
     def executor(self) -> ThreadPoolExecutor:
-        return ThreadPoolExecutor(max_workers=os.cpu_count() * 2)
+        return ThreadPoolExecutor(max_workers=self.max_connections)
+
+    @property
+    def max_connections(self) -> int:
+        return os.cpu_count() * 2
 
     def download_headers(self) -> dict:
         """Headers sent with every ranged download request, merged with Range."""
         return {}
 
-    @property
-    def blob_directory(self) -> str:
-        """Folder holding the blob being imported, empty at the import root."""
-        directory = os.path.dirname(self.filename)
-        return f"{directory}/" if directory else ""
+    def import_blobs(
+        self, blobs: Iterable[Blob], executor: ThreadPoolExecutor
+    ) -> list[str]:
+        scheduler = TransferScheduler(executor, max_connections=self.max_connections)
 
-    def import_blob(self, executor: ThreadPoolExecutor) -> list[str]:
-        logger.info(
-            "Importing blob for videos_import_request %s", self.videos_import_request.id
-        )
-        parts_info = self.determine_parts_info(self.transfer_total_size)
+        try:
+            for blob in blobs:
+                scheduler.add(self.start_transfer(blob, scheduler))
 
+            return scheduler.finish()
+        except Exception:
+            scheduler.cancel()
+            raise
+
+    def start_transfer(self, blob: Blob, scheduler: TransferScheduler) -> FileTransfer:
         logger.info(
-            "Total size to download %s bytes, file parts %s for videos_import_request %s",
-            self.transfer_total_size,
-            parts_info,
+            "Importing blob %s for videos_import_request %s",
+            blob.filename,
             self.videos_import_request.id,
         )
+        progress = self.get_file_progress(blob)
+        transfer = FileTransfer(blob=blob)
 
-        self.has_multiple_parts = len(parts_info) > 1
+        if progress.status == VideosImportFile.Status.DONE:
+            logger.info(
+                "Skipping %s, already imported by videos_import_request %s",
+                blob.filename,
+                self.videos_import_request.id,
+            )
+            transfer.imported_files = progress.imported_files
+            return transfer
 
-        parts = self.download_file(parts_info, executor)
-        self.merge_parts(parts)
-        try:
-            with open(self.merged_file.name, "rb") as full_file:
-                return self.process_downloaded_file(full_file, executor)
-        finally:
-            self.cleanup()
-
-    def process_downloaded_file(
-        self, full_file: BufferedReader, executor: ThreadPoolExecutor
-    ):
-        match self.extension[1:]:
+        def on_complete():
+            if progress.upload_id:
+                self.complete_upload(blob, progress)
+
+            progress.status = VideosImportFile.Status.DONE
+            progress.imported_files = transfer.imported_files
+            progress.upload_id = ""
+            progress.save(update_fields=["status", "imported_files", "upload_id"])
+            progress.parts.all().delete()
+
+        transfer.on_complete = on_complete
+
+        match blob.extension[1:]:
             case "zip":
-                imported_files = self.process_zip_file(full_file, executor)
+                self.add_zip_entries_jobs(transfer)
             case _:
-                imported_files = [self.save_file_to_s3(self.filename, full_file)]
+                self.add_file_jobs(transfer, progress, scheduler)
 
-        return imported_files
+        return transfer
 
-    def process_zip_file(
-        self, full_file: BufferedReader, executor: ThreadPoolExecutor
-    ) -> list[str]:
-        futures = []
-        all_filenames = []
+    def get_file_progress(self, blob: Blob) -> VideosImportFile:
+        progress, created = VideosImportFile.objects.get_or_create(
+            videos_import_request=self.videos_import_request,
+            source_path=blob.filename,
+            defaults={"size": blob.size},
+        )
 
-        zip_ref = zipfile.ZipFile(full_file, "r")
-        try:
-            for file_info in zip_ref.infolist():
-                if not is_file_allowed(file_info):
-                    continue
+        if created or progress.size == blob.size:
+            return progress
 
-                filename = file_info.filename
-                futures.append(
-                    executor.submit(self.process_zip_file_obj, zip_ref, filename)
-                )
+        # The source changed since the last attempt, its parts are useless
+        logger.info(
+            "Size of %s changed from %s to %s, restarting it for videos_import_request %s",
+            blob.filename,
+            progress.size,
+            blob.size,
+            self.videos_import_request.id,
+        )
+        self.abort_upload(progress)
+        progress.size = blob.size
+        progress.status = VideosImportFile.Status.PENDING
+        progress.save(update_fields=["size", "status"])
+        return progress
+
+    def is_already_imported(self, remote_path: str, size: int) -> bool:
+        return (
+            self.storage.exists(remote_path) and self.storage.size(remote_path) == size
+        )
 
-            for future in as_completed(futures):
-                all_filenames.append(future.result())
-        finally:
-            zip_ref.close()
+    def open_blob(self, blob: Blob) -> RangedHTTPReader:
+        return RangedHTTPReader(blob.size, functools.partial(self.download_part, blob))
+
+    def add_zip_entries_jobs(self, transfer: FileTransfer) -> None:
+        blob = transfer.blob
+
+        # Only the central directory is downloaded here, entries are read
+        # by their own jobs
+        with zipfile.ZipFile(self.open_blob(blob), "r") as zip_ref:
+            entries = [
+                file_info
+                for file_info in zip_ref.infolist()
+                if is_file_allowed(file_info)
+            ]
+
+        # The uploads read the uncompressed data, buffered by boto3 on S3 and
+        # streamed by the other storages
+        buffer_size = (
+            ZIP_ENTRY_UPLOAD_BUFFER_SIZE
+            if is_s3_storage(self.storage)
+            else READ_AHEAD_SIZE
+        )
 
-        return all_filenames
+        for file_info in entries:
+            transfer.jobs.append(
+                TransferJob(
+                    size=min(file_info.file_size, buffer_size),
+                    run=functools.partial(self.process_zip_file_obj, blob, file_info),
+                    on_done=transfer.imported_files.append,
+                )
+            )
 
-    def process_zip_file_obj(self, zip_ref: zipfile.ZipFile, filename: str):
+    def process_zip_file_obj(self, blob: Blob, file_info: zipfile.ZipInfo):
+        filename = file_info.filename
         # A zip is a container: its entries belong where the zip itself sits,
         # so a zip imported from a subfolder keeps that subfolder. Without
         # this, two subfolders shipping the same entry name overwrite one
         # another. A zip at the root has no prefix, as before.
-        remote_filename = f"{self.blob_directory}{filename}"
+        remote_filename = f"{blob.directory}{filename}"
 
-        with zip_ref.open(filename) as file_obj:
+        if self.is_already_imported(
+            self.get_remote_path(remote_filename), file_info.file_size
+        ):
+            logger.info(
+                "Skipping %s, already in storage for videos_import_request %s",
+                remote_filename,
+                self.videos_import_request.id,
+            )
+            return remote_filename
+
+        # Every entry gets its own reader, so entries download in parallel
+        # instead of taking turns on the lock of a shared ZipFile
+        with (
+            zipfile.ZipFile(self.open_blob(blob), "r") as zip_ref,
+            zip_ref.open(filename) as file_obj,
+        ):
             self.save_file_to_s3(remote_filename, file_obj)
 
         return remote_filename
 
-    def save_file_to_s3(self, filename: str, file_data: BytesIO):
+    def get_remote_path(self, filename: str) -> str:
+        conference = self.videos_import_request.conference
+        return f"conference-videos/{conference.code}/{filename}"
+
+    def save_file_to_s3(self, filename: str, file_data: BinaryIO):
         logger.info(
             "Uploading file %s to S3 for videos_import_request %s",
             filename,
             self.videos_import_request.id,
         )
 
-        conference = self.videos_import_request.conference
-        remote_path = f"conference-videos/{conference.code}/{filename}"
+        remote_path = self.get_remote_path(filename)
         if is_s3_storage(self.storage):
+            # Bounded so that an upload never holds more than the
+            # ZIP_ENTRY_UPLOAD_BUFFER_SIZE its job is counted as
             config = TransferConfig(
-                multipart_threshold=512 * MB,
-                max_concurrency=8,
-                multipart_chunksize=64 * MB,
+                multipart_threshold=ZIP_ENTRY_UPLOAD_CHUNK_SIZE,
+                max_concurrency=ZIP_ENTRY_UPLOAD_CONCURRENCY,
+                multipart_chunksize=ZIP_ENTRY_UPLOAD_CHUNK_SIZE,
                 use_threads=True,
                 max_io_queue=100,
             )
+            # Not an argument of the boto3 config, s3transfer defaults to 10
+            config.max_in_memory_upload_chunks = ZIP_ENTRY_UPLOAD_CONCURRENCY
 
             self.s3_client.upload_fileobj(
                 file_data, self.storage.bucket_name, remote_path, Config=config
@@ -232,132 +621,200 @@ class BaseTransferProcessing:
             self.storage.save(remote_path, file_data)
         return filename
 
-    def cleanup(self):
-        if self.merged_file:
-            os.remove(self.merged_file.name)
-            self.merged_file = None
-
-    def download_file(
-        self, parts_info: list[PartInfo], executor: ThreadPoolExecutor
-    ) -> list[str]:
-        futures = []
-        parts_paths = []
+    def add_file_jobs(
+        self,
+        transfer: FileTransfer,
+        progress: VideosImportFile,
+        scheduler: TransferScheduler,
+    ) -> None:
+        blob = transfer.blob
+        remote_path = self.get_remote_path(blob.filename)
 
-        for part_info in parts_info:
-            futures.append(executor.submit(self.download_part, part_info))
+        if not progress.upload_id and self.is_already_imported(remote_path, blob.size):
+            logger.info(
+                "Skipping %s, already in storage for videos_import_request %s",
+                remote_path,
+                self.videos_import_request.id,
+            )
+            transfer.imported_files.append(blob.filename)
+            return
 
-        for future in futures:
-            filename = future.result()
-            parts_paths.append(filename)
+        if not is_s3_storage(self.storage):
+            transfer.jobs.append(
+                TransferJob(
+                    size=min(blob.size, READ_AHEAD_SIZE),
+                    run=lambda: self.save_file_to_s3(
+                        blob.filename, self.open_blob(blob)
+                    ),
+                    on_done=transfer.imported_files.append,
+                )
+            )
+            return
 
-        logger.info(
-            "Finished downloading all parts for videos_import_request %s",
-            self.videos_import_request.id,
-        )
-        return parts_paths
+        if not progress.upload_id:
+            progress.upload_id = self.s3_client.create_multipart_upload(
+                Bucket=self.storage.bucket_name, Key=remote_path
+            )["UploadId"]
+            progress.part_size = scheduler.part_size(blob.size)
+            progress.save(update_fields=["upload_id", "part_size"])
 
-    def merge_parts(self, parts: list[str]):
-        if not self.has_multiple_parts:
-            self.merged_file = open(parts[0], "rb")
-            return
+        # Parts keep the size the upload started with, so that the parts
+        # uploaded before a restart still line up
+        parts_info = self.determine_parts_info(blob.size, progress.part_size)
+        uploaded_parts = set(progress.parts.values_list("part_number", flat=True))
 
         logger.info(
-            "Merging parts for videos_import_request %s",
+            "Streaming %s bytes in %s parts (%s already uploaded) to %s for videos_import_request %s",
+            blob.size,
+            len(parts_info),
+            len(uploaded_parts),
+            remote_path,
             self.videos_import_request.id,
         )
 
-        self.merged_file = tempfile.NamedTemporaryFile(
-            "wb",
-            prefix=f"videos_import_{self.videos_import_request.id}",
-            suffix=self.extension,
-            delete=False,
-        )
+        def on_part_done(result):
+            # Parts are saved as they finish, a restart only transfers the
+            # parts that were still missing
+            part_number, etag = result
+            VideosImportFilePart.objects.create(
+                file=progress, part_number=part_number, etag=etag
+            )
 
-        subprocess.run(["cat"] + parts, stdout=open(self.merged_file.name, "wb"))
+        for part_info in parts_info:
+            if part_info.part_number in uploaded_parts:
+                continue
 
-        for part in parts:
-            os.remove(part)
+            transfer.jobs.append(
+                TransferJob(
+                    size=part_info.size,
+                    run=functools.partial(
+                        self.transfer_part,
+                        blob,
+                        remote_path,
+                        progress.upload_id,
+                        part_info,
+                    ),
+                    on_done=on_part_done,
+                )
+            )
 
-    def download_part(self, part_info: PartInfo) -> str:
-        attempts = 1
+        transfer.imported_files.append(blob.filename)
+
+    def complete_upload(self, blob: Blob, progress: VideosImportFile) -> None:
+        remote_path = self.get_remote_path(blob.filename)
+        self.s3_client.complete_multipart_upload(
+            Bucket=self.storage.bucket_name,
+            Key=remote_path,
+            UploadId=progress.upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"PartNumber": part_number, "ETag": etag}
+                    for part_number, etag in progress.parts.order_by(
+                        "part_number"
+                    ).values_list("part_number", "etag")
+                ]
+            },
+        )
 
-        while True:
-            if attempts > 3:
-                raise Exception(
-                    f"Failed to download part {str(part_info)} for videos_import_request {self.videos_import_request.id}"
-                )
+        logger.info(
+            "Finished streaming %s for videos_import_request %s",
+            remote_path,
+            self.videos_import_request.id,
+        )
 
-            part_file = tempfile.NamedTemporaryFile(
-                "wb",
-                prefix=f"videos_import_{self.videos_import_request.id}.part{part_info.part_number}",
-                suffix=self.extension,
-                delete=False,
+    def abort_upload(self, progress: VideosImportFile):
+        if progress.upload_id and self.s3_client:
+            self.s3_client.abort_multipart_upload(
+                Bucket=self.storage.bucket_name,
+                Key=self.get_remote_path(progress.source_path),
+                UploadId=progress.upload_id,
             )
 
+        progress.upload_id = ""
+        progress.part_size = None
+        progress.save(update_fields=["upload_id", "part_size"])
+        progress.parts.all().delete()
+
+    def transfer_part(
+        self, blob: Blob, remote_path: str, upload_id: str, part_info: PartInfo
+    ) -> tuple[int, str]:
+        data = self.download_part(blob, part_info)
+
+        response = self.s3_client.upload_part(
+            Bucket=self.storage.bucket_name,
+            Key=remote_path,
+            UploadId=upload_id,
+            PartNumber=part_info.part_number,
+            Body=data,
+        )
+        return part_info.part_number, response["ETag"]
+
+    def download_part(self, blob: Blob, part_info: PartInfo) -> bytes:
+        for attempt in range(1, PART_DOWNLOAD_ATTEMPTS + 1):
             logger.info(
-                "Downloading part %s for videos_import_request %s. Destination = %s. Attempt = %s",
+                "Downloading part %s of %s for videos_import_request %s. Attempt = %s",
                 str(part_info),
+                blob.filename,
                 self.videos_import_request.id,
-                part_file.name,
-                attempts,
+                attempt,
             )
 
             headers = {**self.download_headers(), **part_info.http_range_header}
 
-            with requests.get(
-                self.download_link, headers=headers, stream=True
-            ) as response:
-                response.raise_for_status()
-                shutil.copyfileobj(response.raw, part_file, length=512 * MB)
-
-            part_file.flush()
-            os.fsync(part_file.fileno())
-            part_disk_size = os.path.getsize(part_file.name)
-
-            if part_disk_size != part_info.size:
+            try:
+                with requests.get(
+                    blob.download_link,
+                    headers=headers,
+                    stream=True,
+                    timeout=PART_DOWNLOAD_TIMEOUT,
+                ) as response:
+                    response.raise_for_status()
+                    data = response.raw.read()
+            except (
+                requests.ConnectionError,
+                requests.Timeout,
+                urllib3.exceptions.HTTPError,
+            ) as e:
                 logger.warning(
-                    "Downloaded part %s size does not match the expected size %s (file size %s) for videos_import_request %s. Trying again",
+                    "Downloading part %s failed with %r for videos_import_request %s. Trying again",
                     str(part_info),
-                    part_info.size,
-                    part_disk_size,
+                    e,
                     self.videos_import_request.id,
                 )
-                attempts += 1
-                os.remove(part_file.name)
                 continue
 
-            logger.info(
-                "Downloaded part %s for videos_import_request %s",
+            if len(data) == part_info.size:
+                return data
+
+            logger.warning(
+                "Downloaded part %s size does not match the expected size %s (downloaded %s) for videos_import_request %s. Trying again",
                 str(part_info),
+                part_info.size,
+                len(data),
                 self.videos_import_request.id,
             )
-            return part_file.name
-
-    def determine_parts_info(self, file_size: int) -> list[PartInfo]:
-        num_parts = self._determinate_total_num_of_parts(file_size)
-        chunk_size = file_size // num_parts
-        parts_info = []
-
-        for i in range(num_parts):
-            byte_start = i * chunk_size
-            byte_end = byte_start + chunk_size if i < num_parts - 1 else file_size
-            parts_info.append(
-                PartInfo(part_number=i + 1, byte_start=byte_start, byte_end=byte_end)
-            )
-
-        return parts_info
 
-    def _determinate_total_num_of_parts(self, file_size: int) -> int:
-        if file_size >= 50 * GB:
-            return 8
-
-        if file_size >= 10 * GB:
-            return 4
+        raise Exception(
+            f"Failed to download part {str(part_info)} for videos_import_request {self.videos_import_request.id}"
+        )
 
-        return 1
+    def determine_parts_info(
+        self, file_size: int, part_size: int | None = None
+    ) -> list[PartInfo]:
+        part_size = part_size or get_part_size(file_size)
+        num_parts = max(1, math.ceil(file_size / part_size))
+
+        return [
+            PartInfo(
+                part_number=i + 1,
+                byte_start=i * part_size,
+                byte_end=min((i + 1) * part_size, file_size),
+            )
+            for i in range(num_parts)
+        ]
 
-    def get_file_total_size(self) -> int:
-        head_response = requests.head(self.download_link)
+    def get_file_total_size(self, download_link: str) -> int:
+        head_response = requests.head(download_link)
         return int(head_response.headers["Content-Length"])
 
     def _get_s3_client(self):
@@ -373,12 +830,15 @@ class BaseTransferProcessing:
 class WetransferProcessing(BaseTransferProcessing):
     def run(self) -> list[str]:
         self.setup()
-        self.download_link = self.get_download_link()
-        self.filename, self.extension = self.get_filename_and_extension()
-        self.transfer_total_size = self.get_file_total_size()
+        download_link = self.get_download_link()
+        blob = Blob(
+            filename=self.get_filename(download_link),
+            size=self.get_file_total_size(download_link),
+            download_link=download_link,
+        )
 
         with self.executor() as executor:
-            return self.import_blob(executor)
+            return self.import_blobs([blob], executor)
 
     def get_download_link(self) -> str:
         wetransfer_url = self.videos_import_request.source_url
@@ -400,11 +860,9 @@ class WetransferProcessing(BaseTransferProcessing):
         direct_link = wetransfer_response["direct_link"]
         return direct_link
 
-    def get_filename_and_extension(self):
-        parsed_url = urlparse(self.download_link)
-        direct_link_filename = unquote(parsed_url.path.split("/")[-1])
-        _, ext = os.path.splitext(direct_link_filename)
-        return direct_link_filename, ext
+    def get_filename(self, download_link: str) -> str:
+        parsed_url = urlparse(download_link)
+        return unquote(parsed_url.path.split("/")[-1])
 
 
 GOOGLE_APPS_MIME_PREFIX = "application/vnd.google-apps."
@@ -501,7 +959,7 @@ class GoogleDriveProcessing(BaseTransferProcessing):
                 f"a regular file and share that instead."
             )
 
-        return self.import_file(metadata, metadata["name"], executor)
+        return self.import_blobs([self.get_blob(metadata, metadata["name"])], executor)
 
     def import_folder(self, folder_id: str, executor: ThreadPoolExecutor) -> list[str]:
         logger.info(
@@ -509,62 +967,78 @@ class GoogleDriveProcessing(BaseTransferProcessing):
             folder_id,
             self.videos_import_request.id,
         )
-        imported_files = []
+        # The folder is listed while its first files are already
+        # downloading
+        return self.import_blobs(
+            (
+                self.get_blob(metadata, relative_path)
+                for metadata, relative_path in self.walk_folder(folder_id)
+            ),
+            executor,
+        )
 
-        for metadata, relative_path in self.walk_folder(folder_id, ""):
-            imported_files.extend(self.import_file(metadata, relative_path, executor))
+    def walk_folder(self, folder_id: str):
+        """Yield (metadata, path relative to the shared folder) for every file.
 
-        return imported_files
+        The tree is walked level by level, listing the children of up to
+        DRIVE_PARENTS_PER_QUERY folders with a single Drive query.
+        """
+        prefixes = {folder_id: ""}
+        pending_folder_ids = deque([folder_id])
 
-    def walk_folder(self, folder_id: str, prefix: str):
-        """Yield (metadata, path relative to the shared folder) for every file."""
-        logger.info(
-            "Walking folder %s for videos_import_request %s",
-            folder_id,
-            self.videos_import_request.id,
-        )
-        for item in drive_list_files_in_folder(
-            folder_id=folder_id, credentials=self.credentials
-        ):
-            path = f"{prefix}{item['name']}"
+        while pending_folder_ids:
+            folder_ids = [
+                pending_folder_ids.popleft()
+                for _ in range(min(len(pending_folder_ids), DRIVE_PARENTS_PER_QUERY))
+            ]
+            logger.info(
+                "Walking folders %s for videos_import_request %s",
+                folder_ids,
+                self.videos_import_request.id,
+            )
 
-            if item["mimeType"] == DRIVE_FOLDER_MIME_TYPE:
-                yield from self.walk_folder(item["id"], f"{path}/")
-                continue
+            for item in drive_list_files_in_folders(
+                folder_ids=folder_ids, credentials=self.credentials
+            ):
+                parent_id = next(
+                    (
+                        parent_id
+                        for parent_id in item.get("parents", [])
+                        if parent_id in folder_ids
+                    ),
+                    folder_ids[0],
+                )
+                path = f"{prefixes[parent_id]}{item['name']}"
+
+                if item["mimeType"] == DRIVE_FOLDER_MIME_TYPE:
+                    if item["id"] not in prefixes:
+                        prefixes[item["id"]] = f"{path}/"
+                        pending_folder_ids.append(item["id"])
+                    continue
+
+                if is_google_native(item):
+                    logger.info(
+                        "Skipping %s (%s), it has no downloadable content, "
+                        "for videos_import_request %s",
+                        path,
+                        item["mimeType"],
+                        self.videos_import_request.id,
+                    )
+                    continue
 
-            if is_google_native(item):
                 logger.info(
-                    "Skipping %s (%s), it has no downloadable content, "
-                    "for videos_import_request %s",
-                    path,
-                    item["mimeType"],
+                    "Yielding item %s for videos_import_request %s",
+                    item,
                     self.videos_import_request.id,
                 )
-                continue
-
-            logger.info(
-                "Yielding item %s for videos_import_request %s",
-                item,
-                self.videos_import_request.id,
-            )
-            yield item, path
+                yield item, path
 
-    def import_file(
-        self, metadata: dict, filename: str, executor: ThreadPoolExecutor
-    ) -> list[str]:
-        logger.info(
-            "Importing file %s for videos_import_request %s",
-            filename,
-            self.videos_import_request.id,
+    def get_blob(self, metadata: dict, filename: str) -> Blob:
+        return Blob(
+            filename=filename,
+            size=int(metadata["size"]),
+            download_link=f"{DRIVE_API_URL}/files/{metadata['id']}?alt=media&supportsAllDrives=true",
         )
-        self.filename = filename
-        _, self.extension = os.path.splitext(metadata["name"])
-        self.transfer_total_size = int(metadata["size"])
-        self.download_link = (
-            f"{DRIVE_API_URL}/files/{metadata['id']}?alt=media&supportsAllDrives=true"
-        )
-
-        return self.import_blob(executor)
 
 
 PROCESSING_CLASSES_BY_HOSTNAME = {
@@ -0,0 +1,101 @@
+import logging
+import time
+from enum import Enum
+from typing import Iterable, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.functions import Lower
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+
+class EligibilitySource(str, Enum):
+    """Why a user can (or cannot) vote, decides how long it is cached."""
+
+    SPEAKER = "speaker"
+    TICKET = "ticket"
+    MEMBER = "member"
+    NONE = "none"
+
+
+# Every source is also invalidated when it changes (submission created,
+# pretix order synced, membership saved), the TTLs only bound how stale a
+# decision can get if an invalidation is missed
+ELIGIBILITY_TTLS = {
+    EligibilitySource.SPEAKER: 60 * 60 * 24,  # 1 day
+    EligibilitySource.TICKET: 60 * 60 * 6,  # 6 hours
+    EligibilitySource.MEMBER: 60 * 60 * 24,  # 1 day
+    EligibilitySource.NONE: 60 * 10,  # 10 minutes
+}
+
+
+def _get_cache_key(user_id: int) -> str:
+    # All the decisions of a user live in one entry, so that a membership
+    # change can drop them for every conference at once
+    return f"voting:eligibility:v{CACHE_VERSION}:user_{user_id}"
+
+
+def get_cached_eligibility(user_id: int, conference_id: int) -> Optional[bool]:
+    decisions = cache.get(_get_cache_key(user_id)) or {}
+    decision = decisions.get(conference_id)
+
+    if not decision:
+        return None
+
+    can_vote, expires_at = decision
+
+    if expires_at <= time.time():
+        return None
+
+    return can_vote
+
+
+def store_eligibility(
+    user_id: int, conference_id: int, source: EligibilitySource
+) -> None:
+    key = _get_cache_key(user_id)
+    now = time.time()
+
+    decisions = {
+        cached_conference_id: decision
+        for cached_conference_id, decision in (cache.get(key) or {}).items()
+        if decision[1] > now
+    }
+    decisions[conference_id] = (
+        source != EligibilitySource.NONE,
+        now + ELIGIBILITY_TTLS[source],
+    )
+
+    cache.set(key, decisions, max(ELIGIBILITY_TTLS.values()))
+
+
+def invalidate_voting_eligibility(*user_ids: int) -> None:
+    """Drops the cached decisions once the current transaction commits,
+    before that a check would cache again the decision from the old data."""
+    if not user_ids:
+        return
+
+    def invalidate():
+        logger.debug("Invalidating voting eligibility of user_ids=%s", user_ids)
+        cache.delete_many([_get_cache_key(user_id) for user_id in user_ids])
+
+    transaction.on_commit(invalidate)
+
+
+def invalidate_voting_eligibility_of_emails(emails: Iterable[str]) -> None:
+    from users.models import User
+
+    emails = {email.lower() for email in emails if email}
+
+    if not emails:
+        return
+
+    user_ids = (
+        User.objects.annotate(lower_email=Lower("email"))
+        .filter(lower_email__in=emails)
+        .values_list("id", flat=True)
+    )
+    invalidate_voting_eligibility(*user_ids)
@@ -3,6 +3,11 @@ from pretix import user_has_admission_ticket
 from users.models import User
 from submissions.models import Submission
 from association_membership.models import Membership
+from voting.eligibility import (
+    EligibilitySource,
+    get_cached_eligibility,
+    store_eligibility,
+)
 
 
 def check_if_user_can_vote(user: User, conference: Conference):
@@ -10,9 +15,22 @@ def check_if_user_can_vote(user: User, conference: Conference):
     if user.is_staff:
         return True
 
+    can_vote = get_cached_eligibility(user.id, conference.id)
+
+    if can_vote is not None:
+        return can_vote
+
+    source = get_voting_eligibility_source(user, conference)
+    store_eligibility(user.id, conference.id, source)
+    return source != EligibilitySource.NONE
+
+
+def get_voting_eligibility_source(
+    user: User, conference: Conference
+) -> EligibilitySource:
     # User is a speaker
     if Submission.objects.filter(speaker_id=user.id, conference=conference).exists():
-        return True
+        return EligibilitySource.SPEAKER
 
     additional_events = [
         {
@@ -30,13 +48,13 @@ def check_if_user_can_vote(user: User, conference: Conference):
         event_slug=conference.pretix_event_id,
         additional_events=additional_events,
     ):
-        return True
+        return EligibilitySource.TICKET
 
     # User is a member of Python Italia
     if user_is_python_italia_member(user.id):
-        return True
+        return EligibilitySource.MEMBER
 
-    return False
+    return EligibilitySource.NONE
 
 
 def user_is_python_italia_member(user_id: int) -> bool:
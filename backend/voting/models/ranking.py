@@ -1,8 +1,8 @@
+from collections import Counter
 from typing import Any, Dict, List, Tuple, TypedDict
 
+import numpy as np
 from django.db import models
-from django.db.models import Count
-from django.db.models.functions import Sqrt
 from django.utils.translation import gettext_lazy as _
 from model_utils.fields import AutoCreatedField
 
@@ -10,6 +10,14 @@ from conferences.models import Conference
 from helpers.constants import GENDERS
 from users.models import User
 from submissions.models import Submission
+from voting.ranking_strategies import (
+    DEFAULT_RANKING_STRATEGY,
+    NO_TAG,
+    RANKING_STRATEGIES,
+    RankingStrategy,
+    TaggedVotes,
+    UsersMostVotedBased,
+)
 
 
 class RankStat(models.Model):
@@ -70,97 +78,95 @@ class RankRequest(models.Model):
         self.save_rank_submissions(ranked_submissions_by_tags)
         self.build_stats()
 
-    def build_ranking(self, conference: Conference):
-        """Builds the ranking
-
-        P. S. maybe we should make some *Strategy* in order to have all
-        available and run different strategies...
+    def build_ranking(
+        self, conference: Conference, strategy: str = DEFAULT_RANKING_STRATEGY
+    ):
+        """Builds the ranking using one of the `RANKING_STRATEGIES`
 
-        :return: list of dictionary ordered by score descending
-        [{
-            "submission_id": submission.id,
-            "submission__topic_id": submission.topic_id,
-            "score": score
-        },
+        :return: list of (tag, ranks) tuples, ranks ordered by score descending
+        [(
+            {"tags__id": tag.id, "tags__name": tag.name, "total": 3},
+            [{"submission_id": submission.id, "score": score}, ...]
+        ),
         ...
         ]
         """
 
-        return RankRequest.users_most_voted_based(conference)
+        return RankRequest.rank_by_tag(conference, RANKING_STRATEGIES[strategy])
 
     @staticmethod
     def users_most_voted_based(conference) -> List[Tuple[Dict[str, Any], List[Rank]]]:
         """Builds the ranking based on the votes each user has gived
-        This algorithm rewards users who have given more votes. If a user
-        votes many submissions, it means that he cares about his choices so
-        he must be rewarded by weighing his votes more.
+        See `voting.ranking_strategies.UsersMostVotedBased`.
+        """
 
-        P. S. maybe we should make some *Strategy* in order to have all
-        available and run different strategies...
+        return RankRequest.rank_by_tag(conference, UsersMostVotedBased())
 
+    @staticmethod
+    def rank_by_tag(
+        conference, strategy: RankingStrategy
+    ) -> List[Tuple[Dict[str, Any], List[Rank]]]:
+        """Ranks the proposed submissions of each tag by the score given by
+        `strategy`. All the votes and tags are loaded in two queries and
+        scored at once.
         """
 
-        from voting.models import Vote
+        memberships = list(
+            Submission.objects.filter(
+                conference=conference, status=Submission.STATUS.proposed
+            )
+            .order_by("id")
+            .values_list("id", "tags__id", "tags__name")
+        )
 
-        submissions = Submission.objects.prefetch_related("tags").filter(
-            conference=conference, status=Submission.STATUS.proposed
+        if not memberships:
+            return []
+
+        totals = Counter((tag_id, name) for _, tag_id, name in memberships)
+        tags = sorted(
+            (
+                {
+                    "tags__id": tag_id,
+                    "tags__name": name,
+                    # Submissions without tags are ranked together but,
+                    # like before, they do not count as a tag
+                    "total": total if tag_id is not None else 0,
+                }
+                for (tag_id, name), total in totals.items()
+            ),
+            key=lambda tag: (-tag["total"], tag["tags__name"] or ""),
         )
+        tag_positions = {tag["tags__id"]: index for index, tag in enumerate(tags)}
 
-        tags = (
-            submissions.values("tags__id", "tags__name")
-            .annotate(total=Count("tags"))
-            .order_by("-total", "tags__name")
+        submission_ids = np.array([row[0] for row in memberships], dtype=np.int64)
+        tag_ids = np.array(
+            [NO_TAG if row[1] is None else row[1] for row in memberships],
+            dtype=np.int64,
+        )
+        scores = strategy.score(
+            TaggedVotes.for_conference(conference), tag_ids, submission_ids
         )
 
-        votes = Vote.objects.filter(submission__conference=conference)
-
-        users_weight = RankRequest.get_users_weights(votes)
-        rankings = []
-        for tag in tags:
-            tag_submissions = submissions.filter(tags__id=tag["tags__id"])
-
-            tag_ranking: List[Rank] = []
-            for submission in tag_submissions:
-                submission_votes = votes.filter(submission=submission)
-
-                if submission_votes:
-                    vote_info = {}
-                    for vote in submission_votes:
-                        vote_info[vote.id] = {
-                            "normalised_vote": vote.value
-                            * users_weight[(vote.user_id, tag["tags__id"])],
-                            "scale_factor": users_weight[
-                                (vote.user_id, tag["tags__id"])
-                            ],
-                        }
-                    score = sum(
-                        [v["normalised_vote"] for v in vote_info.values()]
-                    ) / sum([v["scale_factor"] for v in vote_info.values()])
-                else:
-                    score = 0
-
-                rank: Rank = {
-                    "submission_id": submission.id,
-                    "score": score,
+        # Tag order first, then highest score, ties keep the submission order
+        order = np.lexsort(
+            (
+                np.arange(len(memberships)),
+                -scores,
+                np.array([tag_positions[row[1]] for row in memberships]),
+            )
+        )
+
+        rankings = [(tag, []) for tag in tags]
+        for index in order:
+            rankings[tag_positions[memberships[index][1]]][1].append(
+                {
+                    "submission_id": memberships[index][0],
+                    "score": float(scores[index]),
                 }
-                tag_ranking.append(rank)
-                tag_ranking = sorted(
-                    tag_ranking, key=lambda k: k["score"], reverse=True
-                )
+            )
 
-            rankings.append((tag, tag_ranking))
         return rankings
 
-    @staticmethod
-    def get_users_weights(votes):
-        queryset = votes.values("submission__tags", "user_id").annotate(
-            weight=Sqrt(Count("submission__tags"))
-        )
-        return {
-            (weight["user_id"], weight["submission__tags"]): weight["weight"]
-            for weight in queryset
-        }
-
     def save_rank_submissions(
         self, ranked_submissions_by_tag: List[Tuple[Dict[str, Any], List[Rank]]]
     ):
@@ -168,16 +174,21 @@ class RankRequest(models.Model):
         from the score
         """
 
-        for tag, submissions in ranked_submissions_by_tag:
-            for index, rank in enumerate(submissions):
-                RankSubmission.objects.create(
+        RankSubmission.objects.bulk_create(
+            [
+                RankSubmission(
                     rank_request=self,
-                    submission=Submission.objects.get(pk=rank["submission_id"]),
+                    submission_id=rank["submission_id"],
                     rank=index + 1,
                     score=rank["score"],
                     total_submissions_per_tag=tag["total"],
                     tag_id=tag["tags__id"],
                 )
+                for tag, submissions in ranked_submissions_by_tag
+                for index, rank in enumerate(submissions)
+            ],
+            batch_size=1000,
+        )
 
     def build_stats(self):
         submissions = self.rank_submissions.all()
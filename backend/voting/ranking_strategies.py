@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Protocol
+
+import numpy as np
+
+# Tag id used for the votes and submissions without tags
+NO_TAG = -1
+
+
+def _pair_keys(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Packs two id columns into a single int64 key per row, so pairs can be
+    grouped and looked up with `np.unique` and `np.searchsorted`.
+    """
+    return ((first.astype(np.int64) + 1) << 32) | second.astype(np.int64)
+
+
+@dataclass
+class TaggedVotes:
+    """Votes of a conference, one row for each tag of the voted submission."""
+
+    user_ids: np.ndarray
+    submission_ids: np.ndarray
+    tag_ids: np.ndarray
+    values: np.ndarray
+
+    @classmethod
+    def for_conference(cls, conference) -> TaggedVotes:
+        from voting.models import Vote
+
+        rows = list(
+            Vote.objects.filter(submission__conference=conference).values_list(
+                "user_id", "submission_id", "submission__tags", "value"
+            )
+        )
+
+        return cls(
+            user_ids=np.array([row[0] for row in rows], dtype=np.int64),
+            submission_ids=np.array([row[1] for row in rows], dtype=np.int64),
+            tag_ids=np.array(
+                [NO_TAG if row[2] is None else row[2] for row in rows],
+                dtype=np.int64,
+            ),
+            values=np.array([row[3] for row in rows], dtype=np.float64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class RankingStrategy(Protocol):
+    """Protocol defining how submissions are scored inside each tag."""
+
+    def score(
+        self,
+        votes: TaggedVotes,
+        tag_ids: np.ndarray,
+        submission_ids: np.ndarray,
+    ) -> np.ndarray:
+        """Return the score of each (tag, submission) pair, 0 when the
+        submission has no votes."""
+        ...
+
+
+def weighted_mean_by_pair(
+    votes: TaggedVotes,
+    weights: np.ndarray,
+    tag_ids: np.ndarray,
+    submission_ids: np.ndarray,
+) -> np.ndarray:
+    """Weighted mean of the vote values of each (tag, submission) pair."""
+    scores = np.zeros(len(tag_ids), dtype=np.float64)
+
+    if not len(votes):
+        return scores
+
+    keys, inverse = np.unique(
+        _pair_keys(votes.tag_ids, votes.submission_ids), return_inverse=True
+    )
+    means = np.bincount(inverse, weights=votes.values * weights) / np.bincount(
+        inverse, weights=weights
+    )
+
+    wanted = _pair_keys(tag_ids, submission_ids)
+    positions = np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)
+    found = keys[positions] == wanted
+    scores[found] = means[positions[found]]
+    return scores
+
+
+class UsersMostVotedBased:
+    """Rewards users who have given more votes. If a user votes many
+    submissions, it means that they care about their choices so their
+    votes must weigh more.
+
+    The weight of a user in a tag is the square root of the number of
+    submissions with that tag they voted.
+    """
+
+    def score(
+        self,
+        votes: TaggedVotes,
+        tag_ids: np.ndarray,
+        submission_ids: np.ndarray,
+    ) -> np.ndarray:
+        if not len(votes):
+            return np.zeros(len(tag_ids), dtype=np.float64)
+
+        _, inverse, counts = np.unique(
+            _pair_keys(votes.tag_ids, votes.user_ids),
+            return_inverse=True,
+            return_counts=True,
+        )
+        weights = np.sqrt(counts[inverse])
+
+        return weighted_mean_by_pair(votes, weights, tag_ids, submission_ids)
+
+
+class Unweighted:
+    """Every vote counts the same, the score is the mean vote."""
+
+    def score(
+        self,
+        votes: TaggedVotes,
+        tag_ids: np.ndarray,
+        submission_ids: np.ndarray,
+    ) -> np.ndarray:
+        return weighted_mean_by_pair(
+            votes, np.ones(len(votes)), tag_ids, submission_ids
+        )
+
+
+RANKING_STRATEGIES: dict[str, RankingStrategy] = {
+    "users_most_voted_based": UsersMostVotedBased(),
+    "unweighted": Unweighted(),
+}
+
+DEFAULT_RANKING_STRATEGY = "users_most_voted_based"
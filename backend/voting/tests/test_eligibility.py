@@ -0,0 +1,125 @@
+import pytest
+import time_machine
+from django.test import override_settings
+
+from association_membership.tests.factories import MembershipFactory
+from conferences.tests.factories import ConferenceFactory
+from submissions.tests.factories import SubmissionFactory
+from users.tests.factories import UserFactory
+from voting.eligibility import (
+    EligibilitySource,
+    get_cached_eligibility,
+    invalidate_voting_eligibility,
+    invalidate_voting_eligibility_of_emails,
+    store_eligibility,
+)
+from voting.helpers import check_if_user_can_vote
+
+pytestmark = pytest.mark.django_db
+
+LOCMEM_CACHE = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "test-voting-eligibility",
+    }
+}
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache():
+    from django.core.cache import cache
+
+    with override_settings(CACHES=LOCMEM_CACHE):
+        cache.clear()
+        yield
+        cache.clear()
+
+
+def test_decisions_are_cached_per_conference():
+    store_eligibility(1, 10, EligibilitySource.TICKET)
+    store_eligibility(1, 20, EligibilitySource.NONE)
+
+    assert get_cached_eligibility(1, 10) is True
+    assert get_cached_eligibility(1, 20) is False
+    assert get_cached_eligibility(1, 30) is None
+    assert get_cached_eligibility(2, 10) is None
+
+
+def test_decisions_expire_based_on_their_source():
+    with time_machine.travel("2024-01-01 10:00Z", tick=False):
+        store_eligibility(1, 10, EligibilitySource.TICKET)
+        store_eligibility(1, 20, EligibilitySource.NONE)
+
+    with time_machine.travel("2024-01-01 10:30Z", tick=False):
+        assert get_cached_eligibility(1, 10) is True
+        assert get_cached_eligibility(1, 20) is None
+
+
+def test_invalidate_voting_eligibility(django_capture_on_commit_callbacks):
+    store_eligibility(1, 10, EligibilitySource.TICKET)
+    store_eligibility(2, 10, EligibilitySource.TICKET)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidate_voting_eligibility(1)
+
+        # Nothing is dropped until the transaction commits
+        assert get_cached_eligibility(1, 10) is True
+
+    assert get_cached_eligibility(1, 10) is None
+    assert get_cached_eligibility(2, 10) is True
+
+
+def test_invalidate_voting_eligibility_of_emails(django_capture_on_commit_callbacks):
+    user = UserFactory(email="Voter@example.org")
+    store_eligibility(user.id, 10, EligibilitySource.NONE)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidate_voting_eligibility_of_emails(["voter@example.org"])
+
+    assert get_cached_eligibility(user.id, 10) is None
+
+
+def test_check_if_user_can_vote_caches_the_decision(mocker):
+    user = UserFactory()
+    conference = ConferenceFactory()
+    has_ticket = mocker.patch(
+        "voting.helpers.user_has_admission_ticket", return_value=True
+    )
+
+    assert check_if_user_can_vote(user, conference) is True
+    assert check_if_user_can_vote(user, conference) is True
+
+    has_ticket.assert_called_once()
+
+
+def test_creating_a_submission_invalidates_the_decision(
+    mocker, django_capture_on_commit_callbacks
+):
+    user = UserFactory()
+    conference = ConferenceFactory()
+    mocker.patch("voting.helpers.user_has_admission_ticket", return_value=False)
+    mocker.patch("reviews.tasks.schedule_submission_embeddings_update")
+
+    assert check_if_user_can_vote(user, conference) is False
+
+    with django_capture_on_commit_callbacks(execute=True):
+        SubmissionFactory(speaker=user, conference=conference)
+
+    assert check_if_user_can_vote(user, conference) is True
+
+
+def test_membership_changes_invalidate_the_decision(
+    mocker, django_capture_on_commit_callbacks
+):
+    user = UserFactory()
+    conference = ConferenceFactory()
+    mocker.patch("voting.helpers.user_has_admission_ticket", return_value=False)
+    membership = MembershipFactory(user=user)
+
+    assert check_if_user_can_vote(user, conference) is False
+
+    with django_capture_on_commit_callbacks(execute=True):
+        membership.mark_as_active()
+        membership.save()
+
+    assert check_if_user_can_vote(user, conference) is True
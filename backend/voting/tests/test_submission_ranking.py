@@ -1,8 +1,12 @@
+import math
+
 from conferences.tests.factories import ConferenceFactory
 from submissions.tests.factories import SubmissionFactory, SubmissionTagFactory
 import pytest
 
+from users.tests.factories import UserFactory
 from voting.models import RankRequest
+from voting.tests.factories import VoteFactory
 
 pytestmark = pytest.mark.django_db
 
@@ -59,3 +63,86 @@ def test_tag_count_should_remain_the_same():
     assert ranking.rank_submissions.filter(tag=polenta).count() == 6
     assert ranking.rank_submissions.filter(tag=sushi).count() == 3
     assert ranking.rank_submissions.filter(tag=pizza).count() == 6
+
+
+def _voted_pizza_submissions(conference):
+    pizza = SubmissionTagFactory(name="Pizza")
+    first = SubmissionFactory(conference=conference, tags=["Pizza"])
+    second = SubmissionFactory(conference=conference, tags=["Pizza"])
+    not_voted = SubmissionFactory(conference=conference, tags=["Pizza"])
+
+    user = UserFactory()
+    VoteFactory(user=user, submission=first, value=4)
+    VoteFactory(user=user, submission=second, value=2)
+    VoteFactory(user=UserFactory(), submission=first, value=1)
+
+    return pizza, first, second, not_voted
+
+
+def test_users_who_voted_more_weigh_more():
+    conference = ConferenceFactory()
+    pizza, first, second, not_voted = _voted_pizza_submissions(conference)
+
+    ranking = RankRequest.objects.create(conference=conference, is_public=True)
+
+    rank_submissions = list(ranking.rank_submissions.filter(tag=pizza).order_by("rank"))
+
+    assert [r.submission for r in rank_submissions] == [first, second, not_voted]
+    assert [r.rank for r in rank_submissions] == [1, 2, 3]
+    # The first user voted 2 pizza submissions, so their vote weighs sqrt(2)
+    assert float(rank_submissions[0].score) == pytest.approx(
+        (4 * math.sqrt(2) + 1) / (math.sqrt(2) + 1), abs=1e-6
+    )
+    assert float(rank_submissions[1].score) == 2
+    assert float(rank_submissions[2].score) == 0
+    assert all(r.total_submissions_per_tag == 3 for r in rank_submissions)
+
+
+def test_build_ranking_with_another_strategy():
+    conference = ConferenceFactory()
+    pizza, first, second, not_voted = _voted_pizza_submissions(conference)
+
+    [(tag, ranks)] = RankRequest(conference=conference).build_ranking(
+        conference, strategy="unweighted"
+    )
+
+    assert tag["tags__id"] == pizza.id
+    assert ranks == [
+        {"submission_id": first.id, "score": 2.5},
+        {"submission_id": second.id, "score": 2.0},
+        {"submission_id": not_voted.id, "score": 0.0},
+    ]
+
+
+def test_submissions_without_tags_are_ranked_together():
+    conference = ConferenceFactory()
+    SubmissionTagFactory(name="Pizza")
+    tagged = SubmissionFactory(conference=conference, tags=["Pizza"])
+    untagged = SubmissionFactory(conference=conference)
+    untagged.tags.clear()
+
+    rankings = RankRequest.users_most_voted_based(conference)
+
+    assert [(tag["tags__name"], tag["total"]) for tag, _ in rankings] == [
+        ("Pizza", 1),
+        (None, 0),
+    ]
+    assert rankings[0][1] == [{"submission_id": tagged.id, "score": 0.0}]
+    assert rankings[1][1] == [{"submission_id": untagged.id, "score": 0.0}]
+
+
+def test_build_ranking_runs_a_fixed_number_of_queries(
+    django_assert_max_num_queries,
+):
+    conference = ConferenceFactory()
+    SubmissionTagFactory(name="Pizza")
+    SubmissionTagFactory(name="Sushi")
+
+    for _ in range(10):
+        submission = SubmissionFactory(conference=conference, tags=["Pizza", "Sushi"])
+        VoteFactory(submission=submission)
+
+    with django_assert_max_num_queries(2):
+        rankings = RankRequest.users_most_voted_based(conference)
+
+    assert [len(ranks) for _, ranks in rankings] == [10, 10]
@@ -49,6 +49,31 @@ const getConferenceRoleForTicketData = async (orderPosition) => {
   return CACHED_ORDER_POSITIONS[orderPosition.id];
 };
 
+const loadConferenceRoles = async (orderPositions) => {
+  const request = await fetch(
+    "https://admin.pycon.it/badges/pycon2026/roles",
+    {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+        "X-Backend-Token": process.env.BERI_API_TOKEN,
+      },
+      body: JSON.stringify({ positions: orderPositions }),
+    },
+  );
+
+  // One JSON object per line, streamed while the roles are calculated
+  const response = await request.text();
+  for (const line of response.split("\n")) {
+    if (!line) {
+      continue;
+    }
+
+    const { id, role, ticket_hashid } = JSON.parse(line);
+    CACHED_ORDER_POSITIONS[id] = { role, ticketHashid: ticket_hashid };
+  }
+};
+
 const getAllOrderPositions = async () => {
   let next =
     "https://tickets.pycon.it/api/v1/organizers/python-italia/events/pyconit2026/checkinlists/72/positions/";
@@ -88,8 +113,11 @@ const createEmptyBadgeOrderPositions = () => {
 
   const allBadgesCreated = [];
 
+  const orderPositions = await getAllOrderPositions();
+  await loadConferenceRoles(orderPositions);
+
   const allOrderPositions = [
-    ...(await getAllOrderPositions()),
+    ...orderPositions,
     ...createEmptyBadgeOrderPositions(),
   ];
 
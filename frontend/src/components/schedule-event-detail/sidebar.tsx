@@ -58,7 +58,11 @@ export const Sidebar = ({
   const [
     executeBookScheduleItem,
     { data: bookSpotData, loading: isBookingSpot },
-  ] = useBookScheduleItemMutation();
+  ] = useBookScheduleItemMutation({
+    // A full event answers with the waitlist position instead of the
+    // schedule item, so the booking state needs to be loaded again
+    refetchQueries: ["WorkshopBookingState"],
+  });
 
   const [executeCancelBooking, { loading: isCancellingBooking }] =
     useCancelBookingScheduleItemMutation();
@@ -80,6 +84,9 @@ export const Sidebar = ({
   };
 
   const userHasSpot = bookingStateData?.conference?.talk?.userHasSpot;
+  const waitlistPosition =
+    bookingStateData?.conference?.talk?.userWaitlistPosition;
+  const isInWaitlist = !userHasSpot && !!waitlistPosition;
 
   return (
     <>
@@ -125,16 +132,20 @@ export const Sidebar = ({
             <FormattedMessage id="talk.spotReserved" />
           </EventInfo>
         )}
+        {isInWaitlist && (
+          <EventInfo>
+            <FormattedMessage
+              id="talk.waitingListPosition"
+              values={{ position: waitlistPosition }}
+            />
+          </EventInfo>
+        )}
       </MultiplePartsCard>
       <Spacer size="medium" />
       {bookable && (
         <VerticalStack alignItems="start">
           <ErrorsList
             errors={[
-              bookSpotData?.bookScheduleItem?.__typename ===
-                "ScheduleItemIsFull" && (
-                <FormattedMessage id="talk.eventIsFull" />
-              ),
               bookSpotData?.bookScheduleItem?.__typename ===
                 "UserNeedsConferenceTicket" && (
                 <FormattedMessage
@@ -155,19 +166,27 @@ export const Sidebar = ({
               ),
             ]}
           />
-          {!isLoadingBookingState &&
-            isLoggedIn &&
-            (spacesLeft > 0 || userHasSpot) && (
-              <Button
-                onClick={userHasSpot ? cancelBooking : bookScheduleItem}
-                disabled={isBookingSpot || isCancellingBooking}
-                size="small"
-                variant="secondary"
-              >
-                {userHasSpot && <FormattedMessage id="talk.unregisterCta" />}
-                {!userHasSpot && <FormattedMessage id="talk.bookCta" />}
-              </Button>
-            )}
+          {!isLoadingBookingState && isLoggedIn && (
+            <Button
+              onClick={
+                userHasSpot || isInWaitlist ? cancelBooking : bookScheduleItem
+              }
+              disabled={isBookingSpot || isCancellingBooking}
+              size="small"
+              variant="secondary"
+            >
+              {userHasSpot && <FormattedMessage id="talk.unregisterCta" />}
+              {isInWaitlist && (
+                <FormattedMessage id="talk.leaveWaitingListCta" />
+              )}
+              {!userHasSpot && !isInWaitlist && spacesLeft > 0 && (
+                <FormattedMessage id="talk.bookCta" />
+              )}
+              {!userHasSpot && !isInWaitlist && spacesLeft <= 0 && (
+                <FormattedMessage id="talk.joinWaitingListCta" />
+              )}
+            </Button>
+          )}
         </VerticalStack>
       )}
       {children}
@@ -1054,6 +1054,10 @@ If this new timing doesn't work for you, please don't hesitate to let us know be
     "talk.buyATicket": "You need to buy a ticket to book: {link}",
     "talk.buyATicketCTA": "Tickets",
     "talk.eventIsFull": "No spaces left",
+    "talk.joinWaitingListCta": "Join the waiting list",
+    "talk.leaveWaitingListCta": "Leave the waiting list",
+    "talk.waitingListPosition":
+      "The event is full, you are #{position} in the waiting list. We will email you if a spot frees up",
     "talk.speaker": "{count, plural, one {Speaker} other {Speakers}}",
     "talk.language": "Language",
     "talk.language.it": "Italian",
@@ -1826,6 +1830,10 @@ Il tuo voto ci aiuterà a creare un programma che più rispecchia ciò che la co
     "talk.buyATicket": "Devi acquistare un biglietto per registrarti: {link}",
     "talk.buyATicketCTA": "Biglietti",
     "talk.eventIsFull": "Nessun posto rimasto",
+    "talk.joinWaitingListCta": "Entra in lista d'attesa",
+    "talk.leaveWaitingListCta": "Esci dalla lista d'attesa",
+    "talk.waitingListPosition":
+      "L'evento è pieno, sei #{position} nella lista d'attesa. Ti invieremo un'email se si libera un posto",
     "talk.speaker": "{count, plural, one {Speaker} other {Speaker}}",
     "talk.language": "Lingua",
     "talk.language.it": "Italiano",
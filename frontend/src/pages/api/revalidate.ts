@@ -1,16 +1,26 @@
 export default async function handler(req, res) {
-  const { secret, path } = req.body;
+  const { secret, path, paths } = req.body;
 
   if (secret !== process.env.REVALIDATE_SECRET) {
     return res.status(401).json({ message: "Invalid secret" });
   }
 
-  if (!path) {
+  const pathsToRevalidate = paths ?? (path ? [path] : []);
+
+  if (
+    !Array.isArray(pathsToRevalidate) ||
+    pathsToRevalidate.length === 0 ||
+    pathsToRevalidate.some((pathToRevalidate) => !pathToRevalidate)
+  ) {
     return res.status(400).json({ message: "Invalid path" });
   }
 
   try {
-    await res.revalidate(path);
+    await Promise.all(
+      pathsToRevalidate.map((pathToRevalidate) =>
+        res.revalidate(pathToRevalidate),
+      ),
+    );
     return res.json({ revalidated: true });
   } catch (err) {
     console.error(err);
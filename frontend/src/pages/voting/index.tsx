@@ -75,6 +75,8 @@ export const VotingPage = () => {
     tags: [],
   });
   const [currentPage, setCurrentPage] = useState(1);
+  // Keeps the next pages on the same shuffled list as the first one
+  const [cursor, setCursor] = useState<string | null>(null);
 
   const updateUrl = (filters, page) => {
     const qs = new URLSearchParams();
@@ -115,6 +117,7 @@ export const VotingPage = () => {
     nextStateValues.voted = voted !== null ? [voted.toString()] : [];
     updateUrl(nextStateValues, 1);
     setCurrentPage(1);
+    setCursor(null);
     setCurrentFilters(nextStateValues);
   };
 
@@ -144,6 +147,7 @@ export const VotingPage = () => {
     variables: {
       conference: process.env.conferenceCode,
       page: currentPage,
+      cursor: currentPage > 1 ? cursor : null,
       language,
       languages: currentFilters.languages,
       voted: toBoolean(currentFilters.voted?.[0]),
@@ -155,6 +159,14 @@ export const VotingPage = () => {
     errorPolicy: "all",
   });
 
+  useEffect(() => {
+    const nextCursor = data?.submissions?.pageInfo?.cursor;
+
+    if (nextCursor) {
+      setCursor(nextCursor);
+    }
+  }, [data?.submissions?.pageInfo?.cursor]);
+
   const navigateToPage = (page: number) => {
     setCurrentPage(page);
     updateUrl(currentFilters, page);